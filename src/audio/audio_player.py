@@ -2,62 +2,139 @@
 
 基於 sounddevice 的音訊播放器，支援即時音訊處理和等化器。
 """
+import math
 import threading
 import time
-from typing import Optional, Callable
+from typing import Optional, Callable, NamedTuple
 import numpy as np
+from src.core.constants import AUDIO_BLOCK_SIZE
 from src.core.logger import logger
+from src.audio.callback_stats import CallbackStats
+from src.audio.decoders import DecoderRegistry
+from src.audio.fade_curves import FADE_CURVES, FADE_LINEAR, apply_fade_table, get_fade_table
+from src.audio.latency_profiles import (
+    LATENCY_PROFILES, PROFILE_ADAPTIVE, PROFILE_BALANCED, PROFILE_NAMES, AdaptiveLatencyController
+)
+
+from src.audio.output_backends import SoundDeviceBackend
+from src.audio.pcm_cache import INT16_SCALE, encode_int16
 
 try:
     import sounddevice as sd
-    import librosa
-    import soundfile as sf
     SOUNDDEVICE_AVAILABLE = True
-except ImportError:
+except (ImportError, OSError):
+    # OSError: 已安裝 sounddevice 但找不到 PortAudio (例如無頭 Linux)
+    sd = None
     SOUNDDEVICE_AVAILABLE = False
-    logger.warning("sounddevice 相關套件未安裝，AudioPlayer 無法使用")
+    logger.warning("sounddevice 未安裝或無法載入，AudioPlayer 只能使用模擬輸出後端")
+
+try:
+    import soundfile as sf
+except ImportError:
+    # 解碼由 DecoderRegistry 處理，缺少的後端會自動略過 (librosa 只在需要時才載入)
+    sf = None
+
+
+class PlaybackParams(NamedTuple):
+    """音訊回調讀取的播放參數快照
+
+    快照為不可變物件，控制端以 _replace() 建立新快照後整個替換，
+    回調在每個區塊開始時讀取一次參照，因此永遠看到一致的參數組合。
+    """
+    paused: bool = False
+    volume: float = 1.0
+    fade_enabled: bool = True
+    fade_curve: str = FADE_LINEAR
+    fade_table: tuple = get_fade_table(FADE_LINEAR)  # (增益表, 差值表)
 
 
 class AudioPlayer:
     """基於 sounddevice 的音訊播放器
 
     功能:
-    - 音訊檔案載入和解碼 (支援 MP3, WAV, FLAC, OGG)
+    - 音訊檔案載入和解碼 (支援 MP3, WAV, FLAC, OGG)，由 DecoderRegistry 選擇解碼後端
     - 播放控制: play(), pause(), resume(), stop()
     - 跳轉控制: seek(position_seconds)
     - 音量控制: set_volume(0.0 - 1.0)
     - 即時音訊處理: 整合 AudioProcessor
     - 播放狀態查詢: is_playing(), is_paused(), get_position(), get_duration()
     - 播放結束回調: on_playback_end
+    - 解碼快取: 可選的 PCMCache，重播已快取的歌曲不需再次解碼
+    - 輸出後端: 預設為 sounddevice，也可使用 SimulatedOutputBackend 在沒有音效卡時播放
+
+    即時回調只在串流開啟時預先配置的緩衝區上就地運算，
+    穩定播放期間不會配置新的音訊陣列。
+
+    執行緒模型:
+    - 回調從不取得鎖；控制端透過原子替換的 PlaybackParams 快照傳遞參數
+    - current_frame 只由回調寫入 (串流停止時例外)，UI 查詢直接讀取
+    - seek() 只發布 (序號, 目標幀) 請求，由回調在下一個區塊套用
+    - 播放速度由 AudioProcessor 的串流時間伸縮即時處理，
+      current_frame 以來源幀計算，因此位置與時長不受速度影響
+    - self._lock 僅用來序列化控制端操作，不會與回調競爭
+    - 回調不寫日誌；狀態旗標、處理錯誤與耗時記錄在 callback_stats，由控制端讀取
     """
 
-    def __init__(self, audio_processor=None):
+    # 預設串流區塊大小 (frames)，實際大小依延遲設定檔 (self.blocksize)
+    BLOCKSIZE = AUDIO_BLOCK_SIZE
+
+    def __init__(self, audio_processor=None, pcm_cache=None, decoders=None, output_backend=None,
+                 compact_memory=False):
         """初始化音訊播放器
 
         Args:
             audio_processor: AudioProcessor 實例，用於即時音訊處理
+            pcm_cache: PCMCache 實例，用於快取解碼後的音訊 (可選)
+            decoders: DecoderRegistry 實例，預設使用 soundfile、ffmpeg、librosa
+            output_backend: OutputBackend 實例，預設使用 sounddevice
+            compact_memory: True 時整首載入的音訊以 int16 與原始聲道數保存在記憶體，
+                            回調逐區塊轉換為 float32 立體聲 (記憶體用量為 1/2 到 1/4)
+
+        Raises:
+            ImportError: 未指定輸出後端且 sounddevice 無法使用
         """
-        if not SOUNDDEVICE_AVAILABLE:
-            raise ImportError(
-                "sounddevice, librosa, soundfile 未安裝。"
-                "請執行: pip install sounddevice librosa soundfile"
-            )
+        if output_backend is None:
+            if not SOUNDDEVICE_AVAILABLE:
+                raise ImportError(
+                    "sounddevice 未安裝或無法載入。"
+                    "請執行: pip install sounddevice librosa soundfile"
+                )
+            output_backend = SoundDeviceBackend()
 
-        self.audio_processor = audio_processor
+        self._audio_processor = None
+        self.pcm_cache = pcm_cache
+        self.decoders = decoders if decoders is not None else DecoderRegistry()
+        self.output_backend = output_backend
         self.stream = None
-        self.audio_data = None  # shape: (frames, channels)
+        self.compact_memory = compact_memory
+        self.audio_data = None  # shape: (frames, channels)，float32 / int16 陣列或快取的 memmap
         self.sample_rate = 44100
         self.current_frame = 0
         self._is_playing = False
-        self._is_paused = False
-        self.volume = 1.0
+
+        # 回調讀取的參數快照 (暫停、音量、淡入淡出開關)
+        self._params = PlaybackParams()
+        self.audio_processor = audio_processor
+
+        # 跳轉請求: (序號, 目標幀)，序號與 _seek_applied 不同時表示尚未套用
+        self._seek_request = (0, 0)
+        self._seek_applied = 0
+
+        # 播放結束是否已通知 (只由回調寫入，每次播放只觸發一次 on_playback_end)
+        self._end_reported = False
 
         # 淡入淡出設定
         self.fade_in_duration = 1.0  # 秒
         self.fade_out_duration = 1.0  # 秒
-        self.fade_enabled = True
         self._fade_in_frames = 0
         self._fade_out_start_frame = 0
+        self._fade_out_frames = 1  # 淡出區段長度 (每首曲目計算一次)
+
+        # 延遲設定 (區塊大小與裝置延遲，adaptive 時由控制器依回調餘裕調整區塊大小)
+        self.latency_profile = PROFILE_BALANCED
+        self.blocksize = self.BLOCKSIZE
+        self._stream_latency = None
+        self._adaptive_latency = None
 
         # 播放速度設定
         self.playback_speed = 1.0  # 1.0 = 正常速度
@@ -68,53 +145,127 @@ class AudioPlayer:
         self._sleep_timer_thread = None
         self._sleep_timer_active = False
 
-        # 線程鎖 (保護共享狀態)
+        # 即時回調的預先配置緩衝區 (於 play() 時依區塊大小配置)
+        self._block_buffer = None  # shape: (blocksize, channels)
+        self._input_buffer = None  # 變速時的來源區塊，shape: (最大輸入幀數, channels)
+        self._frame_offsets = None  # 0..blocksize-1，用於計算淡入淡出曲線
+        self._gain_buffer = None  # 淡入淡出增益暫存
+        self._fade_position = None  # 淡入淡出查表暫存 (表格位置 / 格內位置)
+        self._fade_indices = None  # 淡入淡出查表暫存 (格點索引)
+        self._fade_slopes = None  # 淡入淡出查表暫存 (格點差值)
+
+        # 控制端鎖 (序列化 play/stop/seek 等操作，回調不使用)
         self._lock = threading.Lock()
 
+        # 回調執行時間、欠載與處理錯誤統計 (回調寫入，UI / 診斷讀取)
+        self.callback_stats = CallbackStats()
+        self._logged_problems = (0, 0, 0)  # 已寫入日誌的 (期限未達, 欠載/溢位, 處理錯誤)
+
+        # 頻譜分析器 (接收處理後的樣本，可選)
+        self.spectrum_tap = None
+
         # 播放結束回調
         self.on_playback_end: Optional[Callable[[], None]] = None
 
+    @property
+    def volume(self) -> float:
+        """播放器音量 (0.0 - 1.0)"""
+        return self._params.volume
+
+    @volume.setter
+    def volume(self, value: float):
+        self._update_params(volume=value)
+        self._sync_output_gain()
+
+    @property
+    def audio_processor(self):
+        """即時音訊處理器 (有處理器時音量由處理器的增益節點套用)"""
+        return self._audio_processor
+
+    @audio_processor.setter
+    def audio_processor(self, processor):
+        self._audio_processor = processor
+        self._sync_output_gain()
+
+    def _sync_output_gain(self):
+        """將播放器音量轉交給處理器，與其他增益合併為一次乘法"""
+        processor = self._audio_processor
+        if processor is not None:
+            processor.set_output_gain(self._params.volume)
+
+    @property
+    def fade_enabled(self) -> bool:
+        """是否啟用淡入淡出"""
+        return self._params.fade_enabled
+
+    @fade_enabled.setter
+    def fade_enabled(self, value: bool):
+        self._update_params(fade_enabled=bool(value))
+
+    def _update_params(self, **changes):
+        """發布新的參數快照給音訊回調
+
+        Args:
+            **changes: 要變更的 PlaybackParams 欄位
+        """
+        with self._lock:
+            self._params = self._params._replace(**changes)
+
     def _load_audio(self, file_path: str) -> tuple:
-        """載入音訊檔案
+        """載入音訊檔案 (優先使用 PCM 快取)
 
         Args:
             file_path: 音訊檔案路徑
 
         Returns:
             tuple: (audio_data, sample_rate)
-                   audio_data shape 為 (frames, channels)
+                   audio_data shape 為 (frames, channels)，
+                   dtype 為 float32 或 int16 (快取或精簡記憶體模式)
 
         Raises:
             FileNotFoundError: 檔案不存在
             Exception: 解碼失敗
         """
-        try:
-            # 優先嘗試使用 soundfile (更快，支援 WAV, FLAC, OGG)
-            try:
-                audio_data, sample_rate = sf.read(file_path, always_2d=True)
-                logger.info(f"使用 soundfile 載入音訊: {file_path}")
-            except Exception:
-                # 如果失敗，使用 librosa (支援 MP3)
-                audio_data, sample_rate = librosa.load(
-                    file_path,
-                    sr=None,  # 保持原始採樣率
-                    mono=False  # 保持立體聲
-                )
-                # librosa 返回 shape (channels, frames)，需轉置
-                if audio_data.ndim == 2:
-                    audio_data = audio_data.T
-                else:
-                    # 單聲道，擴展為 (frames, 1)
-                    audio_data = audio_data.reshape(-1, 1)
+        if self.pcm_cache is not None:
+            cached = self.pcm_cache.get(file_path)
+            if cached is not None:
+                return cached
 
-                logger.info(f"使用 librosa 載入音訊: {file_path}")
+        audio_data, sample_rate = self._decode_audio(file_path)
+
+        if self.pcm_cache is not None:
+            # 背景寫入快取，不延遲播放開始 (快取需要 float32 輸入)
+            self.pcm_cache.put_async(file_path, audio_data, sample_rate)
+
+        if self.compact_memory:
+            # 精簡記憶體模式: 以 int16 保存，回調讀取時再轉換
+            audio_data = encode_int16(audio_data)
+
+        return audio_data, sample_rate
+
+    def _decode_audio(self, file_path: str) -> tuple:
+        """解碼音訊檔案
+
+        Args:
+            file_path: 音訊檔案路徑
+
+        Returns:
+            tuple: (audio_data, sample_rate)
+                   audio_data 為 float32，shape 為 (frames, channels)
+
+        Raises:
+            FileNotFoundError: 檔案不存在
+            Exception: 解碼失敗
+        """
+        try:
+            audio_data, sample_rate = self.decoders.decode(file_path)
 
             # 確保是 float32 類型
             if audio_data.dtype != np.float32:
                 audio_data = audio_data.astype(np.float32)
 
-            # 確保是立體聲 (frames, 2)
-            if audio_data.shape[1] == 1:
+            # 確保是立體聲 (frames, 2)；精簡記憶體模式保留原始聲道數，由回調升混
+            if audio_data.shape[1] == 1 and not self.compact_memory:
                 # 單聲道，複製到兩個通道
                 audio_data = np.repeat(audio_data, 2, axis=1)
 
@@ -132,6 +283,80 @@ class AudioPlayer:
             logger.error(f"載入音訊檔案失敗: {e}")
             raise
 
+    def _allocate_buffers(self, frames, channels):
+        """預先配置即時回調使用的緩衝區
+
+        Args:
+            frames: 每個區塊的幀數
+            channels: 聲道數
+        """
+        self._block_buffer = np.zeros((frames, channels), dtype=np.float32)
+        input_frames = frames
+        if self.audio_processor is not None:
+            input_frames = self.audio_processor.max_input_frames(frames)
+        self._input_buffer = np.zeros((input_frames, channels), dtype=np.float32)
+        self._frame_offsets = np.arange(frames, dtype=np.float32)
+        self._gain_buffer = np.zeros(frames, dtype=np.float32)
+        self._fade_position = np.zeros(frames, dtype=np.float32)
+        self._fade_indices = np.zeros(frames, dtype=np.intp)
+        self._fade_slopes = np.zeros(frames, dtype=np.float32)
+
+    def _ensure_buffers(self, frames, channels):
+        """確保預先配置的緩衝區足夠容納指定區塊
+
+        正常情況下緩衝區已在 play() 時配置，此處只做檢查；
+        只有在串流要求的幀數超過預期時才會重新配置。
+
+        Args:
+            frames: 需要的幀數
+            channels: 聲道數
+        """
+        buffer = self._block_buffer
+        if buffer is None or buffer.shape[0] < frames or buffer.shape[1] != channels:
+            self._allocate_buffers(frames, channels)
+
+    def _source_buffer(self, frames, channels):
+        """取得變速時存放來源區塊的預先配置緩衝區
+
+        Args:
+            frames: 需要的輸入幀數
+            channels: 聲道數
+
+        Returns:
+            np.ndarray: shape 為 (frames, channels) 的緩衝區視圖
+        """
+        buffer = self._input_buffer
+        if buffer is None or buffer.shape[0] < frames or buffer.shape[1] != channels:
+            buffer = np.zeros((frames, channels), dtype=np.float32)
+            self._input_buffer = buffer
+        return buffer[:frames]
+
+    def _read_block(self, start, out):
+        """從音訊來源讀取一個區塊到指定緩衝區，超出結尾的部分補零
+
+        單聲道來源以廣播複製到所有輸出聲道，int16 來源在複製時轉換為 float32，
+        兩者都直接寫入預先配置的緩衝區。
+
+        Args:
+            start: 起始幀位置
+            out: 目標緩衝區，shape 為 (frames, channels)
+
+        Returns:
+            int: 實際讀取的幀數
+        """
+        audio_data = self.audio_data
+        available = max(0, min(len(out), len(audio_data) - start))
+        region = out[:available]
+        if audio_data.dtype == np.int16:
+            # int16 (快取或精簡記憶體模式): 轉換為 float32 並縮放
+            np.copyto(region, audio_data[start:start + available], casting='unsafe')
+            np.multiply(region, INT16_SCALE, out=region)
+        else:
+            np.copyto(region, audio_data[start:start + available])
+        if available < len(out):
+            out[available:] = 0
+        return available
+
     def _audio_callback(self, outdata, frames, time_info, status):
         """sounddevice 回調函數 (在獨立線程執行)
 
@@ -141,67 +366,103 @@ class AudioPlayer:
             time_info: 時間資訊
             status: 狀態旗標
         """
+        stats = self.callback_stats
+        stats.begin_block(time.perf_counter())
         if status:
-            logger.warning(f"Audio callback status: {status}")
-
-        with self._lock:
-            # 檢查是否暫停
-            if self._is_paused:
-                # 輸出靜音
-                outdata[:] = 0
-                return
-
-            # 讀取音訊數據
-            start = self.current_frame
-            end = start + frames
-
-            if end > len(self.audio_data):
-                # 播放結束
-                chunk = self.audio_data[start:]
-                outdata[:len(chunk)] = chunk
-
-                # 填充靜音
-                if len(chunk) < frames:
-                    outdata[len(chunk):] = 0
-
-                # 標記播放結束
-                self._is_playing = False
+            stats.record_status(status)
+
+        # 每個區塊只讀取一次參數快照，不取得任何鎖
+        params = self._params
+
+        # 檢查是否暫停
+        if params.paused:
+            # 輸出靜音
+            outdata.fill(0)
+            stats.end_block(frames, self.sample_rate, time.perf_counter())
+            return
+
+        processor = self.audio_processor
+
+        # 套用尚未處理的跳轉請求
+        seek_request = self._seek_request
+        if seek_request[0] != self._seek_applied:
+            self.current_frame = seek_request[1]
+            self._seek_applied = seek_request[0]
+            self._end_reported = False
+            if processor:
+                processor.flush()
+
+        # 取得輸出區塊 (寫入預先配置的緩衝區)
+        self._ensure_buffers(frames, outdata.shape[1])
+        chunk = self._block_buffer
+        if chunk.shape[0] != frames:
+            chunk = chunk[:frames]
+
+        # 變速時由時間伸縮決定本區塊消耗的來源幀數
+        start = self.current_frame
+        stretching = processor is not None and processor.is_stretching()
+        needed = processor.input_frames_for(frames) if stretching else frames
+
+        # 讀取音訊數據 (超出結尾的部分補零)
+        if stretching:
+            source = self._source_buffer(needed, chunk.shape[1])
+            available = self._read_block(start, source)
+        else:
+            available = self._read_block(start, chunk)
+        finished = available < needed
+        stats.mark_stage(CallbackStats.STAGE_READ, time.perf_counter())
+
+        # 應用音訊處理 (時間伸縮 + 等化器 + 增益 + 限幅，播放器音量為處理器的輸出增益)
+        processed = False
+        if processor:
+            try:
+                if stretching:
+                    processor.render(source, chunk)
+                else:
+                    processor.process_inplace(chunk)
+                processed = True
+            except Exception as e:
+                stats.record_error(e)
+        stats.mark_stage(CallbackStats.STAGE_DSP, time.perf_counter())
 
-                # 觸發回調 (在主線程)
-                if self.on_playback_end:
-                    threading.Thread(
-                        target=self._on_playback_end,
-                        daemon=True
-                    ).start()
+        # 沒有處理器 (或處理失敗) 時由播放器套用音量
+        if not processed and abs(params.volume - 1.0) > 1e-6:
+            np.multiply(chunk, params.volume, out=chunk)
 
-                return
+        # 應用淡入淡出 (依來源位置計算，變速時每個輸出幀對應 needed / frames 個來源幀)
+        if params.fade_enabled:
+            self._apply_fade(chunk, start, needed / frames if stretching else 1.0, params.fade_table)
+        stats.mark_stage(CallbackStats.STAGE_FADE, time.perf_counter())
 
-            # 取得音訊塊
-            chunk = self.audio_data[start:end].copy()
+        # 防止削波 (處理器的限幅器已限制範圍，淡入淡出只會衰減)
+        if not processed:
+            np.clip(chunk, -1.0, 1.0, out=chunk)
 
-            # 應用音訊處理 (等化器 + 音量)
-            if self.audio_processor:
-                try:
-                    chunk = self.audio_processor.process(chunk)
-                except Exception as e:
-                    logger.error(f"音訊處理失敗: {e}")
+        # 輸出音訊
+        outdata[:] = chunk
 
-            # 應用音量
-            if abs(self.volume - 1.0) > 1e-6:
-                chunk = chunk * self.volume
+        # 頻譜分析: 只複製樣本到環形緩衝區，分析在背景線程進行
+        spectrum_tap = self.spectrum_tap
+        if spectrum_tap is not None:
+            spectrum_tap.write(chunk)
+        stats.mark_stage(CallbackStats.STAGE_OUTPUT, time.perf_counter())
 
-            # 應用淡入淡出
-            if self.fade_enabled:
-                chunk = self._apply_fade(chunk, start)
+        # 發布新的播放位置 (單一寫入者)
+        self.current_frame = start + available
 
-            # 防止削波
-            chunk = np.clip(chunk, -1.0, 1.0)
+        if finished and not self._end_reported:
+            # 播放結束 (串流在 stop() 前仍會繼續呼叫回調，只通知一次)
+            self._end_reported = True
+            self._is_playing = False
 
-            # 輸出音訊
-            outdata[:] = chunk
+            # 觸發回調 (在主線程)
+            if self.on_playback_end:
+                threading.Thread(
+                    target=self._on_playback_end,
+                    daemon=True
+                ).start()
 
-            # 更新當前幀位置
-            self.current_frame = end
+        stats.end_block(frames, self.sample_rate, time.perf_counter())
 
     def _on_playback_end(self):
         """播放結束回調 (內部使用)"""
@@ -211,90 +472,104 @@ class AudioPlayer:
             except Exception as e:
                 logger.error(f"播放結束回調執行失敗: {e}")
 
-    def _apply_fade(self, chunk, start_frame):
-        """應用淡入淡出效果
+    def _fade_ramp(self, length, offset, slope, fade_table):
+        """在預先配置的緩衝區中計算淡入淡出增益曲線
+
+        先計算線性的淡入淡出進度，再查表轉換為所選曲線的增益。
+
+        Args:
+            length: 曲線長度 (幀數)
+            offset: 第一幀的進度 (0.0 - 1.0)
+            slope: 每幀進度變化量
+            fade_table: get_fade_table() 返回的 (增益表, 差值表)
+
+        Returns:
+            np.ndarray: shape 為 (length,) 的增益曲線 (緩衝區視圖)
+        """
+        gain = self._gain_buffer[:length]
+        np.multiply(self._frame_offsets[:length], slope, out=gain)
+        np.add(gain, offset, out=gain)
+        apply_fade_table(
+            gain, fade_table[0], fade_table[1],
+            self._fade_position[:length],
+            self._fade_indices[:length],
+            self._fade_slopes[:length]
+        )
+        return gain
+
+    @staticmethod
+    def _apply_gain_curve(region, curve):
+        """將增益曲線就地套用到每個聲道
+
+        逐聲道相乘而非使用 (frames, 1) 廣播，
+        避免 NumPy 為廣播運算配置暫存緩衝區。
+
+        Args:
+            region: 音訊數據，shape 為 (frames, channels)
+            curve: 增益曲線，shape 為 (frames,)
+        """
+        for channel in range(region.shape[1]):
+            column = region[:, channel]
+            np.multiply(column, curve, out=column)
+
+    def _apply_fade(self, chunk, start_frame, step=1.0, fade_table=None):
+        """應用淡入淡出效果 (就地修改 chunk)
 
         Args:
             chunk: 音訊數據塊
-            start_frame: 當前塊的起始幀位置
+            start_frame: 當前塊的起始幀位置 (來源幀)
+            step: 每個輸出幀對應的來源幀數 (變速時不為 1.0)
+            fade_table: get_fade_table() 返回的查找表，None 表示使用目前的曲線
 
         Returns:
-            np.ndarray: 應用淡入淡出後的音訊數據
+            np.ndarray: 應用淡入淡出後的音訊數據 (即 chunk 本身)
         """
         frames = len(chunk)
-        end_frame = start_frame + frames
-        fade_chunk = chunk.copy()
+        end_frame = start_frame + frames * step
+        self._ensure_buffers(frames, chunk.shape[1])
+        if fade_table is None:
+            fade_table = self._params.fade_table
 
         # 淡入效果
         if start_frame < self._fade_in_frames:
-            fade_in_end = min(end_frame, self._fade_in_frames)
-            fade_in_length = fade_in_end - start_frame
+            fade_in_length = min(frames, math.ceil((self._fade_in_frames - start_frame) / step))
 
             if fade_in_length > 0:
-                # 線性淡入曲線
-                fade_in_curve = np.linspace(
+                # 淡入曲線
+                fade_in_curve = self._fade_ramp(
+                    fade_in_length,
                     start_frame / self._fade_in_frames,
-                    fade_in_end / self._fade_in_frames,
-                    fade_in_length
-                ).reshape(-1, 1)
+                    step / self._fade_in_frames,
+                    fade_table
+                )
 
                 # 應用淡入
-                fade_chunk[:fade_in_length] *= fade_in_curve
+                self._apply_gain_curve(chunk[:fade_in_length], fade_in_curve)
 
         # 淡出效果
         if end_frame > self._fade_out_start_frame:
-            fade_out_start = max(start_frame, self._fade_out_start_frame)
-            fade_out_length = end_frame - fade_out_start
-            fade_out_offset = fade_out_start - start_frame
+            fade_out_offset = max(0, math.ceil((self._fade_out_start_frame - start_frame) / step))
+            fade_out_length = frames - fade_out_offset
 
             if fade_out_length > 0:
-                total_frames = len(self.audio_data)
-                fade_out_total = total_frames - self._fade_out_start_frame
+                fade_out_total = self._fade_out_frames
+                fade_out_start = start_frame + fade_out_offset * step
 
-                # 線性淡出曲線
-                fade_out_curve = np.linspace(
+                # 淡出曲線 (變速時伸縮器的殘留資料可能超出結尾，查表前進度限制在 0 以上)
+                fade_out_curve = self._fade_ramp(
+                    fade_out_length,
                     1.0 - (fade_out_start - self._fade_out_start_frame) / fade_out_total,
-                    1.0 - (end_frame - self._fade_out_start_frame) / fade_out_total,
-                    fade_out_length
-                ).reshape(-1, 1)
+                    -step / fade_out_total,
+                    fade_table
+                )
 
                 # 應用淡出
-                fade_chunk[fade_out_offset:fade_out_offset + fade_out_length] *= fade_out_curve
-
-        return fade_chunk
-
-    def _adjust_speed(self, audio_data, speed):
-        """調整播放速度
-
-        Args:
-            audio_data: 音訊數據 (frames, channels)
-            speed: 播放速度 (0.5 = 慢速, 1.0 = 正常, 2.0 = 快速)
-
-        Returns:
-            np.ndarray: 速度調整後的音訊數據
-        """
-        try:
-            # 分離立體聲通道
-            if audio_data.shape[1] == 2:
-                left = audio_data[:, 0]
-                right = audio_data[:, 1]
-
-                # 使用 librosa 進行時間拉伸（不改變音高）
-                left_stretched = librosa.effects.time_stretch(left, rate=speed)
-                right_stretched = librosa.effects.time_stretch(right, rate=speed)
-
-                # 合併通道
-                stretched = np.column_stack((left_stretched, right_stretched))
-            else:
-                # 單聲道
-                stretched = librosa.effects.time_stretch(audio_data[:, 0], rate=speed)
-                stretched = stretched.reshape(-1, 1)
-
-            return stretched.astype(np.float32)
+                self._apply_gain_curve(
+                    chunk[fade_out_offset:fade_out_offset + fade_out_length],
+                    fade_out_curve
+                )
 
-        except Exception as e:
-            logger.error(f"播放速度調整失敗: {e}")
-            return audio_data
+        return chunk
 
     def play(self, file_path: str) -> bool:
         """載入並播放音訊檔案
@@ -312,53 +587,173 @@ class AudioPlayer:
             # 載入音訊
             self.audio_data, self.sample_rate = self._load_audio(file_path)
 
-            # 應用播放速度調整
-            if self._speed_adjustment_enabled and abs(self.playback_speed - 1.0) > 0.01:
-                self.audio_data = self._adjust_speed(self.audio_data, self.playback_speed)
-
             self.current_frame = 0
+            self._seek_applied = self._seek_request[0]
+
+            # 串流尚未開啟，清除上一首殘留的處理狀態
+            if self.audio_processor:
+                self.audio_processor.flush()
 
             # 計算淡入淡出幀位置
             self._fade_in_frames = int(self.fade_in_duration * self.sample_rate)
             total_frames = len(self.audio_data)
             fade_out_frames = int(self.fade_out_duration * self.sample_rate)
             self._fade_out_start_frame = max(0, total_frames - fade_out_frames)
+            self._fade_out_frames = max(1, total_frames - self._fade_out_start_frame)
 
-            # 建立 sounddevice 串流
-            self.stream = sd.OutputStream(
-                samplerate=self.sample_rate,
-                channels=self.audio_data.shape[1],
-                callback=self._audio_callback,
-                blocksize=2048,  # 適中的緩衝區大小
-                dtype='float32'
-            )
+            if self.spectrum_tap is not None:
+                self.spectrum_tap.set_sample_rate(self.sample_rate)
 
-            # 啟動串流
-            self.stream.start()
+            # 預先配置即時回調緩衝區並建立輸出串流
+            self.stream = self._open_stream()
 
+            # 先發布播放狀態再啟動串流 (比即時更快的後端可能在 start() 返回前就播完)
             with self._lock:
+                self._params = self._params._replace(paused=False)
+                self._end_reported = False
                 self._is_playing = True
-                self._is_paused = False
+
+            # 啟動串流
+            self.stream.start()
 
             logger.info(f"開始播放: {file_path}")
             return True
 
         except Exception as e:
             logger.error(f"播放失敗: {e}")
+            self._is_playing = False
+            return False
+
+    def _open_stream(self):
+        """依目前的區塊大小配置回調緩衝區並開啟輸出串流 (尚未開始)
+
+        Returns:
+            輸出後端的串流物件
+        """
+        channels = self._output_channels()
+        self._allocate_buffers(self.blocksize, channels)
+        stream = self.output_backend.open_stream(
+            samplerate=self.sample_rate,
+            channels=channels,
+            blocksize=self.blocksize,
+            callback=self._audio_callback,
+            latency=self._stream_latency
+        )
+        if self._adaptive_latency is not None:
+            self._adaptive_latency.reset(self.callback_stats.snapshot(), time.monotonic())
+        return stream
+
+    def _output_channels(self):
+        """輸出聲道數 (單聲道來源升混為立體聲)
+
+        Returns:
+            int: 聲道數
+        """
+        channels = self.audio_data.shape[1]
+        return 2 if channels == 1 else channels
+
+    def _reopen_stream(self):
+        """以新的區塊大小重新開啟串流，保留播放位置、暫停狀態與處理狀態
+
+        呼叫端需持有 self._lock。舊串流停止後回調不再執行，
+        current_frame 與尚未套用的跳轉請求都原樣保留給新串流的回調。
+
+        Returns:
+            bool: 成功返回 True
+        """
+        old_stream = self.stream
+        if old_stream is None:
             return False
 
+        try:
+            old_stream.stop()
+            old_stream.close()
+        except Exception as e:
+            logger.error(f"關閉音訊串流失敗: {e}")
+
+        try:
+            self.stream = self._open_stream()
+            self.stream.start()
+        except Exception as e:
+            logger.error(f"重新開啟音訊串流失敗: {e}")
+            self.stream = None
+            self._is_playing = False
+            return False
+
+        logger.info(f"音訊串流已重新開啟: 區塊大小 {self.blocksize} 幀")
+        return True
+
+    def set_latency_profile(self, profile: str):
+        """設定延遲設定檔 (播放中會立即重新開啟串流，不影響播放位置)
+
+        Args:
+            profile: 'low_latency'、'balanced'、'power_saver' 或 'adaptive'
+
+        Raises:
+            ValueError: 不支援的設定檔
+        """
+        if profile not in PROFILE_NAMES:
+            raise ValueError(f"不支援的延遲設定檔: {profile}")
+
+        with self._lock:
+            if profile == PROFILE_ADAPTIVE:
+                # 自動調整從平衡設定開始
+                base = LATENCY_PROFILES[PROFILE_BALANCED]
+                self._adaptive_latency = AdaptiveLatencyController(base.blocksize)
+            else:
+                base = LATENCY_PROFILES[profile]
+                self._adaptive_latency = None
+
+            self.latency_profile = profile
+            changed = (base.blocksize, base.latency) != (self.blocksize, self._stream_latency)
+            self.blocksize = base.blocksize
+            self._stream_latency = base.latency
+            if changed and self.stream is not None:
+                self._reopen_stream()
+            elif self._adaptive_latency is not None:
+                self._adaptive_latency.reset(self.callback_stats.snapshot(), time.monotonic())
+
+        logger.info(f"延遲設定檔設為: {profile} (區塊大小 {self.blocksize} 幀)")
+
+    def get_latency_profile(self) -> str:
+        """取得延遲設定檔
+
+        Returns:
+            str: 設定檔名稱
+        """
+        return self.latency_profile
+
+    def check_adaptive_latency(self) -> bool:
+        """依回調統計調整區塊大小 (adaptive 設定檔時由控制端定期呼叫)
+
+        Returns:
+            bool: 區塊大小已調整並重新開啟串流時返回 True
+        """
+        with self._lock:
+            controller = self._adaptive_latency
+            if controller is None or self.stream is None:
+                return False
+
+            blocksize = controller.update(self.callback_stats.snapshot(), time.monotonic())
+            if blocksize is None:
+                return False
+
+            logger.info(f"自動延遲調整: 區塊大小 {self.blocksize} → {blocksize} 幀")
+            self.blocksize = blocksize
+            return self._reopen_stream()
+
     def pause(self):
         """暫停播放"""
         with self._lock:
-            if self._is_playing and not self._is_paused:
-                self._is_paused = True
+            if self._is_playing and not self._params.paused:
+                self._params = self._params._replace(paused=True)
                 logger.info("播放已暫停")
 
     def resume(self):
         """恢復播放"""
         with self._lock:
-            if self._is_playing and self._is_paused:
-                self._is_paused = False
+            if self._is_playing and self._params.paused:
+                self._params = self._params._replace(paused=False)
                 logger.info("播放已恢復")
 
     def stop(self):
@@ -372,10 +767,13 @@ class AudioPlayer:
                     logger.error(f"關閉音訊串流失敗: {e}")
 
                 self.stream = None
+                self._log_callback_problems()
 
+            # 串流已停止，控制端可以安全地重設回調擁有的狀態
             self._is_playing = False
-            self._is_paused = False
+            self._params = self._params._replace(paused=False)
             self.current_frame = 0
+            self._seek_applied = self._seek_request[0]
 
             logger.info("播放已停止")
 
@@ -395,7 +793,8 @@ class AudioPlayer:
             # 限制範圍
             frame = max(0, min(frame, len(self.audio_data)))
 
-            self.current_frame = frame
+            # 發布跳轉請求，由回調在下一個區塊套用
+            self._seek_request = (self._seek_request[0] + 1, frame)
 
             logger.info(f"跳轉到位置: {position_seconds:.2f} 秒")
 
@@ -421,8 +820,7 @@ class AudioPlayer:
         Returns:
             bool: 播放中返回 True
         """
-        with self._lock:
-            return self._is_playing
+        return self._is_playing
 
     def is_paused(self) -> bool:
         """檢查是否暫停
@@ -430,8 +828,7 @@ class AudioPlayer:
         Returns:
             bool: 暫停返回 True
         """
-        with self._lock:
-            return self._is_paused
+        return self._params.paused
 
     def get_position(self) -> float:
         """取得當前播放位置
@@ -439,10 +836,23 @@ class AudioPlayer:
         Returns:
             float: 位置 (秒)
         """
-        with self._lock:
-            if self.audio_data is None or self.sample_rate == 0:
-                return 0.0
-            return self.current_frame / self.sample_rate
+        if self.audio_data is None or self.sample_rate == 0:
+            return 0.0
+        return self._get_current_frame() / self.sample_rate
+
+    def _get_current_frame(self) -> int:
+        """取得當前幀位置 (不取得鎖)
+
+        若有尚未被回調套用的跳轉請求，回傳跳轉目標，
+        讓 UI 在跳轉後立即看到新位置。
+
+        Returns:
+            int: 幀位置
+        """
+        seek_request = self._seek_request
+        if seek_request[0] != self._seek_applied:
+            return seek_request[1]
+        return self.current_frame
 
     def get_duration(self) -> float:
         """取得音訊總時長
@@ -450,10 +860,10 @@ class AudioPlayer:
         Returns:
             float: 時長 (秒)
         """
-        with self._lock:
-            if self.audio_data is None or self.sample_rate == 0:
-                return 0.0
-            return len(self.audio_data) / self.sample_rate
+        audio_data = self.audio_data
+        if audio_data is None or self.sample_rate == 0:
+            return 0.0
+        return len(audio_data) / self.sample_rate
 
     def set_fade_enabled(self, enabled: bool):
         """設定是否啟用淡入淡出效果
@@ -479,6 +889,29 @@ class AudioPlayer:
             self.fade_out_duration = max(0.0, float(fade_out))
             logger.info(f"淡出時長設為: {self.fade_out_duration} 秒")
 
+    def set_fade_curve(self, curve: str):
+        """設定淡入淡出曲線 (下一個區塊生效)
+
+        Args:
+            curve: 'linear'、'logarithmic' 或 'equal_power'
+
+        Raises:
+            ValueError: 不支援的曲線
+        """
+        if curve not in FADE_CURVES:
+            raise ValueError(f"不支援的淡入淡出曲線: {curve}")
+        # 曲線名稱與查找表在同一個快照中發布
+        self._update_params(fade_curve=curve, fade_table=get_fade_table(curve))
+        logger.info(f"淡入淡出曲線設為: {curve}")
+
+    def get_fade_curve(self) -> str:
+        """取得淡入淡出曲線
+
+        Returns:
+            str: 曲線名稱
+        """
+        return self._params.fade_curve
+
     def set_playback_speed(self, speed: float):
         """設定播放速度
 
@@ -488,6 +921,7 @@ class AudioPlayer:
         """
         speed = max(0.5, min(2.0, float(speed)))
         self.playback_speed = speed
+        self._apply_speed_to_processor()
         logger.info(f"播放速度設為: {speed}x")
 
     def enable_speed_adjustment(self, enabled: bool):
@@ -496,12 +930,21 @@ class AudioPlayer:
         Args:
             enabled: True 為啟用，False 為停用
 
-        注意: 速度調整會在載入音訊時進行處理，
-              啟用此功能可能會增加載入時間
+        注意: 速度調整由 AudioProcessor 在播放中即時處理，
+              變更會在下一個音訊區塊生效，不需重新載入音訊
         """
         self._speed_adjustment_enabled = enabled
+        self._apply_speed_to_processor()
         logger.info(f"播放速度調整: {'啟用' if enabled else '停用'}")
 
+    def _apply_speed_to_processor(self):
+        """將目前生效的播放速度傳給 AudioProcessor"""
+        speed = self.playback_speed if self._speed_adjustment_enabled else 1.0
+        if self.audio_processor is not None:
+            self.audio_processor.set_playback_speed(speed)
+        elif abs(speed - 1.0) > 1e-3:
+            logger.warning("未設定 AudioProcessor，播放速度調整不會生效")
+
     def get_playback_speed(self) -> float:
         """取得當前播放速度
 
@@ -510,6 +953,70 @@ class AudioPlayer:
         """
         return self.playback_speed
 
+    def get_decoder_metrics(self) -> dict:
+        """取得各解碼後端的吞吐量統計
+
+        Returns:
+            dict: {後端名稱: 統計資料}，詳見 DecoderRegistry.get_metrics()
+        """
+        return self.decoders.get_metrics()
+
+    def set_spectrum_tap(self, tap):
+        """設定接收處理後樣本的頻譜分析器
+
+        Args:
+            tap: SpectrumAnalyzer 實例 (需提供 write() 與 set_sample_rate())，None 表示移除
+        """
+        if tap is not None:
+            tap.set_sample_rate(self.sample_rate)
+        self.spectrum_tap = tap
+
+    def get_callback_stats(self) -> dict:
+        """取得即時回調的執行統計 (不影響音訊線程)
+
+        Returns:
+            dict: 詳見 CallbackStats.snapshot()
+        """
+        return self.callback_stats.snapshot()
+
+    def get_callback_report(self) -> str:
+        """取得即時回調的診斷報告
+
+        Returns:
+            str: 多行文字報告
+        """
+        return self.callback_stats.format_report()
+
+    def reset_callback_stats(self):
+        """清除即時回調統計 (下一個區塊生效)"""
+        self.callback_stats.request_reset()
+
+    def _log_callback_problems(self):
+        """在控制端將回調記錄到的新問題寫入日誌 (回調本身不寫日誌)"""
+        stats = self.callback_stats
+        problems = (stats.deadline_misses, stats.underflows + stats.overflows, stats.processing_errors)
+        logged = self._logged_problems
+        if any(now < before for now, before in zip(problems, logged)):
+            # 統計已被重置
+            logged = (0, 0, 0)
+        misses, xruns, errors = (now - before for now, before in zip(problems, logged))
+        self._logged_problems = problems
+        if misses > 0 or xruns > 0 or errors > 0:
+            message = f"音訊回調問題: 期限未達 {misses} 次，欠載/溢位 {xruns} 次，處理錯誤 {errors} 次"
+            if errors > 0:
+                message += f" (最後一次: {stats.last_error})"
+            logger.warning(message)
+
+    def warm_up_cache(self, file_paths):
+        """在背景預先解碼並快取即將播放的歌曲
+
+        Args:
+            file_paths: 音訊檔案路徑列表 (依播放順序)
+        """
+        if self.pcm_cache is None:
+            return
+        self.pcm_cache.warm_up(file_paths, self._decode_audio)
+
     def _sleep_timer_worker(self, duration_seconds: float):
         """睡眠定時器工作線程
 
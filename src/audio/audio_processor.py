@@ -1,20 +1,39 @@
 """音訊處理管線模組
 
-整合音量、等化器等音訊效果，提供統一的音訊處理接口。
+整合時間伸縮、音量、等化器等音訊效果，提供統一的音訊處理接口。
 支援即時處理音訊流。
 """
 import numpy as np
 from typing import Optional
+from src.audio.dsp_graph import DSPGraph, EqualizerNode, GainNode, LimiterNode
 from src.audio.equalizer_filter import EqualizerFilter
+from src.audio.time_stretch import TimeStretcher
 
 
 class AudioProcessor:
     """音訊處理管線
 
-    整合多種音訊效果（等化器、音量等），按順序處理音訊數據。
+    整合多種音訊效果（時間伸縮、等化器、音量等），按順序處理音訊數據。
     設計為即時音訊流處理，支援 sounddevice callback。
+
+    時間伸縮會改變輸入與輸出的幀數比例，因此是管線的第一級 (來源級)，
+    以拉動方式運作: 呼叫端先以 input_frames_for() 取得需要的輸入幀數，
+    再呼叫 render() 產生固定幀數的輸出。
+
+    其餘效果為 DSPGraph 的節點 (依序: 等化器、響度正規化、音量、輸出增益、限幅器)，
+    三個增益節點在編譯時合併為一次乘法；可透過 graph 加入其他節點 (例如 MeterNode)。
     """
 
+    # 響度正規化增益上限 (約 +12 dB)
+    MAX_REPLAY_GAIN = 4.0
+
+    # 節點名稱
+    NODE_EQUALIZER = 'equalizer'
+    NODE_REPLAY_GAIN = 'replay_gain'
+    NODE_VOLUME = 'volume'
+    NODE_OUTPUT_GAIN = 'output_gain'
+    NODE_LIMITER = 'limiter'
+
     def __init__(self, sample_rate=44100, enable_equalizer=True):
         """初始化音訊處理器
 
@@ -23,13 +42,59 @@ class AudioProcessor:
             enable_equalizer (bool): 是否啟用等化器，預設 True
         """
         self.sample_rate = sample_rate
-        self.volume = 1.0  # 音量 (0.0 - 1.0)
 
-        # 等化器
-        self.enable_equalizer = enable_equalizer
-        self.equalizer = None
-        if self.enable_equalizer:
-            self.equalizer = EqualizerFilter(sample_rate=sample_rate)
+        # 等化器、增益與限幅器節點
+        self._equalizer_node = EqualizerNode(
+            self.NODE_EQUALIZER,
+            EqualizerFilter(sample_rate=sample_rate) if enable_equalizer else None,
+            enabled=enable_equalizer
+        )
+        self._replay_gain_node = GainNode(self.NODE_REPLAY_GAIN)  # 響度正規化增益 (線性)
+        self._volume_node = GainNode(self.NODE_VOLUME)  # 音量 (0.0 - 1.0)
+        self._output_gain_node = GainNode(self.NODE_OUTPUT_GAIN)  # 播放器音量 (0.0 - 1.0)
+        self.graph = DSPGraph([
+            self._equalizer_node,
+            self._replay_gain_node,
+            self._volume_node,
+            self._output_gain_node,
+            LimiterNode(self.NODE_LIMITER),
+        ])
+
+        # 串流時間伸縮 (播放速度)
+        self.time_stretcher = TimeStretcher(sample_rate=sample_rate)
+
+    @property
+    def volume(self):
+        """音量 (0.0 - 1.0)"""
+        return self._volume_node.gain
+
+    @property
+    def replay_gain(self):
+        """響度正規化增益 (線性)"""
+        return self._replay_gain_node.gain
+
+    @property
+    def output_gain(self):
+        """輸出增益 (播放器音量，0.0 - 1.0)"""
+        return self._output_gain_node.gain
+
+    @property
+    def equalizer(self):
+        """等化器實例 (可替換，None 表示沒有等化器)"""
+        return self._equalizer_node.equalizer
+
+    @equalizer.setter
+    def equalizer(self, equalizer):
+        self.graph.update(self.NODE_EQUALIZER, equalizer=equalizer)
+
+    @property
+    def enable_equalizer(self):
+        """是否啟用等化器"""
+        return self._equalizer_node.enabled
+
+    @enable_equalizer.setter
+    def enable_equalizer(self, enabled):
+        self.graph.set_enabled(self.NODE_EQUALIZER, enabled)
 
     def set_volume(self, volume):
         """設定音量
@@ -37,7 +102,7 @@ class AudioProcessor:
         Args:
             volume (float): 音量 (0.0 - 1.0)
         """
-        self.volume = max(0.0, min(1.0, float(volume)))
+        self.graph.set_gain(self.NODE_VOLUME, max(0.0, min(1.0, float(volume))))
 
     def get_volume(self):
         """取得當前音量
@@ -47,16 +112,66 @@ class AudioProcessor:
         """
         return self.volume
 
+    def set_replay_gain(self, gain):
+        """設定響度正規化增益 (預先分析的固定增益，與音量合併為一次乘法)
+
+        Args:
+            gain (float): 線性增益，1.0 表示不調整
+        """
+        self.graph.set_gain(self.NODE_REPLAY_GAIN, max(0.0, min(self.MAX_REPLAY_GAIN, float(gain))))
+
+    def get_replay_gain(self):
+        """取得響度正規化增益
+
+        Returns:
+            float: 線性增益
+        """
+        return self.replay_gain
+
+    def set_output_gain(self, gain):
+        """設定輸出增益 (由 AudioPlayer 轉交播放器音量，與其他增益合併為一次乘法)
+
+        Args:
+            gain (float): 線性增益 (0.0 - 1.0)
+        """
+        self.graph.set_gain(self.NODE_OUTPUT_GAIN, max(0.0, min(1.0, float(gain))))
+
+    def get_output_gain(self):
+        """取得輸出增益
+
+        Returns:
+            float: 線性增益
+        """
+        return self.output_gain
+
+    def set_playback_speed(self, speed):
+        """設定播放速度 (下一個區塊立即生效，不改變音高)
+
+        Args:
+            speed (float): 播放速度 (0.5 - 2.0)
+        """
+        self.time_stretcher.set_speed(speed)
+
+    def get_playback_speed(self):
+        """取得播放速度
+
+        Returns:
+            float: 播放速度
+        """
+        return self.time_stretcher.get_speed()
+
     def set_equalizer_enabled(self, enabled):
         """啟用或停用等化器
 
         Args:
             enabled (bool): True 啟用，False 停用
         """
-        if enabled and not self.equalizer:
+        equalizer = self.equalizer
+        if enabled and not equalizer:
             # 建立等化器
-            self.equalizer = EqualizerFilter(sample_rate=self.sample_rate)
-        self.enable_equalizer = bool(enabled)
+            equalizer = EqualizerFilter(sample_rate=self.sample_rate)
+        # 等化器與啟用狀態在同一次發布中生效
+        self.graph.update(self.NODE_EQUALIZER, equalizer=equalizer, enabled=bool(enabled))
 
     def is_equalizer_enabled(self):
         """檢查等化器是否啟用
@@ -77,7 +192,7 @@ class AudioProcessor:
     def process(self, audio_data):
         """處理音訊數據
 
-        按順序應用：1. 等化器 2. 音量調整
+        按順序應用：1. 等化器 2. 增益 (響度正規化、音量、輸出增益) 3. 限幅
 
         Args:
             audio_data (np.ndarray): 音訊數據，shape 為 (frames, 2) 或 (frames, 1)
@@ -90,28 +205,84 @@ class AudioProcessor:
         if audio_data.size == 0:
             return audio_data
 
-        # 確保數據類型為 float32
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
+        if self.is_equalizer_enabled() and (audio_data.ndim == 1 or audio_data.shape[1] == 1):
+            # 等化器輸出立體聲: 單聲道先複製為兩個聲道
+            output = np.repeat(audio_data.reshape(-1, 1), 2, axis=1).astype(np.float32)
+        else:
+            # 複製數據避免修改原始輸入，並確保數據類型為 float32
+            output = audio_data.astype(np.float32, copy=True)
 
-        # 複製數據避免修改原始輸入
-        output = audio_data.copy()
+        self.process_inplace(output)
+        return output
 
-        # 1. 應用等化器
-        if self.is_equalizer_enabled():
-            output = self.equalizer.process(output)
+    def input_frames_for(self, frames):
+        """開始一個區塊: 取得產生指定輸出幀數需要的輸入幀數
 
-        # 2. 應用音量
-        if abs(self.volume - 1.0) > 1e-6:  # 避免不必要的乘法
-            output = output * self.volume
+        未變速時返回 frames 本身；變速時每次呼叫後都必須接著呼叫 render()。
+        只能在音訊回調線程呼叫。
 
-        # 防止削波
-        output = np.clip(output, -1.0, 1.0)
+        Args:
+            frames (int): 輸出幀數
 
-        return output
+        Returns:
+            int: 輸入幀數
+        """
+        stretcher = self.time_stretcher
+        if not stretcher.is_engaged():
+            return frames
+        return stretcher.input_frames_needed(frames)
+
+    def max_input_frames(self, frames):
+        """計算單一區塊最多可能需要的輸入幀數 (供呼叫端預先配置緩衝區)
+
+        Args:
+            frames (int): 輸出幀數
+
+        Returns:
+            int: 輸入幀數上限
+        """
+        return self.time_stretcher.max_input_frames(frames)
+
+    def flush(self):
+        """清除串流狀態但保留設定 (跳轉或換曲時呼叫)"""
+        self.time_stretcher.reset()
+
+    def is_stretching(self):
+        """檢查時間伸縮是否參與處理 (變速中或仍有殘留資料)
+
+        Returns:
+            bool: 參與處理時返回 True
+        """
+        return self.time_stretcher.is_engaged()
+
+    def render(self, source_block, out):
+        """將來源區塊經時間伸縮後寫入輸出緩衝區，再就地套用其餘效果
+
+        Args:
+            source_block (np.ndarray): 來源音訊，幀數為 input_frames_for() 的返回值
+            out (np.ndarray): float32 輸出緩衝區，shape 為 (frames, channels)
+        """
+        self.time_stretcher.process(source_block, out)
+        self.process_inplace(out)
+
+    def process_inplace(self, buffer):
+        """就地處理音訊緩衝區（即時回調使用）
+
+        與 process() 相同的處理順序，但直接寫回傳入的緩衝區，
+        不配置任何新的音訊陣列。
+
+        Args:
+            buffer (np.ndarray): float32 音訊緩衝區，shape 為 (frames, channels)
+        """
+        if buffer.shape[0] == 0:
+            return
+
+        # 執行計畫只讀取一次參照，控制端可隨時重新設定節點
+        self.graph.process(buffer)
 
     def reset(self):
-        """重置處理器狀態"""
-        self.volume = 1.0
-        if self.equalizer:
-            self.equalizer.reset()
+        """重置處理器狀態 (輸出增益屬於播放器音量，不重置)"""
+        self.graph.update(self.NODE_VOLUME, gain=1.0)
+        self.graph.update(self.NODE_REPLAY_GAIN, gain=1.0)
+        self.graph.reset()
+        self.time_stretcher.reset()
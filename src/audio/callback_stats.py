@@ -0,0 +1,261 @@
+"""即時音訊回調統計模組
+
+在音訊回調線程記錄執行時間、期限未達 (deadline miss)、裝置欠載 (xrun) 與各處理階段耗時，
+供 UI 或診斷報告讀取。回調端只做數值指派，不取得鎖、不寫日誌、不配置陣列。
+"""
+import bisect
+import time
+import numpy as np
+
+
+class CallbackStats:
+    """音訊回調統計 (單一寫入者: 音訊回調線程)
+
+    回調每個區塊依序呼叫 begin_block()、mark_stage() (每個階段一次)、end_block()。
+    讀取端以 snapshot() 取得複本，可能與正在寫入的區塊相差一筆，但不會干擾回調。
+    重置同樣以請求方式發布，由回調在下一個區塊開始時套用。
+    """
+
+    # 處理階段 (索引即 mark_stage() 的參數)
+    STAGE_READ = 0
+    STAGE_DSP = 1
+    STAGE_FADE = 2
+    STAGE_OUTPUT = 3
+    STAGE_NAMES = ('read', 'dsp', 'fade', 'output')
+
+    # 直方圖桶上界 (回調耗時 / 區塊期限)，最後一個桶收集超過 2 倍期限的區塊
+    BUCKET_EDGES = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0)
+
+    # 耗時超過期限此比例的區塊記錄到慢回調環形緩衝區
+    SLOW_RATIO = 0.75
+
+    # 慢回調環形緩衝區大小
+    RING_SIZE = 64
+
+    # 環形緩衝區欄位: 時間點、耗時、期限，之後為各階段耗時
+    _RING_TIME = 0
+    _RING_ELAPSED = 1
+    _RING_DEADLINE = 2
+    _RING_STAGES = 3
+
+    def __init__(self, slow_ratio=SLOW_RATIO, ring_size=RING_SIZE):
+        """初始化回調統計
+
+        Args:
+            slow_ratio (float): 視為慢回調的耗時 / 期限比例
+            ring_size (int): 保留的最近慢回調筆數
+        """
+        self.slow_ratio = slow_ratio
+        stage_count = len(self.STAGE_NAMES)
+
+        # 以下欄位只由回調寫入
+        self.callbacks = 0
+        self.deadline_misses = 0
+        self.underflows = 0
+        self.overflows = 0
+        self.processing_errors = 0
+        self.last_error = None
+        self.total_seconds = 0.0
+        self.max_ratio = 0.0
+        self._histogram = [0] * (len(self.BUCKET_EDGES) + 1)
+        self._stage_total = [0.0] * stage_count
+        self._stage_max = [0.0] * stage_count
+        self._stage_current = [0.0] * stage_count
+        self._ring = np.zeros((ring_size, self._RING_STAGES + stage_count), dtype=np.float64)
+        self._slow_count = 0
+        self._block_start = 0.0
+        self._last_mark = 0.0
+
+        # 重置請求: 序號與 _reset_applied 不同時，回調在下一個區塊開始時清除統計
+        self._reset_request = 0
+        self._reset_applied = 0
+
+    # ---------- 回調端 (音訊線程) ----------
+
+    def begin_block(self, now):
+        """區塊開始
+
+        Args:
+            now (float): time.perf_counter() 的值
+        """
+        if self._reset_request != self._reset_applied:
+            self._clear()
+            self._reset_applied = self._reset_request
+        self._block_start = now
+        self._last_mark = now
+        current = self._stage_current
+        for index in range(len(current)):
+            current[index] = 0.0
+
+    def mark_stage(self, stage, now):
+        """記錄一個處理階段結束
+
+        Args:
+            stage (int): 階段索引 (STAGE_READ 等)
+            now (float): time.perf_counter() 的值
+        """
+        elapsed = now - self._last_mark
+        self._last_mark = now
+        self._stage_current[stage] = elapsed
+        self._stage_total[stage] += elapsed
+        if elapsed > self._stage_max[stage]:
+            self._stage_max[stage] = elapsed
+
+    def record_status(self, status):
+        """記錄裝置回報的狀態旗標 (sounddevice.CallbackFlags)
+
+        Args:
+            status: 回調的 status 參數
+        """
+        if getattr(status, 'output_underflow', False):
+            self.underflows += 1
+        if getattr(status, 'output_overflow', False):
+            self.overflows += 1
+
+    def record_error(self, error):
+        """記錄處理例外 (由讀取端負責寫入日誌)
+
+        Args:
+            error (Exception): 例外
+        """
+        self.processing_errors += 1
+        self.last_error = error
+
+    def end_block(self, frames, sample_rate, now):
+        """區塊結束: 更新計數、直方圖與慢回調紀錄
+
+        Args:
+            frames (int): 區塊幀數
+            sample_rate (int): 採樣率
+            now (float): time.perf_counter() 的值
+        """
+        elapsed = now - self._block_start
+        deadline = frames / sample_rate if sample_rate else 0.0
+        ratio = elapsed / deadline if deadline > 0 else 0.0
+
+        self.callbacks += 1
+        self.total_seconds += elapsed
+        if ratio > self.max_ratio:
+            self.max_ratio = ratio
+        if ratio > 1.0:
+            self.deadline_misses += 1
+        self._histogram[bisect.bisect_left(self.BUCKET_EDGES, ratio)] += 1
+
+        if ratio >= self.slow_ratio:
+            ring = self._ring
+            row = self._slow_count % len(ring)
+            ring[row, self._RING_TIME] = self._block_start
+            ring[row, self._RING_ELAPSED] = elapsed
+            ring[row, self._RING_DEADLINE] = deadline
+            current = self._stage_current
+            for index in range(len(current)):
+                ring[row, self._RING_STAGES + index] = current[index]
+            self._slow_count += 1
+
+    # ---------- 讀取端 (UI / 診斷) ----------
+
+    def request_reset(self):
+        """請求清除統計 (下一個區塊生效)"""
+        self._reset_request += 1
+
+    def snapshot(self):
+        """取得統計複本
+
+        Returns:
+            dict: {'callbacks', 'deadline_misses', 'underflows', 'overflows', 'xruns',
+                   'processing_errors', 'last_error', 'mean_seconds', 'max_ratio',
+                   'histogram', 'stages', 'recent_slow'}
+        """
+        callbacks = self.callbacks
+        histogram = list(self._histogram)
+        stage_total = list(self._stage_total)
+        stage_max = list(self._stage_max)
+        ring = self._ring.copy()
+        slow_count = self._slow_count
+        now = time.perf_counter()
+
+        bucket_labels = [f"<={edge:g}" for edge in self.BUCKET_EDGES] + [f">{self.BUCKET_EDGES[-1]:g}"]
+        stages = {
+            name: {
+                'total_seconds': stage_total[index],
+                'mean_seconds': stage_total[index] / callbacks if callbacks else 0.0,
+                'max_seconds': stage_max[index],
+            }
+            for index, name in enumerate(self.STAGE_NAMES)
+        }
+
+        # 慢回調: 由舊到新
+        recent_slow = []
+        size = len(ring)
+        for count in range(max(0, slow_count - size), slow_count):
+            row = ring[count % size]
+            recent_slow.append({
+                'seconds_ago': now - row[self._RING_TIME],
+                'elapsed': row[self._RING_ELAPSED],
+                'deadline': row[self._RING_DEADLINE],
+                'stages': {
+                    name: row[self._RING_STAGES + index]
+                    for index, name in enumerate(self.STAGE_NAMES)
+                },
+            })
+
+        return {
+            'callbacks': callbacks,
+            'deadline_misses': self.deadline_misses,
+            'underflows': self.underflows,
+            'overflows': self.overflows,
+            'xruns': self.underflows + self.overflows,
+            'processing_errors': self.processing_errors,
+            'last_error': str(self.last_error) if self.last_error is not None else None,
+            'mean_seconds': self.total_seconds / callbacks if callbacks else 0.0,
+            'max_ratio': self.max_ratio,
+            'histogram': dict(zip(bucket_labels, histogram)),
+            'stages': stages,
+            'recent_slow': recent_slow,
+        }
+
+    def format_report(self):
+        """產生可讀的診斷報告
+
+        Returns:
+            str: 多行文字報告
+        """
+        data = self.snapshot()
+        lines = [
+            f"回調次數: {data['callbacks']}",
+            f"期限未達: {data['deadline_misses']}，欠載/溢位: {data['xruns']}，處理錯誤: {data['processing_errors']}",
+            f"平均耗時: {data['mean_seconds'] * 1000:.3f} ms，最大耗時/期限: {data['max_ratio']:.2f}",
+            "耗時/期限分佈:",
+        ]
+        for label, count in data['histogram'].items():
+            lines.append(f"  {label:>6}: {count}")
+        lines.append("各階段耗時 (平均 / 最大 ms):")
+        for name, values in data['stages'].items():
+            lines.append(f"  {name:>6}: {values['mean_seconds'] * 1000:.3f} / {values['max_seconds'] * 1000:.3f}")
+        if data['last_error']:
+            lines.append(f"最後一次處理錯誤: {data['last_error']}")
+        if data['recent_slow']:
+            lines.append(f"最近 {len(data['recent_slow'])} 次慢回調 (耗時 / 期限 ms):")
+            for entry in data['recent_slow'][-10:]:
+                lines.append(
+                    f"  {entry['seconds_ago']:.1f} 秒前: "
+                    f"{entry['elapsed'] * 1000:.3f} / {entry['deadline'] * 1000:.3f}"
+                )
+        return "\n".join(lines)
+
+    def _clear(self):
+        """清除所有統計 (由回調線程執行，不配置新的物件)"""
+        self.callbacks = 0
+        self.deadline_misses = 0
+        self.underflows = 0
+        self.overflows = 0
+        self.processing_errors = 0
+        self.last_error = None
+        self.total_seconds = 0.0
+        self.max_ratio = 0.0
+        for index in range(len(self._histogram)):
+            self._histogram[index] = 0
+        for index in range(len(self._stage_total)):
+            self._stage_total[index] = 0.0
+            self._stage_max[index] = 0.0
+        self._slow_count = 0
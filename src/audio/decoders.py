@@ -0,0 +1,366 @@
+"""音訊解碼後端模組
+
+提供多種解碼後端 (soundfile、ffmpeg 管線、librosa)，
+由 DecoderRegistry 探測可用性並依副檔名選擇最合適的後端。
+"""
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+from src.core.logger import logger
+
+
+class DecoderBackend:
+    """解碼後端基底類別
+
+    子類別需實作 is_available()、supports() 與 decode()。
+    """
+
+    name = 'base'
+
+    def is_available(self):
+        """檢查後端是否可用 (相依套件或執行檔是否存在)
+
+        Returns:
+            bool: 可用時返回 True
+        """
+        raise NotImplementedError
+
+    def supports(self, extension):
+        """檢查後端是否支援指定副檔名
+
+        Args:
+            extension (str): 小寫副檔名 (不含點)，例如 'mp3'
+
+        Returns:
+            bool: 支援時返回 True
+        """
+        raise NotImplementedError
+
+    def decode(self, file_path):
+        """解碼音訊檔案
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            tuple: (audio_data, sample_rate)，audio_data 為 float32，
+                   shape 為 (frames, channels)
+        """
+        raise NotImplementedError
+
+
+class SoundFileDecoder(DecoderBackend):
+    """libsndfile 解碼後端 (libsndfile 1.1 以上支援 MP3)"""
+
+    name = 'soundfile'
+
+    # 副檔名與 libsndfile 格式名稱的對應 (未列出者直接轉為大寫)
+    FORMAT_ALIASES = {
+        'aif': 'AIFF',
+        'oga': 'OGG',
+        'opus': 'OGG',
+    }
+
+    def __init__(self):
+        self._formats = None
+
+    def is_available(self):
+        return importlib.util.find_spec('soundfile') is not None
+
+    def supports(self, extension):
+        if self._formats is None:
+            import soundfile as sf
+            self._formats = set(sf.available_formats())
+        return self.FORMAT_ALIASES.get(extension, extension.upper()) in self._formats
+
+    def decode(self, file_path):
+        import soundfile as sf
+        audio_data, sample_rate = sf.read(file_path, dtype='float32', always_2d=True)
+        return audio_data, sample_rate
+
+
+class FFmpegDecoder(DecoderBackend):
+    """ffmpeg 子行程解碼後端
+
+    以 ffprobe 取得採樣率與聲道數，再由 ffmpeg 將原始 float32 PCM
+    串流輸出到管線，同時讀取 stdout 與 stderr (避免 stderr 管線塞滿而卡住)。
+    """
+
+    name = 'ffmpeg'
+
+    # 解碼整首歌的最長時間 (秒)，超過時終止 ffmpeg
+    DECODE_TIMEOUT_SECONDS = 120
+
+    def __init__(self, ffmpeg_path='ffmpeg', ffprobe_path='ffprobe'):
+        """初始化 ffmpeg 解碼後端
+
+        Args:
+            ffmpeg_path (str): ffmpeg 執行檔
+            ffprobe_path (str): ffprobe 執行檔
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+
+    def is_available(self):
+        return shutil.which(self.ffmpeg_path) is not None and shutil.which(self.ffprobe_path) is not None
+
+    def supports(self, extension):
+        # ffmpeg 支援幾乎所有音訊格式，實際失敗時由登錄表改用下一個後端
+        return True
+
+    def decode(self, file_path):
+        sample_rate, channels = self._probe(file_path)
+
+        cmd = [
+            self.ffmpeg_path, '-v', 'error', '-nostdin',
+            '-i', file_path,
+            '-map', '0:a:0',
+            '-f', 'f32le', '-acodec', 'pcm_f32le',
+            '-'
+        ]
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+
+        try:
+            buffer, stderr = process.communicate(timeout=self.DECODE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise RuntimeError(f"ffmpeg 解碼逾時 ({self.DECODE_TIMEOUT_SECONDS} 秒): {file_path}")
+
+        if process.returncode != 0:
+            message = stderr.decode('utf-8', errors='ignore').strip()
+            raise RuntimeError(f"ffmpeg 解碼失敗: {message}")
+
+        frame_bytes = 4 * channels
+        usable = len(buffer) - len(buffer) % frame_bytes
+        audio_data = np.frombuffer(buffer, dtype=np.float32, count=usable // 4)
+        return audio_data.reshape(-1, channels), sample_rate
+
+    def _probe(self, file_path):
+        """以 ffprobe 取得第一個音訊串流的格式
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            tuple: (sample_rate, channels)
+
+        Raises:
+            RuntimeError: 無法取得音訊串流資訊
+        """
+        result = subprocess.run(
+            [
+                self.ffprobe_path, '-v', 'error',
+                '-select_streams', 'a:0',
+                '-show_entries', 'stream=sample_rate,channels',
+                '-of', 'json',
+                file_path
+            ],
+            capture_output=True,
+            timeout=30,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        if result.returncode != 0:
+            message = result.stderr.decode('utf-8', errors='ignore').strip()
+            raise RuntimeError(f"ffprobe 失敗: {message}")
+
+        streams = json.loads(result.stdout.decode('utf-8', errors='ignore')).get('streams', [])
+        if not streams:
+            raise RuntimeError(f"找不到音訊串流: {file_path}")
+        return int(streams[0]['sample_rate']), int(streams[0]['channels'])
+
+
+class LibrosaDecoder(DecoderBackend):
+    """librosa 解碼後端 (透過 audioread，最慢，作為最後手段)"""
+
+    name = 'librosa'
+
+    def is_available(self):
+        return importlib.util.find_spec('librosa') is not None
+
+    def supports(self, extension):
+        return True
+
+    def decode(self, file_path):
+        import librosa
+        audio_data, sample_rate = librosa.load(
+            file_path,
+            sr=None,  # 保持原始採樣率
+            mono=False  # 保持立體聲
+        )
+        # librosa 返回 shape (channels, frames)，需轉置
+        if audio_data.ndim == 2:
+            audio_data = audio_data.T
+        else:
+            # 單聲道，擴展為 (frames, 1)
+            audio_data = audio_data.reshape(-1, 1)
+        return audio_data, sample_rate
+
+
+class DecoderRegistry:
+    """解碼後端登錄表
+
+    功能:
+    - 第一次使用時探測各後端是否可用 (只探測一次)
+    - 依優先順序嘗試支援該副檔名的後端，失敗時改用下一個
+    - 記住每種副檔名最後成功的後端，之後優先使用
+    - 記錄每個後端的解碼吞吐量 (音訊秒數 / 解碼耗時)
+    """
+
+    def __init__(self, backends=None):
+        """初始化登錄表
+
+        Args:
+            backends (list): DecoderBackend 列表 (依優先順序)，
+                             預設為 soundfile、ffmpeg、librosa
+        """
+        if backends is None:
+            backends = [SoundFileDecoder(), FFmpegDecoder(), LibrosaDecoder()]
+        self.backends = list(backends)
+
+        self._lock = threading.Lock()
+        self._available = None  # 探測結果
+        self._preferred = {}  # {副檔名: 後端名稱}
+        self._metrics = {backend.name: self._new_metrics() for backend in self.backends}
+
+    def probe(self):
+        """探測可用的後端 (只在第一次呼叫時實際探測)
+
+        Returns:
+            list: 可用的後端 (依優先順序)
+        """
+        with self._lock:
+            if self._available is None:
+                available = []
+                for backend in self.backends:
+                    try:
+                        if backend.is_available():
+                            available.append(backend)
+                    except Exception as e:
+                        logger.warning(f"探測解碼後端 {backend.name} 失敗: {e}")
+                self._available = available
+                logger.info(f"可用的解碼後端: {[backend.name for backend in available]}")
+            return self._available
+
+    def get_candidates(self, file_path):
+        """取得可解碼指定檔案的後端 (上次成功的後端排在最前)
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            list: DecoderBackend 列表
+        """
+        extension = self._extension(file_path)
+        candidates = []
+        for backend in self.probe():
+            try:
+                if backend.supports(extension):
+                    candidates.append(backend)
+            except Exception as e:
+                logger.debug(f"解碼後端 {backend.name} 無法檢查格式 {extension}: {e}")
+
+        preferred = self._preferred.get(extension)
+        candidates.sort(key=lambda backend: backend.name != preferred)
+        return candidates
+
+    def decode(self, file_path):
+        """使用最合適的後端解碼音訊檔案
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            tuple: (audio_data, sample_rate)，audio_data shape 為 (frames, channels)
+
+        Raises:
+            RuntimeError: 沒有可用的後端
+            Exception: 所有後端都失敗時拋出最後一個後端的例外
+        """
+        candidates = self.get_candidates(file_path)
+        if not candidates:
+            raise RuntimeError(f"沒有可解碼此檔案的後端: {file_path}")
+
+        last_error = None
+        for backend in candidates:
+            start = time.perf_counter()
+            try:
+                audio_data, sample_rate = backend.decode(file_path)
+            except Exception as e:
+                self._record_failure(backend)
+                logger.debug(f"解碼後端 {backend.name} 無法解碼 {file_path}: {e}")
+                last_error = e
+                continue
+
+            elapsed = time.perf_counter() - start
+            self._record_success(backend, len(audio_data) / sample_rate, elapsed)
+            self._preferred[self._extension(file_path)] = backend.name
+            logger.info(f"使用 {backend.name} 解碼音訊 ({elapsed:.2f} 秒): {file_path}")
+            return audio_data, sample_rate
+
+        raise last_error
+
+    def get_preferred_backend(self, file_path):
+        """取得指定檔案類型目前優先使用的後端名稱
+
+        Args:
+            file_path (str): 音訊檔案路徑或副檔名
+
+        Returns:
+            str: 後端名稱，尚未成功解碼過時返回 None
+        """
+        return self._preferred.get(self._extension(file_path))
+
+    def get_metrics(self):
+        """取得各後端的解碼統計
+
+        Returns:
+            dict: {後端名稱: {'files', 'failures', 'audio_seconds', 'decode_seconds', 'throughput'}}，
+                  throughput 為每秒解碼的音訊秒數 (即時倍率)
+        """
+        with self._lock:
+            metrics = {}
+            for name, values in self._metrics.items():
+                entry = dict(values)
+                decode_seconds = entry['decode_seconds']
+                entry['throughput'] = entry['audio_seconds'] / decode_seconds if decode_seconds > 0 else 0.0
+                metrics[name] = entry
+            return metrics
+
+    def _record_success(self, backend, audio_seconds, decode_seconds):
+        """記錄一次成功的解碼"""
+        with self._lock:
+            metrics = self._metrics.setdefault(backend.name, self._new_metrics())
+            metrics['files'] += 1
+            metrics['audio_seconds'] += audio_seconds
+            metrics['decode_seconds'] += decode_seconds
+
+    def _record_failure(self, backend):
+        """記錄一次失敗的解碼"""
+        with self._lock:
+            metrics = self._metrics.setdefault(backend.name, self._new_metrics())
+            metrics['failures'] += 1
+
+    @staticmethod
+    def _new_metrics():
+        """建立空的統計資料"""
+        return {'files': 0, 'failures': 0, 'audio_seconds': 0.0, 'decode_seconds': 0.0}
+
+    @staticmethod
+    def _extension(file_path):
+        """取得小寫副檔名 (不含點)"""
+        extension = os.path.splitext(file_path)[1]
+        if not extension and '/' not in file_path and os.sep not in file_path:
+            # 直接傳入副檔名
+            extension = file_path
+        return extension.lower().lstrip('.')
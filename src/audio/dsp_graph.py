@@ -0,0 +1,376 @@
+"""DSP 節點圖模組
+
+將音訊效果拆成依序執行、可個別略過 (bypass) 的節點: 增益、等化器、限幅器、音量表等。
+控制端每次修改節點設定後重新編譯出執行計畫 (tuple)，並以一次參照替換發布，
+音訊回調每個區塊只讀取一次計畫，因此重新設定不需要鎖，也不會讓區塊只套用到一半的設定:
+- 略過的節點不會出現在計畫中 (零成本)
+- 相鄰的增益節點合併為一次乘法，總增益為 1.0 時整個乘法省略
+"""
+import threading
+import numpy as np
+
+
+class DSPNode:
+    """DSP 節點基底類別
+
+    子類別實作 process()，就地處理 float32 區塊 (shape 為 (frames, channels))，
+    不得配置區塊大小的陣列。
+    """
+
+    def __init__(self, name, enabled=True):
+        """初始化節點
+
+        Args:
+            name (str): 節點名稱 (在同一個圖中唯一)
+            enabled (bool): 是否啟用，False 表示略過
+        """
+        self.name = name
+        self.enabled = bool(enabled)
+
+    def is_active(self):
+        """檢查節點是否需要出現在執行計畫中
+
+        Returns:
+            bool: 需要處理時返回 True
+        """
+        return self.enabled
+
+    def process(self, buffer):
+        """就地處理一個區塊
+
+        Args:
+            buffer (np.ndarray): float32 音訊緩衝區
+        """
+        raise NotImplementedError
+
+    def compile(self):
+        """取得放入執行計畫的可呼叫物件
+
+        子類別可覆寫以在編譯時擷取目前的設定 (例如等化器物件)，
+        之後修改節點屬性不會影響已發布的計畫。
+
+        Returns:
+            callable: 接受 buffer 並就地處理
+        """
+        return self.process
+
+    def reset(self):
+        """清除節點的串流狀態 (濾波器狀態等)"""
+
+
+class GainNode(DSPNode):
+    """線性增益節點 (相鄰的增益節點在編譯時合併)"""
+
+    def __init__(self, name, gain=1.0, enabled=True):
+        """初始化增益節點
+
+        Args:
+            name (str): 節點名稱
+            gain (float): 線性增益
+            enabled (bool): 是否啟用
+        """
+        super().__init__(name, enabled)
+        self.gain = float(gain)
+
+    def process(self, buffer):
+        np.multiply(buffer, self.gain, out=buffer)
+
+
+class EqualizerNode(DSPNode):
+    """等化器節點 (包裝 EqualizerFilter)"""
+
+    def __init__(self, name, equalizer=None, enabled=True):
+        """初始化等化器節點
+
+        Args:
+            name (str): 節點名稱
+            equalizer (EqualizerFilter): 等化器，None 表示沒有等化器 (略過)
+            enabled (bool): 是否啟用
+        """
+        super().__init__(name, enabled)
+        self.equalizer = equalizer
+
+    def is_active(self):
+        return self.enabled and self.equalizer is not None
+
+    def process(self, buffer):
+        self.equalizer.process_inplace(buffer)
+
+    def compile(self):
+        # 擷取編譯時的等化器，控制端之後替換或移除等化器不影響執行中的計畫
+        return self.equalizer.process_inplace
+
+    def reset(self):
+        if self.equalizer is not None:
+            self.equalizer.reset()
+
+
+class LimiterNode(DSPNode):
+    """硬限幅節點 (限制在 ±ceiling，防止削波)"""
+
+    def __init__(self, name, ceiling=1.0, enabled=True):
+        """初始化限幅節點
+
+        Args:
+            name (str): 節點名稱
+            ceiling (float): 樣本絕對值上限
+            enabled (bool): 是否啟用
+        """
+        super().__init__(name, enabled)
+        self.ceiling = float(ceiling)
+
+    def process(self, buffer):
+        np.clip(buffer, -self.ceiling, self.ceiling, out=buffer)
+
+
+class MeterNode(DSPNode):
+    """量測節點: 將區塊交給 tap (例如 SpectrumAnalyzer)，不修改樣本"""
+
+    def __init__(self, name, tap, enabled=True):
+        """初始化量測節點
+
+        Args:
+            name (str): 節點名稱
+            tap: 具有 write(block) 的物件，write() 必須只做記憶體複製
+            enabled (bool): 是否啟用
+        """
+        super().__init__(name, enabled)
+        self.tap = tap
+
+    def is_active(self):
+        return self.enabled and self.tap is not None
+
+    def process(self, buffer):
+        self.tap.write(buffer)
+
+    def compile(self):
+        return self.tap.write
+
+
+class _FusedGain:
+    """編譯後的合併增益 (一次乘法)"""
+
+    __slots__ = ('gain',)
+
+    def __init__(self, gain):
+        self.gain = gain
+
+    def __call__(self, buffer):
+        np.multiply(buffer, self.gain, out=buffer)
+
+
+class DSPGraph:
+    """依序執行的 DSP 節點圖
+
+    控制端以 add_node()、remove_node()、set_enabled()、set_gain() 等修改節點，
+    每次修改後重新編譯執行計畫並以一次參照替換發布；
+    音訊回調以 process() 執行計畫 (不取得鎖、不配置陣列)。
+    """
+
+    # 視為 1.0 的合併增益誤差
+    UNITY_TOLERANCE = 1e-6
+
+    def __init__(self, nodes=()):
+        """初始化節點圖
+
+        Args:
+            nodes (iterable): 依處理順序排列的節點
+
+        Raises:
+            ValueError: 節點名稱重複
+        """
+        self._lock = threading.Lock()  # 只序列化控制端的修改，回調不取得
+        self._nodes = []
+        self._plan = ()  # ((標籤, 可呼叫物件), ...)
+        self.set_nodes(nodes)
+
+    # ---------- 音訊線程 ----------
+
+    def process(self, buffer):
+        """依執行計畫就地處理一個區塊
+
+        Args:
+            buffer (np.ndarray): float32 音訊緩衝區
+        """
+        # 每個區塊只讀取一次計畫，控制端的替換在下一個區塊才生效
+        for _, step in self._plan:
+            step(buffer)
+
+    # ---------- 控制端 ----------
+
+    @property
+    def nodes(self):
+        """目前的節點 (依處理順序的複本)"""
+        return list(self._nodes)
+
+    def get_node(self, name):
+        """依名稱取得節點
+
+        Args:
+            name (str): 節點名稱
+
+        Returns:
+            DSPNode: 節點，不存在時返回 None
+        """
+        for node in self._nodes:
+            if node.name == name:
+                return node
+        return None
+
+    def set_nodes(self, nodes):
+        """一次替換全部節點
+
+        Args:
+            nodes (iterable): 依處理順序排列的節點
+
+        Raises:
+            ValueError: 節點名稱重複
+        """
+        nodes = list(nodes)
+        names = [node.name for node in nodes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"節點名稱重複: {names}")
+        with self._lock:
+            self._nodes = nodes
+            self._rebuild_locked()
+
+    def add_node(self, node, before=None, after=None):
+        """加入節點
+
+        Args:
+            node (DSPNode): 節點
+            before (str): 插入到此節點之前
+            after (str): 插入到此節點之後 (都未指定時加到最後)
+
+        Raises:
+            ValueError: 節點名稱重複或找不到參考節點
+        """
+        with self._lock:
+            nodes = list(self._nodes)
+            if any(existing.name == node.name for existing in nodes):
+                raise ValueError(f"節點名稱重複: {node.name}")
+            reference = before if before is not None else after
+            if reference is None:
+                nodes.append(node)
+            else:
+                index = self._index_of(nodes, reference)
+                nodes.insert(index if before is not None else index + 1, node)
+            self._nodes = nodes
+            self._rebuild_locked()
+
+    def remove_node(self, name):
+        """移除節點
+
+        Args:
+            name (str): 節點名稱
+
+        Returns:
+            DSPNode: 被移除的節點，不存在時返回 None
+        """
+        with self._lock:
+            nodes = list(self._nodes)
+            for index, node in enumerate(nodes):
+                if node.name == name:
+                    del nodes[index]
+                    self._nodes = nodes
+                    self._rebuild_locked()
+                    return node
+        return None
+
+    def set_enabled(self, name, enabled):
+        """啟用或略過節點
+
+        Args:
+            name (str): 節點名稱
+            enabled (bool): False 表示略過
+
+        Raises:
+            KeyError: 找不到節點
+        """
+        self.update(name, enabled=bool(enabled))
+
+    def set_gain(self, name, gain):
+        """設定增益節點的增益
+
+        Args:
+            name (str): 節點名稱
+            gain (float): 線性增益
+
+        Raises:
+            KeyError: 找不到節點
+        """
+        self.update(name, gain=float(gain))
+
+    def update(self, name, **attributes):
+        """修改節點屬性並重新編譯 (多個屬性在同一次發布中生效)
+
+        Args:
+            name (str): 節點名稱
+            **attributes: 要修改的屬性
+
+        Raises:
+            KeyError: 找不到節點
+        """
+        with self._lock:
+            node = self.get_node(name)
+            if node is None:
+                raise KeyError(name)
+            for key, value in attributes.items():
+                setattr(node, key, value)
+            self._rebuild_locked()
+
+    def rebuild(self):
+        """重新編譯執行計畫 (直接修改節點屬性後呼叫)"""
+        with self._lock:
+            self._rebuild_locked()
+
+    def describe(self):
+        """取得目前執行計畫的步驟標籤 (診斷與測試用)
+
+        Returns:
+            list: 步驟標籤，合併的增益顯示為 'gain(名稱+名稱)'
+        """
+        return [label for label, _ in self._plan]
+
+    def reset(self):
+        """清除所有節點的串流狀態"""
+        for node in self._nodes:
+            node.reset()
+
+    def _rebuild_locked(self):
+        """編譯執行計畫並發布 (呼叫端需持有 _lock)"""
+        plan = []
+        gain = 1.0
+        gain_names = []
+
+        def flush_gain():
+            if gain_names and abs(gain - 1.0) > self.UNITY_TOLERANCE:
+                plan.append((f"gain({'+'.join(gain_names)})", _FusedGain(gain)))
+
+        for node in self._nodes:
+            if not node.is_active():
+                continue
+            if isinstance(node, GainNode):
+                gain *= node.gain
+                gain_names.append(node.name)
+                continue
+            flush_gain()
+            gain = 1.0
+            gain_names = []
+            plan.append((node.name, node.compile()))
+        flush_gain()
+
+        # 一次參照替換: 回調看到的永遠是完整的舊計畫或完整的新計畫
+        self._plan = tuple(plan)
+
+    @staticmethod
+    def _index_of(nodes, name):
+        """取得節點索引
+
+        Raises:
+            ValueError: 找不到節點
+        """
+        for index, node in enumerate(nodes):
+            if node.name == name:
+                return index
+        raise ValueError(f"找不到節點: {name}")
@@ -3,10 +3,44 @@
 使用 scipy.signal 實作 10 頻段參數等化器 (Peaking EQ)。
 支援即時調整增益，適用於音訊流處理。
 """
+from functools import lru_cache
+from typing import NamedTuple
 import numpy as np
 from scipy import signal
 
 
+@lru_cache(maxsize=8)
+def _response_basis(sample_rate, num_points):
+    """計算頻率響應使用的頻率點與 z^-1、z^-2 (每組採樣率與點數只計算一次)
+
+    Args:
+        sample_rate (int): 採樣率 (Hz)
+        num_points (int): 頻率點數量
+
+    Returns:
+        tuple: (frequencies, exp(-jw), exp(-2jw))，皆為唯讀陣列
+    """
+    # 建立頻率範圍 (20Hz - Nyquist frequency)
+    frequencies = np.logspace(np.log10(20), np.log10(sample_rate / 2), num_points)
+    w = 2 * np.pi * frequencies / sample_rate
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    for array in (frequencies, z1, z2):
+        array.setflags(write=False)
+    return frequencies, z1, z2
+
+
+class _FilterKernel(NamedTuple):
+    """即時濾波使用的係數與狀態快照
+
+    控制端每次修改增益都會建立新的快照並整個替換，
+    音訊回調只讀取一次快照參照，不需要取得鎖。
+    """
+    sos: np.ndarray  # shape (bands, 6)
+    states: np.ndarray  # shape (bands, 2, MAX_CHANNELS)
+    active: bool  # 是否有任何頻段的增益不為 0
+
+
 class EqualizerFilter:
     """10 頻段參數等化器
 
@@ -27,6 +61,9 @@ class EqualizerFilter:
     # 預設 Q 因子 (頻寬參數)
     DEFAULT_Q = 1.0
 
+    # 濾波器狀態支援的最大聲道數
+    MAX_CHANNELS = 2
+
     def __init__(self, sample_rate=44100, frequencies=None, q_factor=DEFAULT_Q):
         """初始化等化器濾波器
 
@@ -45,8 +82,16 @@ class EqualizerFilter:
         # 濾波器係數快取 (避免重複計算)
         self._filter_coeffs = {}
 
-        # 濾波器狀態 (用於連續處理音訊流)
-        self._filter_states = {}
+        # 各頻段頻率響應快取: 頻段索引 → ((增益, 點數, 採樣率, Q), dB 響應)
+        self._band_responses = {}
+
+        # 串接的 second-order sections 與濾波器狀態快照 (用於連續處理音訊流)
+        num_bands = len(self.frequencies)
+        self._kernel = _FilterKernel(
+            sos=np.zeros((num_bands, 6)),
+            states=np.zeros((num_bands, 2, self.MAX_CHANNELS)),
+            active=False
+        )
 
         # 初始化濾波器係數
         self._update_all_filters()
@@ -100,20 +145,44 @@ class EqualizerFilter:
 
         return b, a
 
+    @property
+    def _filter_states(self):
+        """目前快照的濾波器狀態，shape (bands, 2, channels)"""
+        return self._kernel.states
+
     def _update_all_filters(self):
         """更新所有頻段的濾波器係數"""
         self._filter_coeffs.clear()
-        self._filter_states.clear()
 
+        sos = np.zeros_like(self._kernel.sos)
         for i, (freq, gain) in enumerate(zip(self.frequencies, self.gains)):
-            b, a = self._create_peaking_filter(freq, gain)
-            self._filter_coeffs[i] = (b, a)
-            # 初始化濾波器狀態 (2 個通道) - 乘以 0 避免初始暫態
-            zi = signal.lfilter_zi(b, a)
-            self._filter_states[i] = {
-                'left': zi * 0.0,
-                'right': zi * 0.0
-            }
+            self._set_band_coeffs(sos, i, *self._create_peaking_filter(freq, gain))
+
+        # 重置濾波器狀態 - 歸零避免初始暫態
+        self._publish_kernel(sos, np.zeros_like(self._kernel.states))
+
+    def _set_band_coeffs(self, sos, band_index, b, a):
+        """寫入單一頻段的濾波器係數
+
+        Args:
+            sos (np.ndarray): 要寫入的 second-order sections 陣列
+            band_index (int): 頻段索引
+            b (np.ndarray): 分子係數
+            a (np.ndarray): 分母係數
+        """
+        self._filter_coeffs[band_index] = (b, a)
+        sos[band_index, :3] = b
+        sos[band_index, 3:] = a
+
+    def _publish_kernel(self, sos, states):
+        """以新的係數與狀態替換即時濾波快照
+
+        Args:
+            sos (np.ndarray): second-order sections
+            states (np.ndarray): 濾波器狀態
+        """
+        active = any(abs(g) >= 0.01 for g in self.gains)
+        self._kernel = _FilterKernel(sos=sos, states=states, active=active)
 
     def set_band_gain(self, band_index, gain_db):
         """設定特定頻段的增益
@@ -139,16 +208,16 @@ class EqualizerFilter:
         self.gains[band_index] = gain_db
 
         # 重新計算該頻段的濾波器係數
+        # 在副本上修改，再整個替換快照，避免回調讀到一半更新的係數
+        kernel = self._kernel
+        sos = kernel.sos.copy()
+        states = kernel.states.copy()
         freq = self.frequencies[band_index]
-        b, a = self._create_peaking_filter(freq, gain_db)
-        self._filter_coeffs[band_index] = (b, a)
+        self._set_band_coeffs(sos, band_index, *self._create_peaking_filter(freq, gain_db))
 
-        # 重置濾波器狀態 - 乘以 0 避免初始暫態
-        zi = signal.lfilter_zi(b, a)
-        self._filter_states[band_index] = {
-            'left': zi * 0.0,
-            'right': zi * 0.0
-        }
+        # 重置該頻段的濾波器狀態 - 歸零避免初始暫態
+        states[band_index] = 0.0
+        self._publish_kernel(sos, states)
 
         return True
 
@@ -214,74 +283,75 @@ class EqualizerFilter:
 
         if audio_data.shape[1] == 1:
             # 單聲道，複製到兩個通道
-            audio_data = np.repeat(audio_data, 2, axis=1)
+            output = np.repeat(audio_data, 2, axis=1).astype(np.float32, copy=False)
+        else:
+            output = audio_data.astype(np.float32, copy=True)
 
-        # 分離左右聲道
-        left_channel = audio_data[:, 0].copy()
-        right_channel = audio_data[:, 1].copy()
+        self.process_inplace(output)
 
-        # 依序應用所有頻段的濾波器
-        for i in range(len(self.frequencies)):
-            # 跳過增益為 0 的頻段 (優化性能)
-            if abs(self.gains[i]) < 0.01:
-                continue
-
-            b, a = self._filter_coeffs[i]
+        # 防止削波 (clipping)
+        np.clip(output, -1.0, 1.0, out=output)
 
-            # 處理左聲道
-            left_channel, self._filter_states[i]['left'] = signal.lfilter(
-                b, a, left_channel, zi=self._filter_states[i]['left']
-            )
+        return output
 
-            # 處理右聲道
-            right_channel, self._filter_states[i]['right'] = signal.lfilter(
-                b, a, right_channel, zi=self._filter_states[i]['right']
-            )
+    def process_inplace(self, buffer):
+        """就地處理音訊緩衝區（即時回調使用）
 
-        # 合併聲道
-        output = np.column_stack((left_channel, right_channel))
+        所有頻段以 second-order sections 串接，由 sosfilt 一次處理全部聲道，
+        結果寫回原緩衝區。所有頻段增益為 0 時直接返回，不做任何運算。
 
-        # 防止削波 (clipping)
-        output = np.clip(output, -1.0, 1.0)
+        Args:
+            buffer (np.ndarray): float32 音訊緩衝區，shape 為 (frames, channels)，
+                                 channels 不可超過 MAX_CHANNELS
+        """
+        # 只讀取一次快照；控制端同時替換快照時，本區塊仍使用舊快照完成
+        kernel = self._kernel
+        if not kernel.active or buffer.shape[0] == 0:
+            return
 
-        return output
+        zi = kernel.states[:, :, :buffer.shape[1]]
+        output, zf = signal.sosfilt(kernel.sos, buffer, axis=0, zi=zi)
+        buffer[...] = output
+        zi[...] = zf
 
     def get_frequency_response(self, num_points=1000):
         """計算等化器的頻率響應
 
+        整體響應 (dB) 為各頻段響應 (dB) 的總和。各頻段的響應依增益快取，
+        拖動滑桿時只需重新計算變動的頻段，其餘頻段直接相加；
+        需要重新計算的頻段以一次廣播運算完成。
+
         Args:
             num_points (int): 頻率點數量
 
         Returns:
             tuple: (frequencies, magnitude_db) 頻率和增益響應
         """
-        # 建立頻率範圍 (20Hz - Nyquist frequency)
-        frequencies = np.logspace(
-            np.log10(20),
-            np.log10(self.sample_rate / 2),
-            num_points
-        )
-
-        # 計算整體頻率響應 (所有濾波器的乘積)
-        w = 2 * np.pi * frequencies / self.sample_rate
-        H = np.ones(num_points, dtype=complex)
+        frequencies, z1, z2 = _response_basis(self.sample_rate, num_points)
+        magnitude_db = np.zeros(num_points)
 
-        for i in range(len(self.frequencies)):
-            if abs(self.gains[i]) < 0.01:
+        missing = []
+        for i, gain in enumerate(self.gains):
+            if abs(gain) < 0.01:
                 continue  # 跳過增益為 0 的頻段
 
-            b, a = self._filter_coeffs[i]
-
-            # 計算該濾波器的頻率響應
-            H_i = (
-                b[0] + b[1] * np.exp(-1j * w) + b[2] * np.exp(-2j * w)
-            ) / (
-                a[0] + a[1] * np.exp(-1j * w) + a[2] * np.exp(-2j * w)
-            )
-
-            H *= H_i
-
-        # 轉換為 dB
-        magnitude_db = 20 * np.log10(np.abs(H) + 1e-10)
-
-        return frequencies, magnitude_db
+            key = (gain, num_points, self.sample_rate, self.q_factor)
+            cached = self._band_responses.get(i)
+            if cached is not None and cached[0] == key:
+                magnitude_db += cached[1]
+            else:
+                missing.append((i, key))
+
+        if missing:
+            # 一次計算所有需要更新的頻段: 係數 shape (bands, 3)，響應 shape (bands, num_points)
+            b = np.array([self._filter_coeffs[i][0] for i, _ in missing])
+            a = np.array([self._filter_coeffs[i][1] for i, _ in missing])
+            numerator = b[:, 0:1] + b[:, 1:2] * z1 + b[:, 2:3] * z2
+            denominator = a[:, 0:1] + a[:, 1:2] * z1 + a[:, 2:3] * z2
+            responses = 20 * np.log10(np.abs(numerator / denominator) + 1e-10)
+
+            for (i, key), response in zip(missing, responses):
+                self._band_responses[i] = (key, response)
+            magnitude_db += responses.sum(axis=0)
+
+        return frequencies.copy(), magnitude_db
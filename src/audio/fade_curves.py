@@ -0,0 +1,85 @@
+"""淡入淡出曲線模組
+
+每種曲線預先計算一次共用的查找表 (進度 0.0 - 1.0 → 增益)，
+回調以線性內插查表，所有曲線的每區塊成本相同，且只使用預先配置的緩衝區。
+"""
+from functools import lru_cache
+import numpy as np
+
+# 支援的曲線
+FADE_LINEAR = 'linear'
+FADE_LOGARITHMIC = 'logarithmic'
+FADE_EQUAL_POWER = 'equal_power'
+FADE_CURVES = (FADE_LINEAR, FADE_LOGARITHMIC, FADE_EQUAL_POWER)
+
+# 查找表區間數 (表長度為 TABLE_SIZE + 1)
+TABLE_SIZE = 1024
+
+# 對數曲線的動態範圍 (dB)
+LOGARITHMIC_RANGE_DB = 60.0
+
+
+@lru_cache(maxsize=None)
+def get_fade_table(curve=FADE_LINEAR):
+    """取得淡入淡出曲線的查找表
+
+    淡入時進度由 0 增加到 1，淡出時由 1 減少到 0，兩者使用同一張表。
+
+    Args:
+        curve (str): 曲線名稱 (FADE_CURVES 之一)
+
+    Returns:
+        tuple: (table, slopes)，table 為各格點的增益，
+               slopes 為相鄰格點的差值 (內插用)，皆為唯讀 float32 陣列
+
+    Raises:
+        ValueError: 不支援的曲線
+    """
+    progress = np.linspace(0.0, 1.0, TABLE_SIZE + 1)
+    if curve == FADE_LINEAR:
+        table = progress
+    elif curve == FADE_LOGARITHMIC:
+        # 增益以 dB 線性變化 (聽感上均勻)，並平移使進度 0 時為靜音
+        floor = 10 ** (-LOGARITHMIC_RANGE_DB / 20.0)
+        table = (10 ** (LOGARITHMIC_RANGE_DB * (progress - 1.0) / 20.0) - floor) / (1.0 - floor)
+    elif curve == FADE_EQUAL_POWER:
+        # 交叉淡化時兩側功率和固定
+        table = np.sin(progress * np.pi / 2)
+    else:
+        raise ValueError(f"不支援的淡入淡出曲線: {curve}")
+
+    table = table.astype(np.float32)
+    slopes = np.diff(table).astype(np.float32)
+    table.setflags(write=False)
+    slopes.setflags(write=False)
+    return table, slopes
+
+
+def apply_fade_table(progress, table, slopes, position, indices, slope_buffer):
+    """將進度就地轉換為增益 (線性內插查表，不配置陣列)
+
+    Args:
+        progress (np.ndarray): float32 進度，就地改寫為增益
+        table (np.ndarray): get_fade_table() 的增益表
+        slopes (np.ndarray): get_fade_table() 的差值表
+        position (np.ndarray): 與 progress 等長的 float32 暫存緩衝區
+        indices (np.ndarray): 與 progress 等長的 intp 暫存緩衝區
+        slope_buffer (np.ndarray): 與 progress 等長的 float32 暫存緩衝區
+    """
+    cells = len(slopes)
+    np.clip(progress, 0.0, 1.0, out=progress)
+    np.multiply(progress, cells, out=position)
+
+    # 格點索引 (最後一格的右端點仍使用最後一格內插)
+    np.floor(position, out=progress)
+    np.minimum(progress, cells - 1, out=progress)
+    np.copyto(indices, progress, casting='unsafe')
+
+    # 格內位置 (0.0 - 1.0)
+    np.subtract(position, progress, out=position)
+
+    # 增益 = table[i] + slopes[i] * 格內位置
+    np.take(table, indices, out=progress, mode='clip')
+    np.take(slopes, indices, out=slope_buffer, mode='clip')
+    np.multiply(slope_buffer, position, out=slope_buffer)
+    np.add(progress, slope_buffer, out=progress)
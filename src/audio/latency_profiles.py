@@ -0,0 +1,153 @@
+"""輸出延遲設定模組
+
+提供固定的延遲設定檔 (低延遲、平衡、省電)，以及依回調統計自動調整區塊大小的控制器:
+- 回調期限未達、裝置欠載或接近期限的區塊過多時加大區塊 (降低每秒回調次數)
+- 長時間保持充足餘裕時縮小區塊 (跳轉與等化器調整反應更快)
+控制器只做決策，串流的重新開啟由 AudioPlayer 負責。
+"""
+import bisect
+from typing import NamedTuple, Optional
+from src.audio.callback_stats import CallbackStats
+from src.core.constants import AUDIO_BLOCK_SIZE
+
+
+class LatencyProfile(NamedTuple):
+    """延遲設定檔"""
+    name: str
+    blocksize: int  # 每次回調的幀數
+    latency: Optional[str]  # 傳給輸出裝置的延遲設定 ('low'、'high')，None 表示裝置預設值
+
+
+PROFILE_LOW_LATENCY = 'low_latency'
+PROFILE_BALANCED = 'balanced'
+PROFILE_POWER_SAVER = 'power_saver'
+PROFILE_ADAPTIVE = 'adaptive'
+
+LATENCY_PROFILES = {
+    PROFILE_LOW_LATENCY: LatencyProfile(PROFILE_LOW_LATENCY, 512, 'low'),
+    PROFILE_BALANCED: LatencyProfile(PROFILE_BALANCED, AUDIO_BLOCK_SIZE, None),
+    PROFILE_POWER_SAVER: LatencyProfile(PROFILE_POWER_SAVER, 8192, 'high'),
+}
+
+# 可選擇的設定檔 (含自動調整)
+PROFILE_NAMES = tuple(LATENCY_PROFILES) + (PROFILE_ADAPTIVE,)
+
+
+class AdaptiveLatencyController:
+    """依回調餘裕自動調整區塊大小
+
+    每次 update() 比較目前與上一次決策時的 CallbackStats.snapshot()，
+    只根據這段期間的區塊做判斷。區塊大小以 2 倍為單位增減。
+    """
+
+    # 區塊大小範圍 (幀數)
+    MIN_BLOCKSIZE = 512
+    MAX_BLOCKSIZE = 8192
+
+    # 耗時超過期限此比例的區塊視為餘裕不足
+    SLOW_RATIO = 0.75
+
+    # 餘裕不足的區塊超過此比例時加大區塊
+    GROW_SLOW_FRACTION = 0.02
+
+    # 所有區塊耗時都在期限此比例以內時才考慮縮小區塊
+    SHRINK_MAX_RATIO = 0.25
+
+    # 縮小區塊前需要觀察的最短時間 (秒)
+    SHRINK_WINDOW_SECONDS = 10.0
+
+    # 加大區塊後禁止縮小的時間 (秒)，避免在兩種大小之間來回切換
+    HOLD_SECONDS = 60.0
+
+    # 判斷餘裕比例所需的最少區塊數
+    MIN_CALLBACKS = 20
+
+    def __init__(self, blocksize=AUDIO_BLOCK_SIZE, min_blocksize=MIN_BLOCKSIZE, max_blocksize=MAX_BLOCKSIZE):
+        """初始化控制器
+
+        Args:
+            blocksize (int): 起始區塊大小
+            min_blocksize (int): 最小區塊大小
+            max_blocksize (int): 最大區塊大小
+        """
+        self.min_blocksize = min_blocksize
+        self.max_blocksize = max_blocksize
+        self.blocksize = max(min_blocksize, min(max_blocksize, int(blocksize)))
+        self._baseline = None
+        self._window_start = 0.0
+        self._hold_until = 0.0
+
+    def reset(self, snapshot, now):
+        """以目前的統計作為新的觀察起點 (開始播放或重新開啟串流後呼叫)
+
+        Args:
+            snapshot (dict): CallbackStats.snapshot() 的結果
+            now (float): time.monotonic() 的值
+        """
+        self._baseline = self._counters(snapshot)
+        self._window_start = now
+
+    def update(self, snapshot, now):
+        """根據上次決策後的區塊統計決定是否調整區塊大小
+
+        Args:
+            snapshot (dict): CallbackStats.snapshot() 的結果
+            now (float): time.monotonic() 的值
+
+        Returns:
+            int: 新的區塊大小，不需調整時返回 None
+        """
+        counters = self._counters(snapshot)
+        baseline = self._baseline
+        if baseline is None or counters[0] < baseline[0]:
+            # 尚未開始觀察或統計已被重置
+            self.reset(snapshot, now)
+            return None
+
+        callbacks, problems, slow, busy = (current - previous for current, previous in zip(counters, baseline))
+        if callbacks <= 0:
+            return None
+
+        if problems > 0 or (callbacks >= self.MIN_CALLBACKS and slow / callbacks > self.GROW_SLOW_FRACTION):
+            self._hold_until = now + self.HOLD_SECONDS
+            self.reset(snapshot, now)
+            return self._resize(self.blocksize * 2)
+
+        if now - self._window_start < self.SHRINK_WINDOW_SECONDS or callbacks < self.MIN_CALLBACKS:
+            return None
+
+        # 觀察期結束: 重新開始下一段觀察
+        self.reset(snapshot, now)
+        if busy == 0 and now >= self._hold_until:
+            return self._resize(self.blocksize // 2)
+        return None
+
+    def _resize(self, blocksize):
+        """套用新的區塊大小 (限制範圍)
+
+        Returns:
+            int: 新的區塊大小，與目前相同時返回 None
+        """
+        blocksize = max(self.min_blocksize, min(self.max_blocksize, blocksize))
+        if blocksize == self.blocksize:
+            return None
+        self.blocksize = blocksize
+        return blocksize
+
+    def _counters(self, snapshot):
+        """從統計取得累計計數
+
+        Returns:
+            tuple: (回調次數, 期限未達 + 欠載/溢位, 餘裕不足的區塊數, 超過縮小門檻的區塊數)
+        """
+        histogram = list(snapshot['histogram'].values())
+        edges = CallbackStats.BUCKET_EDGES
+        # 第 i 個桶收集 (edges[i-1], edges[i]] 的區塊，桶的下界不小於門檻時整個桶都計入
+        slow = sum(histogram[bisect.bisect_left(edges, self.SLOW_RATIO) + 1:])
+        busy = sum(histogram[bisect.bisect_left(edges, self.SHRINK_MAX_RATIO) + 1:])
+        return (
+            snapshot['callbacks'],
+            snapshot['deadline_misses'] + snapshot['xruns'],
+            slow,
+            busy,
+        )
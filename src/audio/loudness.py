@@ -0,0 +1,478 @@
+"""響度分析與音量正規化模組
+
+依 ITU-R BS.1770 / EBU R128 計算整合響度 (LUFS) 與真峰值 (dBTP)，
+以串流區塊處理檔案 (記憶體用量與曲長無關)，並透過行程池批次分析整個音樂庫。
+分析結果存放在以 (修改時間, 檔案大小) 驗證的索引檔，
+播放時 AudioProcessor 只需套用一個固定增益。
+"""
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import numpy as np
+from scipy import signal
+from src.core.constants import LOUDNESS_TARGET_LUFS, LOUDNESS_MAX_TRUE_PEAK_DBTP
+from src.core.logger import logger
+
+
+def k_weighting_sos(sample_rate):
+    """計算 BS.1770 K 加權濾波器 (高架 + RLB 高通) 的二階節係數
+
+    係數由類比原型經雙線性轉換求得，在 48 kHz 時與標準表列係數一致。
+
+    Args:
+        sample_rate (int): 採樣率 (Hz)
+
+    Returns:
+        np.ndarray: shape 為 (2, 6) 的 SOS 係數
+    """
+    # 第一級: 高架濾波器 (模擬頭部的聲學效應)
+    f0 = 1681.974450955533
+    gain_db = 3.999843853973347
+    q = 0.7071752369554196
+    k = math.tan(math.pi * f0 / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+        1.0,
+        2 * (k * k - 1) / a0,
+        (1 - k / q + k * k) / a0,
+    ]
+
+    # 第二級: RLB 高通濾波器
+    f0 = 38.13547087602444
+    q = 0.5003270373238773
+    k = math.tan(math.pi * f0 / sample_rate)
+    a0 = 1 + k / q + k * k
+    highpass = [
+        1.0, -2.0, 1.0,
+        1.0,
+        2 * (k * k - 1) / a0,
+        (1 - k / q + k * k) / a0,
+    ]
+
+    return np.array([shelf, highpass], dtype=np.float64)
+
+
+class LoudnessMeter:
+    """串流 BS.1770 響度計
+
+    以任意大小的區塊呼叫 process()，只保留每 100 ms 的能量，
+    最後再計算閘控後的整合響度。
+    """
+
+    # 閘控區塊長度與步長 (75% 重疊)
+    BLOCK_SECONDS = 0.4
+    STEP_SECONDS = 0.1
+
+    # 絕對閘限 (LUFS) 與相對閘限 (LU)
+    ABSOLUTE_GATE = -70.0
+    RELATIVE_GATE = -10.0
+
+    # 真峰值的超取樣倍率與區塊間保留的歷史幀數
+    OVERSAMPLE = 4
+    PEAK_HISTORY = 32
+
+    def __init__(self, sample_rate, channels):
+        """初始化響度計
+
+        Args:
+            sample_rate (int): 採樣率 (Hz)
+            channels (int): 聲道數 (每個聲道權重皆為 1.0)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+
+        self._sos = k_weighting_sos(sample_rate)
+        self._zi = np.zeros((self._sos.shape[0], 2, channels))
+
+        # 每 100 ms 的能量 (各聲道均方值總和)
+        self._step_frames = max(1, int(round(sample_rate * self.STEP_SECONDS)))
+        self._steps_per_block = int(round(self.BLOCK_SECONDS / self.STEP_SECONDS))
+        self._step_energy = []
+        self._pending_sum = 0.0
+        self._pending_count = 0
+
+        # 真峰值
+        self._peak = 0.0
+        self._history = np.zeros((0, channels), dtype=np.float64)
+
+    def process(self, block):
+        """處理一個音訊區塊
+
+        Args:
+            block (np.ndarray): 音訊數據，shape 為 (frames, channels)
+        """
+        frames = len(block)
+        if frames == 0:
+            return
+        block = np.asarray(block, dtype=np.float64)
+        self.frames += frames
+
+        filtered, self._zi = signal.sosfilt(self._sos, block, axis=0, zi=self._zi)
+        energy = np.sum(filtered * filtered, axis=1)
+        self._accumulate(energy)
+        self._update_peak(block)
+
+    def integrated_loudness(self):
+        """計算整合響度
+
+        Returns:
+            float: 整合響度 (LUFS)，音訊太短或全為靜音時返回 None
+        """
+        steps = np.asarray(self._step_energy)
+        count = len(steps) - self._steps_per_block + 1
+        if count <= 0:
+            return None
+
+        # 400 ms 閘控區塊 (每 100 ms 一個)
+        cumulative = np.concatenate(([0.0], np.cumsum(steps)))
+        blocks = (cumulative[self._steps_per_block:] - cumulative[:count]) / self._steps_per_block
+
+        with np.errstate(divide='ignore'):
+            loudness = -0.691 + 10 * np.log10(blocks)
+
+        gated = blocks[loudness > self.ABSOLUTE_GATE]
+        if len(gated) == 0:
+            return None
+
+        relative_gate = -0.691 + 10 * math.log10(np.mean(gated)) + self.RELATIVE_GATE
+        gated = blocks[(loudness > self.ABSOLUTE_GATE) & (loudness > relative_gate)]
+        if len(gated) == 0:
+            return None
+        return -0.691 + 10 * math.log10(np.mean(gated))
+
+    def true_peak(self):
+        """取得真峰值
+
+        Returns:
+            float: 真峰值 (dBTP)，全為靜音時返回 None
+        """
+        if self._peak <= 0.0:
+            return None
+        return 20 * math.log10(self._peak)
+
+    def _accumulate(self, energy):
+        """將逐幀能量累積為每 100 ms 的均方值"""
+        step = self._step_frames
+        position = 0
+
+        # 補齊上一個區塊未滿的步長
+        if self._pending_count:
+            take = min(step - self._pending_count, len(energy))
+            self._pending_sum += float(np.sum(energy[:take]))
+            self._pending_count += take
+            position = take
+            if self._pending_count == step:
+                self._step_energy.append(self._pending_sum / step)
+                self._pending_sum = 0.0
+                self._pending_count = 0
+
+        full = (len(energy) - position) // step
+        if full:
+            sums = energy[position:position + full * step].reshape(full, step).sum(axis=1)
+            self._step_energy.extend((sums / step).tolist())
+            position += full * step
+
+        if position < len(energy):
+            self._pending_sum += float(np.sum(energy[position:]))
+            self._pending_count += len(energy) - position
+
+    def _update_peak(self, block):
+        """以超取樣估計真峰值
+
+        重取樣會把區塊兩端視為補零，因此只採用距離兩端
+        PEAK_HISTORY / 2 幀以外的輸出，並保留尾端作為下一個區塊的歷史。
+        """
+        # 取樣峰值是真峰值的下限 (涵蓋最後未評估的尾端)
+        self._peak = max(self._peak, float(np.max(np.abs(block))))
+
+        margin = self.PEAK_HISTORY // 2
+        extended = np.concatenate((self._history, block))
+        start = margin if len(self._history) else 0
+        end = len(extended) - margin
+        if end > start:
+            upsampled = signal.resample_poly(extended, self.OVERSAMPLE, 1, axis=0)
+            region = upsampled[start * self.OVERSAMPLE:end * self.OVERSAMPLE]
+            self._peak = max(self._peak, float(np.max(np.abs(region))))
+        self._history = extended[-self.PEAK_HISTORY:]
+
+
+def analyze_file(file_path, block_frames=65536):
+    """串流分析單一檔案的響度與真峰值
+
+    優先以 soundfile 逐區塊讀取；無法串流的格式改用解碼後端完整解碼。
+    此函數會在行程池的子行程中執行。
+
+    Args:
+        file_path (str): 音訊檔案路徑
+        block_frames (int): 每次讀取的幀數
+
+    Returns:
+        dict: {'integrated_lufs', 'true_peak_dbtp', 'duration'}
+    """
+    try:
+        import soundfile as sf
+        with sf.SoundFile(file_path) as audio_file:
+            meter = LoudnessMeter(audio_file.samplerate, audio_file.channels)
+            for block in audio_file.blocks(blocksize=block_frames, dtype='float32', always_2d=True):
+                meter.process(block)
+    except Exception:
+        from src.audio.decoders import DecoderRegistry
+        audio_data, sample_rate = DecoderRegistry().decode(file_path)
+        meter = LoudnessMeter(sample_rate, audio_data.shape[1])
+        for start in range(0, len(audio_data), block_frames):
+            meter.process(audio_data[start:start + block_frames])
+
+    return {
+        'integrated_lufs': meter.integrated_loudness(),
+        'true_peak_dbtp': meter.true_peak(),
+        'duration': meter.frames / meter.sample_rate,
+    }
+
+
+def compute_gain(integrated_lufs, true_peak_dbtp,
+                 target_lufs=LOUDNESS_TARGET_LUFS,
+                 max_true_peak_dbtp=LOUDNESS_MAX_TRUE_PEAK_DBTP):
+    """計算正規化增益 (不讓真峰值超過上限)
+
+    Args:
+        integrated_lufs (float): 整合響度，None 表示未知
+        true_peak_dbtp (float): 真峰值，None 表示未知
+        target_lufs (float): 目標響度
+        max_true_peak_dbtp (float): 套用增益後的真峰值上限
+
+    Returns:
+        float: 線性增益
+    """
+    if integrated_lufs is None:
+        return 1.0
+
+    gain_db = target_lufs - integrated_lufs
+    if true_peak_dbtp is not None:
+        gain_db = min(gain_db, max_true_peak_dbtp - true_peak_dbtp)
+    return 10 ** (gain_db / 20)
+
+
+class LoudnessIndex:
+    """響度分析結果索引
+
+    以檔案絕對路徑為鍵，並記錄分析時的修改時間與大小；
+    檔案變更後項目自動視為過期。分析失敗的檔案也會記錄，
+    避免每次重新分析無法解碼的檔案。
+    """
+
+    def __init__(self, index_path):
+        """初始化索引
+
+        Args:
+            index_path (str): 索引 JSON 檔案路徑
+        """
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def is_current(self, file_path):
+        """檢查檔案是否已有最新的分析結果
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            bool: 結果存在且檔案未變更時返回 True
+        """
+        return self.get(file_path) is not None
+
+    def get(self, file_path):
+        """取得檔案的分析結果
+
+        Args:
+            file_path (str): 音訊檔案路徑
+
+        Returns:
+            dict: 分析結果，不存在或已過期時返回 None
+        """
+        identity = self._identity(file_path)
+        if identity is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(file_path))
+        if entry is None or entry.get('mtime_ns') != identity[0] or entry.get('size') != identity[1]:
+            return None
+        return entry
+
+    def put(self, file_path, result):
+        """記錄分析結果
+
+        Args:
+            file_path (str): 音訊檔案路徑
+            result (dict): analyze_file() 的結果，分析失敗時傳入 {'error': 訊息}
+        """
+        identity = self._identity(file_path)
+        if identity is None:
+            return
+        entry = dict(result)
+        entry['mtime_ns'], entry['size'] = identity
+        with self._lock:
+            self._entries[os.path.abspath(file_path)] = entry
+
+    def get_gain(self, file_path,
+                 target_lufs=LOUDNESS_TARGET_LUFS,
+                 max_true_peak_dbtp=LOUDNESS_MAX_TRUE_PEAK_DBTP):
+        """取得檔案的正規化增益
+
+        Args:
+            file_path (str): 音訊檔案路徑
+            target_lufs (float): 目標響度
+            max_true_peak_dbtp (float): 真峰值上限
+
+        Returns:
+            float: 線性增益，尚未分析時返回 1.0
+        """
+        entry = self.get(file_path)
+        if entry is None:
+            return 1.0
+        return compute_gain(
+            entry.get('integrated_lufs'),
+            entry.get('true_peak_dbtp'),
+            target_lufs,
+            max_true_peak_dbtp
+        )
+
+    def save(self):
+        """寫入索引檔 (先寫入暫存檔再改名)
+
+        Returns:
+            bool: 是否成功
+        """
+        with self._lock:
+            entries = dict(self._entries)
+        try:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.index_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+            return True
+        except Exception as e:
+            logger.error(f"儲存響度索引失敗: {e}")
+            return False
+
+    def _load(self):
+        """載入索引檔
+
+        Returns:
+            dict: 索引內容
+        """
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except Exception as e:
+            logger.warning(f"載入響度索引失敗: {e}")
+            return {}
+
+    @staticmethod
+    def _identity(file_path):
+        """取得檔案的 (修改時間, 大小)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+def analyze_library(file_paths, index, max_workers=None, on_progress=None, use_processes=True,
+                    cancel_event=None, save_every=50, save_interval=30.0):
+    """批次分析尚未分析或已變更的檔案
+
+    只保留少量已送出的工作 (邊分析邊送出)，取消時捨棄尚未開始的工作；
+    每分析 save_every 首或經過 save_interval 秒儲存一次索引，中斷時保留已完成的結果。
+
+    Args:
+        file_paths (list): 音訊檔案路徑列表
+        index (LoudnessIndex): 分析結果索引
+        max_workers (int): 行程 (或執行緒) 數，None 表示使用預設值
+        on_progress (callable): 進度回調 on_progress(completed, total, file_path)
+        use_processes (bool): True 使用行程池；False 使用執行緒池
+                              (應用程式內使用，打包後的執行檔不會另外啟動行程)
+        cancel_event (threading.Event): 設定後停止分析 (已完成的結果仍會儲存)
+        save_every (int): 每分析幾首儲存一次索引
+        save_interval (float): 距離上次儲存超過幾秒時儲存索引
+
+    Returns:
+        dict: {'analyzed': int, 'skipped': int, 'failed': int}
+    """
+    unique_paths = list(dict.fromkeys(file_paths))
+    pending = [path for path in unique_paths if not index.is_current(path)]
+    summary = {'analyzed': 0, 'skipped': len(unique_paths) - len(pending), 'failed': 0}
+    if not pending:
+        return summary
+
+    logger.info(f"開始響度分析: {len(pending)} 首 (略過 {summary['skipped']} 首)")
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    executor = executor_class(max_workers=max_workers)
+    # 每個工作者最多保留兩個工作，避免一次送出整個音樂庫
+    in_flight_limit = 2 * (max_workers or os.cpu_count() or 1)
+    remaining = iter(pending)
+    futures = {}
+    completed = 0
+    unsaved = 0
+    last_save = time.monotonic()
+    cancelled = False
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+
+            while len(futures) < in_flight_limit:
+                path = next(remaining, None)
+                if path is None:
+                    break
+                futures[executor.submit(analyze_file, path)] = path
+            if not futures:
+                break
+
+            # 定期醒來檢查是否已取消
+            done, _ = wait(futures, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = futures.pop(future)
+                try:
+                    index.put(path, future.result())
+                    summary['analyzed'] += 1
+                except Exception as e:
+                    logger.warning(f"響度分析失敗: {path} ({e})")
+                    index.put(path, {'error': str(e)})
+                    summary['failed'] += 1
+
+                completed += 1
+                unsaved += 1
+                if on_progress:
+                    on_progress(completed, len(pending), path)
+
+            if unsaved and (unsaved >= save_every or time.monotonic() - last_save >= save_interval):
+                index.save()
+                unsaved = 0
+                last_save = time.monotonic()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if unsaved:
+        index.save()
+    if cancelled:
+        logger.info(f"響度分析已取消: {summary}")
+    else:
+        logger.info(f"響度分析完成: {summary}")
+    return summary
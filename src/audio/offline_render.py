@@ -0,0 +1,362 @@
+"""離線渲染模組
+
+以與即時播放相同的區塊大小與處理順序驅動 AudioProcessor，
+將目前的等化器、音量、響度正規化與播放速度設定套用到檔案並輸出 WAV / FLAC，
+不需要即時播放，速度只受 CPU 限制。
+
+用法:
+    python -m src.audio.offline_render song.mp3 -o output --preset rock
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple, Optional
+import numpy as np
+from src.audio.audio_processor import AudioProcessor
+from src.core.constants import AUDIO_BLOCK_SIZE
+from src.core.logger import logger
+
+
+# 支援的輸出格式與預設樣本格式 (FLAC 不支援浮點數)
+OUTPUT_SUBTYPES = {
+    'wav': 'FLOAT',
+    'flac': 'PCM_24',
+}
+
+
+class RenderSettings(NamedTuple):
+    """離線渲染設定 (不可變且可 pickle，可直接傳給行程池的子行程)"""
+    equalizer_gains: Optional[tuple] = None  # 各頻段增益 (dB)，None 表示不使用等化器
+    replay_gain: float = 1.0  # 響度正規化增益 (線性)
+    speed: float = 1.0  # 播放速度
+    volume: float = 1.0  # 播放器音量 (處理器的輸出增益，與即時回調相同)
+    block_size: int = AUDIO_BLOCK_SIZE
+
+    @classmethod
+    def from_processor(cls, processor, volume=None):
+        """從 AudioProcessor 的目前設定建立渲染設定
+
+        Args:
+            processor (AudioProcessor): 音訊處理器
+            volume (float): 播放器音量，None 表示使用處理器目前的輸出增益
+
+        Returns:
+            RenderSettings: 渲染設定
+        """
+        equalizer = processor.get_equalizer()
+        return cls(
+            equalizer_gains=tuple(equalizer.get_all_gains()) if equalizer else None,
+            replay_gain=processor.get_replay_gain(),
+            speed=processor.get_playback_speed(),
+            volume=processor.get_output_gain() if volume is None else volume,
+        )
+
+
+def build_processor(settings, sample_rate):
+    """依渲染設定建立音訊處理器
+
+    Args:
+        settings (RenderSettings): 渲染設定
+        sample_rate (int): 採樣率
+
+    Returns:
+        AudioProcessor: 音訊處理器
+    """
+    processor = AudioProcessor(
+        sample_rate=sample_rate,
+        enable_equalizer=settings.equalizer_gains is not None
+    )
+    if settings.equalizer_gains is not None:
+        processor.get_equalizer().set_all_gains(list(settings.equalizer_gains))
+    processor.set_replay_gain(settings.replay_gain)
+    processor.set_output_gain(settings.volume)
+    processor.set_playback_speed(settings.speed)
+    return processor
+
+
+def render_stream(read, processor, settings, channels, write):
+    """以即時回調的處理順序逐區塊渲染音訊來源
+
+    每個區塊: 時間伸縮 (變速時) → 等化器 → 合併的增益 (含播放器音量) → 限幅，
+    與 AudioPlayer._audio_callback 在淡入淡出停用時的輸出逐樣本相同。
+
+    Args:
+        read (callable): read(out) 將來源的下一段寫入 out，超出結尾的部分補零，
+                         返回實際讀取的幀數
+        processor (AudioProcessor): 音訊處理器
+        settings (RenderSettings): 渲染設定
+        channels (int): 輸出聲道數
+        write (callable): write(block) 接收每個輸出區塊
+
+    Returns:
+        int: 輸出的總幀數
+    """
+    frames = settings.block_size
+    chunk = np.zeros((frames, channels), dtype=np.float32)
+    source = np.zeros((processor.max_input_frames(frames), channels), dtype=np.float32)
+    total = 0
+
+    while True:
+        stretching = processor.is_stretching()
+        needed = processor.input_frames_for(frames) if stretching else frames
+
+        if stretching:
+            available = read(source[:needed])
+            processor.render(source[:needed], chunk)
+        else:
+            available = read(chunk)
+            processor.process_inplace(chunk)
+
+        finished = available < needed
+        count = frames
+        if finished:
+            # 最後一個區塊只輸出剩餘來源對應的幀數 (變速時依本區塊的來源/輸出比例換算)
+            count = min(frames, -(-available * frames // needed))
+
+        if count > 0:
+            write(chunk[:count])
+            total += count
+        if finished:
+            return total
+
+
+def render_array(audio_data, sample_rate, settings=None):
+    """渲染記憶體中的音訊
+
+    Args:
+        audio_data (np.ndarray): 音訊數據，shape 為 (frames, channels)
+        sample_rate (int): 採樣率
+        settings (RenderSettings): 渲染設定，None 表示使用預設值
+
+    Returns:
+        np.ndarray: float32 輸出，shape 為 (frames, channels)
+    """
+    settings = settings or RenderSettings()
+    processor = build_processor(settings, sample_rate)
+    position = [0]
+    blocks = []
+
+    def read(out):
+        start = position[0]
+        available = max(0, min(len(out), len(audio_data) - start))
+        out[:available] = audio_data[start:start + available]
+        out[available:] = 0
+        position[0] = start + available
+        return available
+
+    render_stream(read, processor, settings, audio_data.shape[1], lambda block: blocks.append(block.copy()))
+    if not blocks:
+        return np.zeros((0, audio_data.shape[1]), dtype=np.float32)
+    return np.concatenate(blocks)
+
+
+def render_file(input_path, output_path, settings=None, subtype=None):
+    """渲染單一檔案並寫入 WAV / FLAC
+
+    以 soundfile 串流讀寫 (記憶體用量與曲長無關)；無法串流的格式改用解碼後端完整解碼。
+    單聲道來源與即時播放相同，複製為立體聲後處理。此函數會在行程池的子行程中執行。
+
+    Args:
+        input_path (str): 來源音訊檔案路徑
+        output_path (str): 輸出檔案路徑 (副檔名決定格式)
+        settings (RenderSettings): 渲染設定，None 表示使用預設值
+        subtype (str): soundfile 樣本格式，None 表示使用該格式的預設值
+
+    Returns:
+        dict: {'input', 'output', 'duration', 'elapsed', 'realtime_factor'}
+
+    Raises:
+        ValueError: 不支援的輸出格式
+    """
+    import soundfile as sf
+
+    extension = os.path.splitext(output_path)[1].lower().lstrip('.')
+    if extension not in OUTPUT_SUBTYPES:
+        raise ValueError(f"不支援的輸出格式: {extension}")
+
+    settings = settings or RenderSettings()
+    started = time.perf_counter()
+
+    try:
+        source_file = sf.SoundFile(input_path)
+    except Exception:
+        source_file = None
+
+    if source_file is not None:
+        with source_file:
+            sample_rate = source_file.samplerate
+            source_channels = source_file.channels
+
+            def read(out):
+                data = source_file.read(len(out), dtype='float32', always_2d=True)
+                return _copy_source(data, out)
+
+            frames = _render_to_file(read, sample_rate, source_channels, output_path,
+                                     settings, subtype or OUTPUT_SUBTYPES[extension])
+    else:
+        from src.audio.decoders import DecoderRegistry
+        audio_data, sample_rate = DecoderRegistry().decode(input_path)
+        position = [0]
+
+        def read(out):
+            start = position[0]
+            position[0] = min(len(audio_data), start + len(out))
+            return _copy_source(audio_data[start:position[0]], out)
+
+        frames = _render_to_file(read, sample_rate, audio_data.shape[1], output_path,
+                                 settings, subtype or OUTPUT_SUBTYPES[extension])
+
+    elapsed = time.perf_counter() - started
+    duration = frames / sample_rate
+    return {
+        'input': input_path,
+        'output': output_path,
+        'duration': duration,
+        'elapsed': elapsed,
+        'realtime_factor': duration / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _render_to_file(read, sample_rate, source_channels, output_path, settings, subtype):
+    """建立處理器並將渲染結果串流寫入輸出檔
+
+    Returns:
+        int: 輸出的總幀數
+    """
+    import soundfile as sf
+
+    # 與 AudioPlayer 相同: 單聲道複製為立體聲
+    channels = 2 if source_channels == 1 else source_channels
+    processor = build_processor(settings, sample_rate)
+    with sf.SoundFile(output_path, 'w', samplerate=sample_rate, channels=channels, subtype=subtype) as out_file:
+        return render_stream(read, processor, settings, channels, out_file.write)
+
+
+def _copy_source(data, out):
+    """將來源資料複製到區塊緩衝區 (單聲道複製到所有聲道)，超出結尾的部分補零
+
+    Returns:
+        int: 複製的幀數
+    """
+    available = len(data)
+    out[:available] = data
+    out[available:] = 0
+    return available
+
+
+def render_batch(jobs, settings=None, max_workers=None, on_progress=None):
+    """以行程池批次渲染多個檔案
+
+    Args:
+        jobs (list): (來源路徑, 輸出路徑) 列表
+        settings (RenderSettings): 渲染設定
+        max_workers (int): 行程數，None 表示使用 CPU 核心數
+        on_progress (callable): 進度回調 on_progress(completed, total, result)，
+                                失敗時 result 含 'error'
+
+    Returns:
+        dict: {'rendered', 'failed', 'audio_seconds', 'elapsed', 'realtime_factor'}，
+              realtime_factor 為整批的音訊秒數 / 實際經過秒數
+    """
+    settings = settings or RenderSettings()
+    summary = {'rendered': 0, 'failed': 0, 'audio_seconds': 0.0, 'elapsed': 0.0, 'realtime_factor': 0.0}
+    if not jobs:
+        return summary
+
+    started = time.perf_counter()
+    logger.info(f"開始離線渲染: {len(jobs)} 個檔案")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(render_file, input_path, output_path, settings): (input_path, output_path)
+            for input_path, output_path in jobs
+        }
+        for completed, future in enumerate(as_completed(futures), 1):
+            input_path, output_path = futures[future]
+            try:
+                result = future.result()
+                summary['rendered'] += 1
+                summary['audio_seconds'] += result['duration']
+            except Exception as e:
+                logger.warning(f"離線渲染失敗: {input_path} ({e})")
+                result = {'input': input_path, 'output': output_path, 'error': str(e)}
+                summary['failed'] += 1
+
+            if on_progress:
+                on_progress(completed, len(jobs), result)
+
+    summary['elapsed'] = time.perf_counter() - started
+    if summary['elapsed'] > 0:
+        summary['realtime_factor'] = summary['audio_seconds'] / summary['elapsed']
+    logger.info(f"離線渲染完成: {summary}")
+    return summary
+
+
+def _parse_gains(text):
+    """解析以逗號分隔的等化器增益"""
+    try:
+        return tuple(float(value) for value in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"無效的等化器增益: {text}")
+
+
+def main(argv=None):
+    """命令列入口
+
+    Args:
+        argv (list): 命令列參數，None 表示使用 sys.argv
+
+    Returns:
+        int: 結束代碼 (有檔案失敗時為 1)
+    """
+    from src.music.utils.music_equalizer import MusicEqualizer
+
+    presets = [name for name, preset in MusicEqualizer.PRESETS.items() if preset['gains'] is not None]
+    parser = argparse.ArgumentParser(description='以目前的音訊處理設定離線渲染音訊檔案')
+    parser.add_argument('inputs', nargs='+', help='來源音訊檔案')
+    parser.add_argument('-o', '--output-dir', required=True, help='輸出目錄')
+    parser.add_argument('-f', '--format', choices=sorted(OUTPUT_SUBTYPES), default='flac', help='輸出格式')
+    equalizer_group = parser.add_mutually_exclusive_group()
+    equalizer_group.add_argument('--preset', choices=presets, help='等化器預設模式')
+    equalizer_group.add_argument('--eq', type=_parse_gains, help='各頻段增益 (dB)，以逗號分隔')
+    parser.add_argument('--gain-db', type=float, default=0.0, help='響度正規化增益 (dB)')
+    parser.add_argument('--volume', type=float, default=1.0, help='音量 (0.0 - 1.0)')
+    parser.add_argument('--speed', type=float, default=1.0, help='播放速度 (0.5 - 2.0)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='行程數 (預設為 CPU 核心數)')
+    args = parser.parse_args(argv)
+
+    gains = args.eq
+    if args.preset:
+        gains = tuple(MusicEqualizer.PRESETS[args.preset]['gains'])
+    if gains is not None and len(gains) != len(MusicEqualizer.DEFAULT_FREQUENCIES):
+        parser.error(f"等化器需要 {len(MusicEqualizer.DEFAULT_FREQUENCIES)} 個頻段增益")
+
+    settings = RenderSettings(
+        equalizer_gains=gains,
+        replay_gain=10 ** (args.gain_db / 20),
+        speed=args.speed,
+        volume=max(0.0, min(1.0, args.volume)),
+    )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = []
+    for input_path in args.inputs:
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        jobs.append((input_path, os.path.join(args.output_dir, f"{name}.{args.format}")))
+
+    def report(completed, total, result):
+        if 'error' in result:
+            print(f"[{completed}/{total}] 失敗: {result['input']} ({result['error']})", file=sys.stderr)
+        else:
+            print(f"[{completed}/{total}] {result['output']} "
+                  f"({result['duration']:.1f} 秒，{result['realtime_factor']:.1f}x 即時)")
+
+    summary = render_batch(jobs, settings, max_workers=args.workers, on_progress=report)
+    print(f"完成 {summary['rendered']} 個，失敗 {summary['failed']} 個，"
+          f"整體 {summary['realtime_factor']:.1f}x 即時")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""音訊輸出後端模組
+
+AudioPlayer 透過輸出後端開啟串流，後端負責週期性呼叫音訊回調:
+- SoundDeviceBackend: 實際音效卡輸出 (sounddevice / PortAudio)
+- SimulatedOutputBackend: 以模擬時脈驅動回調，輸出送到 sink (丟棄、寫檔或收集)，
+  可比即時更快或依實際時間節拍執行，也可由呼叫端逐區塊推進，
+  讓播放引擎在沒有音效卡的環境 (CI、無頭伺服器) 中可被測試與量測
+"""
+import threading
+import time
+from typing import NamedTuple
+import numpy as np
+from src.core.logger import logger
+
+
+class OutputBackend:
+    """輸出後端基底類別
+
+    子類別需實作 open_stream()，返回具有 start()、stop()、close() 的串流物件。
+    """
+
+    name = 'base'
+
+    def open_stream(self, samplerate, channels, blocksize, callback, latency=None):
+        """開啟輸出串流 (尚未開始)
+
+        Args:
+            samplerate (int): 採樣率
+            channels (int): 聲道數
+            blocksize (int): 每次回調的幀數
+            callback (callable): callback(outdata, frames, time_info, status)
+            latency: 裝置延遲設定 ('low'、'high' 或秒數)，None 表示裝置預設值
+
+        Returns:
+            串流物件
+        """
+        raise NotImplementedError
+
+
+class SoundDeviceBackend(OutputBackend):
+    """sounddevice 輸出後端 (實際音效卡)"""
+
+    name = 'sounddevice'
+
+    def open_stream(self, samplerate, channels, blocksize, callback, latency=None):
+        import sounddevice as sd
+        options = {}
+        if latency is not None:
+            options['latency'] = latency
+        return sd.OutputStream(
+            samplerate=samplerate,
+            channels=channels,
+            callback=callback,
+            blocksize=blocksize,
+            dtype='float32',
+            **options
+        )
+
+
+class SimulatedTimeInfo(NamedTuple):
+    """模擬的回調時間資訊 (欄位名稱與 sounddevice 相同)"""
+    currentTime: float
+    outputBufferDacTime: float
+
+
+class NullSink:
+    """丟棄所有輸出的 sink"""
+
+    def open(self, samplerate, channels):
+        """串流開始時呼叫"""
+
+    def write(self, block):
+        """接收一個輸出區塊"""
+
+    def close(self):
+        """串流關閉時呼叫"""
+
+
+class ArraySink(NullSink):
+    """將輸出收集在記憶體中的 sink (測試用)"""
+
+    def __init__(self):
+        self.samplerate = None
+        self._blocks = []
+
+    def open(self, samplerate, channels):
+        self.samplerate = samplerate
+
+    def write(self, block):
+        self._blocks.append(block.copy())
+
+    def get_audio(self):
+        """取得目前收集到的所有輸出
+
+        Returns:
+            np.ndarray: shape 為 (frames, channels)，尚無輸出時為 None
+        """
+        if not self._blocks:
+            return None
+        return np.concatenate(self._blocks)
+
+
+class FileSink(NullSink):
+    """將輸出寫入音訊檔案的 sink (WAV / FLAC，依副檔名決定)"""
+
+    def __init__(self, path, subtype=None):
+        """初始化檔案 sink
+
+        Args:
+            path (str): 輸出檔案路徑
+            subtype (str): soundfile 樣本格式，None 表示使用該格式的預設值
+        """
+        self.path = path
+        self.subtype = subtype
+        self._file = None
+
+    def open(self, samplerate, channels):
+        import soundfile as sf
+        self._file = sf.SoundFile(self.path, 'w', samplerate=samplerate, channels=channels, subtype=self.subtype)
+
+    def write(self, block):
+        if self._file is not None:
+            self._file.write(block)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SimulatedOutputStream:
+    """由模擬時脈驅動回調的輸出串流
+
+    時脈以已輸出的幀數計算 (frames / samplerate)，與實際經過時間無關，
+    因此在 'manual' 與 'fast' 模式下結果完全可重現。
+
+    節拍模式:
+    - 'manual': 不建立線程，由呼叫端以 advance() 逐區塊推進
+    - 'fast': 背景線程連續執行回調，不等待 (比即時更快)
+    - 'realtime': 背景線程依實際時間節拍執行，模擬真實裝置
+    """
+
+    PACING_MODES = ('manual', 'fast', 'realtime')
+
+    def __init__(self, samplerate, channels, blocksize, callback, sink=None, pacing='manual'):
+        """初始化模擬串流
+
+        Args:
+            samplerate (int): 採樣率
+            channels (int): 聲道數
+            blocksize (int): 每次回調的幀數
+            callback (callable): callback(outdata, frames, time_info, status)
+            sink: 輸出 sink，None 表示丟棄輸出
+            pacing (str): 節拍模式 ('manual'、'fast' 或 'realtime')
+
+        Raises:
+            ValueError: 不支援的節拍模式
+        """
+        if pacing not in self.PACING_MODES:
+            raise ValueError(f"不支援的節拍模式: {pacing}")
+
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.callback = callback
+        self.sink = sink if sink is not None else NullSink()
+        self.pacing = pacing
+
+        self.frames = 0  # 已輸出的幀數 (模擬時脈)
+        self.active = False
+        self.closed = False
+
+        # 回調耗時統計 (秒)
+        self.callback_count = 0
+        self.callback_seconds = 0.0
+        self.max_callback_seconds = 0.0
+        self.overruns = 0  # 回調耗時超過區塊長度的次數 (真實裝置上會造成斷音)
+
+        self._outdata = np.zeros((blocksize, channels), dtype=np.float32)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._sink_opened = False
+
+    @property
+    def time(self):
+        """模擬時脈 (秒)"""
+        return self.frames / self.samplerate
+
+    @property
+    def block_seconds(self):
+        """每個區塊的長度，即回調的時間預算 (秒)"""
+        return self.blocksize / self.samplerate
+
+    def start(self):
+        """開始串流 (非 manual 模式時啟動背景線程)"""
+        if self.closed:
+            raise RuntimeError("串流已關閉")
+        if self.active:
+            return
+        if not self._sink_opened:
+            self.sink.open(self.samplerate, self.channels)
+            self._sink_opened = True
+
+        self.active = True
+        self._stop_event.clear()
+        if self.pacing != 'manual':
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止串流 (等待背景線程結束)"""
+        self.active = False
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def close(self):
+        """關閉串流與 sink"""
+        self.stop()
+        if self._sink_opened:
+            self.sink.close()
+            self._sink_opened = False
+        self.closed = True
+
+    def advance(self, blocks=1):
+        """推進指定數量的區塊 (manual 模式使用)
+
+        Args:
+            blocks (int): 區塊數
+
+        Returns:
+            int: 實際執行的區塊數 (串流未啟動時為 0)
+        """
+        count = 0
+        while count < blocks and self.active:
+            self._run_block()
+            count += 1
+        return count
+
+    def advance_seconds(self, seconds):
+        """推進指定的模擬時間 (不足一個區塊時進位)
+
+        Args:
+            seconds (float): 模擬秒數
+
+        Returns:
+            int: 實際執行的區塊數
+        """
+        return self.advance(int(np.ceil(seconds * self.samplerate / self.blocksize)))
+
+    def get_stats(self):
+        """取得回調耗時統計
+
+        Returns:
+            dict: {'callbacks', 'mean_seconds', 'max_seconds', 'overruns', 'budget_seconds'}
+        """
+        count = self.callback_count
+        return {
+            'callbacks': count,
+            'mean_seconds': self.callback_seconds / count if count else 0.0,
+            'max_seconds': self.max_callback_seconds,
+            'overruns': self.overruns,
+            'budget_seconds': self.block_seconds,
+        }
+
+    def _run(self):
+        """背景線程: 依節拍模式連續執行回調"""
+        started = time.perf_counter()
+        start_frames = self.frames
+        while not self._stop_event.is_set():
+            self._run_block()
+            if self.pacing == 'realtime':
+                # 等到模擬時脈對應的實際時間
+                due = started + (self.frames - start_frames) / self.samplerate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+
+    def _run_block(self):
+        """執行一次回調並將輸出送到 sink"""
+        outdata = self._outdata
+        now = self.time
+        time_info = SimulatedTimeInfo(currentTime=now, outputBufferDacTime=now + self.block_seconds)
+
+        started = time.perf_counter()
+        try:
+            self.callback(outdata, self.blocksize, time_info, None)
+        except Exception as e:
+            logger.error(f"模擬輸出回調失敗: {e}")
+            outdata.fill(0)
+        elapsed = time.perf_counter() - started
+
+        self.callback_count += 1
+        self.callback_seconds += elapsed
+        self.max_callback_seconds = max(self.max_callback_seconds, elapsed)
+        if elapsed > self.block_seconds:
+            self.overruns += 1
+
+        self.sink.write(outdata)
+        self.frames += self.blocksize
+
+
+class SimulatedOutputBackend(OutputBackend):
+    """模擬輸出後端 (不需要音效卡)
+
+    每次 open_stream() 建立一個 SimulatedOutputStream；
+    所有串流共用同一個 sink，因此換曲前後的輸出會接續在一起，可用來檢查無縫播放。
+    """
+
+    name = 'simulated'
+
+    def __init__(self, sink=None, pacing='manual'):
+        """初始化模擬輸出後端
+
+        Args:
+            sink: 輸出 sink (NullSink、ArraySink、FileSink)，None 表示丟棄輸出
+            pacing (str): 節拍模式 ('manual'、'fast' 或 'realtime')
+        """
+        if pacing not in SimulatedOutputStream.PACING_MODES:
+            raise ValueError(f"不支援的節拍模式: {pacing}")
+        self.sink = sink if sink is not None else NullSink()
+        self.pacing = pacing
+        self.streams = []
+        self._sink_opened = False
+
+    @property
+    def stream(self):
+        """最近開啟的串流 (尚未開啟時為 None)"""
+        return self.streams[-1] if self.streams else None
+
+    def open_stream(self, samplerate, channels, blocksize, callback, latency=None):
+        # 模擬串流沒有裝置緩衝，延遲設定只影響區塊大小 (由呼叫端決定)
+        stream = SimulatedOutputStream(
+            samplerate, channels, blocksize, callback,
+            sink=_SharedSink(self),
+            pacing=self.pacing
+        )
+        self.streams.append(stream)
+        return stream
+
+    def advance(self, blocks=1):
+        """推進最近開啟的串流 (manual 模式使用)
+
+        Args:
+            blocks (int): 區塊數
+
+        Returns:
+            int: 實際執行的區塊數
+        """
+        stream = self.stream
+        return stream.advance(blocks) if stream is not None else 0
+
+    def close(self):
+        """關閉共用的 sink (例如完成輸出檔案)"""
+        for stream in self.streams:
+            stream.close()
+        if self._sink_opened:
+            self.sink.close()
+            self._sink_opened = False
+
+    def _open_sink(self, samplerate, channels):
+        """第一個串流開始時開啟 sink"""
+        if not self._sink_opened:
+            self.sink.open(samplerate, channels)
+            self._sink_opened = True
+
+
+class _SharedSink(NullSink):
+    """讓多個串流共用後端的 sink: 只轉發寫入，開啟與關閉由後端負責"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def open(self, samplerate, channels):
+        self._backend._open_sink(samplerate, channels)
+
+    def write(self, block):
+        self._backend.sink.write(block)
@@ -0,0 +1,393 @@
+"""解碼後 PCM 磁碟快取模組
+
+將解碼後的音訊以原始 float32 或 int16 檔案儲存，
+之後播放同一首歌時直接以 numpy.memmap 讀取，不需要再次解碼。
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+from src.core.constants import PCM_CACHE_MAX_BYTES
+from src.core.logger import logger
+
+# float32 換算為 int16 的比例 (寫入時乘上此值)
+INT16_MAX = 32767.0
+
+# int16 樣本換算為 float32 的比例 (讀取時乘上此值)，與寫入使用同一個比例
+INT16_SCALE = 1.0 / INT16_MAX
+
+
+def encode_int16(audio_data):
+    """將 float32 音訊轉為 int16 (超出 [-1, 1] 的部分先限制範圍)
+
+    Args:
+        audio_data (np.ndarray): float32 音訊數據
+
+    Returns:
+        np.ndarray: int16 連續陣列，shape 與輸入相同
+    """
+    scaled = np.clip(audio_data, -1.0, 1.0) * INT16_MAX
+    return np.rint(scaled).astype(np.int16)
+
+
+class PCMCache:
+    """解碼後 PCM 的磁碟快取
+
+    功能:
+    - 以 (絕對路徑, 修改時間, 檔案大小) 作為快取鍵，來源檔案變更後自動失效
+    - 每個項目由原始 PCM 資料檔 (.pcm) 與描述格式的標頭檔 (.json) 組成
+    - 讀取時返回唯讀 numpy.memmap，播放與跳轉只讀取需要的頁面
+    - 總大小超過上限時依最近使用時間 (資料檔 mtime) 淘汰
+    - 背景預熱: 依序解碼播放清單中尚未快取的歌曲
+    """
+
+    # 支援的儲存格式
+    SUPPORTED_DTYPES = ('float32', 'int16')
+
+    DATA_SUFFIX = '.pcm'
+    HEADER_SUFFIX = '.json'
+
+    def __init__(self, cache_dir, max_bytes=PCM_CACHE_MAX_BYTES, dtype='float32'):
+        """初始化 PCM 快取
+
+        Args:
+            cache_dir (str): 快取目錄
+            max_bytes (int): 快取總大小上限 (bytes)
+            dtype (str): 儲存格式，'float32' (無轉換成本) 或 'int16' (佔用空間減半)
+
+        Raises:
+            ValueError: 不支援的儲存格式
+        """
+        if dtype not in self.SUPPORTED_DTYPES:
+            raise ValueError(f"不支援的 PCM 快取格式: {dtype}")
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+
+        self._lock = threading.Lock()
+        self._writing = set()  # 正在寫入的快取鍵 (播放與預熱可能同時寫入同一首)
+
+        # 背景預熱
+        self._warm_up_queue = []
+        self._warm_up_decoder = None
+        self._warm_up_thread = None
+        self._warm_up_cancel = threading.Event()
+
+    def make_key(self, file_path):
+        """計算來源檔案的快取鍵
+
+        Args:
+            file_path (str): 來源音訊檔案路徑
+
+        Returns:
+            str: 快取鍵，檔案不存在時返回 None
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        identity = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def contains(self, file_path):
+        """檢查來源檔案是否已有快取
+
+        Args:
+            file_path (str): 來源音訊檔案路徑
+
+        Returns:
+            bool: 已快取時返回 True
+        """
+        key = self.make_key(file_path)
+        return key is not None and os.path.exists(self._header_path(key))
+
+    def get(self, file_path):
+        """讀取快取的 PCM 資料
+
+        Args:
+            file_path (str): 來源音訊檔案路徑
+
+        Returns:
+            tuple: (audio_data, sample_rate)，audio_data 為 shape (frames, channels)
+                   的唯讀 memmap；未命中時返回 None
+        """
+        key = self.make_key(file_path)
+        if key is None:
+            return None
+
+        header_path = self._header_path(key)
+        data_path = self._data_path(key)
+        try:
+            with open(header_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+
+            audio_data = np.memmap(
+                data_path,
+                dtype=header['dtype'],
+                mode='r',
+                shape=(header['frames'], header['channels'])
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"PCM 快取項目損毀，已移除: {e}")
+            self._remove_entry(key)
+            return None
+
+        # 更新最近使用時間 (LRU)
+        try:
+            os.utime(data_path, None)
+        except OSError:
+            pass
+
+        logger.info(f"PCM 快取命中: {file_path}")
+        return audio_data, header['sample_rate']
+
+    def put(self, file_path, audio_data, sample_rate):
+        """將解碼後的音訊寫入快取
+
+        Args:
+            file_path (str): 來源音訊檔案路徑
+            audio_data (np.ndarray): float32 音訊數據，shape 為 (frames, channels)
+            sample_rate (int): 採樣率
+
+        Returns:
+            bool: 成功寫入返回 True
+        """
+        key = self.make_key(file_path)
+        if key is None or audio_data is None or len(audio_data) == 0:
+            return False
+
+        data_path = self._data_path(key)
+        header_path = self._header_path(key)
+        header = {
+            'source': os.path.abspath(file_path),
+            'sample_rate': int(sample_rate),
+            'frames': int(audio_data.shape[0]),
+            'channels': int(audio_data.shape[1]),
+            'dtype': self.dtype
+        }
+
+        with self._lock:
+            if key in self._writing:
+                # 另一個線程正在寫入同一個項目
+                return False
+            self._writing.add(key)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # 先寫入暫存檔再改名，避免讀到寫到一半的資料
+            self._write_atomic(key, data_path, self._encode(audio_data).tofile)
+
+            # 標頭最後寫入，標頭存在即代表項目完整
+            self._write_atomic(key, header_path, lambda f: f.write(json.dumps(header).encode('utf-8')))
+        except Exception as e:
+            logger.error(f"寫入 PCM 快取失敗: {e}")
+            self._remove_entry(key)
+            return False
+        finally:
+            with self._lock:
+                self._writing.discard(key)
+
+        logger.info(f"已快取 PCM: {file_path}")
+        self.enforce_limit(keep=key)
+        return True
+
+    def put_async(self, file_path, audio_data, sample_rate):
+        """在背景線程寫入快取 (不延遲播放開始)
+
+        Args:
+            file_path (str): 來源音訊檔案路徑
+            audio_data (np.ndarray): float32 音訊數據，shape 為 (frames, channels)
+            sample_rate (int): 採樣率
+
+        Returns:
+            threading.Thread: 寫入線程
+        """
+        thread = threading.Thread(
+            target=self.put,
+            args=(file_path, audio_data, sample_rate),
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def enforce_limit(self, keep=None):
+        """淘汰最久未使用的項目直到總大小不超過上限
+
+        Args:
+            keep (str): 不淘汰的快取鍵 (剛寫入的項目)
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for key in self._list_keys():
+                try:
+                    stat = os.stat(self._data_path(key))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, key))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, key in entries:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                # 正在播放 (已映射) 的檔案在部分平台無法刪除，略過即可
+                if self._remove_entry(key):
+                    total -= size
+
+    def get_total_size(self):
+        """取得快取資料總大小
+
+        Returns:
+            int: 總大小 (bytes)
+        """
+        total = 0
+        for key in self._list_keys():
+            try:
+                total += os.path.getsize(self._data_path(key))
+            except OSError:
+                pass
+        return total
+
+    def clear(self):
+        """清除所有快取項目"""
+        with self._lock:
+            for key in self._list_keys():
+                self._remove_entry(key)
+
+    def warm_up(self, file_paths, decoder):
+        """在背景解碼並快取尚未快取的歌曲
+
+        新的呼叫會取代尚未處理的清單 (例如切換播放清單時)。
+
+        Args:
+            file_paths (list): 來源音訊檔案路徑 (依優先順序)
+            decoder (callable): 解碼函數，接受路徑並返回 (audio_data, sample_rate)
+        """
+        with self._lock:
+            self._warm_up_queue = list(file_paths)
+            self._warm_up_decoder = decoder
+            self._warm_up_cancel.clear()
+            if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+                return
+            self._warm_up_thread = threading.Thread(target=self._warm_up_worker, daemon=True)
+            self._warm_up_thread.start()
+
+    def cancel_warm_up(self):
+        """取消背景預熱"""
+        with self._lock:
+            self._warm_up_queue = []
+        self._warm_up_cancel.set()
+
+    def wait_for_warm_up(self, timeout=None):
+        """等待背景預熱完成
+
+        Args:
+            timeout (float): 最長等待時間 (秒)，None 表示一直等待
+
+        Returns:
+            bool: 預熱已完成返回 True
+        """
+        thread = self._warm_up_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _warm_up_worker(self):
+        """背景預熱工作線程"""
+        while not self._warm_up_cancel.is_set():
+            with self._lock:
+                if not self._warm_up_queue:
+                    self._warm_up_thread = None
+                    return
+                file_path = self._warm_up_queue.pop(0)
+                decoder = self._warm_up_decoder
+
+            if self.contains(file_path):
+                continue
+            try:
+                audio_data, sample_rate = decoder(file_path)
+                self.put(file_path, audio_data, sample_rate)
+            except Exception as e:
+                logger.warning(f"預熱 PCM 快取失敗: {file_path} ({e})")
+
+    def _encode(self, audio_data):
+        """將 float32 音訊轉為儲存格式
+
+        Args:
+            audio_data (np.ndarray): float32 音訊數據
+
+        Returns:
+            np.ndarray: 儲存格式的連續陣列
+        """
+        if self.dtype == 'int16':
+            return encode_int16(audio_data)
+        return np.ascontiguousarray(audio_data, dtype=np.float32)
+
+    def _write_atomic(self, key, target_path, write):
+        """寫入此寫入者專用的暫存檔後改名為目標檔案
+
+        Args:
+            key (str): 快取鍵 (暫存檔名稱前綴)
+            target_path (str): 目標檔案路徑
+            write (callable): 接受以二進位模式開啟的檔案並寫入內容
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=key + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _list_keys(self):
+        """列出快取目錄中所有資料檔的快取鍵
+
+        Returns:
+            list: 快取鍵列表 (目錄不存在時為空)
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        suffix = self.DATA_SUFFIX
+        return [name[:-len(suffix)] for name in names if name.endswith(suffix)]
+
+    def _data_path(self, key):
+        """取得資料檔路徑"""
+        return os.path.join(self.cache_dir, key + self.DATA_SUFFIX)
+
+    def _header_path(self, key):
+        """取得標頭檔路徑"""
+        return os.path.join(self.cache_dir, key + self.HEADER_SUFFIX)
+
+    def _remove_entry(self, key):
+        """刪除快取項目
+
+        Returns:
+            bool: 資料檔已刪除 (或原本就不存在) 時返回 True
+        """
+        try:
+            # 先刪除標頭，讓項目立即視為未快取
+            if os.path.exists(self._header_path(key)):
+                os.remove(self._header_path(key))
+            if os.path.exists(self._data_path(key)):
+                os.remove(self._data_path(key))
+            return True
+        except OSError as e:
+            logger.debug(f"無法刪除 PCM 快取項目 {key}: {e}")
+            return False
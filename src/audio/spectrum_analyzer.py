@@ -0,0 +1,299 @@
+"""頻譜分析模組
+
+音訊回調把處理後的樣本複製到無鎖環形緩衝區 (只做一次記憶體複製)，
+低優先權的背景線程以固定的最高畫面更新率計算加窗 FFT，
+合併為與等化器相同中心頻率的對數頻段，並發布頻段電平與各聲道的 RMS / 峰值，
+供播放檢視繪製頻譜與音量表。
+"""
+import math
+import threading
+import time
+from typing import NamedTuple
+import numpy as np
+from src.audio.equalizer_filter import EqualizerFilter
+
+
+class SampleRing:
+    """單一寫入者 / 單一讀取者的樣本環形緩衝區
+
+    寫入端 (音訊回調) 先複製資料再更新 write_index；
+    讀取端依 write_index 複製最新的資料，複製期間若被寫入端覆蓋則放棄這次讀取。
+    """
+
+    def __init__(self, capacity, channels=2):
+        """初始化環形緩衝區
+
+        Args:
+            capacity (int): 容量 (幀數)
+            channels (int): 聲道數 (寫入的區塊聲道較多時只保留前面的聲道，單聲道則複製到所有聲道)
+        """
+        self.channels = channels
+        self._buffer = np.zeros((capacity, channels), dtype=np.float32)
+        self.write_index = 0  # 已寫入的總幀數 (只由寫入端更新)
+
+    @property
+    def capacity(self):
+        """容量 (幀數)"""
+        return len(self._buffer)
+
+    def write(self, block):
+        """寫入一個區塊 (音訊回調呼叫，只做記憶體複製)
+
+        Args:
+            block (np.ndarray): 音訊區塊，shape 為 (frames, channels)
+        """
+        buffer = self._buffer
+        capacity = len(buffer)
+        count = len(block)
+        if count > capacity:
+            block = block[count - capacity:]
+            count = capacity
+
+        # 單聲道區塊以廣播寫入所有聲道，其餘只寫入共同的聲道
+        channels = self.channels if block.shape[1] == 1 else min(self.channels, block.shape[1])
+        block = block[:, :channels]
+        position = self.write_index % capacity
+        first = min(count, capacity - position)
+        buffer[position:position + first, :channels] = block[:first]
+        if count > first:
+            buffer[:count - first, :channels] = block[first:count]
+        self.write_index += count
+
+    def read_latest(self, out):
+        """複製最新的 len(out) 幀
+
+        Args:
+            out (np.ndarray): 目標緩衝區，shape 為 (frames, channels)
+
+        Returns:
+            bool: 成功返回 True；資料不足或讀取期間被覆蓋時返回 False
+        """
+        buffer = self._buffer
+        capacity = len(buffer)
+        frames = len(out)
+        end = self.write_index
+        if end < frames or frames > capacity:
+            return False
+
+        start = end - frames
+        position = start % capacity
+        first = min(frames, capacity - position)
+        out[:first] = buffer[position:position + first]
+        if frames > first:
+            out[first:] = buffer[:frames - first]
+
+        # 寫入端在複製期間繞過讀取起點: 資料可能混雜，放棄這次讀取
+        return self.write_index - start <= capacity
+
+    def clear(self):
+        """清除資料 (只能在寫入端停止時呼叫)"""
+        self._buffer.fill(0)
+        self.write_index = 0
+
+
+class SpectrumFrame(NamedTuple):
+    """一次頻譜分析結果 (發布後不再修改)"""
+    frequencies: tuple  # 各頻段中心頻率 (Hz)
+    bands: np.ndarray  # 各頻段電平 (dB，滿刻度正弦波為 0 dB)
+    rms: np.ndarray  # 各聲道 RMS (dBFS)
+    peak: np.ndarray  # 各聲道峰值 (dBFS)
+    timestamp: float  # time.perf_counter() 的值
+
+
+class SpectrumAnalyzer:
+    """即時頻譜與音量分析器
+
+    write() 由音訊回調呼叫；start() 啟動的背景線程以最多 frame_rate 次/秒的頻率分析，
+    UI 以 get_latest() 讀取最新的 SpectrumFrame (原子替換的參照，不需要鎖)。
+    """
+
+    # FFT 長度 (幀數)
+    FFT_SIZE = 4096
+
+    # 最高分析頻率 (次/秒)
+    FRAME_RATE = 30
+
+    # 電平下限 (dB)
+    FLOOR_DB = -90.0
+
+    def __init__(self, sample_rate=44100, frequencies=None, fft_size=FFT_SIZE,
+                 frame_rate=FRAME_RATE, channels=2):
+        """初始化頻譜分析器
+
+        Args:
+            sample_rate (int): 採樣率 (Hz)
+            frequencies (list): 頻段中心頻率，預設與等化器相同
+            fft_size (int): FFT 長度
+            frame_rate (float): 最高分析頻率 (次/秒)
+            channels (int): 聲道數
+        """
+        self.frequencies = tuple(frequencies or EqualizerFilter.DEFAULT_FREQUENCIES)
+        self.fft_size = fft_size
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_rate = sample_rate
+
+        self.ring = SampleRing(fft_size * 4, channels)
+        self._window = np.hanning(fft_size).astype(np.float32)
+        # 將 |X|^2 換算為均方值 (單邊頻譜)，再以滿刻度正弦波 (均方值 0.5) 為 0 dB
+        self._power_scale = 2.0 / (fft_size * float(np.sum(self._window.astype(np.float64) ** 2))) / 0.5
+        self._samples = np.zeros((fft_size, channels), dtype=np.float32)
+        self._band_layout = None  # (採樣率, 起始 bin, 結束 bin, 各頻段起點偏移)
+
+        self._latest = None
+        self._active = True
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ---------- 音訊線程 ----------
+
+    def write(self, block):
+        """複製處理後的樣本 (音訊回調呼叫)
+
+        Args:
+            block (np.ndarray): 音訊區塊，shape 為 (frames, channels)
+        """
+        self.ring.write(block)
+
+    # ---------- 控制端 ----------
+
+    def set_sample_rate(self, sample_rate):
+        """設定採樣率 (換曲時呼叫，背景線程在下一次分析時重新計算頻段)
+
+        Args:
+            sample_rate (int): 採樣率 (Hz)
+        """
+        self.sample_rate = sample_rate
+
+    def set_active(self, active):
+        """暫停或恢復分析 (例如視窗隱藏時暫停以節省 CPU)
+
+        Args:
+            active (bool): True 表示分析
+        """
+        self._active = bool(active)
+
+    def start(self):
+        """啟動背景分析線程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='SpectrumAnalyzer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止背景分析線程"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=1.0)
+        self._thread = None
+
+    def is_running(self):
+        """檢查背景線程是否執行中
+
+        Returns:
+            bool: 執行中返回 True
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_latest(self):
+        """取得最新的分析結果
+
+        Returns:
+            SpectrumFrame: 分析結果，尚未分析過時返回 None
+        """
+        return self._latest
+
+    def analyze(self, samples):
+        """分析一段樣本
+
+        Args:
+            samples (np.ndarray): 音訊數據，shape 為 (fft_size, channels)
+
+        Returns:
+            SpectrumFrame: 分析結果
+        """
+        floor = self.FLOOR_DB
+
+        # 各聲道 RMS 與峰值
+        rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64), axis=0))
+        peak = np.max(np.abs(samples), axis=0).astype(np.float64)
+        rms_db = self._to_db(rms, 20.0)
+        peak_db = self._to_db(peak, 20.0)
+
+        # 混為單聲道後加窗 FFT
+        mono = samples.mean(axis=1) * self._window
+        power = np.abs(np.fft.rfft(mono)) ** 2 * self._power_scale
+
+        # 合併為對數頻段
+        _, low_bin, high_bin, offsets = self._get_band_layout()
+        band_power = np.add.reduceat(power[low_bin:high_bin], offsets)
+        bands = np.maximum(self._to_db(band_power, 10.0), floor)
+
+        return SpectrumFrame(
+            frequencies=self.frequencies,
+            bands=bands,
+            rms=np.maximum(rms_db, floor),
+            peak=np.maximum(peak_db, floor),
+            timestamp=time.perf_counter()
+        )
+
+    def _run(self):
+        """背景線程: 有新資料時以最多 frame_rate 次/秒分析"""
+        interval = 1.0 / self.frame_rate
+        last_index = -1
+        while not self._stop_event.wait(interval):
+            if not self._active:
+                continue
+            index = self.ring.write_index
+            if index == last_index:
+                # 沒有新資料 (暫停或停止播放)
+                continue
+            if not self.ring.read_latest(self._samples):
+                continue
+            last_index = index
+            self._latest = self.analyze(self._samples)
+
+    def _get_band_layout(self):
+        """取得目前採樣率的頻段 bin 配置 (採樣率改變時重新計算)
+
+        頻段邊界為相鄰中心頻率的幾何平均，每個頻段至少包含一個 bin。
+
+        Returns:
+            tuple: (採樣率, 起始 bin, 結束 bin, 各頻段相對起始 bin 的偏移)
+        """
+        sample_rate = self.sample_rate
+        layout = self._band_layout
+        if layout is not None and layout[0] == sample_rate:
+            return layout
+
+        centers = self.frequencies
+        nyquist_bin = self.fft_size // 2
+        bin_hz = sample_rate / self.fft_size
+
+        edges = [centers[0] / math.sqrt(centers[1] / centers[0])]
+        edges += [math.sqrt(low * high) for low, high in zip(centers, centers[1:])]
+        edges.append(centers[-1] * math.sqrt(centers[-1] / centers[-2]))
+
+        starts = []
+        previous = 0
+        for edge in edges[:-1]:
+            start = max(previous, int(math.ceil(edge / bin_hz)))
+            if starts and start <= starts[-1]:
+                start = starts[-1] + 1
+            # 超過 Nyquist 頻率的頻段只能顯示最高的 bin
+            start = min(start, nyquist_bin)
+            starts.append(start)
+            previous = start
+        high_bin = max(starts[-1] + 1, min(nyquist_bin + 1, int(math.ceil(edges[-1] / bin_hz))))
+
+        low_bin = starts[0]
+        offsets = np.array([start - low_bin for start in starts], dtype=np.intp)
+        self._band_layout = (sample_rate, low_bin, high_bin, offsets)
+        return self._band_layout
+
+    @staticmethod
+    def _to_db(values, factor):
+        """轉換為 dB (零值以極小值代替)"""
+        return factor * np.log10(np.maximum(values, 1e-12))
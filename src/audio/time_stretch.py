@@ -0,0 +1,359 @@
+"""串流時間伸縮模組
+
+使用 WSOLA (Waveform Similarity Overlap-Add) 演算法逐區塊調整播放速度，
+不改變音高、延遲固定，且可以在播放中隨時改變速度。
+"""
+import math
+import numpy as np
+
+
+class TimeStretcher:
+    """WSOLA 串流時間伸縮器
+
+    以拉動 (pull) 方式運作: 每個區塊先呼叫 input_frames_needed() 詢問
+    產生 N 幀輸出需要多少輸入幀，讀取該數量的來源後再呼叫 process()，
+    即可得到恰好 N 幀輸出。
+
+    狀態:
+    - bypass: 速度為 1.0 且沒有殘留資料，呼叫端直接複製來源即可
+    - stretching: 以 WSOLA 產生輸出
+    - draining: 速度恢復為 1.0 後，先輸出緩衝區內的殘留資料，
+                與來源逐幀對齊後回到 bypass (無跳音)
+    """
+
+    # 速度範圍
+    MIN_SPEED = 0.5
+    MAX_SPEED = 2.0
+
+    # 分析窗長度與對齊搜尋範圍 (秒)
+    FRAME_SECONDS = 0.025
+    TOLERANCE_SECONDS = 0.006
+
+    _BYPASS = 'bypass'
+    _STRETCHING = 'stretching'
+    _DRAINING = 'draining'
+
+    def __init__(self, sample_rate=44100, channels=2):
+        """初始化時間伸縮器
+
+        Args:
+            sample_rate (int): 採樣率 (Hz)，預設 44100
+            channels (int): 聲道數，預設 2 (處理時若不同會自動重新配置)
+        """
+        self.sample_rate = sample_rate
+        self.speed = 1.0
+
+        # 分析窗長度 (偶數)、合成步長 (50% 重疊) 與對齊搜尋範圍
+        self.frame_length = max(64, int(sample_rate * self.FRAME_SECONDS) // 2 * 2)
+        self.hop = self.frame_length // 2
+        self.tolerance = max(1, int(sample_rate * self.TOLERANCE_SECONDS))
+
+        # periodic Hann 窗在 50% 重疊時總和恰為 1
+        n = np.arange(self.frame_length)
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * n / self.frame_length)).astype(np.float32)
+        self._window_column = self._window[:, np.newaxis]  # 以廣播套用到各聲道
+
+        self._channels = 0
+        self._input = None  # 尚未消耗的輸入 (FIFO)
+        self._output = None  # 已合成但尚未輸出的資料 (FIFO)
+        self._acc = None  # 重疊相加累加器
+        self._scratch = None  # 加窗後的分析窗 (避免在音訊回調中配置記憶體)
+        self._allocate(channels)
+        self.reset()
+
+    def set_speed(self, speed):
+        """設定播放速度 (下一個區塊生效)
+
+        Args:
+            speed (float): 播放速度 (0.5 - 2.0)
+        """
+        self.speed = max(self.MIN_SPEED, min(self.MAX_SPEED, float(speed)))
+
+    def get_speed(self):
+        """取得播放速度
+
+        Returns:
+            float: 播放速度
+        """
+        return self.speed
+
+    def reset(self):
+        """清除所有緩衝資料並回到 bypass 狀態 (跳轉或換曲時呼叫)"""
+        self._state = self._BYPASS
+        self._input_len = 0
+        self._output_len = 0
+        self._analysis_pos = 0.0  # 下一個分析窗的名目位置 (相對於輸入 FIFO)
+        self._prev_pos = None  # 上一個分析窗的實際位置
+        self._resume_pos = 0  # draining 時下一個直接輸出的輸入位置
+        self._finishing = False  # 下一個分析窗使用自然延續位置並轉為 draining
+        self._block_speed = 1.0
+        self._acc.fill(0)
+
+    def is_engaged(self):
+        """檢查伸縮器是否需要參與處理
+
+        Returns:
+            bool: 速度不為 1.0 或仍有殘留資料時返回 True
+        """
+        return self._state != self._BYPASS or self._is_stretch_speed(self.speed)
+
+    def max_input_frames(self, frames):
+        """計算單一區塊最多可能需要的輸入幀數 (供呼叫端預先配置緩衝區)
+
+        Args:
+            frames (int): 輸出幀數
+
+        Returns:
+            int: 輸入幀數上限
+        """
+        iterations = math.ceil(frames / self.hop) + 1
+        return int(iterations * self.hop * self.MAX_SPEED) + 2 * self.frame_length + 2 * self.tolerance
+
+    def input_frames_needed(self, frames):
+        """開始一個區塊: 計算產生指定輸出幀數所需的輸入幀數
+
+        每次呼叫後必須接著以相同幀數呼叫 process()。
+
+        Args:
+            frames (int): 輸出幀數
+
+        Returns:
+            int: 需要讀取並傳給 process() 的輸入幀數
+        """
+        speed = self.speed
+        self._block_speed = speed
+        stretch = self._is_stretch_speed(speed)
+
+        if self._state == self._BYPASS:
+            if not stretch:
+                return frames
+            self._state = self._STRETCHING
+        elif self._state == self._DRAINING and stretch:
+            # 再次變速: 從目前對齊的位置重新開始伸縮
+            self._discard_input(self._resume_pos)
+            self._analysis_pos = 0.0
+            self._prev_pos = None
+            self._acc.fill(0)
+            self._state = self._STRETCHING
+
+        if self._state == self._DRAINING:
+            direct = self._input_len - self._resume_pos
+            return max(0, frames - self._output_len - direct)
+
+        if not stretch and self._prev_pos is not None:
+            # 以自然延續位置合成最後一個分析窗，之後直接輸出來源
+            natural = self._prev_pos + self.hop
+            resume = natural + self.hop
+            required = max(
+                natural + self.frame_length,
+                resume + frames - self._output_len - self.hop
+            )
+            return max(0, required - self._input_len)
+
+        iterations = math.ceil(max(0, frames - self._output_len) / self.hop)
+        if iterations == 0:
+            return 0
+
+        analysis_hop = speed * self.hop
+        last = self._analysis_pos + (iterations - 1) * analysis_hop
+        required = self._round(last) + self.tolerance + self.frame_length
+        if iterations >= 2:
+            previous = self._round(last - analysis_hop) + self.tolerance
+        else:
+            previous = self._prev_pos
+        if previous is not None:
+            required = max(required, previous + self.hop + self.frame_length)
+        return max(0, required - self._input_len)
+
+    def process(self, input_block, out):
+        """附加輸入並產生恰好 len(out) 幀輸出
+
+        Args:
+            input_block (np.ndarray): 輸入音訊，shape 為 (frames, channels)，
+                                      幀數應等於 input_frames_needed() 的返回值
+            out (np.ndarray): 輸出緩衝區，shape 為 (frames, channels)
+        """
+        frames = len(out)
+        self._ensure_channels(out.shape[1])
+        self._append_input(input_block)
+
+        if self._state == self._BYPASS:
+            # 未參與伸縮: 直接複製
+            count = min(frames, self._input_len)
+            out[:count] = self._input[:count]
+            out[count:] = 0
+            self._input_len = 0
+            return
+
+        if self._state == self._STRETCHING:
+            if not self._is_stretch_speed(self._block_speed) and self._prev_pos is not None:
+                self._finishing = True
+            while self._output_len < frames and self._state == self._STRETCHING:
+                if not self._synthesize_frame():
+                    break
+
+        # 先輸出已合成的資料
+        count = min(frames, self._output_len)
+        out[:count] = self._output[:count]
+        self._consume_output(count)
+
+        if count < frames and self._state == self._DRAINING:
+            # 與來源對齊後直接輸出輸入資料
+            direct = min(frames - count, self._input_len - self._resume_pos)
+            out[count:count + direct] = self._input[self._resume_pos:self._resume_pos + direct]
+            self._resume_pos += direct
+            count += direct
+
+        if count < frames:
+            out[count:] = 0
+
+        self._compact_input()
+
+        if (self._state == self._DRAINING and self._output_len == 0
+                and self._resume_pos >= self._input_len):
+            self.reset()
+
+    def _synthesize_frame(self):
+        """合成一個分析窗並輸出一個合成步長的資料
+
+        Returns:
+            bool: 輸入不足無法合成時返回 False
+        """
+        length = self.frame_length
+        hop = self.hop
+
+        if self._prev_pos is None:
+            pos = self._round(self._analysis_pos)
+        elif self._finishing:
+            pos = self._prev_pos + hop
+        else:
+            pos = self._find_best_position(self._prev_pos + hop)
+
+        if pos + length > self._input_len:
+            return False
+
+        frame = self._input[pos:pos + length]
+        np.multiply(frame, self._window_column, out=self._scratch)
+        self._acc += self._scratch
+        if self._prev_pos is None:
+            # 第一個分析窗: 前半段視為與前一段完美對齊，避免淡入造成的音量凹陷
+            self._acc[:hop] = frame[:hop]
+
+        self._append_output(self._acc[:hop])
+        self._acc[:hop] = self._acc[hop:]
+        self._acc[hop:] = 0
+
+        self._prev_pos = pos
+        self._analysis_pos += self._block_speed * hop
+
+        if self._finishing:
+            # 已與來源對齊: 捨棄累加器殘留的半個窗，之後直接輸出來源
+            self._finishing = False
+            self._acc.fill(0)
+            self._resume_pos = pos + hop
+            self._state = self._DRAINING
+        return True
+
+    def _find_best_position(self, natural):
+        """在名目位置附近搜尋與自然延續波形最相似的位置
+
+        Args:
+            natural (int): 上一個分析窗的自然延續位置
+
+        Returns:
+            int: 分析窗起始位置
+        """
+        hop = self.hop
+        center = self._round(self._analysis_pos)
+        low = max(0, center - self.tolerance)
+        high = min(center + self.tolerance, self._input_len - self.frame_length)
+        if high <= low:
+            return max(0, min(center, self._input_len - self.frame_length))
+
+        target = self._input[natural:natural + hop].sum(axis=1)
+        region = self._input[low:high + hop].sum(axis=1)
+        correlation = np.correlate(region, target, mode='valid')
+        return low + int(np.argmax(correlation))
+
+    def _allocate(self, channels):
+        """依聲道數配置內部緩衝區"""
+        self._channels = channels
+        self._input = np.zeros((self.frame_length * 4, channels), dtype=np.float32)
+        self._output = np.zeros((self.frame_length * 2, channels), dtype=np.float32)
+        self._acc = np.zeros((self.frame_length, channels), dtype=np.float32)
+        self._scratch = np.empty((self.frame_length, channels), dtype=np.float32)
+
+    def _ensure_channels(self, channels):
+        """聲道數改變時重新配置緩衝區 (捨棄殘留資料)"""
+        if channels == self._channels:
+            return
+        stretching = self._state != self._BYPASS
+        self._allocate(channels)
+        self.reset()
+        if stretching:
+            self._state = self._STRETCHING
+
+    def _append_input(self, block):
+        """將輸入附加到 FIFO (容量不足時擴充)"""
+        count = len(block)
+        if count == 0:
+            return
+        required = self._input_len + count
+        if required > len(self._input):
+            grown = np.zeros((max(required, len(self._input) * 2), self._channels), dtype=np.float32)
+            grown[:self._input_len] = self._input[:self._input_len]
+            self._input = grown
+        self._input[self._input_len:required] = block
+        self._input_len = required
+
+    def _append_output(self, block):
+        """將合成結果附加到輸出 FIFO (容量不足時擴充)"""
+        count = len(block)
+        required = self._output_len + count
+        if required > len(self._output):
+            grown = np.zeros((max(required, len(self._output) * 2), self._channels), dtype=np.float32)
+            grown[:self._output_len] = self._output[:self._output_len]
+            self._output = grown
+        self._output[self._output_len:required] = block
+        self._output_len = required
+
+    def _consume_output(self, count):
+        """從輸出 FIFO 移除已輸出的資料"""
+        remaining = self._output_len - count
+        if remaining > 0 and count > 0:
+            self._output[:remaining] = self._output[count:self._output_len]
+        self._output_len = max(0, remaining)
+
+    def _compact_input(self):
+        """移除之後不會再用到的輸入資料"""
+        if self._state == self._DRAINING:
+            drop = self._resume_pos
+        elif self._prev_pos is None:
+            drop = 0
+        else:
+            drop = min(self._prev_pos + self.hop, self._round(self._analysis_pos) - self.tolerance)
+        self._discard_input(max(0, drop))
+
+    def _discard_input(self, drop):
+        """捨棄輸入 FIFO 開頭的資料並平移所有位置"""
+        drop = min(drop, self._input_len)
+        if drop <= 0:
+            return
+        remaining = self._input_len - drop
+        if remaining > 0:
+            self._input[:remaining] = self._input[drop:self._input_len]
+        self._input_len = remaining
+        self._analysis_pos -= drop
+        self._resume_pos = max(0, self._resume_pos - drop)
+        if self._prev_pos is not None:
+            self._prev_pos -= drop
+
+    @staticmethod
+    def _round(value):
+        """四捨五入為整數位置"""
+        return int(math.floor(value + 0.5))
+
+    @staticmethod
+    def _is_stretch_speed(speed):
+        """檢查速度是否需要時間伸縮"""
+        return abs(speed - 1.0) > 1e-3
@@ -33,6 +33,42 @@ DEFAULT_MUSIC_VOLUME = 70
 # 專輯封面最大尺寸 (像素)
 ALBUM_COVER_MAX_SIZE = 250
 
+# 專輯封面磁碟快取目錄
+ALBUM_ART_CACHE_DIR = 'album_art_cache'
+
+# 專輯封面預先產生的縮圖尺寸 (最大邊長，像素)
+ALBUM_ART_SIZES = {'player': 230, 'list': 48}
+
+# 遠端封面重新驗證 (ETag) 的間隔 (秒)
+ALBUM_ART_REVALIDATE_SECONDS = 7 * 24 * 3600
+
+# 音訊串流區塊大小 (frames，即時播放與離線渲染共用)
+AUDIO_BLOCK_SIZE = 2048
+
+# PCM 解碼快取目錄
+PCM_CACHE_DIR = 'pcm_cache'
+
+# PCM 解碼快取總大小上限 (bytes)
+PCM_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+# 背景預熱的歌曲數 (播放清單中接下來的歌曲)
+PCM_CACHE_WARM_UP_COUNT = 3
+
+# 響度分析索引檔
+LOUDNESS_INDEX_FILE = 'loudness_index.json'
+
+# 音量正規化目標響度 (LUFS)
+LOUDNESS_TARGET_LUFS = -14.0
+
+# 正規化後允許的真峰值上限 (dBTP)
+LOUDNESS_MAX_TRUE_PEAK_DBTP = -1.0
+
+# 已解析歌詞的快取項目數上限
+LYRICS_CACHE_MAX_ENTRIES = 64
+
+# 記錄「沒有歌詞檔」的有效時間 (秒)，期間內不再檢查檔案是否存在
+LYRICS_CACHE_MISS_TTL = 300
+
 # ==================== YouTube 下載器配置 ====================
 
 # yt-dlp 搜尋超時時間 (秒)
@@ -2,9 +2,13 @@
 
 import sys
 import os
+import multiprocessing
 
-# 確保可以找到 src 模組（支援從任意位置執行）
 if __name__ == "__main__":
+    # 打包後的執行檔以 spawn 啟動子行程時，子行程在此直接執行工作而不重新啟動應用程式
+    multiprocessing.freeze_support()
+
+    # 確保可以找到 src 模組（支援從任意位置執行）
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(current_dir)
     if project_root not in sys.path:
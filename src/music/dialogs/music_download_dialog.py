@@ -6,12 +6,14 @@ import threading
 import re
 import os
 from src.core.logger import logger
+from src.utils.ui_dispatcher import UIDispatcher
 
 
 class MusicDownloadDialog:
     """管理音樂下載相關的 UI 和邏輯"""
 
-    def __init__(self, parent, music_manager, youtube_downloader, on_download_complete=None):
+    def __init__(self, parent, music_manager, youtube_downloader, on_download_complete=None,
+                 ui_dispatcher=None):
         """初始化下載對話框
 
         Args:
@@ -19,11 +21,13 @@ class MusicDownloadDialog:
             music_manager: 音樂管理器實例
             youtube_downloader: YouTube 下載器實例
             on_download_complete: 下載完成後的回調函數
+            ui_dispatcher (UIDispatcher): UI 更新派送佇列，None 表示以父視窗建立
         """
         self.parent = parent
         self.music_manager = music_manager
         self.youtube_downloader = youtube_downloader
         self.on_download_complete = on_download_complete
+        self.ui_dispatcher = ui_dispatcher or UIDispatcher(parent)
 
         # 對話框實例
         self.dialog = None
@@ -223,7 +227,7 @@ class MusicDownloadDialog:
             results = self.youtube_downloader.search_youtube(query, max_results=5)
 
             if not results:
-                self.parent.after(0, lambda: messagebox.showerror(
+                self.ui_dispatcher.post(lambda: messagebox.showerror(
                     "搜尋失敗",
                     "沒有找到相關影片,請嘗試其他關鍵字。",
                     parent=self.dialog
@@ -231,7 +235,7 @@ class MusicDownloadDialog:
                 return
 
             # 顯示搜尋結果選擇對話框
-            self.parent.after(0, lambda: self.show_search_results(results, category))
+            self.ui_dispatcher.post(self.show_search_results, results, category)
 
         threading.Thread(target=search_thread, daemon=True).start()
 
@@ -374,22 +378,22 @@ class MusicDownloadDialog:
 
         # 在背景執行緒中下載
         def download_thread():
-            # 更新狀態
-            self.parent.after(0, lambda: self._update_progress_status("正在獲取影片資訊..."))
+            # 更新狀態 (只保留最新的狀態文字)
+            self.ui_dispatcher.post(self._update_progress_status, "正在獲取影片資訊...", key='download_status')
 
             result = self.youtube_downloader.download_audio(url, category)
 
-            # 停止進度條
-            self.parent.after(0, self._stop_progress)
+            # 停止進度條 (以下更新在同一個通道依序執行)
+            self.ui_dispatcher.post(self._stop_progress)
 
             # 關閉進度對話框
-            self.parent.after(0, lambda: self.progress_dialog.destroy() if self.progress_dialog else None)
+            self.ui_dispatcher.post(lambda: self.progress_dialog.destroy() if self.progress_dialog else None)
 
             # 調用完成回調
             if result['success']:
-                self.parent.after(0, lambda: self.on_download_complete(True, result['message'], category))
+                self.ui_dispatcher.post(self.on_download_complete, True, result['message'], category)
             else:
-                self.parent.after(0, lambda: self.on_download_complete(False, result['message'], None))
+                self.ui_dispatcher.post(self.on_download_complete, False, result['message'], None)
 
         threading.Thread(target=download_thread, daemon=True).start()
 
@@ -10,6 +10,7 @@ import re
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from src.core.logger import logger
+from src.music.utils.lyrics_parser import LyricsTimeline
 
 
 class LyricsManager:
@@ -20,6 +21,10 @@ class LyricsManager:
         self.current_lyrics = None
         self.current_song_id = None
 
+        # 同步歌詞的時間軸 (對應 current_lyrics['synced'])
+        self._timeline_source = None
+        self._timeline = None
+
     def load_lyrics(self, song_info: Dict) -> Optional[Dict]:
         """載入歌曲歌詞
 
@@ -134,15 +139,10 @@ class LyricsManager:
         if not self.current_lyrics or not self.current_lyrics['has_sync']:
             return None
 
-        synced_lyrics = self.current_lyrics['synced']
-
-        # 找到最接近的歌詞行
-        for i in range(len(synced_lyrics) - 1, -1, -1):
-            time_ms, line = synced_lyrics[i]
-            if position_ms >= time_ms:
-                return line
-
-        return None
+        index = self._get_timeline().index_at(position_ms)
+        if index < 0:
+            return None
+        return self.current_lyrics['synced'][index][1]
 
     def get_surrounding_lyrics(self, position_ms: int, before: int = 2, after: int = 2) -> List[Tuple[int, str, bool]]:
         """取得當前位置周圍的歌詞行
@@ -160,13 +160,8 @@ class LyricsManager:
 
         synced_lyrics = self.current_lyrics['synced']
 
-        # 找到當前歌詞索引
-        current_index = 0
-        for i, (time_ms, _) in enumerate(synced_lyrics):
-            if position_ms >= time_ms:
-                current_index = i
-            else:
-                break
+        # 找到當前歌詞索引 (第一句之前視為第一句)
+        current_index = max(0, self._get_timeline().index_at(position_ms))
 
         # 取得周圍歌詞
         start_index = max(0, current_index - before)
@@ -180,6 +175,18 @@ class LyricsManager:
 
         return result
 
+    def _get_timeline(self) -> LyricsTimeline:
+        """取得目前同步歌詞的時間軸 (歌詞變更時重新建立)
+
+        Returns:
+            時間軸 (毫秒)
+        """
+        synced_lyrics = self.current_lyrics['synced']
+        if self._timeline_source is not synced_lyrics or len(self._timeline) != len(synced_lyrics):
+            self._timeline_source = synced_lyrics
+            self._timeline = LyricsTimeline(time_ms for time_ms, _ in synced_lyrics)
+        return self._timeline
+
     def save_lyrics(self, song_info: Dict, lyrics_content: str) -> bool:
         """儲存歌詞到檔案
 
@@ -227,3 +234,5 @@ class LyricsManager:
         """清除當前歌詞"""
         self.current_lyrics = None
         self.current_song_id = None
+        self._timeline_source = None
+        self._timeline = None
@@ -8,6 +8,7 @@ from typing import Dict, List
 from collections import defaultdict
 from src.core.constants import DEFAULT_MUSIC_ROOT_PATH
 from src.core.logger import logger
+from src.music.utils.song_sort_index import make_sort_keys
 from src.utils.path_utils import normalize_network_path, path_exists_safe, is_network_path
 
 
@@ -197,8 +198,11 @@ class MusicManager:
                         'uploader': song_data.get('uploader', '未知'),
                         'audio_path': audio_path,
                         'category': category_name,
-                        'json_path': json_file
+                        'json_path': json_file,
+                        'added_time': self._get_added_time(json_file)
                     }
+                    # 預先計算排序鍵，排序時不需再轉換大小寫或查詢欄位
+                    song_info['sort_keys'] = make_sort_keys(song_info)
 
                     songs.append(song_info)
 
@@ -214,6 +218,21 @@ class MusicManager:
 
         return songs
 
+    @staticmethod
+    def _get_added_time(json_file):
+        """取得歌曲加入音樂庫的時間 (元數據檔案的修改時間)
+
+        Args:
+            json_file (str): 元數據 JSON 檔案路徑
+
+        Returns:
+            float: 時間戳記，無法取得時返回 0
+        """
+        try:
+            return os.path.getmtime(json_file)
+        except OSError:
+            return 0
+
     def get_all_categories(self):
         """取得所有分類
 
@@ -0,0 +1,354 @@
+"""專輯封面磁碟快取模組
+
+- 原始圖片以內容雜湊 (SHA-256) 命名儲存，相同圖片只保存一份
+- 預先產生各顯示尺寸的縮圖 (播放器 230 px、列表小圖)，之後只需讀取小檔案
+- 遠端網址記錄 ETag / Last-Modified，過期後以條件式請求重新驗證 (未變更時不下載)
+- 解碼與縮放在固定大小的工作執行緒池執行，同一張圖片的重複請求合併為一次
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import requests
+from PIL import Image
+from src.core.constants import ALBUM_ART_SIZES, ALBUM_ART_REVALIDATE_SECONDS
+from src.core.logger import logger
+
+
+class AlbumArtCache:
+    """專輯封面快取"""
+
+    INDEX_FILE = 'index.json'
+    ORIGINALS_DIR = 'originals'
+    DERIVED_DIR = 'derived'
+
+    # 下載逾時 (秒)
+    DOWNLOAD_TIMEOUT = 5
+
+    def __init__(self, cache_dir, max_workers=2, revalidate_seconds=ALBUM_ART_REVALIDATE_SECONDS):
+        """初始化封面快取
+
+        Args:
+            cache_dir (str): 快取目錄
+            max_workers (int): 解碼與縮放的工作執行緒數
+            revalidate_seconds (float): 遠端封面重新驗證的間隔 (秒)
+        """
+        self.cache_dir = cache_dir
+        self.revalidate_seconds = revalidate_seconds
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._entries = self._load_index()
+        self._pending = {}  # {(來源, 尺寸): Future}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="AlbumArt")
+
+    def get_cached(self, source, size):
+        """取得已快取的縮圖 (不連網也不縮放，只讀取磁碟上的縮圖)
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+            size (int): 最大邊長 (像素)
+
+        Returns:
+            PIL.Image.Image: 縮圖，未快取時返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(source)
+        if entry is None:
+            return None
+        return self._open_derived(entry['hash'], size)
+
+    def request(self, source, size, callback):
+        """在背景取得縮圖 (必要時下載並縮放)
+
+        callback 在工作執行緒中呼叫，UI 更新需自行轉回 UI 線程。
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+            size (int): 最大邊長 (像素)
+            callback (callable): callback(image)，失敗時 image 為 None
+
+        Returns:
+            concurrent.futures.Future: 取得結果的 Future
+        """
+        key = (source, size)
+        with self._lock:
+            future = self._pending.get(key)
+            submitted = future is None
+            if submitted:
+                future = self._executor.submit(self._load, source, size)
+                self._pending[key] = future
+        if submitted:
+            # 在鎖外註冊: 已完成的 Future 會立即呼叫回調
+            future.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+        def deliver(done):
+            if done.cancelled():
+                # 關閉時取消的工作不再回調
+                return
+            try:
+                image = done.result()
+            except Exception as e:
+                logger.error(f"載入專輯封面失敗: {e}")
+                image = None
+            callback(image)
+
+        future.add_done_callback(deliver)
+        return future
+
+    def is_stale(self, source):
+        """檢查已快取的封面是否需要重新驗證 (遠端網址超過驗證間隔，或本機檔案已變更)
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+
+        Returns:
+            bool: 需要重新驗證或尚未快取時返回 True
+        """
+        with self._lock:
+            entry = self._entries.get(source)
+        return entry is None or self._is_stale(source, entry)
+
+    def shutdown(self, wait=False):
+        """停止工作執行緒池 (取消尚未開始的下載)
+
+        Args:
+            wait (bool): 是否等待進行中的工作完成
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def save(self):
+        """寫入索引檔 (先寫入暫存檔再改名)
+
+        Returns:
+            bool: 是否成功
+        """
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False).encode('utf-8')
+        try:
+            self._write_atomic(self._index_path, data)
+            return True
+        except Exception as e:
+            logger.error(f"儲存專輯封面索引失敗: {e}")
+            return False
+
+    # ==================== 工作執行緒 ====================
+
+    def _finish(self, key, future):
+        """請求完成後移除合併記錄"""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _load(self, source, size):
+        """取得縮圖 (工作執行緒)
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+            size (int): 最大邊長 (像素)
+
+        Returns:
+            PIL.Image.Image: 縮圖，失敗時返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(source)
+
+        if entry is not None and not self._is_stale(source, entry):
+            image = self._open_derived(entry['hash'], size)
+            if image is not None:
+                return image
+            # 缺少此尺寸的縮圖: 由原始圖片產生
+            data = self._read_original(entry['hash'])
+            if data is not None:
+                return self._store_derivatives(entry['hash'], data, size)
+
+        data, entry = self._fetch(source, entry)
+        if data is None:
+            if entry is not None:
+                # 未變更 (304) 或暫時無法連線: 沿用既有的封面
+                return self._open_derived(entry['hash'], size) or self._derive_from_original(entry['hash'], size)
+            return None
+        return self._store_derivatives(entry['hash'], data, size)
+
+    def _fetch(self, source, entry):
+        """讀取原始圖片 (遠端網址使用條件式請求)
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+            entry (dict): 既有的索引項目，沒有時為 None
+
+        Returns:
+            tuple: (原始圖片資料, 索引項目)；未變更或失敗時資料為 None
+        """
+        if not source.startswith(('http://', 'https://')):
+            try:
+                with open(source, 'rb') as f:
+                    data = f.read()
+                stat = os.stat(source)
+            except OSError as e:
+                logger.debug(f"讀取本機封面失敗: {source} ({e})")
+                return None, entry
+            return data, self._record(source, data, {'mtime_ns': stat.st_mtime_ns})
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = requests.get(source, headers=headers, timeout=self.DOWNLOAD_TIMEOUT)
+            if response.status_code == 304 and entry is not None:
+                with self._lock:
+                    entry['checked'] = time.time()
+                self.save()
+                return None, entry
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"下載專輯封面失敗: {source[:50]} ({e})")
+            return None, entry
+
+        data = response.content
+        return data, self._record(source, data, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+
+    def _record(self, source, data, extra):
+        """儲存原始圖片並更新索引
+
+        Args:
+            source (str): 封面網址或本機檔案路徑
+            data (bytes): 原始圖片資料
+            extra (dict): 額外記錄的欄位 (驗證資訊)
+
+        Returns:
+            dict: 索引項目
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        original_path = self._original_path(digest)
+        if not os.path.exists(original_path):
+            self._write_atomic(original_path, data)
+
+        entry = {'hash': digest, 'checked': time.time()}
+        entry.update({key: value for key, value in extra.items() if value is not None})
+        with self._lock:
+            self._entries[source] = entry
+        self.save()
+        return entry
+
+    def _store_derivatives(self, digest, data, requested_size):
+        """解碼原始圖片並產生所有尺寸的縮圖
+
+        Args:
+            digest (str): 原始圖片雜湊
+            data (bytes): 原始圖片資料
+            requested_size (int): 需要返回的尺寸
+
+        Returns:
+            PIL.Image.Image: requested_size 的縮圖，解碼失敗時返回 None
+        """
+        try:
+            image = Image.open(BytesIO(data))
+            image.load()
+            image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        except Exception as e:
+            logger.warning(f"解碼專輯封面失敗: {e}")
+            return None
+
+        sizes = sorted(set(ALBUM_ART_SIZES.values()) | {requested_size}, reverse=True)
+        result = None
+        for size in sizes:
+            # 由大到小縮放，較小的尺寸從上一個縮圖產生
+            image = self._fit(image, size)
+            try:
+                buffer = BytesIO()
+                image.save(buffer, format='PNG')
+                self._write_atomic(self._derived_path(digest, size), buffer.getvalue())
+            except Exception as e:
+                logger.warning(f"儲存專輯封面縮圖失敗: {e}")
+            if size == requested_size:
+                result = image
+        return result
+
+    def _derive_from_original(self, digest, size):
+        """由已儲存的原始圖片產生縮圖"""
+        data = self._read_original(digest)
+        if data is None:
+            return None
+        return self._store_derivatives(digest, data, size)
+
+    def _is_stale(self, source, entry):
+        """檢查項目是否需要重新驗證"""
+        if source.startswith(('http://', 'https://')):
+            return time.time() - entry.get('checked', 0) >= self.revalidate_seconds
+        try:
+            return os.stat(source).st_mtime_ns != entry.get('mtime_ns')
+        except OSError:
+            return False
+
+    @staticmethod
+    def _fit(image, size):
+        """保持長寬比縮放到 size 以內 (不放大)"""
+        width, height = image.size
+        ratio = min(size / width, size / height, 1.0)
+        if ratio >= 1.0:
+            return image
+        new_size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        return image.resize(new_size, Image.Resampling.LANCZOS)
+
+    def _open_derived(self, digest, size):
+        """讀取縮圖
+
+        Returns:
+            PIL.Image.Image: 縮圖，不存在或損毀時返回 None
+        """
+        path = self._derived_path(digest, size)
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image.copy()
+        except (OSError, ValueError):
+            return None
+
+    def _read_original(self, digest):
+        """讀取原始圖片資料"""
+        try:
+            with open(self._original_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _original_path(self, digest):
+        return os.path.join(self.cache_dir, self.ORIGINALS_DIR, digest)
+
+    def _derived_path(self, digest, size):
+        return os.path.join(self.cache_dir, self.DERIVED_DIR, f"{digest}_{size}.png")
+
+    @staticmethod
+    def _write_atomic(path, data):
+        """先寫入暫存檔再改名，避免讀到寫到一半的檔案"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _load_index(self):
+        """載入索引檔
+
+        Returns:
+            dict: {來源: 索引項目}
+        """
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except Exception as e:
+            logger.warning(f"載入專輯封面索引失敗: {e}")
+            return {}
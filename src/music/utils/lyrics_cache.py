@@ -0,0 +1,147 @@
+"""已解析歌詞快取模組
+
+避免在 UI 線程上讀取與解析 .lrc 檔案:
+- 以 (歌詞檔路徑, 修改時間) 作為快取鍵，檔案變更後自動重新解析
+- 依最近使用順序保留固定數量的項目 (LRU)
+- 記錄沒有歌詞檔的歌曲，有效期間內不再檢查檔案是否存在
+- 背景預先解析接下來要播放的歌曲
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.core.constants import LYRICS_CACHE_MAX_ENTRIES, LYRICS_CACHE_MISS_TTL
+from src.core.logger import logger
+
+
+class LyricsCache:
+    """已解析歌詞的記憶體快取"""
+
+    def __init__(self, parser, max_entries=LYRICS_CACHE_MAX_ENTRIES, miss_ttl=LYRICS_CACHE_MISS_TTL):
+        """初始化歌詞快取
+
+        Args:
+            parser: LyricsParser 實例
+            max_entries (int): 快取項目數上限
+            miss_ttl (float): 沒有歌詞檔的記錄有效時間 (秒)
+        """
+        self.parser = parser
+        self.max_entries = max(1, int(max_entries))
+        self.miss_ttl = miss_ttl
+
+        # {歌詞檔路徑: (修改時間, 歌詞列表)}
+        self._entries = OrderedDict()
+        # {歌詞檔路徑: 記錄時間 (time.monotonic())}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+        # 背景預先解析
+        self._prefetch_queue = []
+        self._prefetch_thread = None
+
+    def get(self, lrc_path):
+        """取得已解析的歌詞 (未快取或檔案已變更時讀取並解析)
+
+        Args:
+            lrc_path (str): 歌詞檔路徑
+
+        Returns:
+            list: 歌詞列表 [{'time': float, 'text': str}, ...]，沒有歌詞檔時返回 None
+        """
+        lrc_path = str(lrc_path)
+        with self._lock:
+            missed_at = self._misses.get(lrc_path)
+            if missed_at is not None and time.monotonic() - missed_at < self.miss_ttl:
+                return None
+
+        try:
+            mtime = os.stat(lrc_path).st_mtime
+        except OSError:
+            with self._lock:
+                self._misses[lrc_path] = time.monotonic()
+                self._entries.pop(lrc_path, None)
+            return None
+
+        with self._lock:
+            self._misses.pop(lrc_path, None)
+            entry = self._entries.get(lrc_path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(lrc_path)
+                return entry[1]
+
+        # 無法解析的檔案記錄為空歌詞，直到檔案變更
+        lyrics = self.parser.parse_lrc_file(lrc_path) or []
+
+        with self._lock:
+            self._entries[lrc_path] = (mtime, lyrics)
+            self._entries.move_to_end(lrc_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return lyrics
+
+    def invalidate(self, lrc_path=None):
+        """移除快取項目
+
+        Args:
+            lrc_path (str): 歌詞檔路徑，None 表示清除全部
+        """
+        with self._lock:
+            if lrc_path is None:
+                self._entries.clear()
+                self._misses.clear()
+            else:
+                self._entries.pop(str(lrc_path), None)
+                self._misses.pop(str(lrc_path), None)
+
+    def clear_misses(self):
+        """清除沒有歌詞檔的記錄 (例如下載新歌詞後)"""
+        with self._lock:
+            self._misses.clear()
+
+    def prefetch(self, lrc_paths):
+        """在背景預先解析歌詞
+
+        新的呼叫會取代尚未處理的清單。
+
+        Args:
+            lrc_paths (list): 歌詞檔路徑 (依優先順序)
+        """
+        with self._lock:
+            self._prefetch_queue = [str(path) for path in lrc_paths]
+            if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+                return
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch_worker,
+                daemon=True,
+                name="LyricsPrefetch"
+            )
+            self._prefetch_thread.start()
+
+    def wait_for_prefetch(self, timeout=None):
+        """等待背景預先解析完成
+
+        Args:
+            timeout (float): 最長等待時間 (秒)，None 表示一直等待
+
+        Returns:
+            bool: 預先解析已完成返回 True
+        """
+        thread = self._prefetch_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _prefetch_worker(self):
+        """背景預先解析工作線程"""
+        while True:
+            with self._lock:
+                if not self._prefetch_queue:
+                    self._prefetch_thread = None
+                    return
+                lrc_path = self._prefetch_queue.pop(0)
+
+            try:
+                self.get(lrc_path)
+            except Exception as e:
+                logger.warning(f"預先解析歌詞失敗: {lrc_path} ({e})")
@@ -1,8 +1,54 @@
 """LRC 歌詞解析器模組"""
+import bisect
 import re
 from src.core.logger import logger
 
 
+class LyricsTimeline:
+    """歌詞時間軸: 排序的時間陣列與目前歌詞索引的快取
+
+    播放位置落在目前歌詞與下一句歌詞之間時直接返回快取的索引，
+    超出範圍 (換句或跳轉) 時才以 bisect 重新搜尋。
+    """
+
+    def __init__(self, times):
+        """初始化時間軸
+
+        Args:
+            times (iterable): 已排序的歌詞時間
+        """
+        self.times = list(times)
+        self._index = -1
+        self._start = float('-inf')
+        self._next_change = self.times[0] if self.times else float('inf')
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def next_change_time(self):
+        """目前歌詞之後下一次換句的時間 (沒有時為 inf)"""
+        return self._next_change
+
+    def index_at(self, current_time):
+        """取得指定時間的歌詞索引
+
+        Args:
+            current_time (float): 播放時間
+
+        Returns:
+            int: 歌詞索引，-1 表示還沒有歌詞
+        """
+        if self._start <= current_time < self._next_change:
+            return self._index
+
+        index = bisect.bisect_right(self.times, current_time) - 1
+        self._index = index
+        self._start = self.times[index] if index >= 0 else float('-inf')
+        self._next_change = self.times[index + 1] if index + 1 < len(self.times) else float('inf')
+        return index
+
+
 class LyricsParser:
     """解析 LRC 格式歌詞文件"""
 
@@ -11,6 +57,10 @@ class LyricsParser:
         # LRC 時間標記格式: [mm:ss.xx] 或 [mm:ss.xxx]
         self.time_pattern = re.compile(r'\[(\d{2}):(\d{2})\.(\d{2,3})\](.*)$')
 
+        # 最近查詢的歌詞列表與其時間軸
+        self._timeline_source = None
+        self._timeline = None
+
     def parse_lrc_content(self, lrc_content):
         """解析 LRC 內容
 
@@ -89,18 +139,10 @@ class LyricsParser:
         Returns:
             str: 當前應該顯示的歌詞文字
         """
-        if not lyrics:
+        index = self.get_lyric_index_at_time(lyrics, current_time)
+        if index < 0:
             return ''
-
-        # 找出當前時間之前最近的歌詞
-        current_lyric = ''
-        for lyric in lyrics:
-            if lyric['time'] <= current_time:
-                current_lyric = lyric['text']
-            else:
-                break
-
-        return current_lyric
+        return lyrics[index]['text']
 
     def get_lyric_index_at_time(self, lyrics, current_time):
         """根據當前時間獲取歌詞索引
@@ -115,12 +157,18 @@ class LyricsParser:
         if not lyrics:
             return -1
 
-        # 找出當前時間之前最近的歌詞索引
-        current_index = -1
-        for i, lyric in enumerate(lyrics):
-            if lyric['time'] <= current_time:
-                current_index = i
-            else:
-                break
+        return self.get_timeline(lyrics).index_at(current_time)
 
-        return current_index
+    def get_timeline(self, lyrics):
+        """取得歌詞列表的時間軸 (同一列表重複查詢時沿用)
+
+        Args:
+            lyrics (list): 歌詞列表
+
+        Returns:
+            LyricsTimeline: 時間軸
+        """
+        if self._timeline_source is not lyrics or len(self._timeline) != len(lyrics):
+            self._timeline_source = lyrics
+            self._timeline = LyricsTimeline(lyric['time'] for lyric in lyrics)
+        return self._timeline
@@ -1,8 +1,8 @@
 """音樂播放控制器模組 - 處理播放邏輯"""
 import pygame
 import time
-import random
 from src.core.logger import logger
+from src.music.utils.play_queue import PlayQueue
 
 
 class MusicPlayerController:
@@ -18,15 +18,13 @@ class MusicPlayerController:
 
         # 播放器狀態
         self.current_song = None
-        self.playlist = []
-        self.current_index = -1
+        self.queue = PlayQueue()  # 播放佇列 (playlist / current_index 由此推導)
         self.is_playing = False
         self.is_paused = False
         self.volume = self.music_manager.config_manager.get_music_volume() / 100.0
 
         # 播放模式: 'sequential', 'shuffle', 'repeat_one', 'repeat_all'
         self.play_mode = 'sequential'
-        self.played_indices = []  # 隨機模式用
 
         # 時間追蹤
         self.start_time = 0
@@ -39,6 +37,29 @@ class MusicPlayerController:
         except Exception as e:
             logger.error(f"Pygame mixer 初始化失敗: {e}", exc_info=True)
 
+    @property
+    def playlist(self):
+        """目前播放佇列的歌曲列表 (由 queue 推導，佇列編輯前為同一個列表)"""
+        return self.queue.songs()
+
+    @playlist.setter
+    def playlist(self, songs):
+        self.queue.set_songs(songs)
+
+    @property
+    def current_index(self):
+        """目前歌曲在播放佇列中的索引，沒有時為 -1"""
+        return self.queue.current_index
+
+    @current_index.setter
+    def current_index(self, index):
+        self.queue.set_current_index(index)
+
+    @property
+    def played_indices(self):
+        """本輪隨機播放已播放的歌曲索引"""
+        return self.queue.shuffle_played_indices()
+
     def play_song(self, song):
         """播放歌曲
 
@@ -107,8 +128,15 @@ class MusicPlayerController:
         if not self.playlist:
             return None
 
-        self.current_index = (self.current_index - 1) % len(self.playlist)
-        song = self.playlist[self.current_index]
+        previous_item = None
+        if self.play_mode == 'shuffle':
+            # 隨機模式依播放順序返回上一首
+            previous_item = self.queue.shuffle_previous(self.current_song is not None)
+
+        if previous_item is None:
+            self.current_index = (self.current_index - 1) % len(self.playlist)
+
+        song = self.queue.current_song
         self.play_song(song)
         return song
 
@@ -128,17 +156,8 @@ class MusicPlayerController:
                 self.play_song(song)
                 return song
         elif self.play_mode == 'shuffle':
-            # 隨機模式
-            available_indices = [i for i in range(len(self.playlist)) if i not in self.played_indices]
-
-            if not available_indices:
-                # 所有歌曲都播放過了,清空記錄重新開始
-                self.played_indices = []
-                available_indices = list(range(len(self.playlist)))
-
-            self.current_index = random.choice(available_indices)
-            self.played_indices.append(self.current_index)
-            song = self.playlist[self.current_index]
+            # 隨機模式 (一輪播完後重新洗牌)
+            song = self.queue.shuffle_next(self.current_song is not None).song
             self.play_song(song)
             return song
         else:
@@ -172,9 +191,9 @@ class MusicPlayerController:
         next_index = (current_index + 1) % len(modes)
         self.play_mode = modes[next_index]
 
-        # 如果切換到隨機模式,清空已播放記錄
+        # 如果切換到隨機模式,從目前歌曲開始新的隨機順序
         if self.play_mode == 'shuffle':
-            self.played_indices = []
+            self.queue.reshuffle(self.current_song is not None)
 
         logger.info(f"播放模式已切換為: {self.play_mode}")
         return self.play_mode
@@ -200,8 +219,7 @@ class MusicPlayerController:
             songs (list): 歌曲列表
             index (int): 起始索引,默認為 0
         """
-        self.playlist = songs
-        self.current_index = index
+        self.queue.set_songs(songs, index=index)
         logger.info(f"播放列表已設定: {len(songs)} 首歌曲, 起始索引: {index}")
 
     def get_current_position(self):
@@ -0,0 +1,457 @@
+"""播放佇列模組
+
+以雙向鏈結串列保存播放順序 ("接下來播放"):
+- 插入下一首、加到最後、移除、移動都是 O(1)，不需重建列表
+- 每首歌曲對應一個固定的 QueueItem (項目控制代碼)，編輯佇列後目前播放位置不變
+- 需要索引或列表時才建立快取，直到下次編輯前重複使用
+- 隨機播放順序以項目為單位保存，編輯佇列時只需 O(1) 更新，不影響已播放的順序
+MusicPlayerController 與 MusicWindow 共用此佇列，playlist / current_index 由佇列推導。
+"""
+from src.music.utils.shuffle_bag import ShuffleBag
+
+
+class QueueItem:
+    """佇列項目 (穩定的控制代碼)"""
+
+    __slots__ = ('song', 'prev', 'next', 'queue')
+
+    def __init__(self, song):
+        """初始化佇列項目
+
+        Args:
+            song (dict): 歌曲資訊
+        """
+        self.song = song
+        self.prev = None
+        self.next = None
+        self.queue = None  # 所屬的佇列，已移除時為 None
+
+    def __repr__(self):
+        return f"QueueItem({self.song.get('title', '?') if isinstance(self.song, dict) else self.song!r})"
+
+
+class PlayQueue:
+    """播放佇列"""
+
+    def __init__(self, songs=(), rng=None):
+        """初始化播放佇列
+
+        Args:
+            songs (iterable): 初始歌曲
+            rng (random.Random): 隨機順序的亂數產生器 (測試用)
+        """
+        self._head = None
+        self._tail = None
+        self._size = 0
+        self._current = None
+        # 連續「下一首播放」時，新歌曲排在上一次插入的歌曲之後
+        self._next_anchor = None
+        # 列表與索引快取 (編輯後失效)
+        self._items_cache = None
+        self._songs_cache = None
+        self._index_cache = None
+        # 隨機播放順序 (值為 QueueItem)
+        self._shuffle = ShuffleBag(rng=rng)
+        self._shuffle_at = None  # 隨機順序對應的目前項目
+        self._shuffle_stale = True  # 佇列內容已取代，下次使用時重建
+        self.set_songs(songs)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        """依播放順序逐一返回項目"""
+        item = self._head
+        while item is not None:
+            yield item
+            item = item.next
+
+    # ==================== 目前位置 ====================
+
+    @property
+    def current(self):
+        """目前的項目，沒有時為 None"""
+        return self._current
+
+    @property
+    def current_song(self):
+        """目前的歌曲，沒有時為 None"""
+        return self._current.song if self._current is not None else None
+
+    @property
+    def current_index(self):
+        """目前項目的索引，沒有時為 -1"""
+        if self._current is None:
+            return -1
+        return self.index_of(self._current)
+
+    def set_current(self, item):
+        """設定目前的項目
+
+        Args:
+            item (QueueItem): 佇列中的項目，None 表示清除目前位置
+
+        Raises:
+            ValueError: 項目不屬於此佇列
+        """
+        if item is not None:
+            self._check_member(item)
+        self._current = item
+        self._next_anchor = None
+
+    def set_current_index(self, index):
+        """以索引設定目前的項目 (超出範圍時清除目前位置)
+
+        Args:
+            index (int): 索引
+        """
+        self.set_current(self.item_at(index) if 0 <= index < self._size else None)
+
+    def next_item(self, item=None, wrap=False):
+        """取得下一個項目
+
+        Args:
+            item (QueueItem): 起點，None 表示目前的項目 (沒有目前項目時返回第一個)
+            wrap (bool): 到結尾時是否回到第一個
+
+        Returns:
+            QueueItem: 下一個項目，沒有時返回 None
+        """
+        item = item if item is not None else self._current
+        if item is None:
+            return self._head
+        if item.next is None and wrap:
+            return self._head
+        return item.next
+
+    def previous_item(self, item=None, wrap=False):
+        """取得上一個項目
+
+        Args:
+            item (QueueItem): 起點，None 表示目前的項目 (沒有目前項目時返回最後一個)
+            wrap (bool): 到開頭時是否回到最後一個
+
+        Returns:
+            QueueItem: 上一個項目，沒有時返回 None
+        """
+        item = item if item is not None else self._current
+        if item is None:
+            return self._tail
+        if item.prev is None and wrap:
+            return self._tail
+        return item.prev
+
+    # ==================== 編輯 ====================
+
+    def set_songs(self, songs, index=None):
+        """以新的歌曲取代佇列內容
+
+        Args:
+            songs (iterable): 歌曲列表
+            index (int): 目前歌曲的索引，None 表示若原本的目前歌曲仍在新列表中則保留
+        """
+        previous_song = self.current_song
+        for item in self:
+            item.queue = None
+        self._head = self._tail = self._current = self._next_anchor = None
+        self._size = 0
+        self._invalidate()
+        self._shuffle.reset(0)
+        self._shuffle_stale = True
+
+        for song in songs:
+            self._link_after(QueueItem(song), self._tail)
+
+        if index is not None:
+            self.set_current_index(index)
+        elif previous_song is not None:
+            self._current = next((item for item in self if item.song is previous_song), None)
+
+    def append(self, song):
+        """加到佇列最後
+
+        Args:
+            song (dict): 歌曲資訊
+
+        Returns:
+            QueueItem: 新項目
+        """
+        item = QueueItem(song)
+        self._link_after(item, self._tail)
+        self._shuffle.add(item)
+        return item
+
+    def enqueue_next(self, song):
+        """加到目前歌曲之後 (下一首播放)
+
+        連續加入的歌曲依加入順序排在目前歌曲之後，隨機播放時也是下一首播放。
+
+        Args:
+            song (dict): 歌曲資訊
+
+        Returns:
+            QueueItem: 新項目
+        """
+        anchor = self._next_anchor if self._next_anchor is not None else self._current
+        item = QueueItem(song)
+        self._link_after(item, anchor)
+        self._next_anchor = item
+        self._shuffle.pin_next(item)
+        return item
+
+    def remove(self, item):
+        """移除項目
+
+        移除目前的項目時，目前位置移到前一個項目，下一首仍是原本的下一首
+        (隨機播放時上一首與下一首仍是隨機順序中原本的歌曲)。
+
+        Args:
+            item (QueueItem): 要移除的項目
+
+        Raises:
+            ValueError: 項目不屬於此佇列
+        """
+        self._check_member(item)
+        if item is self._current:
+            self._current = item.prev
+            if self._shuffle_at is item:
+                self._shuffle_at = self._current
+        if item is self._next_anchor:
+            self._next_anchor = item.prev if item.prev is not self._current else None
+        self._unlink(item)
+        self._shuffle.discard(item)
+
+    def move(self, item, after=None):
+        """移動項目
+
+        Args:
+            item (QueueItem): 要移動的項目
+            after (QueueItem): 移到此項目之後，None 表示移到最前面
+
+        Raises:
+            ValueError: 項目不屬於此佇列，或移到自己之後
+        """
+        self._check_member(item)
+        if after is not None:
+            self._check_member(after)
+            if after is item:
+                raise ValueError("無法將項目移到自己之後")
+        if item is self._next_anchor:
+            self._next_anchor = None
+
+        # 隨機順序以項目保存，移動不影響已播放與目前的位置
+        self._unlink(item)
+        self._link_after(item, after)
+
+    def move_to_next(self, item):
+        """將項目移到目前歌曲之後
+
+        Args:
+            item (QueueItem): 要移動的項目
+        """
+        if item is self._current:
+            return
+        self.move(item, self._current)
+
+    def clear(self):
+        """清空佇列"""
+        self.set_songs(())
+
+    # ==================== 隨機播放 ====================
+
+    def shuffle_next(self, played_current=True):
+        """依隨機順序移到下一首 (一輪播完後重新洗牌)
+
+        Args:
+            played_current (bool): 需要重建隨機順序時，目前歌曲是否算作本輪已播放
+
+        Returns:
+            QueueItem: 新的目前項目，佇列為空時返回 None
+        """
+        self._sync_shuffle(played_current)
+        return self._set_shuffle_current(self._shuffle.next())
+
+    def shuffle_previous(self, played_current=True):
+        """依隨機播放順序回到本輪的上一首
+
+        Args:
+            played_current (bool): 需要重建隨機順序時，目前歌曲是否算作本輪已播放
+
+        Returns:
+            QueueItem: 新的目前項目，已是本輪第一首時返回 None (目前位置不變)
+        """
+        self._sync_shuffle(played_current)
+        item = self._shuffle.previous()
+        if item is not None:
+            self._set_shuffle_current(item)
+        return item
+
+    def shuffle_upcoming(self, count, played_current=True):
+        """預覽隨機順序接下來的項目 (與之後 shuffle_next() 的順序相同)
+
+        Args:
+            count (int): 最多取得的項目數
+            played_current (bool): 需要重建隨機順序時，目前歌曲是否算作本輪已播放
+
+        Returns:
+            list: QueueItem 列表
+        """
+        self._sync_shuffle(played_current)
+        return self._shuffle.peek(count)
+
+    def shuffle_played_indices(self):
+        """本輪隨機播放已播放項目的索引 (依播放順序)
+
+        Returns:
+            list: 索引列表
+        """
+        if self._shuffle_stale:
+            return []
+        return [self.index_of(item) for item in self._shuffle.played()]
+
+    def reshuffle(self, played_current=True):
+        """從目前項目開始新的隨機順序
+
+        Args:
+            played_current (bool): 目前歌曲是否算作本輪已播放 (本輪不再播放)
+        """
+        start = self._current if played_current else None
+        self._shuffle.reset(self.items(), start=start)
+        # 尚未播放的「下一首播放」歌曲仍排在最前面
+        for item in self._pending_next():
+            self._shuffle.pin_next(item)
+        self._shuffle_at = self._current
+        self._shuffle_stale = False
+
+    # ==================== 索引與列表 ====================
+
+    def items(self):
+        """依播放順序的項目列表 (唯讀快取，編輯前重複使用)
+
+        Returns:
+            list: QueueItem 列表
+        """
+        if self._items_cache is None:
+            self._items_cache = list(self)
+        return self._items_cache
+
+    def songs(self):
+        """依播放順序的歌曲列表 (唯讀快取，編輯前重複使用)
+
+        Returns:
+            list: 歌曲資訊列表
+        """
+        if self._songs_cache is None:
+            self._songs_cache = [item.song for item in self.items()]
+        return self._songs_cache
+
+    def item_at(self, index):
+        """取得索引位置的項目
+
+        Args:
+            index (int): 索引
+
+        Returns:
+            QueueItem: 項目
+
+        Raises:
+            IndexError: 索引超出範圍
+        """
+        return self.items()[index]
+
+    def index_of(self, item):
+        """取得項目的索引
+
+        Args:
+            item (QueueItem): 項目
+
+        Returns:
+            int: 索引
+
+        Raises:
+            ValueError: 項目不屬於此佇列
+        """
+        self._check_member(item)
+        if self._index_cache is None:
+            self._index_cache = {id(entry): index for index, entry in enumerate(self.items())}
+        return self._index_cache[id(item)]
+
+    # ==================== 內部 ====================
+
+    def _check_member(self, item):
+        """確認項目屬於此佇列
+
+        Raises:
+            ValueError: 項目不屬於此佇列
+        """
+        if item.queue is not self:
+            raise ValueError("項目不在播放佇列中")
+
+    def _sync_shuffle(self, played_current):
+        """佇列內容被取代或直接選擇其他歌曲後，重建隨機順序"""
+        if self._shuffle_stale or self._shuffle_at is not self._current:
+            self.reshuffle(played_current)
+
+    def _pending_next(self):
+        """目前歌曲之後以 enqueue_next() 加入、尚未播放的項目
+
+        Returns:
+            list: QueueItem 列表 (依加入順序)
+        """
+        pending = []
+        if self._next_anchor is None:
+            return pending
+        item = self.next_item()
+        while item is not None and item is not self._current:
+            pending.append(item)
+            if item is self._next_anchor:
+                break
+            item = item.next
+        return pending
+
+    def _set_shuffle_current(self, item):
+        """依隨機順序設定目前的項目"""
+        self._current = self._shuffle_at = item
+        self._next_anchor = None
+        return item
+
+    def _link_after(self, item, anchor):
+        """將項目接在 anchor 之後 (anchor 為 None 時放在最前面)"""
+        if anchor is None:
+            item.prev = None
+            item.next = self._head
+            if self._head is not None:
+                self._head.prev = item
+            self._head = item
+        else:
+            item.prev = anchor
+            item.next = anchor.next
+            if anchor.next is not None:
+                anchor.next.prev = item
+            anchor.next = item
+        if item.next is None:
+            self._tail = item
+        item.queue = self
+        self._size += 1
+        self._invalidate()
+
+    def _unlink(self, item):
+        """從鏈結中移除項目"""
+        if item.prev is not None:
+            item.prev.next = item.next
+        else:
+            self._head = item.next
+        if item.next is not None:
+            item.next.prev = item.prev
+        else:
+            self._tail = item.prev
+        item.prev = item.next = None
+        item.queue = None
+        self._size -= 1
+        self._invalidate()
+
+    def _invalidate(self):
+        """編輯後清除列表與索引快取"""
+        self._items_cache = None
+        self._songs_cache = None
+        self._index_cache = None
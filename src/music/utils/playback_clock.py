@@ -0,0 +1,162 @@
+"""播放時鐘模組
+
+以 UI 事件迴圈的 after() 排程取代每首歌各自的進度輪詢線程:
+- 依設定的間隔發布播放位置
+- 在下一句歌詞的時間點準時喚醒 (不必等到下一個間隔)
+- 同一時間只保留一個待執行的排程，多個觸發來源合併為一次 UI 更新
+每個視窗只建立一個時鐘，所有回調都在 UI 線程執行。
+"""
+import bisect
+import math
+from typing import NamedTuple
+from src.core.logger import logger
+
+
+class ClockState(NamedTuple):
+    """播放狀態快照"""
+    position: float  # 目前播放位置 (秒)
+    duration: float  # 總時長 (秒)
+    paused: bool  # 是否暫停
+
+
+class PlaybackClock:
+    """播放進度時鐘"""
+
+    # 預設的進度更新間隔 (毫秒)
+    DEFAULT_TICK_MS = 500
+
+    # 暫停時檢查是否恢復播放的間隔 (毫秒)
+    PAUSED_POLL_MS = 500
+
+    # 最短喚醒間隔 (毫秒)，避免提早喚醒時密集重排
+    MIN_DELAY_MS = 5
+
+    # 歌詞邊界喚醒時額外延後的時間 (毫秒)，確保喚醒時已越過邊界
+    BOUNDARY_MARGIN_MS = 2
+
+    def __init__(self, scheduler, get_state, on_tick, tick_ms=DEFAULT_TICK_MS):
+        """初始化播放時鐘
+
+        Args:
+            scheduler: 提供 after(ms, func) 與 after_cancel(id) 的物件 (Tk 視窗)
+            get_state (callable): 返回 ClockState，沒有播放時返回 None
+            on_tick (callable): 以 ClockState 呼叫的 UI 更新函數
+            tick_ms (int): 進度更新間隔 (毫秒)
+        """
+        self.scheduler = scheduler
+        self.get_state = get_state
+        self.on_tick = on_tick
+        self.tick_ms = max(self.MIN_DELAY_MS, int(tick_ms))
+        self._boundaries = []
+        self._after_id = None
+
+    def is_running(self):
+        """是否有待執行的排程
+
+        Returns:
+            bool: 時鐘運作中則返回 True
+        """
+        return self._after_id is not None
+
+    def start(self):
+        """開始 (或重新開始) 發布進度，立即更新一次
+
+        已在運作中時只會把下一次更新提前，不會產生第二個迴圈。
+        """
+        self._schedule(0)
+
+    def request_update(self):
+        """要求盡快更新 (例如跳轉播放位置後)"""
+        self._schedule(0)
+
+    def stop(self):
+        """停止發布進度"""
+        if self._after_id is not None:
+            try:
+                self.scheduler.after_cancel(self._after_id)
+            except Exception:
+                # 視窗已銷毀
+                pass
+            self._after_id = None
+
+    def set_boundaries(self, times):
+        """設定需要準時喚醒的時間點 (歌詞時間)
+
+        Args:
+            times (iterable): 時間點 (秒)
+        """
+        self._boundaries = sorted(times)
+        if self._after_id is not None:
+            # 以新的邊界重新計算下一次喚醒時間
+            self._schedule(0)
+
+    def next_boundary(self, position):
+        """取得目前位置之後的第一個邊界
+
+        Args:
+            position (float): 播放位置 (秒)
+
+        Returns:
+            float: 邊界時間，沒有時返回 None
+        """
+        index = bisect.bisect_right(self._boundaries, position)
+        if index < len(self._boundaries):
+            return self._boundaries[index]
+        return None
+
+    def _schedule(self, delay_ms):
+        """排程下一次更新 (取代尚未執行的排程)
+
+        Args:
+            delay_ms (int): 延遲 (毫秒)
+        """
+        self.stop()
+        try:
+            self._after_id = self.scheduler.after(int(delay_ms), self._run)
+        except Exception as e:
+            # 視窗已銷毀
+            logger.debug(f"無法排程播放進度更新: {e}")
+            self._after_id = None
+
+    def _run(self):
+        """執行一次更新並排程下一次"""
+        self._after_id = None
+
+        try:
+            state = self.get_state()
+        except Exception as e:
+            logger.error(f"取得播放狀態時發生錯誤: {e}")
+            return
+
+        if state is None:
+            # 沒有播放中的歌曲，等待下一次 start()
+            return
+
+        if state.paused:
+            self._schedule(self.PAUSED_POLL_MS)
+            return
+
+        try:
+            self.on_tick(state)
+        except Exception as e:
+            logger.error(f"更新進度時發生錯誤: {e}")
+
+        # on_tick 可能已切換歌曲並重新排程
+        if self._after_id is None:
+            self._schedule(self._next_delay(state.position))
+
+    def _next_delay(self, position):
+        """計算到下一次更新的延遲
+
+        Args:
+            position (float): 目前播放位置 (秒)
+
+        Returns:
+            int: 延遲 (毫秒)
+        """
+        delay = self.tick_ms
+        boundary = self.next_boundary(position)
+        if boundary is not None:
+            until_boundary = (boundary - position) * 1000 + self.BOUNDARY_MARGIN_MS
+            delay = min(delay, until_boundary)
+        return max(self.MIN_DELAY_MS, math.ceil(delay))
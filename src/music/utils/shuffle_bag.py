@@ -0,0 +1,246 @@
+"""隨機播放順序模組
+
+以 Fisher–Yates 洗牌產生播放順序，只在需要下一首時才抽出歌曲 (延遲洗牌):
+- 下一首 / 上一首只移動游標，O(1)
+- 一輪播完後重新洗牌，且新一輪的第一首不會與上一首相同
+- 加入、移除、插到下一首都是 O(1)，保留本輪已播放的順序
+
+順序中的值可以是歌曲索引 (reset(size)) 或任何可雜湊的控制代碼 (例如 PlayQueue 的 QueueItem)；
+使用控制代碼時移動佇列中的歌曲不影響隨機順序。
+"""
+import random
+from collections import deque
+
+
+class ShuffleBag:
+    """隨機播放順序
+
+    順序分為三段:
+    - _history: 本輪已播放 (最後一個為目前歌曲)
+    - _upcoming: 已決定但尚未播放 (插到下一首、peek 或上一首後留下的順序)
+    - _pool: 尚未抽出的值 (順序不具意義，以 _pool_positions 做 O(1) 移除)
+    已移除的值只從 _members 刪除，留在 _history / _upcoming 的項目在經過時略過。
+    """
+
+    def __init__(self, size=0, rng=None):
+        """初始化隨機播放順序
+
+        Args:
+            size (int): 歌曲數量
+            rng (random.Random): 亂數產生器 (測試用)，None 表示使用 random 模組
+        """
+        self._rng = rng or random.Random()
+        self._members = set()
+        self._history = []
+        self._upcoming = deque()
+        self._pinned = 0  # _upcoming 開頭「插到下一首」的數量
+        self._pool = []
+        self._pool_positions = {}
+        self.reset(size)
+
+    @property
+    def size(self):
+        """歌曲數量"""
+        return len(self._members)
+
+    @property
+    def current(self):
+        """目前的值，尚未開始或目前歌曲已移除時為 None"""
+        if self._history and self._history[-1] in self._members:
+            return self._history[-1]
+        return None
+
+    def reset(self, values, start=None):
+        """開始新的一輪
+
+        Args:
+            values (int | iterable): 歌曲數量 (值為索引 0..size-1)，或要洗牌的值
+            start: 目前正在播放的值，會作為本輪第一首 (不會在本輪重複播放)
+        """
+        values = list(range(values)) if isinstance(values, int) else list(values)
+        self._members = set(values)
+        self._history = []
+        self._upcoming = deque()
+        self._pinned = 0
+        self._pool = values
+        self._pool_positions = {value: position for position, value in enumerate(values)}
+        if start is not None and start in self._pool_positions:
+            self._take_from_pool(start)
+            self._history.append(start)
+
+    def played(self):
+        """本輪已播放的值 (依播放順序，包含目前歌曲)
+
+        Returns:
+            list: 值的列表
+        """
+        return [value for value in self._history if value in self._members]
+
+    def next(self):
+        """移到下一首
+
+        Returns:
+            歌曲的值，沒有歌曲時返回 None
+        """
+        if not self._members:
+            return None
+
+        while self._upcoming:
+            value = self._upcoming.popleft()
+            if self._pinned:
+                self._pinned -= 1
+            if value in self._members:
+                self._history.append(value)
+                return value
+
+        value = self._draw() if self._pool else self._reshuffle()
+        self._history.append(value)
+        return value
+
+    def previous(self):
+        """回到本輪的上一首
+
+        Returns:
+            歌曲的值，已是本輪第一首時返回 None
+        """
+        history = self._history
+        if not history:
+            return None
+
+        current = history.pop()
+        self._trim_history()
+        if not history:
+            if current in self._members:
+                history.append(current)
+            return None
+
+        if current in self._members:
+            self._upcoming.appendleft(current)
+        self._pinned = 0
+        return history[-1]
+
+    def peek(self, count):
+        """取得接下來的歌曲 (不移動游標，只預覽本輪剩餘的部分)
+
+        Args:
+            count (int): 最多取得的歌曲數
+
+        Returns:
+            list: 值的列表
+        """
+        upcoming = [value for value in self._upcoming if value in self._members][:count]
+        while len(upcoming) < count and self._pool:
+            value = self._draw()
+            self._upcoming.append(value)
+            upcoming.append(value)
+        return upcoming
+
+    def add(self, value):
+        """加入一首歌曲 (放入尚未抽出的部分，本輪稍後隨機播放)
+
+        Args:
+            value: 新的值 (不可已在順序中)
+        """
+        self._members.add(value)
+        self._pool_positions[value] = len(self._pool)
+        self._pool.append(value)
+
+    def pin_next(self, value):
+        """加入一首歌曲並排在目前歌曲之後 (下一首播放)
+
+        連續加入的歌曲依加入順序排在目前歌曲之後。
+
+        Args:
+            value: 新的值，或尚未抽出的值 (移到下一首)
+        """
+        if value in self._pool_positions:
+            self._take_from_pool(value)
+        self._members.add(value)
+        self._upcoming.insert(self._pinned, value)
+        self._pinned += 1
+
+    def discard(self, value):
+        """移除一首歌曲 (不在順序中時忽略)
+
+        移除目前歌曲時，上一首與下一首仍是原本排定的歌曲。
+
+        Args:
+            value: 要移除的值
+        """
+        if value not in self._members:
+            return
+        self._members.discard(value)
+        if value in self._pool_positions:
+            self._take_from_pool(value)
+
+    def insert(self, index):
+        """播放清單在 index 插入一首歌曲 (值為索引時使用，O(n))
+
+        插入位置之後的索引加 1，新歌曲放入尚未抽出的部分，本輪稍後隨機播放。
+
+        Args:
+            index (int): 插入的位置
+        """
+        self._remap(lambda value: value + 1 if value >= index else value)
+        self.add(index)
+
+    def remove(self, index):
+        """播放清單移除 index 的歌曲 (值為索引時使用，O(n))
+
+        移除位置之後的索引減 1；移除目前歌曲時，下一首仍是原本排定的下一首。
+
+        Args:
+            index (int): 移除的位置
+        """
+        if index not in self._members:
+            return
+        self.discard(index)
+        self._remap(lambda value: value - 1 if value > index else value)
+
+    def _draw(self):
+        """延遲洗牌: 從尚未抽出的部分隨機取出一個值"""
+        value = self._pool[self._rng.randrange(len(self._pool))]
+        self._take_from_pool(value)
+        return value
+
+    def _take_from_pool(self, value):
+        """從尚未抽出的部分移除值 (與最後一個交換後移除，O(1))"""
+        position = self._pool_positions.pop(value)
+        last = self._pool.pop()
+        if position < len(self._pool):
+            self._pool[position] = last
+            self._pool_positions[last] = position
+
+    def _trim_history(self):
+        """移除已播放部分結尾的已移除項目"""
+        while self._history and self._history[-1] not in self._members:
+            self._history.pop()
+
+    def _remap(self, mapping):
+        """以 mapping 轉換所有值 (同時清除已移除的項目)"""
+        members = self._members
+        self._history = [mapping(value) for value in self._history if value in members]
+        self._upcoming = deque(mapping(value) for value in self._upcoming if value in members)
+        self._pinned = 0
+        self._pool = [mapping(value) for value in self._pool]
+        self._pool_positions = {value: position for position, value in enumerate(self._pool)}
+        self._members = {mapping(value) for value in members}
+
+    def _reshuffle(self):
+        """一輪結束，重新洗牌並抽出新一輪的第一首 (避免與上一首相同)
+
+        Returns:
+            新一輪第一首的值
+        """
+        last = self.current
+        members = self._members
+        # 一輪結束時所有歌曲都在已播放的部分
+        self.reset([value for value in self._history if value in members])
+        if len(self._pool) < 2 or last is None:
+            return self._draw()
+
+        # 先抽出第一首，排除上一首
+        self._take_from_pool(last)
+        first = self._draw()
+        self.add(last)
+        return first
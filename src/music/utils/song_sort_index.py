@@ -0,0 +1,153 @@
+"""歌曲排序索引模組
+
+- 排序鍵在掃描音樂庫時計算一次 (casefold 後的標題、藝術家，數值時長，加入時間)，存放在歌曲的 'sort_keys'
+- 每個 (來源, 欄位) 只排序一次，快取升序的索引排列
+- 降序是升序排列的反向檢視，不需重新排序或複製
+"""
+from collections import OrderedDict
+from collections.abc import Sequence
+
+
+# 可排序的欄位
+SORT_FIELDS = ('title', 'uploader', 'duration', 'added')
+
+
+def make_sort_keys(song):
+    """計算歌曲的排序鍵
+
+    Args:
+        song (dict): 歌曲資訊 (可包含 'added_time')
+
+    Returns:
+        dict: {欄位: 排序鍵}
+    """
+    try:
+        duration = float(song.get('duration') or 0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    return {
+        'title': str(song.get('title') or '').casefold(),
+        'uploader': str(song.get('uploader') or '').casefold(),
+        'duration': duration,
+        'added': song.get('added_time') or 0,
+    }
+
+
+def get_sort_key(song, field):
+    """取得歌曲某個欄位的排序鍵 (沒有預先計算時即時計算)
+
+    Args:
+        song (dict): 歌曲資訊
+        field (str): 欄位名稱
+
+    Returns:
+        排序鍵
+    """
+    keys = song.get('sort_keys')
+    if keys is None:
+        keys = make_sort_keys(song)
+    return keys[field]
+
+
+class ReversedOrder(Sequence):
+    """索引排列的反向檢視 (O(1) 建立，不複製)"""
+
+    __slots__ = ('_order',)
+
+    def __init__(self, order):
+        """初始化反向檢視
+
+        Args:
+            order (Sequence): 原本的索引排列
+        """
+        self._order = order
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self._order)))]
+        if position < 0:
+            position += len(self._order)
+        if not 0 <= position < len(self._order):
+            raise IndexError("索引超出範圍")
+        return self._order[len(self._order) - 1 - position]
+
+    def __iter__(self):
+        return reversed(self._order)
+
+    def __reversed__(self):
+        return iter(self._order)
+
+
+class SongSortIndex:
+    """歌曲排序索引快取
+
+    快取以 (來源, 欄位) 為鍵，並記錄排序時的歌曲列表物件與長度；
+    列表被替換或長度改變時自動重新排序。
+    """
+
+    # 最多快取的排列數
+    MAX_ENTRIES = 32
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        """初始化排序索引
+
+        Args:
+            max_entries (int): 最多快取的排列數
+        """
+        self.max_entries = max(1, max_entries)
+        self._cache = OrderedDict()  # {(來源, 欄位): (歌曲列表, 長度, 升序排列)}
+
+    def get_order(self, songs, field, ascending=True, source=None):
+        """取得排序後的索引排列
+
+        Args:
+            songs (list): 歌曲列表
+            field (str): 排序欄位 (SORT_FIELDS 之一)
+            ascending (bool): 是否升序
+            source: 快取的來源鍵 (例如分類)，None 表示不快取
+
+        Returns:
+            Sequence: 依顯示順序排列的 songs 索引
+
+        Raises:
+            ValueError: 不支援的排序欄位
+        """
+        if field not in SORT_FIELDS:
+            raise ValueError(f"不支援的排序欄位: {field}")
+
+        order = self._ascending_order(songs, field, source)
+        return order if ascending else ReversedOrder(order)
+
+    def invalidate(self, source=None):
+        """清除快取
+
+        Args:
+            source: 只清除此來源的排列，None 表示全部清除
+        """
+        if source is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == source]:
+            del self._cache[key]
+
+    def _ascending_order(self, songs, field, source):
+        """取得 (必要時計算) 升序排列"""
+        key = (source, field)
+        if source is not None:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] is songs and cached[1] == len(songs):
+                self._cache.move_to_end(key)
+                return cached[2]
+
+        keys = [get_sort_key(song, field) for song in songs]
+        order = sorted(range(len(songs)), key=keys.__getitem__)
+
+        if source is not None:
+            self._cache[key] = (songs, len(songs), order)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return order
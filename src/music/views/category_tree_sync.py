@@ -0,0 +1,306 @@
+"""分類樹同步模組
+
+重新載入音樂庫時不再清空並重建整棵 Treeview，而是比對新舊結構:
+- 只對有變化的節點執行新增、刪除、改名 (更新文字) 與移動
+- 既有節點保留原本的 Tk 項目，因此展開狀態與選取不會遺失
+- Tk 呼叫分批在 after_idle 中執行，每批之間讓出事件迴圈，UI 不會被長時間阻塞
+"""
+import tkinter as tk
+from collections import deque
+from typing import NamedTuple
+from src.core.logger import logger
+
+
+class TreeNode(NamedTuple):
+    """期望的節點結構
+
+    key 只需在同一個父節點下唯一 (例如 'folder:名稱'、'song:ID')，
+    冒號前的部分為節點種類。key 消失的節點只在配對明確時視為改名 (沿用 Tk 項目):
+    有共同子節點且彼此唯一，或該種類各只剩一個、都沒有子節點且前一個節點相同。
+    """
+    key: str
+    text: str
+    values: tuple = ()
+    tags: tuple = ()
+    open: bool = False  # 只在新增節點時套用，既有節點保留使用者的展開狀態
+    children: tuple = ()
+
+
+class _SyncedNode:
+    """已同步到 Treeview 的節點"""
+
+    __slots__ = ('key', 'iid', 'text', 'values', 'tags', 'children')
+
+    def __init__(self, key, iid, text, values, tags):
+        self.key = key
+        self.iid = iid
+        self.text = text
+        self.values = values
+        self.tags = tags
+        self.children = []
+
+
+class CategoryTreeSync:
+    """以差異更新同步 Treeview 的內容"""
+
+    # 每次 after_idle 回調最多執行的 Tk 呼叫數
+    BATCH_SIZE = 200
+
+    def __init__(self, tree, batch_size=BATCH_SIZE):
+        """初始化同步器
+
+        Args:
+            tree (ttk.Treeview): 要同步的 Treeview
+            batch_size (int): 每批執行的 Tk 呼叫數
+        """
+        self.tree = tree
+        self.batch_size = max(1, batch_size)
+        self._roots = []  # 目前 Treeview 中的頂層節點 (_SyncedNode)
+        self._pending = deque()  # 尚未執行的 Tk 操作
+        self._on_done = None
+        self._after_id = None
+        self._next_iid = 0
+
+    def is_pending(self):
+        """是否還有尚未執行的操作
+
+        Returns:
+            bool: 同步中則返回 True
+        """
+        return bool(self._pending) or self._after_id is not None
+
+    def sync(self, nodes, on_done=None):
+        """同步到新的結構
+
+        第一批操作立即執行，其餘的在之後的 after_idle 中執行。
+
+        Args:
+            nodes (iterable): 頂層的 TreeNode
+            on_done (callable): 全部操作完成後呼叫
+        """
+        # 先完成上一次尚未執行的操作，確保比對的基準與 Treeview 一致
+        self.flush()
+
+        operations = []
+        self._roots = self._diff_children('', self._roots, list(nodes), operations)
+        self._pending.extend(operations)
+        self._on_done = on_done
+        self._run_batch()
+
+    def flush(self):
+        """立即執行所有尚未執行的操作"""
+        self._cancel_scheduled()
+        while self._pending:
+            self._apply(self._pending.popleft())
+        self._finish()
+
+    def reset(self):
+        """捨棄同步記錄 (呼叫端已自行清空 Treeview)"""
+        self._cancel_scheduled()
+        self._pending.clear()
+        self._on_done = None
+        self._roots = []
+
+    def iid_of(self, *path):
+        """依 key 路徑取得節點的 Tk 項目 ID
+
+        Args:
+            *path (str): 由頂層開始的 key
+
+        Returns:
+            str: 項目 ID，不存在時返回 None
+        """
+        children = self._roots
+        node = None
+        for key in path:
+            node = next((child for child in children if child.key == key), None)
+            if node is None:
+                return None
+            children = node.children
+        return node.iid if node is not None else None
+
+    # ==================== 比對 ====================
+
+    def _diff_children(self, parent_iid, old_children, new_children, operations):
+        """比對同一個父節點下的子節點並產生操作
+
+        Args:
+            parent_iid (str): 父節點的項目 ID ('' 為根)
+            old_children (list): 目前的 _SyncedNode
+            new_children (list): 期望的 TreeNode
+            operations (list): 產生的操作 (依序加入)
+
+        Returns:
+            list: 同步後的 _SyncedNode
+        """
+        new_keys = {node.key for node in new_children}
+
+        # key 相同的節點直接配對，其餘 (不再存在或重複 key) 的舊節點等待改名配對
+        old_by_key = {}
+        leftovers = []
+        for node in old_children:
+            if node.key in new_keys and node.key not in old_by_key:
+                old_by_key[node.key] = node
+            else:
+                leftovers.append(node)
+
+        matched = [old_by_key.pop(spec.key, None) for spec in new_children]
+        renames = self._match_renames(old_children, new_children, leftovers, matched)
+        for index, node in renames.items():
+            matched[index] = node
+
+        # 先刪除沒有配對到的舊節點 (Tk 會一併刪除其子節點)
+        renamed = {id(node) for node in renames.values()}
+        for node in leftovers:
+            if id(node) not in renamed:
+                operations.append(('delete', node.iid))
+
+        # 依新順序新增、更新與移動
+        reused = {id(node) for node in matched if node is not None}
+        order = [node.iid for node in old_children if id(node) in reused]
+        result = []
+        for index, (spec, node) in enumerate(zip(new_children, matched)):
+            values = tuple(spec.values)
+            tags = tuple(spec.tags)
+            if node is None:
+                node = _SyncedNode(spec.key, self._new_iid(), spec.text, values, tags)
+                operations.append(('insert', parent_iid, index, node.iid, spec.text, values, tags, spec.open))
+                order.insert(index, node.iid)
+            else:
+                if (node.text, node.values, node.tags) != (spec.text, values, tags):
+                    operations.append(('item', node.iid, spec.text, values, tags))
+                    node.text, node.values, node.tags = spec.text, values, tags
+                node.key = spec.key
+                if order[index] != node.iid:
+                    operations.append(('move', node.iid, parent_iid, index))
+                    order.remove(node.iid)
+                    order.insert(index, node.iid)
+            node.children = self._diff_children(node.iid, node.children, list(spec.children), operations)
+            result.append(node)
+        return result
+
+    def _match_renames(self, old_children, new_children, leftovers, matched):
+        """找出明確的改名配對 (key 消失的舊節點 -> 沒有配對的新節點)
+
+        只在配對不會混淆時沿用舊節點，避免無關的新節點接收舊節點的展開與選取狀態:
+        - 有共同的子節點 key (例如改名資料夾下相同的歌曲)，且雙方都只有這一個候選
+        - 否則該種類各只剩一個、都沒有子節點，且前一個兄弟節點的 key 相同 (位置相同)
+
+        Args:
+            old_children (list): 目前的 _SyncedNode
+            new_children (list): 期望的 TreeNode
+            leftovers (list): 沒有以 key 配對到的舊節點
+            matched (list): 每個新節點以 key 配對到的舊節點 (None 表示沒有)
+
+        Returns:
+            dict: {新節點索引: 沿用的 _SyncedNode}
+        """
+        unmatched = [index for index, node in enumerate(matched) if node is None]
+        if not leftovers or not unmatched:
+            return {}
+
+        renames = {}
+        # 有共同子節點且彼此唯一的配對
+        old_keys = {id(node): {child.key for child in node.children} for node in leftovers}
+        candidates = {}
+        claimed_by = {}
+        for index in unmatched:
+            spec = new_children[index]
+            child_keys = {child.key for child in spec.children}
+            if not child_keys:
+                continue
+            candidates[index] = [
+                node for node in leftovers
+                if self._kind(node.key) == self._kind(spec.key) and old_keys[id(node)] & child_keys
+            ]
+            for node in candidates[index]:
+                claimed_by.setdefault(id(node), []).append(index)
+        for index, nodes in candidates.items():
+            if len(nodes) == 1 and len(claimed_by[id(nodes[0])]) == 1:
+                renames[index] = nodes[0]
+
+        # 各只剩一個、沒有子節點且位置相同
+        renamed = {id(node) for node in renames.values()}
+        remaining_old = {}
+        for node in leftovers:
+            if id(node) not in renamed:
+                remaining_old.setdefault(self._kind(node.key), []).append(node)
+        remaining_new = {}
+        for index in unmatched:
+            if index not in renames:
+                remaining_new.setdefault(self._kind(new_children[index].key), []).append(index)
+
+        old_previous = {id(node): (old_children[position - 1].key if position else None)
+                        for position, node in enumerate(old_children)}
+        for kind, indexes in remaining_new.items():
+            nodes = remaining_old.get(kind, [])
+            if len(indexes) != 1 or len(nodes) != 1:
+                continue
+            index, node = indexes[0], nodes[0]
+            previous_key = new_children[index - 1].key if index else None
+            if (not node.children and not new_children[index].children
+                    and old_previous[id(node)] == previous_key):
+                renames[index] = node
+        return renames
+
+    @staticmethod
+    def _kind(key):
+        """節點種類 (key 冒號前的部分)"""
+        return key.split(':', 1)[0]
+
+    def _new_iid(self):
+        """產生新的項目 ID"""
+        self._next_iid += 1
+        return f"node{self._next_iid}"
+
+    # ==================== 執行 ====================
+
+    def _run_batch(self):
+        """執行一批操作，還有剩餘時排程下一批"""
+        self._after_id = None
+        for _ in range(min(self.batch_size, len(self._pending))):
+            self._apply(self._pending.popleft())
+
+        if self._pending:
+            try:
+                self._after_id = self.tree.after_idle(self._run_batch)
+                return
+            except Exception as e:
+                # 視窗已銷毀
+                logger.debug(f"無法排程分類樹更新: {e}")
+                self._pending.clear()
+        self._finish()
+
+    def _finish(self):
+        """所有操作完成後呼叫完成回調"""
+        on_done, self._on_done = self._on_done, None
+        if on_done:
+            on_done()
+
+    def _cancel_scheduled(self):
+        """取消已排程的批次"""
+        if self._after_id is not None:
+            try:
+                self.tree.after_cancel(self._after_id)
+            except Exception:
+                # 視窗已銷毀
+                pass
+            self._after_id = None
+
+    def _apply(self, operation):
+        """執行一個 Tk 操作"""
+        kind = operation[0]
+        try:
+            if kind == 'delete':
+                self.tree.delete(operation[1])
+            elif kind == 'insert':
+                _, parent, index, iid, text, values, tags, is_open = operation
+                self.tree.insert(parent, index, iid=iid, text=text, values=values, tags=tags, open=is_open)
+            elif kind == 'item':
+                _, iid, text, values, tags = operation
+                self.tree.item(iid, text=text, values=values, tags=tags)
+            elif kind == 'move':
+                _, iid, parent, index = operation
+                self.tree.move(iid, parent, index)
+        except tk.TclError as e:
+            logger.warning(f"更新分類樹失敗 ({kind}): {e}")
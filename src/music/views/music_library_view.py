@@ -3,14 +3,27 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import customtkinter as ctk
 from src.core.logger import logger
+from src.music.views.virtual_song_list import VirtualSongList
+from src.music.views.category_tree_sync import CategoryTreeSync, TreeNode
+from src.music.utils.song_sort_index import SongSortIndex
+from src.utils.ui_dispatcher import UIDispatcher
 
 
 class MusicLibraryView:
     """音樂庫視圖類別 - 負責顯示資料夾樹和歌曲列表"""
 
+    # 排序選單項目對應的排序欄位
+    SORT_FIELDS = {
+        "歌曲名稱": 'title',
+        "藝術家": 'uploader',
+        "時長": 'duration',
+        "加入時間": 'added',
+    }
+
     def __init__(self, parent, music_manager, on_category_select=None,
                  on_song_select=None, on_song_double_click=None,
-                 on_category_rename=None, on_category_delete=None):
+                 on_category_rename=None, on_category_delete=None,
+                 on_library_loaded=None, ui_dispatcher=None):
         """初始化音樂庫視圖
 
         Args:
@@ -21,6 +34,8 @@ class MusicLibraryView:
             on_song_double_click: 歌曲雙擊回調函數
             on_category_rename: 分類重命名回調函數
             on_category_delete: 分類刪除回調函數
+            on_library_loaded: 音樂庫掃描完成回調函數
+            ui_dispatcher (UIDispatcher): UI 更新派送佇列，None 表示以父視窗建立
         """
         self.parent = parent
         self.music_manager = music_manager
@@ -29,9 +44,21 @@ class MusicLibraryView:
         self.on_song_double_click = on_song_double_click
         self.on_category_rename = on_category_rename
         self.on_category_delete = on_category_delete
+        self.on_library_loaded = on_library_loaded
+        self.ui_dispatcher = ui_dispatcher or UIDispatcher(parent)
 
-        # 當前播放列表
+        # 當前播放列表 (依顯示順序)
         self.current_playlist = []
+        self._source_songs = []  # display_songs 傳入的原始順序 (排序只替換索引陣列)
+        self._source_ref = []  # display_songs 傳入的列表物件 (排序快取的驗證依據)
+        self._source_key = None  # 目前顯示的來源 ('all' 或 'folder:名稱')，None 表示不快取排序
+        self.sort_index = SongSortIndex()  # 各來源與欄位的排序快取
+        self.song_list = None  # 虛擬化歌曲列表 (VirtualSongList)
+
+        # 分類樹差異更新 (CategoryTreeSync) 與錯誤訊息節點
+        self.category_sync = None
+        self._status_node = None
+        self._loading_nodes = []  # 掃描中的「載入中」節點 (合併的掃描結果一併移除)
 
         # 排序狀態
         self.sort_by = "歌曲名稱"
@@ -113,6 +140,7 @@ class MusicLibraryView:
         )
         self.category_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         category_scroll.config(command=self.category_tree.yview)
+        self.category_sync = CategoryTreeSync(self.category_tree)
 
         # 綁定事件
         self.category_tree.bind('<<TreeviewSelect>>', self._on_category_select_internal)
@@ -168,7 +196,6 @@ class MusicLibraryView:
             song_tree_frame,
             columns=('title', 'artist', 'duration'),
             show='headings',
-            yscrollcommand=song_scroll.set,
             style="Song.Treeview",
             selectmode='browse'
         )
@@ -184,7 +211,8 @@ class MusicLibraryView:
         self.song_tree.column('duration', width=80, anchor=tk.E)
 
         self.song_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        song_scroll.config(command=self.song_tree.yview)
+        # 只建立可見範圍的列，捲軸由虛擬化列表控制
+        self.song_list = VirtualSongList(self.song_tree, song_scroll, self._format_song_row)
         self.song_tree.bind('<Double-1>', self._on_song_double_click)
         self.song_tree.bind('<Button-3>', self._on_song_right_click)
 
@@ -211,7 +239,7 @@ class MusicLibraryView:
         # 排序方式選單
         self.sort_menu = ctk.CTkOptionMenu(
             sort_frame,
-            values=["歌曲名稱", "藝術家", "時長"],
+            values=list(self.SORT_FIELDS),
             command=self._on_sort_change,
             width=120,
             height=32,
@@ -252,30 +280,22 @@ class MusicLibraryView:
         if not self.current_playlist:
             return
 
-        # 根據選擇的排序方式排序
-        if self.sort_by == "歌曲名稱":
-            sorted_playlist = sorted(
-                self.current_playlist,
-                key=lambda x: x.get('title', '').lower(),
-                reverse=not self.ascending
-            )
-        elif self.sort_by == "藝術家":
-            sorted_playlist = sorted(
-                self.current_playlist,
-                key=lambda x: x.get('uploader', '').lower(),
-                reverse=not self.ascending
-            )
-        elif self.sort_by == "時長":
-            sorted_playlist = sorted(
-                self.current_playlist,
-                key=lambda x: x.get('duration', 0),
-                reverse=not self.ascending
-            )
+        if self.current_playlist is not self.song_list.items():
+            # 播放列表已被替換 (例如選擇了單首歌曲)，以它作為排序來源
+            self.display_songs(self.current_playlist)
+
+        # 根據選擇的排序方式取得索引排列 (同一來源與欄位只排序一次，降序為反向檢視)
+        field = self.SORT_FIELDS.get(self.sort_by)
+        if field is None:
+            order = range(len(self._source_songs))
         else:
-            sorted_playlist = self.current_playlist
+            order = self.sort_index.get_order(
+                self._source_ref, field, self.ascending, source=self._source_key
+            )
 
-        # 更新顯示
-        self.display_songs(sorted_playlist)
+        # 更新顯示 (不重建列表項目)
+        self.song_list.set_order(order)
+        self.current_playlist = self.song_list.items()
 
     def _on_song_right_click(self, event):
         """歌曲右鍵選單"""
@@ -286,9 +306,9 @@ class MusicLibraryView:
 
         # 選中該項目
         self.song_tree.selection_set(item_id)
-        item_index = self.song_tree.index(item_id)
+        item_index = self.song_list.position_of(item_id)
 
-        if item_index >= len(self.current_playlist):
+        if not 0 <= item_index < len(self.current_playlist):
             return
 
         song = self.current_playlist[item_index]
@@ -518,83 +538,105 @@ class MusicLibraryView:
 
     def _load_music_library(self):
         """載入音樂庫（異步掃描）"""
-        # 顯示載入中訊息
-        for item in self.category_tree.get_children():
-            self.category_tree.delete(item)
-        loading_node = self.category_tree.insert('', 'end', text='⏳ 載入音樂庫中...')
+        # 顯示載入中訊息 (保留現有節點，掃描完成後只更新有變化的部分)
+        self.category_sync.flush()
+        self._loading_nodes.append(self.category_tree.insert('', 'end', text='⏳ 載入音樂庫中...'))
 
         def on_scan_complete(result):
-            """掃描完成的回調函數"""
-            try:
-                # 在主執行緒中更新 UI
-                self.parent.after(0, lambda: self._update_library_ui(result, loading_node))
-            except Exception as e:
-                logger.error(f"更新 UI 失敗: {e}", exc_info=True)
+            """掃描完成的回調函數 (工作執行緒)"""
+            # 在主執行緒中更新 UI (連續掃描時只套用最新的結果)
+            self.ui_dispatcher.post(self._finish_library_load, result, key='library_loaded')
 
         # 異步掃描音樂庫
         self.music_manager.scan_music_library_async(callback=on_scan_complete)
 
-    def _update_library_ui(self, result, loading_node=None):
-        """更新音樂庫 UI（在主執行緒中調用）"""
-        # 移除載入中訊息
-        if loading_node:
-            try:
-                self.category_tree.delete(loading_node)
-            except:
-                pass
+    def _finish_library_load(self, result):
+        """掃描完成後更新 UI 並通知外部（在主執行緒中調用）"""
+        self._update_library_ui(result)
+        if result['success'] and self.on_library_loaded:
+            self.on_library_loaded()
 
-        # 清空樹狀結構
-        for item in self.category_tree.get_children():
-            self.category_tree.delete(item)
+    def _update_library_ui(self, result):
+        """更新音樂庫 UI（在主執行緒中調用）"""
+        # 移除載入中與錯誤訊息
+        loading_nodes, self._loading_nodes = self._loading_nodes, []
+        for node in loading_nodes + [self._status_node]:
+            if node:
+                try:
+                    self.category_tree.delete(node)
+                except:
+                    pass
+        self._status_node = None
 
         if not result['success']:
             logger.error(f"載入音樂庫失敗: {result['message']}")
-            error_node = self.category_tree.insert('', 'end', text=f'❌ {result["message"]}')
+            # 清空樹狀結構，只顯示錯誤訊息
+            self.category_sync.reset()
+            for item in self.category_tree.get_children():
+                self.category_tree.delete(item)
+            self._status_node = self.category_tree.insert('', 'end', text=f'❌ {result["message"]}')
             return
 
-        # 新增 "所有歌曲" 根節點
-        all_songs_node = self.category_tree.insert('', 'end', text='📋 所有歌曲', values=('all',), open=True)
+        # 重新掃描後的歌曲列表已替換，捨棄舊的排序快取
+        self.sort_index.invalidate()
+
+        # 只套用與目前樹狀結構的差異 (保留展開與選取狀態)
+        self.category_sync.sync(self._build_category_nodes(), on_done=self._on_category_tree_synced)
+
+    def _build_category_nodes(self):
+        """建立分類樹的期望結構
+
+        Returns:
+            list: 頂層的 TreeNode ("所有歌曲" 與各資料夾)
+        """
+        # "所有歌曲" 根節點
+        nodes = [TreeNode('all', '📋 所有歌曲', values=('all',), open=True)]
 
         # 載入分類(資料夾) - 包含空資料夾
         categories = self.music_manager.get_all_categories()
         for category in categories:
-            # 新增資料夾節點(即使是空資料夾也顯示)
-            folder_node = self.category_tree.insert(
-                '', 'end',
-                text=f'📁 {category}',
-                values=(f'folder:{category}',),
-                open=False
-            )
-
             # 載入該資料夾下的歌曲
             songs = self.music_manager.get_songs_by_category(category)
             if songs:
+                children = []
                 for song in songs:
                     duration_str = self.music_manager.format_duration(song['duration'])
-                    song_text = f'🎵 {song["title"]} ({duration_str})'
                     song_id = song.get('id', '')
-                    self.category_tree.insert(
-                        folder_node, 'end',
-                        text=song_text,
+                    children.append(TreeNode(
+                        f'song:{song_id}',
+                        f'🎵 {song["title"]} ({duration_str})',
                         values=(f'song:{song_id}',)
-                    )
+                    ))
             else:
                 # 空資料夾:新增一個提示節點
-                self.category_tree.insert(
-                    folder_node, 'end',
-                    text='   (空資料夾)',
-                    values=('empty',),
-                    tags=('empty',)
-                )
+                children = [TreeNode('empty', '   (空資料夾)', values=('empty',), tags=('empty',))]
+
+            # 資料夾節點(即使是空資料夾也顯示)
+            nodes.append(TreeNode(
+                f'folder:{category}',
+                f'📁 {category}',
+                values=(f'folder:{category}',),
+                children=tuple(children)
+            ))
+        return nodes
+
+    def _on_category_tree_synced(self):
+        """分類樹更新完成後重新載入選取分類的歌曲"""
+        _, item_type = self._get_selected_category_info()
 
-        # 預設選擇所有歌曲
-        self.category_tree.selection_set(all_songs_node)
-        self._load_all_songs()
+        if item_type is None:
+            # 沒有選取 (首次載入或選取的資料夾已刪除): 預設選擇所有歌曲
+            self.category_tree.selection_set(self.category_sync.iid_of('all'))
+            self._load_all_songs()
+        elif item_type == 'all':
+            self._load_all_songs()
+        elif item_type.startswith('folder:'):
+            self._load_folder_songs_view(item_type)
 
     def _load_all_songs(self):
         """載入所有歌曲"""
         songs = self.music_manager.get_all_songs()
-        self.display_songs(songs)
+        self.display_songs(songs, source='all')
 
     def _get_selected_category_info(self):
         """取得選中的分類資訊
@@ -622,7 +664,7 @@ class MusicLibraryView:
         """
         category_name = folder_type.replace('folder:', '')
         songs = self.music_manager.get_songs_by_category(category_name)
-        self.display_songs(songs)
+        self.display_songs(songs, source=folder_type)
 
     def _handle_song_selection(self, song_id, item_id):
         """處理歌曲選擇，更新播放列表
@@ -791,30 +833,40 @@ class MusicLibraryView:
 
         # 獲取選中的項目索引
         item_id = selection[0]
-        item_index = self.song_tree.index(item_id)
+        item_index = self.song_list.position_of(item_id)
 
-        if item_index < len(self.current_playlist):
+        if 0 <= item_index < len(self.current_playlist):
             song = self.current_playlist[item_index]
             if self.on_song_double_click:
                 self.on_song_double_click(song, self.current_playlist, item_index)
 
-    def display_songs(self, songs):
+    def display_songs(self, songs, source=None):
         """顯示歌曲列表
 
         Args:
             songs (list): 歌曲列表
+            source (str): 歌曲來源 ('all' 或 'folder:名稱')，用於快取排序結果
         """
-        self.current_playlist = songs
+        self._source_songs = list(songs)
+        self._source_ref = songs
+        self._source_key = source
 
-        # 清空 Treeview
-        for item in self.song_tree.get_children():
-            self.song_tree.delete(item)
+        # 只格式化並顯示可見範圍的列
+        self.song_list.set_items(self._source_songs)
+        self.current_playlist = self.song_list.items()
 
-        # 插入歌曲到 Treeview
-        for song in songs:
-            duration_str = self.music_manager.format_duration(song['duration'])
-            artist = song.get('uploader', 'Unknown')
-            self.song_tree.insert('', 'end', values=(song['title'], artist, duration_str))
+    def _format_song_row(self, song):
+        """格式化歌曲列表的一列
+
+        Args:
+            song (dict): 歌曲資訊
+
+        Returns:
+            tuple: (歌曲名稱, 藝術家, 時長)
+        """
+        duration_str = self.music_manager.format_duration(song['duration'])
+        artist = song.get('uploader', 'Unknown')
+        return (song['title'], artist, duration_str)
 
     def reload_library(self):
         """重新載入音樂庫"""
@@ -854,12 +906,8 @@ class MusicLibraryView:
         Returns:
             int: 歌曲索引,如果沒有選中則回傳 -1
         """
-        selection = self.song_tree.selection()
-        if not selection:
-            return -1
-
-        item_id = selection[0]
-        return self.song_tree.index(item_id)
+        # 選取列捲出可見範圍後 Treeview 已沒有選取，改由虛擬化列表記錄
+        return self.song_list.selected_position()
 
     def get_current_playlist(self):
         """取得當前播放列表
@@ -871,8 +919,8 @@ class MusicLibraryView:
 
     def clear_song_list(self):
         """清空歌曲列表"""
-        for item in self.song_tree.get_children():
-            self.song_tree.delete(item)
+        self._source_songs = []
+        self.song_list.clear()
         self.current_playlist = []
 
     def _setup_drag_and_drop(self):
@@ -898,8 +946,8 @@ class MusicLibraryView:
             return
 
         # 獲取歌曲索引
-        item_index = self.song_tree.index(item_id)
-        if item_index >= len(self.current_playlist):
+        item_index = self.song_list.position_of(item_id)
+        if not 0 <= item_index < len(self.current_playlist):
             self.drag_data = None
             return
 
@@ -1,7 +1,7 @@
 """音樂歌詞視圖模組 - 負責歌詞顯示與同步"""
 import tkinter as tk
 import customtkinter as ctk
-from src.music.utils.lyrics_parser import LyricsParser
+from src.music.utils.lyrics_parser import LyricsParser, LyricsTimeline
 from src.core.logger import logger
 
 
@@ -21,6 +21,7 @@ class MusicLyricsView:
         # 歌詞數據
         self.current_lyrics = []  # [{'time': float, 'text': str}, ...]
         self.current_index = -1  # 當前高亮的歌詞索引
+        self.timeline = LyricsTimeline([])  # 歌詞時間軸 (排序的時間陣列)
 
         # UI 元件
         self.lyrics_container = None
@@ -88,6 +89,7 @@ class MusicLyricsView:
         """
         self.current_lyrics = lyrics
         self.current_index = -1
+        self.timeline = LyricsTimeline(lyric['time'] for lyric in lyrics or [])
 
         if not self.lyrics_text:
             return
@@ -128,13 +130,10 @@ class MusicLyricsView:
         if not self.current_lyrics or not self.lyrics_text:
             return
 
-        # 找出當前時間對應的歌詞索引
-        new_index = -1
-        for i, lyric in enumerate(self.current_lyrics):
-            if lyric['time'] <= current_time:
-                new_index = i
-            else:
-                break
+        # 找出當前時間對應的歌詞索引 (同一句歌詞內不需搜尋)
+        if len(self.timeline) != len(self.current_lyrics):
+            self.timeline = LyricsTimeline(lyric['time'] for lyric in self.current_lyrics)
+        new_index = self.timeline.index_at(current_time)
 
         # 如果索引改變,更新高亮
         if new_index != self.current_index:
@@ -191,6 +190,7 @@ class MusicLyricsView:
         """清除歌詞"""
         self.current_lyrics = []
         self.current_index = -1
+        self.timeline = LyricsTimeline([])
 
         if self.lyrics_text:
             self.lyrics_text.configure(state="normal")
@@ -5,14 +5,21 @@ import requests
 from collections import OrderedDict
 from PIL import Image, ImageTk, ImageDraw
 from io import BytesIO
+from src.core.constants import ALBUM_ART_SIZES
 from src.core.logger import logger
+from src.utils.ui_dispatcher import UIDispatcher
 
 
 class MusicPlaybackView:
     """管理播放控制區域的 UI 顯示和更新"""
 
+    # 頻譜顯示區高度 (像素) 與顯示範圍 (dB)
+    SPECTRUM_HEIGHT = 60
+    SPECTRUM_MIN_DB = -60.0
+
     def __init__(self, parent_frame, music_manager, on_play_pause, on_play_previous,
-                 on_play_next, on_volume_change, on_cycle_play_mode):
+                 on_play_next, on_volume_change, on_cycle_play_mode, album_art_cache=None,
+                 ui_dispatcher=None):
         """初始化播放檢視
 
         Args:
@@ -23,6 +30,8 @@ class MusicPlaybackView:
             on_play_next: 下一首回調
             on_volume_change: 音量變更回調
             on_cycle_play_mode: 播放模式切換回調
+            album_art_cache (AlbumArtCache): 專輯封面磁碟快取，None 表示每次直接下載
+            ui_dispatcher (UIDispatcher): UI 更新派送佇列，None 表示以父框架建立
         """
         self.parent_frame = parent_frame
         self.music_manager = music_manager
@@ -31,6 +40,8 @@ class MusicPlaybackView:
         self.on_play_next = on_play_next
         self.on_volume_change = on_volume_change
         self.on_cycle_play_mode = on_cycle_play_mode
+        self.album_art_cache = album_art_cache
+        self.ui_dispatcher = ui_dispatcher or UIDispatcher(parent_frame)
 
         # UI 元件
         self.main_frame = None
@@ -44,11 +55,15 @@ class MusicPlaybackView:
         self.play_mode_button = None
         self.volume_slider = None
         self.volume_scale = None  # 向後相容別名
+        self.spectrum_canvas = None
+        self._spectrum_bars = []  # 頻段長條 (canvas 項目 ID)
+        self._level_bars = []  # 各聲道音量表 (canvas 項目 ID)
 
         # 專輯封面快取（LRU，最多 50 張）
         self.thumbnail_cache = OrderedDict()
         self.max_cache_size = 50  # 最多快取 50 張圖片（約 25-50MB）
         self.default_cover_image = None
+        self._cover_song = None  # 目前應顯示封面的歌曲 (捨棄已切歌的背景結果)
 
         # 顏色主題
         self.accent_color = "#0078d4"
@@ -264,6 +279,15 @@ class MusicPlaybackView:
         self.volume_slider.set(saved_volume)
         self.volume_slider.pack(fill="x")
 
+        # === 頻譜與音量表 ===
+        self.spectrum_canvas = ctk.CTkCanvas(
+            content_frame,
+            height=self.SPECTRUM_HEIGHT,
+            bg="#1a1a1a",
+            highlightthickness=0
+        )
+        self.spectrum_canvas.pack(fill="x", pady=(15, 0))
+
         # 設定向後相容別名
         self.progress_bar = self.progress_slider
         self.volume_scale = self.volume_slider
@@ -299,8 +323,90 @@ class MusicPlaybackView:
         if self.artist_label and song.get('uploader'):
             self.artist_label.configure(text=f"🎤 {song.get('uploader', '未知')}")
 
-        # 更新專輯封面(在背景執行緒中)
-        threading.Thread(target=self._update_album_cover, args=(song,), daemon=True).start()
+        if self.album_art_cache is None:
+            # 更新專輯封面(在背景執行緒中)
+            threading.Thread(target=self._update_album_cover, args=(song,), daemon=True).start()
+            return
+
+        self._show_cached_album_cover(song)
+
+    def _show_cached_album_cover(self, song):
+        """透過磁碟快取顯示專輯封面
+
+        已快取的封面直接在 UI 線程顯示 (不連網也不縮放)；
+        未快取或需要重新驗證時交給快取的工作執行緒，完成後再轉回 UI 線程。
+
+        Args:
+            song (dict): 歌曲資訊
+        """
+        self._cover_song = song
+        thumbnail_url = song.get('thumbnail', '')
+        if not thumbnail_url:
+            self._set_album_cover(self._get_default_cover_image())
+            return
+
+        size = ALBUM_ART_SIZES['player']
+        photo = self.thumbnail_cache.get(thumbnail_url)
+        if photo is not None:
+            self.thumbnail_cache.move_to_end(thumbnail_url)
+        else:
+            image = self.album_art_cache.get_cached(thumbnail_url, size)
+            if image is not None:
+                photo = self._cache_cover_photo(thumbnail_url, image)
+
+        self._set_album_cover(photo or self._get_default_cover_image())
+
+        if photo is None or self.album_art_cache.is_stale(thumbnail_url):
+            def on_loaded(image):
+                # 工作執行緒: 轉回 UI 線程建立圖片
+                self.ui_dispatcher.post(
+                    self._on_album_cover_loaded, song, thumbnail_url, image,
+                    key=('album_cover', thumbnail_url)
+                )
+
+            self.album_art_cache.request(thumbnail_url, size, on_loaded)
+
+    def _on_album_cover_loaded(self, song, thumbnail_url, image):
+        """背景載入完成 (UI 線程)
+
+        Args:
+            song (dict): 發出請求時的歌曲
+            thumbnail_url (str): 縮圖 URL
+            image (PIL.Image.Image): 縮圖，失敗時為 None
+        """
+        if image is None:
+            return
+        photo = self._cache_cover_photo(thumbnail_url, image)
+        if song is self._cover_song:
+            self._set_album_cover(photo)
+
+    def _cache_cover_photo(self, thumbnail_url, image):
+        """建立 CTkImage 並加入記憶體 LRU 快取
+
+        Args:
+            thumbnail_url (str): 縮圖 URL
+            image (PIL.Image.Image): 已縮放的圖片
+
+        Returns:
+            CTkImage: 圖片物件
+        """
+        photo = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        self.thumbnail_cache[thumbnail_url] = photo
+        self.thumbnail_cache.move_to_end(thumbnail_url)
+        while len(self.thumbnail_cache) > self.max_cache_size:
+            self.thumbnail_cache.popitem(last=False)
+        return photo
+
+    def _set_album_cover(self, cover_image):
+        """顯示專輯封面
+
+        Args:
+            cover_image (CTkImage): 封面圖片
+        """
+        if cover_image and self.album_cover_label:
+            self.album_cover_label.configure(image=cover_image, text="")
+            # 保持引用避免被垃圾回收
+            self.album_cover_label.image = cover_image
 
     def update_play_pause_button(self, is_paused):
         """更新播放/暫停按鈕
@@ -320,6 +426,76 @@ class MusicPlaybackView:
         if self.progress_slider:
             self.progress_slider.set(progress_value)
 
+    def update_spectrum(self, bands_db, levels_db=None):
+        """更新頻譜與音量表 (只移動既有的長條，不重新建立)
+
+        Args:
+            bands_db (list): 各頻段電平 (dB)
+            levels_db (list): 各聲道峰值電平 (dBFS)，None 表示不顯示音量表
+        """
+        canvas = self.spectrum_canvas
+        if not canvas:
+            return
+
+        levels_db = list(levels_db) if levels_db is not None else []
+        if len(self._spectrum_bars) != len(bands_db) or len(self._level_bars) != len(levels_db):
+            self._create_spectrum_bars(len(bands_db), len(levels_db))
+
+        width = max(1, canvas.winfo_width())
+        height = self.SPECTRUM_HEIGHT
+        meter_width = 8 * len(levels_db)
+        bar_area = width - meter_width - (6 if levels_db else 0)
+        bar_width = bar_area / max(1, len(bands_db))
+
+        for index, value in enumerate(bands_db):
+            x0 = index * bar_width + 1
+            top = height - self._db_to_height(value)
+            canvas.coords(self._spectrum_bars[index], x0, top, x0 + bar_width - 2, height)
+
+        for index, value in enumerate(levels_db):
+            x0 = width - meter_width + index * 8
+            top = height - self._db_to_height(value)
+            canvas.coords(self._level_bars[index], x0, top, x0 + 6, height)
+
+    def clear_spectrum(self):
+        """清除頻譜顯示 (停止或暫停播放時)"""
+        canvas = self.spectrum_canvas
+        if not canvas:
+            return
+        for item in self._spectrum_bars + self._level_bars:
+            canvas.coords(item, 0, 0, 0, 0)
+
+    def _create_spectrum_bars(self, band_count, channel_count):
+        """建立頻段長條與音量表
+
+        Args:
+            band_count (int): 頻段數
+            channel_count (int): 聲道數
+        """
+        canvas = self.spectrum_canvas
+        for item in self._spectrum_bars + self._level_bars:
+            canvas.delete(item)
+        self._spectrum_bars = [
+            canvas.create_rectangle(0, 0, 0, 0, fill=self.accent_color, width=0)
+            for _ in range(band_count)
+        ]
+        self._level_bars = [
+            canvas.create_rectangle(0, 0, 0, 0, fill="#4caf50", width=0)
+            for _ in range(channel_count)
+        ]
+
+    def _db_to_height(self, value):
+        """將電平換算為長條高度
+
+        Args:
+            value (float): 電平 (dB)
+
+        Returns:
+            float: 高度 (像素)
+        """
+        ratio = (value - self.SPECTRUM_MIN_DB) / -self.SPECTRUM_MIN_DB
+        return max(0.0, min(1.0, ratio)) * self.SPECTRUM_HEIGHT
+
     def update_time_label(self, time_text):
         """更新時間標籤
 
@@ -364,6 +540,7 @@ class MusicPlaybackView:
         # 重置專輯封面
         if self.album_cover_label:
             self.album_cover_label.configure(image=None, text="🎵")
+        self.clear_spectrum()
 
     def get_volume(self):
         """取得當前音量
@@ -0,0 +1,323 @@
+"""虛擬化歌曲列表模組
+
+大型分類 (例如「所有歌曲」) 不再為每首歌曲建立一列 Treeview 項目:
+- Treeview 只保留可見列數加上預留列 (overscan) 的固定項目池
+- 捲動時重複使用項目池，只改寫各列的內容，不刪除或新增項目
+- 排序與篩選只替換索引陣列，不重建任何元件
+- 列內容只在該列第一次進入可見範圍時才格式化
+"""
+import tkinter as tk
+from collections.abc import Sequence
+
+
+class VirtualSongList:
+    """Treeview 的虛擬化列表轉接器
+
+    顯示位置 (position) 是列表中的第幾列，透過索引陣列對應到 items 中的項目。
+    """
+
+    # 可見範圍之外額外保留的列數
+    OVERSCAN_ROWS = 5
+
+    # 尚未取得元件高度前假設的可見列數
+    DEFAULT_VISIBLE_ROWS = 20
+
+    # 每列高度 (像素)，需與 Treeview 樣式的 rowheight 相同
+    DEFAULT_ROW_HEIGHT = 25
+
+    # 滑鼠滾輪每一格捲動的列數
+    WHEEL_ROWS = 3
+
+    def __init__(self, tree, scrollbar, format_row, overscan=OVERSCAN_ROWS,
+                 row_height=DEFAULT_ROW_HEIGHT):
+        """初始化虛擬化列表
+
+        Args:
+            tree (ttk.Treeview): 顯示用的 Treeview
+            scrollbar (tk.Scrollbar): 垂直捲軸 (由本物件控制)，None 表示沒有捲軸
+            format_row (callable): format_row(item) 返回該列的 values
+            overscan (int): 可見範圍之外額外保留的列數
+            row_height (int): 每列高度 (像素)
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.overscan = max(0, overscan)
+        self.row_height = max(1, row_height)
+        self.visible_rows = self.DEFAULT_VISIBLE_ROWS
+        # 標題列 (show='headings') 高度，量測到第一列的位置前假設與一列同高
+        self.heading_height = self.row_height
+
+        self._items = []
+        self._order = []  # 顯示位置 -> items 索引
+        self._view_cache = None  # 依顯示順序的項目列表
+        self._first = 0  # 第一個可見列的顯示位置
+        self._pool = []  # Treeview 項目 ID (依畫面順序)
+        self._rendered = []  # 各項目池列目前顯示的 items 索引 (避免重複更新)
+        self._row_cache = {}  # {items 索引: 已格式化的 values}
+        self._selected = None  # 選取列的 items 索引
+
+        if scrollbar is not None:
+            scrollbar.config(command=self.yview)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tree.bind(sequence, self._on_mousewheel)
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            tree.bind(sequence, self._on_key)
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        tree.bind('<Configure>', self._on_configure, add='+')
+
+    def __len__(self):
+        return len(self._order)
+
+    # ==================== 資料 ====================
+
+    def set_items(self, items):
+        """替換顯示的項目 (依原始順序顯示並回到頂端)
+
+        Args:
+            items (list): 項目列表
+        """
+        self._items = list(items)
+        self._order = list(range(len(self._items)))
+        self._view_cache = None
+        self._first = 0
+        self._selected = None
+        # 索引對應到新的項目，所有列都需重新格式化
+        self._rendered = [None] * len(self._pool)
+        self._row_cache = {}
+        self._render()
+
+    def set_order(self, order):
+        """替換索引陣列 (排序或篩選)，保留捲動位置與仍在列表中的選取項目
+
+        Args:
+            order (Sequence): 依顯示順序排列的 items 索引 (序列直接使用不複製，呼叫端不可再修改)
+        """
+        self._on_select()
+        self._order = order if isinstance(order, Sequence) else list(order)
+        self._view_cache = None
+        if self._selected is not None and self._selected not in self._order:
+            self._selected = None
+        self._render()
+
+    def clear(self):
+        """清空列表"""
+        self.set_items([])
+
+    def items(self):
+        """依顯示順序的項目列表 (唯讀快取，下次排序或替換前重複使用)
+
+        Returns:
+            list: 項目列表
+        """
+        if self._view_cache is None:
+            self._view_cache = [self._items[index] for index in self._order]
+        return self._view_cache
+
+    def item_at(self, position):
+        """取得顯示位置的項目
+
+        Args:
+            position (int): 顯示位置
+
+        Returns:
+            項目，超出範圍時返回 None
+        """
+        if 0 <= position < len(self._order):
+            return self._items[self._order[position]]
+        return None
+
+    # ==================== 位置與選取 ====================
+
+    def position_of(self, row_id):
+        """取得 Treeview 項目目前對應的顯示位置
+
+        Args:
+            row_id (str): Treeview 項目 ID
+
+        Returns:
+            int: 顯示位置，不是列表中的項目時返回 -1
+        """
+        try:
+            offset = self._pool.index(row_id)
+        except ValueError:
+            return -1
+        position = self._first + offset
+        return position if position < len(self._order) else -1
+
+    def selected_position(self):
+        """取得選取列的顯示位置 (選取列捲出項目池後仍保留)
+
+        Returns:
+            int: 顯示位置，沒有選取時返回 -1
+        """
+        # 程式設定的選取可能尚未觸發 <<TreeviewSelect>>
+        self._on_select()
+        if self._selected is None:
+            return -1
+        try:
+            return self._order.index(self._selected)
+        except ValueError:
+            return -1
+
+    def select(self, position):
+        """選取顯示位置的列 (必要時捲動到可見範圍)
+
+        Args:
+            position (int): 顯示位置
+        """
+        if not 0 <= position < len(self._order):
+            return
+        self.see(position)
+        self._selected = self._order[position]
+        self._render()
+
+    def see(self, position):
+        """捲動使顯示位置可見
+
+        Args:
+            position (int): 顯示位置
+        """
+        if position < self._first:
+            self.scroll_to(position)
+        elif position >= self._first + self.visible_rows:
+            self.scroll_to(position - self.visible_rows + 1)
+
+    # ==================== 捲動 ====================
+
+    def scroll_to(self, first):
+        """捲動到指定的第一列
+
+        Args:
+            first (int): 第一個可見列的顯示位置
+        """
+        first = max(0, min(int(first), len(self._order) - self.visible_rows))
+        if first != self._first:
+            # 項目池即將對應到其他歌曲，先記錄目前的選取
+            self._on_select()
+            self._first = first
+            self._render()
+
+    def yview(self, *args):
+        """捲軸命令 ('moveto', 比例) 或 ('scroll', 數量, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * len(self._order)))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= max(1, self.visible_rows - 1)
+            self.scroll_to(self._first + step)
+
+    def _on_mousewheel(self, event):
+        """滑鼠滾輪捲動 (Windows/macOS 使用 delta，Linux 使用 Button-4/5)"""
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self._first - self.WHEEL_ROWS)
+        else:
+            self.scroll_to(self._first + self.WHEEL_ROWS)
+        return "break"
+
+    def _on_key(self, event):
+        """鍵盤移動選取 (取代 Treeview 內建的捲動)"""
+        position = self.selected_position()
+        page = max(1, self.visible_rows - 1)
+        steps = {'Up': -1, 'Down': 1, 'Prior': -page, 'Next': page}
+        if event.keysym == 'Home':
+            target = 0
+        elif event.keysym == 'End':
+            target = len(self._order) - 1
+        elif position < 0:
+            target = self._first
+        else:
+            target = position + steps.get(event.keysym, 0)
+        self.select(max(0, min(target, len(self._order) - 1)))
+        return "break"
+
+    def _on_select(self, event=None):
+        """記錄使用者在 Treeview 中選取的列"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        position = self.position_of(selection[0])
+        if position >= 0:
+            self._selected = self._order[position]
+
+    def _on_configure(self, event):
+        """元件大小改變時重新計算可見列數 (扣除標題列)"""
+        self._measure_heading()
+        visible = max(1, (event.height - self.heading_height) // self.row_height)
+        if visible != self.visible_rows:
+            self._on_select()
+            self.visible_rows = visible
+            self._first = max(0, min(self._first, len(self._order) - visible))
+            self._render()
+
+    def _measure_heading(self):
+        """以第一列的位置量測標題列高度 (第一列固定顯示在頂端)"""
+        if not self._pool:
+            return
+        try:
+            bbox = self.tree.bbox(self._pool[0])
+        except tk.TclError:
+            return
+        # 尚未顯示時 bbox 為空
+        if bbox:
+            self.heading_height = max(0, int(bbox[1]))
+
+    # ==================== 繪製 ====================
+
+    def _render(self):
+        """以項目池顯示目前的可見範圍"""
+        total = len(self._order)
+        pool_size = min(total, self.visible_rows + self.overscan)
+        self._first = max(0, min(self._first, total - self.visible_rows))
+        self._resize_pool(pool_size)
+
+        selected_row = None
+        for offset, row_id in enumerate(self._pool):
+            index = self._order[self._first + offset] if self._first + offset < total else None
+            if index is None:
+                # 列表尾端不足一整個項目池: 清空多餘的列
+                if self._rendered[offset] is not None:
+                    self.tree.item(row_id, values=())
+            elif self._rendered[offset] != index:
+                self.tree.item(row_id, values=self._row_values(index))
+            self._rendered[offset] = index
+            if index is not None and index == self._selected:
+                selected_row = row_id
+
+        # 項目池可能比畫面高，固定顯示項目池的開頭
+        self.tree.yview_moveto(0)
+        if selected_row is not None:
+            self.tree.selection_set(selected_row)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        self._update_scrollbar()
+
+    def _row_values(self, index):
+        """取得項目的列內容 (每個項目只格式化一次)"""
+        values = self._row_cache.get(index)
+        if values is None:
+            values = self.format_row(self._items[index])
+            self._row_cache[index] = values
+        return values
+
+    def _resize_pool(self, size):
+        """調整項目池大小 (只在可見列數或列表長度改變時新增或刪除項目)"""
+        while len(self._pool) < size:
+            self._pool.append(self.tree.insert('', tk.END, values=()))
+            self._rendered.append(None)
+        while len(self._pool) > size:
+            self.tree.delete(self._pool.pop())
+            self._rendered.pop()
+
+    def _update_scrollbar(self):
+        """依完整列表長度更新捲軸位置"""
+        if self.scrollbar is None:
+            return
+        total = len(self._order)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._first / total, min(1.0, (self._first + self.visible_rows) / total))
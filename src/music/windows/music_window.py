@@ -4,10 +4,12 @@ from tkinter import ttk, messagebox, simpledialog
 import pygame
 import threading
 import time
-import random
 import os
 import shutil
 from src.core.logger import logger
+from src.core.constants import (
+    PCM_CACHE_DIR, PCM_CACHE_WARM_UP_COUNT, LOUDNESS_INDEX_FILE, ALBUM_ART_CACHE_DIR
+)
 from src.music.utils.youtube_downloader import YouTubeDownloader
 from src.music.managers.play_history_manager import PlayHistoryManager
 from src.music.managers.playlist_manager import PlaylistManager
@@ -23,9 +25,14 @@ from src.music.views.music_playback_view import MusicPlaybackView
 from src.music.actions.music_song_actions import MusicSongActions
 from src.music.views.music_lyrics_view import MusicLyricsView
 from src.music.utils.lyrics_parser import LyricsParser
+from src.music.utils.lyrics_cache import LyricsCache
+from src.music.utils.album_art_cache import AlbumArtCache
+from src.music.utils.playback_clock import ClockState, PlaybackClock
+from src.music.utils.play_queue import PlayQueue
 from src.music.utils.music_equalizer import MusicEqualizer
 from src.music.windows.music_equalizer_dialog import MusicEqualizerDialog
 from src.utils.ui_theme import UITheme
+from src.utils.ui_dispatcher import UIDispatcher, PRIORITY_HIGH
 from src.utils.discord_presence import DiscordPresence
 from PIL import Image, ImageTk, ImageDraw
 import requests
@@ -36,6 +43,15 @@ from pathlib import Path
 class MusicWindow:
     """音樂播放器視窗類別"""
 
+    # 頻譜結果超過此時間 (秒) 未更新即視為停止，清除顯示
+    SPECTRUM_STALE_SECONDS = 0.25
+
+    # 視窗隱藏時檢查是否恢復顯示的間隔 (毫秒)
+    SPECTRUM_HIDDEN_POLL_MS = 500
+
+    # 播放進度更新間隔 (毫秒)，可由設定 progress_tick_ms 覆寫
+    PROGRESS_TICK_MS = PlaybackClock.DEFAULT_TICK_MS
+
     def __init__(self, music_manager, tk_root=None):
         """初始化音樂播放器視窗
 
@@ -49,15 +65,13 @@ class MusicWindow:
 
         # 播放器狀態
         self.current_song = None
-        self.playlist = []
-        self.current_index = -1
+        self.queue = PlayQueue()  # 播放佇列 (playlist / current_index 由此推導)
         self.is_playing = False
         self.is_paused = False
         # 從設定檔讀取音量
         self.volume = self.music_manager.config_manager.get_music_volume() / 100.0
         # 播放模式: 'sequential' (順序), 'shuffle' (隨機), 'repeat_one' (單曲循環), 'repeat_all' (列表循環)
         self.play_mode = 'sequential'
-        self.played_indices = []  # 已播放的歌曲索引(隨機模式用)
 
         # 時間追蹤
         self.start_time = 0  # 開始播放的時間戳
@@ -107,12 +121,24 @@ class MusicWindow:
         # 歌詞解析器
         self.lyrics_parser = LyricsParser()
 
+        # 已解析歌詞快取 (含背景預先解析下一首)
+        self.lyrics_cache = LyricsCache(self.lyrics_parser)
+
+        # 專輯封面磁碟快取 (內容雜湊 + 預先縮放的縮圖)
+        self.album_art_cache = AlbumArtCache(ALBUM_ART_CACHE_DIR)
+
+        # 背景執行緒的 UI 更新派送佇列 (視窗建立後再設定排程)
+        self.ui_dispatcher = UIDispatcher()
+
         # UI 主題
         self.theme = UITheme(theme_name='dark')
 
         # 等化器
         self.equalizer = MusicEqualizer(self.music_manager.config_manager)
 
+        # 播放時鐘(每個視窗一個，當 window 建立後)
+        self.playback_clock = None
+
         # 等化器對話框(延遲初始化,當 window 建立後)
         self.equalizer_dialog = None
 
@@ -136,10 +162,21 @@ class MusicWindow:
         self.audio_player = None
         self.audio_processor = None
 
+        # 響度正規化 (分析結果索引與背景分析狀態)
+        self.loudness_index = None
+        self._loudness_analysis_running = False
+        self._loudness_cancel = threading.Event()  # 關閉時停止背景分析
+
+        # 頻譜分析器 (由 AudioPlayer 回調提供樣本)
+        self.spectrum_analyzer = None
+
         try:
             from src.audio.audio_player import AudioPlayer
             from src.audio.audio_processor import AudioProcessor
             from src.audio.equalizer_filter import EqualizerFilter
+            from src.audio.pcm_cache import PCMCache
+            from src.audio.loudness import LoudnessIndex
+            from src.audio.spectrum_analyzer import SpectrumAnalyzer
 
             # 建立等化器濾波器 (從 MusicEqualizer 讀取設定)
             equalizer_filter = EqualizerFilter(sample_rate=44100)
@@ -154,13 +191,38 @@ class MusicWindow:
             self.audio_processor = AudioProcessor(sample_rate=44100)
             self.audio_processor.equalizer = equalizer_filter
 
-            # 建立音訊播放器
-            self.audio_player = AudioPlayer(audio_processor=self.audio_processor)
+            # 建立解碼快取 (重播時直接以 memmap 讀取，不需再次解碼)
+            pcm_cache = None
+            if self.music_manager.config_manager.get('pcm_cache_enabled', default=True):
+                pcm_cache = PCMCache(PCM_CACHE_DIR)
+
+            # 載入響度分析結果 (播放時套用固定的正規化增益)
+            if self.music_manager.config_manager.get('loudness_normalization_enabled', default=True):
+                self.loudness_index = LoudnessIndex(LOUDNESS_INDEX_FILE)
+
+            # 建立音訊播放器 (精簡記憶體模式以 int16 保存整首載入的音訊)
+            self.audio_player = AudioPlayer(
+                audio_processor=self.audio_processor,
+                pcm_cache=pcm_cache,
+                compact_memory=self.music_manager.config_manager.get('audio_compact_memory', default=False)
+            )
             self.audio_player.on_playback_end = self._on_audio_player_end
 
+            # 頻譜顯示 (回調只複製樣本，分析在背景線程)
+            if self.music_manager.config_manager.get('spectrum_enabled', default=True):
+                self.spectrum_analyzer = SpectrumAnalyzer(frequencies=equalizer_filter.frequencies)
+                self.audio_player.set_spectrum_tap(self.spectrum_analyzer)
+
             # 設定音量
             self.audio_player.set_volume(self.volume)
 
+            # 延遲設定檔 (low_latency / balanced / power_saver / adaptive)
+            latency_profile = self.music_manager.config_manager.get('audio_latency_profile', default='balanced')
+            try:
+                self.audio_player.set_latency_profile(latency_profile)
+            except ValueError as e:
+                logger.warning(f"延遲設定檔無效，使用預設值: {e}")
+
             self.use_audio_player = True
             logger.info("✅ 使用 AudioPlayer（支援即時等化器）")
 
@@ -219,6 +281,12 @@ class MusicWindow:
         # 綁定視窗變更事件，儲存位置和大小
         self.window.bind('<Configure>', self._on_window_configure)
 
+        # 背景執行緒的 UI 更新由此視窗每個畫面處理一次
+        self.ui_dispatcher.attach(self.window)
+
+        # 播放進度與歌詞同步 (在 UI 線程以 after() 排程)
+        self._create_playback_clock()
+
         # 初始化歷史對話框
         self.history_dialog = MusicHistoryDialog(
             parent=self.window,
@@ -240,7 +308,8 @@ class MusicWindow:
             parent=self.window,
             music_manager=self.music_manager,
             youtube_downloader=self.youtube_downloader,
-            on_download_complete=self._on_download_complete
+            on_download_complete=self._on_download_complete,
+            ui_dispatcher=self.ui_dispatcher
         )
 
         # 初始化等化器對話框
@@ -299,7 +368,9 @@ class MusicWindow:
             on_category_select=self._on_library_category_select,
             on_song_double_click=self._on_library_song_double_click,
             on_category_rename=self._rename_folder,
-            on_category_delete=self._delete_folder
+            on_category_delete=self._delete_folder,
+            on_library_loaded=self._start_loudness_analysis,
+            ui_dispatcher=self.ui_dispatcher
         )
 
         # 保持向後相容:設定 category_tree 和 song_tree 引用
@@ -318,7 +389,9 @@ class MusicWindow:
             on_play_previous=self._play_previous,
             on_play_next=self._play_next,
             on_volume_change=self._on_volume_change,
-            on_cycle_play_mode=self._cycle_play_mode
+            on_cycle_play_mode=self._cycle_play_mode,
+            album_art_cache=self.album_art_cache,
+            ui_dispatcher=self.ui_dispatcher
         )
         self.playback_view.create_view()
 
@@ -362,8 +435,55 @@ class MusicWindow:
         # 關閉視窗時的處理
         self.window.protocol("WM_DELETE_WINDOW", self._close_window)
 
+        # 開始更新頻譜顯示
+        self._start_spectrum_display()
+
         logger.info("音樂播放器視窗初始化完成")
 
+    def _create_playback_clock(self):
+        """為目前的視窗建立播放時鐘"""
+        if self.playback_clock:
+            self.playback_clock.stop()
+
+        tick_ms = self.music_manager.config_manager.get('progress_tick_ms', default=self.PROGRESS_TICK_MS)
+        self.playback_clock = PlaybackClock(
+            self.window,
+            self._get_clock_state,
+            self._on_clock_tick,
+            tick_ms=tick_ms
+        )
+
+    def _start_spectrum_display(self):
+        """啟動頻譜分析線程與 UI 更新迴圈"""
+        if not self.spectrum_analyzer:
+            return
+        self.spectrum_analyzer.start()
+        self._poll_spectrum()
+
+    def _poll_spectrum(self):
+        """在 UI 線程讀取最新的頻譜並更新顯示 (以 after() 週期執行)"""
+        if not self.window or not self.spectrum_analyzer:
+            return
+
+        try:
+            visible = bool(self.window.winfo_viewable())
+        except Exception:
+            # 視窗已銷毀
+            return
+
+        # 視窗隱藏時暫停分析
+        self.spectrum_analyzer.set_active(visible)
+        if visible and self.playback_view:
+            frame = self.spectrum_analyzer.get_latest()
+            if frame is not None and time.perf_counter() - frame.timestamp < self.SPECTRUM_STALE_SECONDS:
+                self.playback_view.update_spectrum(frame.bands, frame.peak)
+            else:
+                # 暫停或停止播放: 沒有新的分析結果
+                self.playback_view.clear_spectrum()
+
+        interval = int(1000 / self.spectrum_analyzer.frame_rate) if visible else self.SPECTRUM_HIDDEN_POLL_MS
+        self.window.after(interval, self._poll_spectrum)
+
     def _load_music_library(self):
         """載入音樂庫（異步掃描）"""
         # 使用 MusicLibraryView 的異步載入功能
@@ -479,16 +599,20 @@ class MusicWindow:
 
             # 載入並顯示歌詞
             self._load_lyrics_for_song(song)
+            self._prefetch_upcoming_lyrics()
 
-            # 啟動進度更新執行緒
-            threading.Thread(target=self._update_progress, daemon=True).start()
+            # 開始發布播放進度
+            self._start_playback_clock()
 
             # 背景執行元數據補全
             if self.metadata_fetcher.is_enabled():
                 def on_fetch_complete(success, metadata):
                     if success and metadata:
-                        # 在主執行緒更新 UI
-                        self.window.after(0, lambda: self._on_metadata_updated(song, metadata))
+                        # 在主執行緒更新 UI (同一首歌只保留最新的結果)
+                        self.ui_dispatcher.post(
+                            self._on_metadata_updated, song, metadata,
+                            key=('metadata', song.get('id'))
+                        )
 
                 self.metadata_fetcher.fetch_metadata_async(song, on_fetch_complete)
 
@@ -510,6 +634,9 @@ class MusicWindow:
         # 同步等化器設定到 AudioProcessor
         self._sync_equalizer_to_processor()
 
+        # 套用響度正規化增益
+        self._apply_replay_gain(song)
+
         # 播放音樂
         result = self.audio_player.play(song['audio_path'])
         if not result:
@@ -518,6 +645,88 @@ class MusicWindow:
         self.start_time = time.time()
         self.pause_position = 0
 
+        # 背景預先解碼接下來的歌曲
+        upcoming = self._get_upcoming_songs(PCM_CACHE_WARM_UP_COUNT)
+        if upcoming:
+            self.audio_player.warm_up_cache([s['audio_path'] for s in upcoming])
+
+    def _apply_replay_gain(self, song):
+        """依響度分析結果設定歌曲的正規化增益 (尚未分析時不調整)
+
+        Args:
+            song (dict): 歌曲資訊
+        """
+        if not self.audio_processor:
+            return
+        gain = 1.0
+        if self.loudness_index:
+            gain = self.loudness_index.get_gain(song['audio_path'])
+        self.audio_processor.set_replay_gain(gain)
+
+    def _start_loudness_analysis(self):
+        """在背景分析音樂庫中尚未分析或已變更的歌曲"""
+        if not self.loudness_index or self._loudness_analysis_running:
+            return
+
+        paths = [song['audio_path'] for song in self.music_manager.get_all_songs()]
+        if not paths:
+            return
+
+        self._loudness_analysis_running = True
+        threading.Thread(
+            target=self._run_loudness_analysis,
+            args=(paths,),
+            daemon=True,
+            name="LoudnessAnalysis"
+        ).start()
+
+    def _run_loudness_analysis(self, paths):
+        """響度分析工作執行緒
+
+        在應用程式內以執行緒分析 (不啟動行程池: 打包後的執行檔以 spawn 啟動子行程時
+        會重新執行主程式)，同時只分析一首，保留 CPU 給播放與 UI。
+
+        Args:
+            paths (list): 音訊檔案路徑列表
+        """
+        from src.audio.loudness import analyze_library
+
+        try:
+            analyze_library(
+                paths,
+                self.loudness_index,
+                max_workers=1,
+                use_processes=False,
+                cancel_event=self._loudness_cancel
+            )
+        except Exception as e:
+            logger.error(f"響度分析失敗: {e}")
+        finally:
+            self._loudness_analysis_running = False
+
+    def _get_upcoming_songs(self, count):
+        """取得接下來會播放的歌曲 (用於預熱解碼快取)
+
+        Args:
+            count (int): 最多取得的歌曲數
+
+        Returns:
+            list: 歌曲資訊列表，單曲循環模式不需預測時為空列表
+        """
+        if self.play_mode == 'repeat_one' or not self._is_valid_current_index():
+            return []
+
+        if self.play_mode == 'shuffle':
+            # 隨機模式預覽本輪接下來的順序
+            upcoming = self.queue.shuffle_upcoming(count, self.current_song is not None)
+            return [item.song for item in upcoming]
+
+        total = len(self.playlist)
+        return [
+            self.playlist[(self.current_index + offset) % total]
+            for offset in range(1, min(count, total - 1) + 1)
+        ]
+
     def _play_with_pygame(self, song):
         """使用 pygame.mixer 播放（fallback）
 
@@ -574,6 +783,7 @@ class MusicWindow:
         self.is_paused = False
         self.start_time = time.time() - self.pause_position
         self._update_playback_ui(is_paused=False)
+        self._start_playback_clock()
 
     def _pause_playback(self):
         """暫停播放"""
@@ -617,8 +827,15 @@ class MusicWindow:
         if not self.playlist:
             return
 
-        self.current_index = (self.current_index - 1) % len(self.playlist)
-        self._play_song(self.playlist[self.current_index])
+        previous_item = None
+        if self.play_mode == 'shuffle':
+            # 隨機模式依播放順序返回上一首
+            previous_item = self.queue.shuffle_previous(self.current_song is not None)
+
+        if previous_item is None:
+            self.current_index = (self.current_index - 1) % len(self.playlist)
+
+        self._play_song(self.queue.current_song)
 
     def _is_valid_current_index(self):
         """檢查當前索引是否有效
@@ -628,20 +845,28 @@ class MusicWindow:
         """
         return 0 <= self.current_index < len(self.playlist)
 
-    def _get_available_shuffle_indices(self):
-        """取得隨機模式下可用的歌曲索引
+    @property
+    def playlist(self):
+        """目前播放佇列的歌曲列表 (由 queue 推導，佇列編輯前為同一個列表)"""
+        return self.queue.songs()
 
-        Returns:
-            list: 可用的歌曲索引列表
-        """
-        available_indices = [i for i in range(len(self.playlist)) if i not in self.played_indices]
+    @playlist.setter
+    def playlist(self, songs):
+        self.queue.set_songs(songs)
 
-        if not available_indices:
-            # 所有歌曲都播放過了,清空記錄重新開始
-            self.played_indices = []
-            available_indices = list(range(len(self.playlist)))
+    @property
+    def current_index(self):
+        """目前歌曲在播放佇列中的索引，沒有時為 -1"""
+        return self.queue.current_index
 
-        return available_indices
+    @current_index.setter
+    def current_index(self, index):
+        self.queue.set_current_index(index)
+
+    @property
+    def played_indices(self):
+        """本輪隨機播放已播放的歌曲索引"""
+        return self.queue.shuffle_played_indices()
 
     def _play_next_in_repeat_one_mode(self):
         """單曲循環模式 - 重播當前歌曲"""
@@ -649,11 +874,9 @@ class MusicWindow:
             self._play_song(self.playlist[self.current_index])
 
     def _play_next_in_shuffle_mode(self):
-        """隨機模式 - 隨機選擇下一首歌曲"""
-        available_indices = self._get_available_shuffle_indices()
-        self.current_index = random.choice(available_indices)
-        self.played_indices.append(self.current_index)
-        self._play_song(self.playlist[self.current_index])
+        """隨機模式 - 依隨機順序播放下一首 (一輪播完後重新洗牌)"""
+        item = self.queue.shuffle_next(self.current_song is not None)
+        self._play_song(item.song)
 
     def _play_next_in_sequential_mode(self):
         """順序模式或列表循環模式 - 播放下一首"""
@@ -702,17 +925,6 @@ class MusicWindow:
         else:
             return not pygame.mixer.music.get_busy() and not self.is_paused
 
-    def _handle_paused_state(self):
-        """處理暫停狀態
-
-        Returns:
-            bool: 如果當前為暫停狀態則返回 True
-        """
-        if self.is_paused:
-            time.sleep(0.1)
-            return True
-        return False
-
     def _calculate_playback_position(self):
         """計算當前播放位置
 
@@ -744,50 +956,48 @@ class MusicWindow:
         total_str = self.music_manager.format_duration(total_duration)
         return f"{current_str} / {total_str}"
 
-    def _update_ui_progress(self, current_pos, total_duration):
-        """更新 UI 進度條和時間標籤
+    def _start_playback_clock(self):
+        """開始 (或立即刷新) 播放進度更新"""
+        if self.playback_clock:
+            self.playback_clock.start()
 
-        Args:
-            current_pos (float): 當前播放位置(秒)
-            total_duration (int): 總時長(秒)
-        """
-        if total_duration <= 0 or not self.playback_view:
-            return
+    def _get_clock_state(self):
+        """取得播放時鐘使用的播放狀態
 
-        # 更新進度條
-        progress = min(100, (current_pos / total_duration) * 100)
-        self.window.after(0, lambda: self.playback_view.update_progress(progress))
+        Returns:
+            ClockState: 播放狀態，沒有播放中的歌曲時返回 None
+        """
+        if not self.is_playing or not self.current_song:
+            return None
 
-        # 更新時間標籤
-        time_text = self._format_time_text(current_pos, total_duration)
-        self.window.after(0, lambda t=time_text: self.playback_view.update_time_label(t))
+        if self.is_paused:
+            return ClockState(self.pause_position, 0, True)
 
-        # 更新歌詞同步
-        if self.lyrics_view:
-            self.window.after(0, lambda p=current_pos: self.lyrics_view.update_current_time(p))
+        current_pos, total_duration = self._calculate_playback_position()
+        return ClockState(current_pos, total_duration, False)
 
-    def _update_progress(self):
-        """更新播放進度"""
-        while self.is_playing and self.current_song:
-            try:
-                # 檢查是否播放結束
-                if self._should_play_next():
-                    self.window.after(0, self._play_next)
-                    break
+    def _on_clock_tick(self, state):
+        """播放時鐘更新: 一次更新進度條、時間標籤與歌詞 (在 UI 線程執行)
 
-                # 處理暫停狀態
-                if self._handle_paused_state():
-                    continue
+        Args:
+            state (ClockState): 播放狀態
+        """
+        # 檢查是否播放結束
+        if self._should_play_next():
+            self._play_next()
+            return
 
-                # 計算播放位置並更新 UI
-                current_pos, total_duration = self._calculate_playback_position()
-                self._update_ui_progress(current_pos, total_duration)
+        if state.duration > 0 and self.playback_view:
+            progress = min(100, (state.position / state.duration) * 100)
+            self.playback_view.update_progress(progress)
+            self.playback_view.update_time_label(self._format_time_text(state.position, state.duration))
 
-                time.sleep(0.5)
+        if self.lyrics_view:
+            self.lyrics_view.update_current_time(state.position)
 
-            except Exception as e:
-                logger.error(f"更新進度時發生錯誤: {e}")
-                break
+        # 自動延遲調整 (只有 adaptive 設定檔會實際調整)
+        if self.use_audio_player and self.audio_player:
+            self.audio_player.check_adaptive_latency()
 
     def _cycle_play_mode(self):
         """循環切換播放模式"""
@@ -800,9 +1010,9 @@ class MusicWindow:
         if self.playback_view:
             self.playback_view.update_play_mode(self.play_mode)
 
-        # 如果切換到隨機模式,清空已播放記錄
+        # 如果切換到隨機模式,從目前歌曲開始新的隨機順序
         if self.play_mode == 'shuffle':
-            self.played_indices = []
+            self.queue.reshuffle(self.current_song is not None)
 
         mode_names = {
             'sequential': '➡️ 順序播放',
@@ -827,9 +1037,8 @@ class MusicWindow:
                 self.playback_view.update_play_pause_button(is_paused=self.is_paused)
                 self.playback_view.update_play_mode(self.play_mode)
 
-                # 如果正在播放(非暫停),重新啟動進度更新
-                if not self.is_paused:
-                    threading.Thread(target=self._update_progress, daemon=True).start()
+                # 重新開始發布播放進度 (暫停中時鐘只會等待恢復)
+                self._start_playback_clock()
 
                 logger.info("播放狀態已恢復")
             else:
@@ -851,6 +1060,9 @@ class MusicWindow:
             category (str): 下載分類
         """
         if success:
+            # 新下載的歌曲可能附帶歌詞檔
+            self.lyrics_cache.clear_misses()
+
             # 重新掃描音樂庫
             self.music_manager.scan_music_library()
 
@@ -1043,6 +1255,10 @@ class MusicWindow:
         Args:
             song (dict): 歌曲資訊
         """
+        # 清除上一首的歌詞時間點
+        if self.playback_clock:
+            self.playback_clock.set_boundaries([])
+
         try:
             # 取得音樂檔案路徑
             audio_path = song.get('audio_path', '')
@@ -1054,17 +1270,19 @@ class MusicWindow:
             # 取得對應的 LRC 檔案路徑
             lrc_path = Path(audio_path).with_suffix('.lrc')
 
-            if not lrc_path.exists():
+            # 從快取取得已解析的歌詞 (未快取時讀取並解析)
+            lyrics = self.lyrics_cache.get(lrc_path)
+            if lyrics is None:
                 logger.info(f"找不到歌詞檔案: {lrc_path}")
                 if self.lyrics_view:
                     self.lyrics_view.show_no_lyrics_message()
                 return
 
-            # 解析歌詞
-            lyrics = self.lyrics_parser.parse_lrc_file(str(lrc_path))
-
             if lyrics and self.lyrics_view:
                 self.lyrics_view.set_lyrics(lyrics)
+                # 在每句歌詞開始時準時更新
+                if self.playback_clock:
+                    self.playback_clock.set_boundaries(lyric['time'] for lyric in lyrics)
                 logger.info(f"成功載入歌詞: {lrc_path.name} ({len(lyrics)} 行)")
             else:
                 if self.lyrics_view:
@@ -1075,6 +1293,16 @@ class MusicWindow:
             if self.lyrics_view:
                 self.lyrics_view.show_no_lyrics_message()
 
+    def _prefetch_upcoming_lyrics(self):
+        """在背景預先解析下一首歌曲的歌詞"""
+        upcoming = self._get_upcoming_songs(1)
+        lrc_paths = [
+            Path(song['audio_path']).with_suffix('.lrc')
+            for song in upcoming if song.get('audio_path')
+        ]
+        if lrc_paths:
+            self.lyrics_cache.prefetch(lrc_paths)
+
     def _on_lyric_click(self, time):
         """點擊歌詞跳轉到指定時間
 
@@ -1098,6 +1326,9 @@ class MusicWindow:
                 self.is_paused = False
                 logger.info(f"跳轉到歌詞位置: {time:.2f} 秒")
 
+            # 立即更新進度與歌詞
+            self._start_playback_clock()
+
         except Exception as e:
             logger.error(f"跳轉播放位置失敗: {e}")
 
@@ -1123,9 +1354,9 @@ class MusicWindow:
         """AudioPlayer 播放結束回調"""
         logger.info("AudioPlayer 播放結束，自動播放下一首")
 
-        # 在主線程中觸發下一首
+        # 在主線程中觸發下一首 (同一個畫面內重複的結束事件只切換一次)
         if self.window:
-            self.window.after(0, self._play_next)
+            self.ui_dispatcher.post(self._play_next, key='play_next', priority=PRIORITY_HIGH)
 
     def _update_discord_presence(self, song):
         """更新 Discord Rich Presence 狀態
@@ -1162,6 +1393,10 @@ class MusicWindow:
 
     def cleanup(self):
         """清理資源(在應用程式完全關閉時呼叫)"""
+        # 停止播放進度更新
+        if self.playback_clock:
+            self.playback_clock.stop()
+
         # 停止音樂
         if self.is_playing:
             if self.use_audio_player:
@@ -1169,6 +1404,19 @@ class MusicWindow:
             else:
                 pygame.mixer.music.stop()
 
+        # 停止頻譜分析線程
+        if self.spectrum_analyzer:
+            self.spectrum_analyzer.stop()
+
+        # 停止背景響度分析 (已完成的結果會儲存)
+        self._loudness_cancel.set()
+
+        # 停止專輯封面工作執行緒
+        self.album_art_cache.shutdown()
+
+        # 捨棄尚未執行的 UI 更新
+        self.ui_dispatcher.shutdown()
+
         # 清除並斷開 Discord Rich Presence
         if self.discord_presence:
             self.discord_presence.clear()
@@ -3,6 +3,7 @@ import customtkinter as ctk
 from tkinter import messagebox, simpledialog
 import threading
 from src.core.logger import logger
+from src.utils.ui_dispatcher import UIDispatcher
 from src.rss.rss_feed_list_view import RSSFeedListView
 from src.rss.rss_filter_manager import RSSFilterManager
 from src.rss.rss_entry_list_view import RSSEntryListView
@@ -19,6 +20,9 @@ class RSSWindow:
         self.current_feed_url = None
         self.loading_label = None
 
+        # 背景執行緒的 UI 更新派送佇列 (視窗建立後再設定排程)
+        self.ui_dispatcher = UIDispatcher()
+
         # 子視圖實例
         self.feed_list_view = None
         self.filter_manager = None
@@ -50,6 +54,8 @@ class RSSWindow:
             # 如果沒有提供根視窗,建立獨立的視窗
             self.window = ctk.CTk()
 
+        self.ui_dispatcher.attach(self.window)
+
         self.window.title("📰 RSS 訂閱管理")
         self.window.geometry("1200x700")
         self.window.resizable(True, True)
@@ -172,8 +178,11 @@ class RSSWindow:
         # 在背景執行緒中載入
         def load_thread():
             entries = self.rss_manager.fetch_feed_entries(feed_url)
-            # 在主執行緒中更新 UI
-            self.window.after(0, lambda: self._update_entries_ui(entries))
+            # 已切換到其他訂閱源時捨棄結果
+            if feed_url != self.current_feed_url:
+                return
+            # 在主執行緒中更新 UI (快速切換時只顯示最後一次的結果)
+            self.ui_dispatcher.post(self._update_entries_ui, entries, key='rss_entries')
 
         thread = threading.Thread(target=load_thread, daemon=True)
         thread.start()
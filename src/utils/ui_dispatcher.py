@@ -0,0 +1,234 @@
+"""UI 派送佇列模組
+
+背景執行緒不再各自呼叫 window.after(0, lambda ...)，而是把 UI 更新交給派送器:
+- 執行緒安全的佇列，每個畫面 (frame) 最多排程一次 after()，一次處理所有待執行的更新
+- 以 key 合併同一個元件或屬性的更新 (後寫入者為準)，例如進度更新只保留最新的一次
+- 優先順序分為高、一般、低三個通道，高優先的更新先執行
+- 記錄佇列深度與處理時間，方便觀察負載
+"""
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from src.core.logger import logger
+
+
+# 優先順序通道 (數字越小越先執行)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class UIDispatcher:
+    """合併式 UI 派送器"""
+
+    # 每個畫面的時間 (毫秒)，兩次處理之間至少間隔此時間
+    FRAME_MS = 16
+
+    def __init__(self, scheduler=None, frame_ms=FRAME_MS):
+        """初始化派送器
+
+        Args:
+            scheduler: 提供 after(ms, func) 與 after_cancel(id) 的物件 (Tk 視窗)，可稍後以 attach() 設定
+            frame_ms (int): 每個畫面的時間 (毫秒)
+        """
+        self.scheduler = scheduler
+        self.frame_ms = max(0, int(frame_ms))
+        self._lock = threading.Lock()
+        self._lanes = {priority: OrderedDict() for priority in (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)}
+        self._key_lanes = {}  # {key: 所在的通道}
+        self._sequence = itertools.count()  # 沒有 key 的更新使用的唯一鍵
+        self._after_id = None
+        self._scheduled = False
+        self._last_drain = 0.0
+        self._closed = False
+        self._stats = {
+            'posted': 0,
+            'coalesced': 0,
+            'executed': 0,
+            'errors': 0,
+            'drains': 0,
+            'last_depth': 0,
+            'max_depth': 0,
+            'last_drain_ms': 0.0,
+            'max_drain_ms': 0.0,
+            'total_drain_ms': 0.0,
+        }
+
+    def attach(self, scheduler):
+        """設定 (或更換) 排程用的 Tk 視窗，並處理已排隊的更新
+
+        Args:
+            scheduler: 提供 after() 與 after_cancel() 的物件
+        """
+        self._cancel_scheduled()
+        with self._lock:
+            self.scheduler = scheduler
+            self._closed = False
+            pending = self._pending_count()
+        if pending:
+            self._request_drain()
+
+    def post(self, func, *args, key=None, priority=PRIORITY_NORMAL):
+        """排入 UI 更新 (可在任何執行緒呼叫)
+
+        Args:
+            func (callable): 在 UI 線程執行的函數
+            *args: 傳給 func 的參數
+            key: 合併鍵，相同 key 尚未執行的更新會被取代 (後寫入者為準)，None 表示不合併
+            priority (int): PRIORITY_HIGH / PRIORITY_NORMAL / PRIORITY_LOW
+
+        Returns:
+            bool: 是否已排入 (派送器已關閉時返回 False)
+        """
+        if priority not in self._lanes:
+            raise ValueError(f"不支援的優先順序: {priority}")
+
+        with self._lock:
+            if self._closed:
+                return False
+            self._stats['posted'] += 1
+
+            if key is None:
+                key = ('_unkeyed', next(self._sequence))
+            else:
+                previous_lane = self._key_lanes.get(key)
+                if previous_lane is not None:
+                    self._stats['coalesced'] += 1
+                    if previous_lane != priority:
+                        del self._lanes[previous_lane][key]
+
+            # 已存在的 key 保留原本的排隊位置，只更新內容
+            self._lanes[priority][key] = (func, args)
+            self._key_lanes[key] = priority
+
+        self._request_drain()
+        return True
+
+    def pending_count(self):
+        """尚未執行的更新數
+
+        Returns:
+            int: 佇列深度
+        """
+        with self._lock:
+            return self._pending_count()
+
+    def stats(self):
+        """取得統計資料
+
+        Returns:
+            dict: posted / coalesced / executed / errors / drains 次數、
+                  last_depth / max_depth 佇列深度、
+                  last_drain_ms / max_drain_ms / avg_drain_ms 處理時間 (毫秒)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = self._pending_count()
+        drains = stats['drains']
+        stats['avg_drain_ms'] = stats.pop('total_drain_ms') / drains if drains else 0.0
+        return stats
+
+    def flush(self):
+        """立即在目前的線程處理所有待執行的更新 (只應在 UI 線程呼叫)"""
+        self._cancel_scheduled()
+        self._drain()
+
+    def shutdown(self):
+        """停止派送並捨棄尚未執行的更新"""
+        self._cancel_scheduled()
+        with self._lock:
+            self._closed = True
+            for lane in self._lanes.values():
+                lane.clear()
+            self._key_lanes.clear()
+            self._scheduled = False
+
+    # ==================== 內部 ====================
+
+    def _pending_count(self):
+        """尚未執行的更新數 (呼叫端需持有鎖)"""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def _request_drain(self):
+        """排程下一次處理 (每個畫面最多一次)"""
+        with self._lock:
+            if self._scheduled or self.scheduler is None or self._closed:
+                return
+            self._scheduled = True
+            # 距離上次處理不足一個畫面時延後到下一個畫面
+            elapsed_ms = (time.monotonic() - self._last_drain) * 1000
+            delay = max(0, math.ceil(self.frame_ms - elapsed_ms))
+            scheduler = self.scheduler
+
+        try:
+            after_id = scheduler.after(delay, self._drain)
+        except Exception as e:
+            # 視窗已銷毀
+            logger.debug(f"無法排程 UI 更新: {e}")
+            with self._lock:
+                self._scheduled = False
+            return
+
+        with self._lock:
+            if self._scheduled:
+                self._after_id = after_id
+
+    def _cancel_scheduled(self):
+        """取消已排程的處理"""
+        with self._lock:
+            after_id, self._after_id = self._after_id, None
+            self._scheduled = False
+            scheduler = self.scheduler
+        if after_id is not None and scheduler is not None:
+            try:
+                scheduler.after_cancel(after_id)
+            except Exception:
+                # 視窗已銷毀
+                pass
+
+    def _drain(self):
+        """處理目前佇列中的所有更新 (UI 線程)
+
+        處理期間新排入的更新留到下一個畫面。
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._after_id = None
+            self._scheduled = False
+            # 以開始時間計算下一個畫面，處理期間排入的更新不會立即再執行
+            self._last_drain = start
+            batch = []
+            for priority in sorted(self._lanes):
+                lane = self._lanes[priority]
+                batch.extend(lane.values())
+                lane.clear()
+            self._key_lanes.clear()
+
+        if not batch:
+            return
+
+        executed = errors = 0
+        for func, args in batch:
+            try:
+                func(*args)
+                executed += 1
+            except Exception as e:
+                errors += 1
+                logger.error(f"執行 UI 更新時發生錯誤: {e}", exc_info=True)
+        drain_ms = (time.monotonic() - start) * 1000
+
+        with self._lock:
+            stats = self._stats
+            stats['drains'] += 1
+            stats['executed'] += executed
+            stats['errors'] += errors
+            stats['last_depth'] = len(batch)
+            stats['max_depth'] = max(stats['max_depth'], len(batch))
+            stats['last_drain_ms'] = drain_ms
+            stats['max_drain_ms'] = max(stats['max_drain_ms'], drain_ms)
+            stats['total_drain_ms'] += drain_ms
+
+        if drain_ms > self.frame_ms:
+            logger.debug(f"UI 更新處理超過一個畫面: {drain_ms:.1f} ms ({len(batch)} 項)")
@@ -0,0 +1,199 @@
+"""AlbumArtCache 的單元測試"""
+import os
+import threading
+import time
+from io import BytesIO
+from unittest.mock import patch, MagicMock
+
+import pytest
+from PIL import Image
+
+from src.music.utils.album_art_cache import AlbumArtCache
+
+
+URL = 'https://example.com/cover.jpg'
+
+
+def make_png(width=400, height=300, color='red'):
+    """建立測試用 PNG 圖片資料"""
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def make_response(status_code=200, content=b'', headers=None):
+    """建立模擬的 requests 回應"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    art_cache = AlbumArtCache(str(tmp_path / 'art'), max_workers=1)
+    yield art_cache
+    art_cache.shutdown(wait=True)
+
+
+def load(cache, source, size):
+    """同步取得縮圖"""
+    return cache.request(source, size, lambda image: None).result(timeout=5)
+
+
+class TestAlbumArtCache:
+    """測試專輯封面快取"""
+
+    def test_download_stores_derivatives(self, cache):
+        """下載後產生播放器與列表尺寸的縮圖"""
+        with patch('src.music.utils.album_art_cache.requests.get',
+                   return_value=make_response(content=make_png(), headers={'ETag': '"v1"'})) as mock_get:
+            image = load(cache, URL, 230)
+
+        assert mock_get.call_count == 1
+        assert image.size == (230, 172)
+        assert cache.get_cached(URL, 48).size == (48, 36)
+
+    def test_cached_cover_needs_no_network(self, cache):
+        """已快取的封面直接從磁碟讀取"""
+        with patch('src.music.utils.album_art_cache.requests.get',
+                   return_value=make_response(content=make_png())):
+            load(cache, URL, 230)
+
+        with patch('src.music.utils.album_art_cache.requests.get') as mock_get:
+            assert cache.get_cached(URL, 230).size == (230, 172)
+            assert load(cache, URL, 230).size == (230, 172)
+        mock_get.assert_not_called()
+        assert not cache.is_stale(URL)
+
+    def test_index_persists_across_instances(self, cache, tmp_path):
+        """重新建立快取後仍可取得封面"""
+        with patch('src.music.utils.album_art_cache.requests.get',
+                   return_value=make_response(content=make_png())):
+            load(cache, URL, 230)
+
+        reopened = AlbumArtCache(str(tmp_path / 'art'))
+        try:
+            assert reopened.get_cached(URL, 230) is not None
+        finally:
+            reopened.shutdown()
+
+    def test_revalidates_with_etag(self, tmp_path):
+        """過期後以 If-None-Match 重新驗證，304 時沿用既有封面"""
+        cache = AlbumArtCache(str(tmp_path / 'art'), revalidate_seconds=0)
+        try:
+            with patch('src.music.utils.album_art_cache.requests.get',
+                       return_value=make_response(content=make_png(), headers={'ETag': '"v1"'})):
+                load(cache, URL, 230)
+
+            assert cache.is_stale(URL)
+            with patch('src.music.utils.album_art_cache.requests.get',
+                       return_value=make_response(status_code=304)) as mock_get:
+                image = load(cache, URL, 230)
+
+            assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+            assert image.size == (230, 172)
+        finally:
+            cache.shutdown(wait=True)
+
+    def test_network_failure_keeps_existing_cover(self, tmp_path):
+        """重新驗證失敗時沿用既有封面"""
+        cache = AlbumArtCache(str(tmp_path / 'art'), revalidate_seconds=0)
+        try:
+            with patch('src.music.utils.album_art_cache.requests.get',
+                       return_value=make_response(content=make_png())):
+                load(cache, URL, 230)
+
+            with patch('src.music.utils.album_art_cache.requests.get',
+                       side_effect=Exception("offline")):
+                assert load(cache, URL, 230) is not None
+        finally:
+            cache.shutdown(wait=True)
+
+    def test_same_content_stored_once(self, cache, tmp_path):
+        """不同網址的相同圖片只保存一份"""
+        data = make_png()
+        with patch('src.music.utils.album_art_cache.requests.get',
+                   return_value=make_response(content=data)):
+            load(cache, URL, 230)
+            load(cache, 'https://example.com/other.jpg', 230)
+
+        assert len(os.listdir(tmp_path / 'art' / AlbumArtCache.ORIGINALS_DIR)) == 1
+
+    def test_failed_download_returns_none(self, cache):
+        """下載失敗時返回 None"""
+        results = []
+        with patch('src.music.utils.album_art_cache.requests.get',
+                   return_value=make_response(status_code=404)):
+            cache.request(URL, 230, results.append).result(timeout=5)
+
+        assert results == [None]
+        assert cache.get_cached(URL, 230) is None
+
+    def test_local_file_source(self, cache, tmp_path):
+        """本機檔案變更後重新產生縮圖"""
+        cover_path = tmp_path / 'cover.png'
+        cover_path.write_bytes(make_png(color='red'))
+        assert load(cache, str(cover_path), 48).getpixel((0, 0)) == (255, 0, 0)
+        assert not cache.is_stale(str(cover_path))
+
+        cover_path.write_bytes(make_png(color='blue'))
+        stat = os.stat(cover_path)
+        os.utime(cover_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.is_stale(str(cover_path))
+        assert load(cache, str(cover_path), 48).getpixel((0, 0)) == (0, 0, 255)
+
+    def test_small_image_is_not_upscaled(self, cache, tmp_path):
+        """小於目標尺寸的圖片不放大"""
+        cover_path = tmp_path / 'small.png'
+        cover_path.write_bytes(make_png(width=40, height=40))
+
+        assert load(cache, str(cover_path), 230).size == (40, 40)
+
+    def test_concurrent_requests_are_coalesced(self, cache):
+        """同一封面的重複請求合併為一次下載"""
+        results = []
+
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return make_response(content=make_png())
+
+        with patch('src.music.utils.album_art_cache.requests.get', side_effect=slow_get) as mock_get:
+            first = cache.request(URL, 230, results.append)
+            second = cache.request(URL, 230, results.append)
+            first.result(timeout=5)
+            second.result(timeout=5)
+
+        assert first is second
+        assert mock_get.call_count == 1
+        assert len(results) == 2
+
+    def test_shutdown_cancels_queued_requests(self, tmp_path):
+        """關閉時取消尚未開始的下載，不呼叫其回調"""
+        cache = AlbumArtCache(str(tmp_path / 'art'), max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+        urls = []
+
+        def slow_get(url, **kwargs):
+            urls.append(url)
+            started.set()
+            release.wait(5)
+            return make_response(content=make_png())
+
+        delivered = []
+        with patch('src.music.utils.album_art_cache.requests.get', side_effect=slow_get):
+            running = cache.request(URL, 48, delivered.append)
+            started.wait(5)
+            queued = cache.request('https://example.com/other.jpg', 48, delivered.append)
+
+            cache.shutdown()
+            release.set()
+            running.result(timeout=5)
+
+        assert queued.cancelled()
+        assert urls == [URL]
+        assert len(delivered) == 1
@@ -4,8 +4,15 @@ from unittest.mock import Mock, MagicMock, patch, call
 import numpy as np
 import threading
 import time
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
 from src.audio.audio_player import AudioPlayer
 from src.audio.audio_processor import AudioProcessor
+from src.audio.pcm_cache import PCMCache
 
 
 class TestAudioPlayerBasicPlayback(unittest.TestCase):
@@ -20,7 +27,7 @@ class TestAudioPlayerBasicPlayback(unittest.TestCase):
         if self.player:
             self.player.stop()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_load_and_play_mp3(self, mock_stream, mock_load):
         """測試載入並播放 MP3 檔案"""
@@ -57,7 +64,21 @@ class TestAudioPlayerBasicPlayback(unittest.TestCase):
         mock_read.assert_called_once()
         self.assertTrue(self.player.is_playing())
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('src.audio.audio_player.sf.read')
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_decoder_metrics(self, mock_stream, mock_read):
+        """測試解碼後記錄使用的後端與吞吐量"""
+        mock_read.return_value = (np.zeros((44100, 2), dtype=np.float32), 44100)
+        mock_stream.return_value = MagicMock()
+
+        self.player.play('test.wav')
+
+        metrics = self.player.get_decoder_metrics()
+        self.assertEqual(metrics['soundfile']['files'], 1)
+        self.assertAlmostEqual(metrics['soundfile']['audio_seconds'], 1.0)
+        self.assertEqual(self.player.decoders.get_preferred_backend('test.wav'), 'soundfile')
+
+    @patch('librosa.load')
     def test_play_nonexistent_file(self, mock_load):
         """測試播放不存在的檔案"""
         # Mock 檔案不存在錯誤
@@ -70,7 +91,7 @@ class TestAudioPlayerBasicPlayback(unittest.TestCase):
         self.assertFalse(result)
         self.assertFalse(self.player.is_playing())
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_play_multiple_files_sequentially(self, mock_stream, mock_load):
         """測試連續播放多個檔案"""
@@ -91,7 +112,7 @@ class TestAudioPlayerBasicPlayback(unittest.TestCase):
         # 驗證 stop 被呼叫
         self.assertEqual(mock_stream_instance.stop.call_count, 1)
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_playback_end_callback(self, mock_stream, mock_load):
         """測試播放結束回調"""
@@ -131,7 +152,7 @@ class TestAudioPlayerControls(unittest.TestCase):
         if self.player:
             self.player.stop()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_pause_and_resume(self, mock_stream, mock_load):
         """測試暫停和恢復播放"""
@@ -156,7 +177,7 @@ class TestAudioPlayerControls(unittest.TestCase):
         self.assertTrue(self.player.is_playing())
         self.assertFalse(self.player.is_paused())
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_stop_playback(self, mock_stream, mock_load):
         """測試停止播放"""
@@ -176,7 +197,7 @@ class TestAudioPlayerControls(unittest.TestCase):
         mock_stream_instance.stop.assert_called()
         mock_stream_instance.close.assert_called()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_seek_forward(self, mock_stream, mock_load):
         """測試向前跳轉"""
@@ -193,7 +214,7 @@ class TestAudioPlayerControls(unittest.TestCase):
         self.player.seek(2.0)
         self.assertAlmostEqual(self.player.get_position(), 2.0, delta=0.1)
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_seek_backward(self, mock_stream, mock_load):
         """測試向後跳轉"""
@@ -211,7 +232,7 @@ class TestAudioPlayerControls(unittest.TestCase):
         self.player.seek(1.0)
         self.assertAlmostEqual(self.player.get_position(), 1.0, delta=0.1)
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_seek_beyond_duration(self, mock_stream, mock_load):
         """測試跳轉到超出時長的位置"""
@@ -260,7 +281,7 @@ class TestAudioPlayerVolumeAndProcessor(unittest.TestCase):
         self.player.set_volume(-0.5)  # 應限制在 0.0
         self.assertEqual(self.player.get_volume(), 0.0)
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_audio_processor_integration(self, mock_stream, mock_load):
         """測試音訊處理器整合"""
@@ -282,7 +303,7 @@ class TestAudioPlayerVolumeAndProcessor(unittest.TestCase):
 
         player.stop()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_processor_enabled_disabled(self, mock_stream, mock_load):
         """測試啟用/停用處理器"""
@@ -310,7 +331,7 @@ class TestAudioPlayerVolumeAndProcessor(unittest.TestCase):
 
         player.stop()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_realtime_processor_update(self, mock_stream, mock_load):
         """測試即時更新處理器參數"""
@@ -334,7 +355,7 @@ class TestAudioPlayerVolumeAndProcessor(unittest.TestCase):
 
         player.stop()
 
-    @patch('src.audio.audio_player.librosa.load')
+    @patch('librosa.load')
     @patch('src.audio.audio_player.sd.OutputStream')
     def test_stereo_mono_audio(self, mock_stream, mock_load):
         """測試立體聲和單聲道音訊"""
@@ -361,5 +382,453 @@ class TestAudioPlayerVolumeAndProcessor(unittest.TestCase):
         self.player.stop()
 
 
+class TestAudioPlayerRealtimeCallback(unittest.TestCase):
+    """測試即時回調的就地處理"""
+
+    def _run_callbacks(self, player, outdata, count):
+        """連續執行多次回調"""
+        for _ in range(count):
+            player._audio_callback(outdata, len(outdata), None, None)
+
+    @patch('src.audio.audio_player.sf.read')
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_steady_state_callback_allocates_no_audio_buffers(self, mock_stream, mock_read):
+        """測試穩定播放期間回調不配置新的音訊緩衝區"""
+        # 3 秒音訊，涵蓋淡入與淡出區段
+        mock_audio = (np.random.rand(44100 * 3, 2).astype(np.float32) - 0.5)
+        mock_read.return_value = (mock_audio, 44100)
+        mock_stream.return_value = MagicMock()
+
+        processor = AudioProcessor(sample_rate=44100)
+        processor.set_volume(0.8)
+        player = AudioPlayer(audio_processor=processor)
+        player.set_volume(0.9)
+        player.play('test.wav')
+
+        outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+
+        # 預熱
+        self._run_callbacks(player, outdata, 2)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            self._run_callbacks(player, outdata, 60)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # 任何一次區塊大小的配置都會讓峰值超過此門檻
+        self.assertLess(peak - baseline, outdata.nbytes // 4)
+        self.assertLess(current - baseline, 1024)
+        self.assertEqual(player.current_frame, AudioPlayer.BLOCKSIZE * 62)
+
+        player.stop()
+
+    @patch('src.audio.audio_player.sf.read')
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_callback_matches_reference_processing(self, mock_stream, mock_read):
+        """測試就地處理的輸出與原本的逐步運算一致"""
+        mock_audio = (np.random.rand(44100 * 3, 2).astype(np.float32) - 0.5)
+        mock_read.return_value = (mock_audio, 44100)
+        mock_stream.return_value = MagicMock()
+
+        player = AudioPlayer(audio_processor=AudioProcessor(enable_equalizer=False))
+        player.set_volume(0.5)
+        player.play('test.wav')
+
+        outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+        player._audio_callback(outdata, len(outdata), None, None)
+
+        # 第一個區塊位於淡入區段: 增益為 frame / fade_in_frames
+        ramp = np.arange(AudioPlayer.BLOCKSIZE, dtype=np.float32) / 44100
+        expected = mock_audio[:AudioPlayer.BLOCKSIZE] * 0.5 * ramp[:, np.newaxis]
+        np.testing.assert_allclose(outdata, expected, atol=1e-6)
+
+        player.stop()
+
+    @patch('src.audio.audio_player.sf.read')
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_volume_applied_once_by_processor(self, mock_stream, mock_read):
+        """測試有處理器時播放器音量併入處理器的增益，只乘一次"""
+        mock_audio = np.full((44100, 2), 0.8, dtype=np.float32)
+        mock_read.return_value = (mock_audio, 44100)
+        mock_stream.return_value = MagicMock()
+
+        processor = AudioProcessor(enable_equalizer=False)
+        processor.set_replay_gain(2.0)
+        player = AudioPlayer(audio_processor=processor)
+        player.set_fade_enabled(False)
+        player.set_volume(0.5)
+        self.assertEqual(processor.get_output_gain(), 0.5)
+        # 合併後的增益為 1.0，整個乘法省略
+        self.assertEqual(processor.graph.describe(), ['limiter'])
+
+        player.play('test.wav')
+        outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+        player._audio_callback(outdata, len(outdata), None, None)
+        np.testing.assert_allclose(outdata, 0.8, atol=1e-6)
+
+        # 替換處理器時同步目前音量
+        replacement = AudioProcessor(enable_equalizer=False)
+        player.audio_processor = replacement
+        self.assertEqual(replacement.get_output_gain(), 0.5)
+
+        player.stop()
+
+
+class TestAudioPlayerStreamingSpeed(unittest.TestCase):
+    """測試播放中即時變速"""
+
+    def setUp(self):
+        """測試前設定"""
+        stream_patcher = patch('src.audio.audio_player.sd.OutputStream')
+        read_patcher = patch('src.audio.audio_player.sf.read')
+        stream_patcher.start().return_value = MagicMock()
+        self.mock_read = read_patcher.start()
+        self.addCleanup(stream_patcher.stop)
+        self.addCleanup(read_patcher.stop)
+
+        t = np.arange(44100 * 10) / 44100
+        mono = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        self.audio = np.column_stack((mono, mono))
+        self.mock_read.return_value = (self.audio, 44100)
+
+        self.processor = AudioProcessor(sample_rate=44100, enable_equalizer=False)
+        self.player = AudioPlayer(audio_processor=self.processor)
+        self.player.enable_speed_adjustment(True)
+        self.outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+
+    def tearDown(self):
+        """測試後清理"""
+        self.player.stop()
+
+    def _callback(self):
+        """模擬一次 sounddevice 回調"""
+        self.player._audio_callback(self.outdata, len(self.outdata), None, None)
+
+    def test_speed_change_applies_without_reload(self):
+        """測試播放中改變速度只影響之後的區塊，不重新載入音訊"""
+        self.player.play('test.wav')
+        for _ in range(10):
+            self._callback()
+        self.assertEqual(self.player.current_frame, AudioPlayer.BLOCKSIZE * 10)
+
+        self.player.set_playback_speed(1.5)
+        before = self.player.current_frame
+        for _ in range(50):
+            self._callback()
+            self.assertTrue(np.all(np.isfinite(self.outdata)))
+
+        advanced = self.player.current_frame - before
+        self.assertAlmostEqual(advanced / (AudioPlayer.BLOCKSIZE * 50), 1.5, delta=0.05)
+        self.assertEqual(self.mock_read.call_count, 1)
+
+        # 位置與時長以來源時間計算
+        self.assertAlmostEqual(self.player.get_duration(), 10.0, places=3)
+
+    def test_seek_while_stretching(self):
+        """測試變速中跳轉後從目標位置繼續"""
+        self.player.set_playback_speed(0.75)
+        self.player.play('test.wav')
+        for _ in range(5):
+            self._callback()
+
+        self.player.seek(5.0)
+        self._callback()
+        self.assertGreaterEqual(self.player.current_frame, 5 * 44100)
+        self.assertLess(self.player.current_frame, 5 * 44100 + AudioPlayer.BLOCKSIZE * 2)
+
+    def test_playback_ends_while_stretching(self):
+        """測試變速播放到結尾時正常結束"""
+        on_end = Mock()
+        self.player.on_playback_end = on_end
+        self.player.set_playback_speed(2.0)
+        self.player.play('test.wav')
+
+        for _ in range(200):
+            if not self.player.is_playing():
+                break
+            self._callback()
+
+        self.assertFalse(self.player.is_playing())
+        self.assertEqual(self.player.current_frame, len(self.audio))
+        time.sleep(0.1)
+        on_end.assert_called_once()
+
+
+class TestAudioPlayerPCMCache(unittest.TestCase):
+    """測試解碼快取整合"""
+
+    def setUp(self):
+        """測試前設定"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source = os.path.join(self.temp_dir.name, 'song.mp3')
+        with open(self.source, 'wb') as f:
+            f.write(b'encoded audio')
+
+        self.audio = (np.random.rand(44100, 2).astype(np.float32) - 0.5)
+        self.outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+
+    def _make_player(self, dtype='float32'):
+        """建立使用暫存快取目錄的播放器"""
+        cache = PCMCache(os.path.join(self.temp_dir.name, 'cache'), dtype=dtype)
+        player = AudioPlayer(audio_processor=AudioProcessor(enable_equalizer=False), pcm_cache=cache)
+        player.set_fade_enabled(False)
+        self.addCleanup(player.stop)
+        return player, cache
+
+    @patch('src.audio.audio_player.sf.read')
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_replay_uses_cache_without_decoding(self, mock_stream, mock_read):
+        """測試重播已快取的歌曲時不再解碼"""
+        mock_stream.return_value = MagicMock()
+        mock_read.return_value = (self.audio, 44100)
+        player, cache = self._make_player()
+
+        self.assertTrue(player.play(self.source))
+
+        # 快取在背景寫入
+        for _ in range(50):
+            if cache.contains(self.source):
+                break
+            time.sleep(0.05)
+        self.assertTrue(cache.contains(self.source))
+
+        self.assertTrue(player.play(self.source))
+        self.assertEqual(mock_read.call_count, 1)
+        self.assertIsInstance(player.audio_data, np.memmap)
+
+        # 跳轉後從 memmap 讀取的區塊與原始音訊一致
+        player.seek(0.5)
+        player._audio_callback(self.outdata, len(self.outdata), None, None)
+        np.testing.assert_allclose(self.outdata, self.audio[22050:22050 + AudioPlayer.BLOCKSIZE], atol=1e-6)
+
+    @patch('src.audio.audio_player.sd.OutputStream')
+    def test_int16_cache_is_converted_per_block(self, mock_stream):
+        """測試 int16 快取在回調中轉換為 float32"""
+        mock_stream.return_value = MagicMock()
+        player, cache = self._make_player(dtype='int16')
+        cache.put(self.source, self.audio, 44100)
+
+        self.assertTrue(player.play(self.source))
+        self.assertEqual(player.audio_data.dtype, np.int16)
+
+        player._audio_callback(self.outdata, len(self.outdata), None, None)
+        np.testing.assert_allclose(self.outdata, self.audio[:AudioPlayer.BLOCKSIZE], atol=1e-4)
+
+    @patch('src.audio.audio_player.sf.read')
+    def test_warm_up_cache_uses_decoder(self, mock_read):
+        """測試預熱使用播放器的解碼流程"""
+        mock_read.return_value = (self.audio, 44100)
+        player, cache = self._make_player()
+
+        player.warm_up_cache([self.source])
+        self.assertTrue(cache.wait_for_warm_up(timeout=5.0))
+        self.assertTrue(cache.contains(self.source))
+
+
+class TestAudioPlayerCompactMemory(unittest.TestCase):
+    """測試精簡記憶體模式 (int16、原始聲道數)"""
+
+    def setUp(self):
+        """測試前設定"""
+        stream_patcher = patch('src.audio.audio_player.sd.OutputStream')
+        read_patcher = patch('src.audio.audio_player.sf.read')
+        self.mock_stream = stream_patcher.start()
+        self.mock_stream.return_value = MagicMock()
+        self.mock_read = read_patcher.start()
+        self.addCleanup(stream_patcher.stop)
+        self.addCleanup(read_patcher.stop)
+
+        t = np.arange(44100 * 3) / 44100
+        self.mono = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32).reshape(-1, 1)
+        self.mock_read.return_value = (self.mono, 44100)
+
+        self.player = AudioPlayer(compact_memory=True)
+        self.player.set_fade_enabled(False)
+        self.outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+
+    def tearDown(self):
+        """測試後清理"""
+        self.player.stop()
+
+    def test_mono_kept_as_int16_single_channel(self):
+        """測試單聲道來源以 int16 單聲道保存 (float32 立體聲的 1/4)"""
+        self.assertTrue(self.player.play('mono.wav'))
+        audio_data = self.player.audio_data
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertEqual(audio_data.shape, (len(self.mono), 1))
+        self.assertEqual(audio_data.nbytes * 4, len(self.mono) * 2 * 4)
+
+        # 串流仍以立體聲輸出
+        self.assertEqual(self.mock_stream.call_args.kwargs['channels'], 2)
+
+    def test_callback_upmixes_and_converts(self):
+        """測試回調逐區塊轉換為 float32 並升混為立體聲"""
+        self.player.play('mono.wav')
+        self.player.seek(1.0)
+        self.player._audio_callback(self.outdata, len(self.outdata), None, None)
+
+        expected = self.mono[44100:44100 + AudioPlayer.BLOCKSIZE, 0]
+        np.testing.assert_allclose(self.outdata[:, 0], expected, atol=1e-4)
+        np.testing.assert_array_equal(self.outdata[:, 0], self.outdata[:, 1])
+
+    def test_callback_does_not_allocate(self):
+        """測試轉換與升混不配置區塊大小的陣列"""
+        self.player.play('mono.wav')
+        self.player._audio_callback(self.outdata, len(self.outdata), None, None)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(20):
+                self.player._audio_callback(self.outdata, len(self.outdata), None, None)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak - baseline, self.outdata.nbytes // 4)
+        self.assertLess(current - baseline, 1024)
+
+
+class TestAudioPlayerLockFreeState(unittest.TestCase):
+    """測試 UI 查詢與音訊回調之間的無鎖參數傳遞"""
+
+    def setUp(self):
+        """測試前設定"""
+        stream_patcher = patch('src.audio.audio_player.sd.OutputStream')
+        read_patcher = patch('src.audio.audio_player.sf.read')
+        stream_patcher.start().return_value = MagicMock()
+        self.mock_read = read_patcher.start()
+        self.addCleanup(stream_patcher.stop)
+        self.addCleanup(read_patcher.stop)
+
+        self.audio = (np.random.rand(44100 * 30, 2).astype(np.float32) - 0.5)
+        self.mock_read.return_value = (self.audio, 44100)
+
+        self.processor = AudioProcessor(sample_rate=44100)
+        self.player = AudioPlayer(audio_processor=self.processor)
+        self.player.play('test.wav')
+        self.outdata = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+
+    def tearDown(self):
+        """測試後清理"""
+        self.player.stop()
+
+    def _callback(self):
+        """模擬一次 sounddevice 回調"""
+        self.player._audio_callback(self.outdata, len(self.outdata), None, None)
+
+    def test_callback_never_waits_for_control_lock(self):
+        """測試控制端持有鎖時回調仍可完成"""
+        def run_callbacks():
+            for _ in range(10):
+                self._callback()
+
+        with self.player._lock:
+            worker = threading.Thread(target=run_callbacks, daemon=True)
+            worker.start()
+            worker.join(timeout=2.0)
+            self.assertFalse(worker.is_alive())
+
+        self.assertEqual(self.player.current_frame, AudioPlayer.BLOCKSIZE * 10)
+
+    def test_seek_is_applied_by_callback(self):
+        """測試跳轉請求在下一個回調套用"""
+        self._callback()
+        self.player.seek(2.0)
+
+        # 回調尚未執行時，查詢已反映跳轉目標
+        self.assertAlmostEqual(self.player.get_position(), 2.0, places=3)
+        self.assertEqual(self.player.current_frame, AudioPlayer.BLOCKSIZE)
+
+        self._callback()
+        self.assertEqual(self.player.current_frame, 88200 + AudioPlayer.BLOCKSIZE)
+
+    def test_pause_snapshot_outputs_silence(self):
+        """測試暫停快照讓回調輸出靜音且不前進"""
+        self._callback()
+        self.player.pause()
+        self.outdata.fill(1.0)
+
+        self._callback()
+
+        self.assertTrue(np.all(self.outdata == 0.0))
+        self.assertEqual(self.player.current_frame, AudioPlayer.BLOCKSIZE)
+
+    def test_ui_queries_under_stress(self):
+        """測試 UI 密集呼叫查詢與控制 API 時回調持續正常運作"""
+        stop = threading.Event()
+        errors = []
+        callback_count = [0]
+        duration = self.player.get_duration()
+
+        def audio_thread():
+            try:
+                while not stop.is_set():
+                    self._callback()
+                    if not np.all(np.isfinite(self.outdata)):
+                        errors.append('non-finite output')
+                    if np.max(np.abs(self.outdata)) > 1.0:
+                        errors.append('clipped output')
+                    callback_count[0] += 1
+            except Exception as e:  # pragma: no cover - 失敗時記錄
+                errors.append(repr(e))
+
+        def ui_thread(seed):
+            rng = random.Random(seed)
+            equalizer = self.processor.get_equalizer()
+            try:
+                while not stop.is_set():
+                    position = self.player.get_position()
+                    if not 0.0 <= position <= duration:
+                        errors.append(f'position out of range: {position}')
+                    self.player.is_playing()
+                    self.player.is_paused()
+                    self.player.get_duration()
+                    action = rng.random()
+                    if action < 0.2:
+                        self.player.seek(rng.uniform(0, 25))
+                    elif action < 0.3:
+                        self.player.pause()
+                    elif action < 0.5:
+                        self.player.resume()
+                    elif action < 0.7:
+                        self.player.set_volume(rng.random())
+                    else:
+                        equalizer.set_band_gain(rng.randrange(10), rng.uniform(-12, 12))
+            except Exception as e:  # pragma: no cover - 失敗時記錄
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=audio_thread, daemon=True)]
+        threads += [threading.Thread(target=ui_thread, args=(i,), daemon=True) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        self.assertEqual(errors, [])
+        self.assertGreater(callback_count[0], 0)
+
+
+class TestAudioPlayerImport(unittest.TestCase):
+    """測試模組載入成本"""
+
+    def test_import_does_not_load_librosa(self):
+        """測試載入播放器模組時不載入 librosa (只在 LibrosaDecoder 解碼時載入)"""
+        code = "import sys; import src.audio.audio_player; print('librosa' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+
 if __name__ == '__main__':
     unittest.main()
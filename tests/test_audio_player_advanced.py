@@ -61,6 +61,7 @@ class TestAudioPlayerFade:
         player.audio_data = np.ones((1100, 2), dtype=np.float32)
         player._fade_in_frames = 50
         player._fade_out_start_frame = 1000
+        player._fade_out_frames = 100
         player.fade_enabled = True
 
         # 應用淡出
@@ -105,20 +106,92 @@ class TestAudioPlayerSpeed:
         player.enable_speed_adjustment(False)
         assert player._speed_adjustment_enabled is False
 
-    @patch('src.audio.audio_player.librosa')
-    def test_adjust_speed(self, mock_librosa, player):
-        """測試速度調整功能"""
-        # 創建測試音訊數據
-        audio_data = np.random.rand(1000, 2).astype(np.float32)
+    def test_speed_forwarded_to_processor(self):
+        """測試速度設定立即傳給 AudioProcessor (不需重新載入音訊)"""
+        from src.audio.audio_processor import AudioProcessor
+
+        with patch('src.audio.audio_player.SOUNDDEVICE_AVAILABLE', True):
+            processor = AudioProcessor(enable_equalizer=False)
+            player = AudioPlayer(audio_processor=processor)
+
+        player.set_playback_speed(1.5)
+        # 尚未啟用速度調整時維持原速
+        assert processor.get_playback_speed() == 1.0
+
+        player.enable_speed_adjustment(True)
+        assert processor.get_playback_speed() == 1.5
+
+        player.set_playback_speed(0.75)
+        assert processor.get_playback_speed() == 0.75
+
+        player.enable_speed_adjustment(False)
+        assert processor.get_playback_speed() == 1.0
+
+    def test_fade_follows_source_position_when_stretching(self, player):
+        """測試變速時淡入曲線依來源位置計算"""
+        player._fade_in_frames = 200
+        player._fade_out_start_frame = 10000
+        player.audio_data = np.zeros((20000, 2), dtype=np.float32)
+
+        chunk = np.ones((100, 2), dtype=np.float32)
+        player._apply_fade(chunk, 0, step=2.0)
+
+        # 第 k 個輸出幀對應來源幀 2k，增益為 2k / 200
+        np.testing.assert_allclose(chunk[:, 0], np.arange(100) * 2.0 / 200, atol=1e-6)
 
-        # Mock librosa.effects.time_stretch
-        mock_librosa.effects.time_stretch.return_value = np.random.rand(800).astype(np.float32)
 
-        # 調整速度
-        result = player._adjust_speed(audio_data, 1.25)
+class TestAudioPlayerFadeCurves:
+    """測試淡入淡出曲線"""
 
-        # 檢查 librosa 被調用
-        assert mock_librosa.effects.time_stretch.called
+    @pytest.fixture
+    def player(self):
+        """創建測試用的播放器"""
+        with patch('src.audio.audio_player.SOUNDDEVICE_AVAILABLE', True):
+            player = AudioPlayer()
+        player._fade_in_frames = 1000
+        player._fade_out_start_frame = 100000
+        return player
+
+    def _fade_in_gains(self, player, frames=1000):
+        """取得淡入區段的增益"""
+        chunk = np.ones((frames, 1), dtype=np.float32)
+        player._apply_fade(chunk, 0)
+        return chunk[:, 0]
+
+    def test_default_curve_is_linear(self, player):
+        """測試預設為線性曲線"""
+        assert player.get_fade_curve() == 'linear'
+        np.testing.assert_allclose(self._fade_in_gains(player), np.arange(1000) / 1000, atol=1e-6)
+
+    def test_equal_power_curve(self, player):
+        """測試等功率曲線"""
+        player.set_fade_curve('equal_power')
+        progress = np.arange(1000) / 1000
+        np.testing.assert_allclose(self._fade_in_gains(player), np.sin(progress * np.pi / 2), atol=1e-5)
+
+    def test_logarithmic_curve(self, player):
+        """測試對數曲線從靜音開始且在中點遠低於線性"""
+        player.set_fade_curve('logarithmic')
+        gains = self._fade_in_gains(player)
+        assert gains[0] == pytest.approx(0.0, abs=1e-6)
+        assert gains[500] < 0.05
+        assert np.all(np.diff(gains) >= 0)
+
+    def test_fade_out_uses_precomputed_span(self, player):
+        """測試淡出區段長度在播放時計算一次，與音訊資料無關"""
+        player._fade_out_start_frame = 1000
+        player._fade_out_frames = 100
+        player.audio_data = None
+
+        chunk = np.ones((100, 2), dtype=np.float32)
+        player._apply_fade(chunk, 1000)
+        np.testing.assert_allclose(chunk[:, 1], 1.0 - np.arange(100) / 100, atol=1e-6)
+
+    def test_invalid_curve(self, player):
+        """測試不支援的曲線"""
+        with pytest.raises(ValueError):
+            player.set_fade_curve('cubic')
+        assert player.get_fade_curve() == 'linear'
 
 
 class TestAudioPlayerSleepTimer:
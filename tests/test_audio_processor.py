@@ -2,6 +2,7 @@
 import pytest
 import numpy as np
 from src.audio.audio_processor import AudioProcessor
+from src.audio.equalizer_filter import EqualizerFilter
 
 
 class TestAudioProcessorInit:
@@ -190,6 +191,69 @@ class TestAudioProcessing:
         assert np.array_equal(audio, original)
 
 
+class TestReplayGain:
+    """測試響度正規化增益"""
+
+    def test_replay_gain_combines_with_volume(self):
+        """測試正規化增益與音量合併為一次乘法"""
+        processor = AudioProcessor(enable_equalizer=False)
+        processor.set_volume(0.5)
+        processor.set_replay_gain(0.5)
+
+        buffer = np.full((256, 2), 0.8, dtype=np.float32)
+        processor.process_inplace(buffer)
+        np.testing.assert_allclose(buffer, 0.2, atol=1e-6)
+
+    def test_replay_gain_is_clamped(self):
+        """測試正規化增益範圍限制"""
+        processor = AudioProcessor()
+        processor.set_replay_gain(100.0)
+        assert processor.get_replay_gain() == AudioProcessor.MAX_REPLAY_GAIN
+        processor.set_replay_gain(-1.0)
+        assert processor.get_replay_gain() == 0.0
+
+    def test_reset_clears_replay_gain(self):
+        """測試重置後不再調整響度"""
+        processor = AudioProcessor()
+        processor.set_replay_gain(2.0)
+        processor.reset()
+        assert processor.get_replay_gain() == 1.0
+
+
+class TestPlaybackSpeed:
+    """測試串流變速"""
+
+    def test_default_speed_passes_through(self):
+        """測試原速時輸入幀數等於輸出幀數"""
+        processor = AudioProcessor()
+        assert processor.get_playback_speed() == 1.0
+        assert not processor.is_stretching()
+        assert processor.input_frames_for(1024) == 1024
+
+    def test_render_with_speed(self):
+        """測試變速時 render 產生固定幀數輸出並套用音量"""
+        processor = AudioProcessor(enable_equalizer=False)
+        processor.set_playback_speed(1.5)
+        processor.set_volume(0.5)
+        assert processor.is_stretching()
+
+        needed = processor.input_frames_for(1024)
+        assert needed > 1024
+        assert needed <= processor.max_input_frames(1024)
+
+        source = np.full((needed, 2), 0.8, dtype=np.float32)
+        out = np.zeros((1024, 2), dtype=np.float32)
+        processor.render(source, out)
+        np.testing.assert_allclose(out, 0.4, atol=1e-4)
+
+    def test_flush_keeps_speed(self):
+        """測試清除串流狀態時保留速度設定"""
+        processor = AudioProcessor()
+        processor.set_playback_speed(0.75)
+        processor.flush()
+        assert processor.get_playback_speed() == 0.75
+
+
 class TestReset:
     """測試重置功能"""
 
@@ -237,6 +301,48 @@ class TestIntegration:
         assert np.all(output <= 1.0)
 
 
+class TestDSPGraph:
+    """測試處理器的節點圖設定"""
+
+    def test_gains_fused_into_single_multiply(self):
+        """測試響度正規化、音量與輸出增益合併為一次乘法"""
+        processor = AudioProcessor(enable_equalizer=False)
+        processor.set_replay_gain(2.0)
+        processor.set_volume(0.5)
+        processor.set_output_gain(0.5)
+        assert processor.graph.describe() == ['gain(replay_gain+volume+output_gain)', 'limiter']
+
+        audio = np.full((100, 2), 0.4, dtype=np.float32)
+        np.testing.assert_allclose(processor.process(audio), 0.2, atol=1e-6)
+
+    def test_bypassed_equalizer_not_in_plan(self):
+        """測試停用等化器後不出現在執行計畫中"""
+        processor = AudioProcessor(enable_equalizer=True)
+        assert processor.graph.describe() == ['equalizer', 'limiter']
+
+        processor.set_equalizer_enabled(False)
+        assert processor.graph.describe() == ['limiter']
+
+    def test_replace_equalizer(self):
+        """測試替換等化器實例後下一個區塊生效"""
+        processor = AudioProcessor(enable_equalizer=True)
+        equalizer = EqualizerFilter(sample_rate=44100)
+        processor.equalizer = equalizer
+        assert processor.get_equalizer() is equalizer
+        assert processor.graph.get_node(AudioProcessor.NODE_EQUALIZER).equalizer is equalizer
+
+    def test_output_gain_clamped_and_kept_on_reset(self):
+        """測試輸出增益限制範圍且 reset() 不重置播放器音量"""
+        processor = AudioProcessor()
+        processor.set_output_gain(1.5)
+        assert processor.get_output_gain() == 1.0
+        processor.set_output_gain(0.3)
+        processor.set_volume(0.5)
+        processor.reset()
+        assert processor.get_volume() == 1.0
+        assert processor.get_output_gain() == 0.3
+
+
 # 執行測試時的配置
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
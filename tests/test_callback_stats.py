@@ -0,0 +1,166 @@
+"""即時回調統計單元測試"""
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+import pytest
+import soundfile as sf
+from src.audio.audio_player import AudioPlayer
+from src.audio.audio_processor import AudioProcessor
+from src.audio.callback_stats import CallbackStats
+from src.audio.output_backends import SimulatedOutputBackend
+
+
+def _block(stats, elapsed, frames=441, sample_rate=44100, start=100.0):
+    """以指定的耗時記錄一個區塊 (各階段平均分配)"""
+    stats.begin_block(start)
+    step = elapsed / len(CallbackStats.STAGE_NAMES)
+    for stage in range(len(CallbackStats.STAGE_NAMES)):
+        stats.mark_stage(stage, start + step * (stage + 1))
+    stats.end_block(frames, sample_rate, start + elapsed)
+
+
+class TestCallbackStats:
+    """測試計數、直方圖與慢回調紀錄"""
+
+    def test_histogram_and_deadline_misses(self):
+        """測試耗時依期限比例分桶，超過期限計為未達"""
+        stats = CallbackStats()
+        # 區塊期限 10 ms
+        for elapsed in (0.0002, 0.004, 0.009, 0.012, 0.030):
+            _block(stats, elapsed)
+
+        data = stats.snapshot()
+        assert data['callbacks'] == 5
+        assert data['deadline_misses'] == 2
+        assert data['max_ratio'] == pytest.approx(3.0)
+        assert data['histogram']['<=0.05'] == 1
+        assert data['histogram']['<=0.5'] == 1
+        assert data['histogram']['<=1'] == 1
+        assert data['histogram']['<=1.5'] == 1
+        assert data['histogram']['>2'] == 1
+        assert sum(data['histogram'].values()) == 5
+
+    def test_stage_timings(self):
+        """測試各階段耗時"""
+        stats = CallbackStats()
+        stats.begin_block(0.0)
+        stats.mark_stage(CallbackStats.STAGE_READ, 0.001)
+        stats.mark_stage(CallbackStats.STAGE_DSP, 0.004)
+        stats.mark_stage(CallbackStats.STAGE_FADE, 0.0045)
+        stats.mark_stage(CallbackStats.STAGE_OUTPUT, 0.005)
+        stats.end_block(441, 44100, 0.005)
+
+        stages = stats.snapshot()['stages']
+        assert stages['read']['max_seconds'] == pytest.approx(0.001)
+        assert stages['dsp']['mean_seconds'] == pytest.approx(0.003)
+        assert stages['output']['total_seconds'] == pytest.approx(0.0005)
+
+    def test_status_flags(self):
+        """測試欠載與溢位旗標計數"""
+        stats = CallbackStats()
+        stats.record_status(SimpleNamespace(output_underflow=True, output_overflow=False))
+        stats.record_status(SimpleNamespace(output_underflow=True, output_overflow=True))
+        stats.record_status(SimpleNamespace(priming_output=True))
+
+        data = stats.snapshot()
+        assert data['underflows'] == 2
+        assert data['overflows'] == 1
+        assert data['xruns'] == 3
+
+    def test_slow_ring_keeps_most_recent(self):
+        """測試慢回調環形緩衝區只保留最近的紀錄，由舊到新排列"""
+        stats = CallbackStats(ring_size=4)
+        for index in range(10):
+            _block(stats, 0.011 + index * 0.001)
+        _block(stats, 0.001)  # 不算慢
+
+        recent = stats.snapshot()['recent_slow']
+        assert len(recent) == 4
+        assert [entry['elapsed'] for entry in recent] == pytest.approx([0.017, 0.018, 0.019, 0.020])
+        assert recent[-1]['deadline'] == pytest.approx(0.01)
+        assert recent[-1]['stages']['read'] == pytest.approx(0.005)
+
+    def test_reset_applies_on_next_block(self):
+        """測試重置請求在下一個區塊開始時由寫入端套用"""
+        stats = CallbackStats()
+        _block(stats, 0.02)
+        stats.request_reset()
+        assert stats.snapshot()['callbacks'] == 1
+
+        _block(stats, 0.001)
+        data = stats.snapshot()
+        assert data['callbacks'] == 1
+        assert data['deadline_misses'] == 0
+        assert data['recent_slow'] == []
+
+    def test_recording_does_not_allocate(self):
+        """測試記錄區塊不會累積記憶體"""
+        stats = CallbackStats()
+        for _ in range(10):
+            _block(stats, 0.02)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(1000):
+                _block(stats, 0.02)
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert current - baseline < 1024
+
+    def test_report(self):
+        """測試診斷報告內容"""
+        stats = CallbackStats()
+        _block(stats, 0.02)
+        stats.record_error(RuntimeError('filter exploded'))
+
+        report = stats.format_report()
+        assert '期限未達: 1' in report
+        assert 'filter exploded' in report
+
+
+class TestPlayerCallbackStats:
+    """測試播放器回調的統計整合"""
+
+    def _play(self, tmp_path, processor=None, blocks=20):
+        path = str(tmp_path / 'song.wav')
+        sf.write(path, np.zeros((44100, 2), dtype=np.float32), 44100)
+        backend = SimulatedOutputBackend()
+        player = AudioPlayer(audio_processor=processor, output_backend=backend)
+        player.play(path)
+        backend.advance(blocks)
+        return player, backend
+
+    def test_counts_player_callbacks(self, tmp_path):
+        """測試每個回調都被記錄"""
+        player, _ = self._play(tmp_path, AudioProcessor(sample_rate=44100))
+        data = player.get_callback_stats()
+        assert data['callbacks'] == 20
+        assert data['stages']['dsp']['total_seconds'] > 0
+        assert '回調次數: 20' in player.get_callback_report()
+        player.stop()
+
+    def test_processing_error_counted_and_logged_by_control_thread(self, tmp_path):
+        """測試處理錯誤由回調計數，停止時才寫入日誌"""
+        processor = AudioProcessor(sample_rate=44100)
+        processor.process_inplace = lambda buffer: (_ for _ in ()).throw(ValueError('bad block'))
+        player, _ = self._play(tmp_path, processor, blocks=3)
+
+        data = player.get_callback_stats()
+        assert data['processing_errors'] == 3
+        assert data['last_error'] == 'bad block'
+
+        with patch('src.audio.audio_player.logger') as mock_logger:
+            player.stop()
+        assert mock_logger.warning.call_count == 1
+        assert 'bad block' in mock_logger.warning.call_args[0][0]
+
+    def test_reset(self, tmp_path):
+        """測試清除播放器統計"""
+        player, backend = self._play(tmp_path)
+        player.reset_callback_stats()
+        backend.advance(2)
+        assert player.get_callback_stats()['callbacks'] == 2
+        player.stop()
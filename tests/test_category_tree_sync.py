@@ -0,0 +1,219 @@
+"""CategoryTreeSync 的單元測試"""
+import pytest
+
+from src.music.views.category_tree_sync import CategoryTreeSync, TreeNode
+
+
+class FakeTree:
+    """模擬 ttk.Treeview 的結構操作"""
+
+    def __init__(self):
+        self.children = {'': []}
+        self.nodes = {}
+        self.calls = []
+        self.idle = []
+
+    def insert(self, parent, index, iid, text='', values=(), tags=(), open=False):
+        self.calls.append('insert')
+        self.nodes[iid] = {'text': text, 'values': tuple(values), 'tags': tuple(tags), 'open': open, 'parent': parent}
+        self.children[iid] = []
+        self.children[parent].insert(index, iid)
+        return iid
+
+    def item(self, iid, **options):
+        self.calls.append('item')
+        self.nodes[iid].update(options)
+
+    def move(self, iid, parent, index):
+        self.calls.append('move')
+        self.children[self.nodes[iid]['parent']].remove(iid)
+        self.children[parent].insert(index, iid)
+        self.nodes[iid]['parent'] = parent
+
+    def delete(self, iid):
+        self.calls.append('delete')
+        self.children[self.nodes[iid]['parent']].remove(iid)
+        self._drop(iid)
+
+    def _drop(self, iid):
+        for child in self.children.pop(iid):
+            self._drop(child)
+        del self.nodes[iid]
+
+    def after_idle(self, func):
+        self.idle.append(func)
+        return f"after#{len(self.idle)}"
+
+    def after_cancel(self, after_id):
+        self.idle.clear()
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+    def texts(self, parent=''):
+        """以 (文字, 子節點文字) 表示的結構"""
+        return [(self.nodes[iid]['text'], self.texts(iid)) for iid in self.children[parent]]
+
+
+def library(folders):
+    """建立分類樹結構: {資料夾: [歌曲 ID]}"""
+    nodes = [TreeNode('all', 'All', values=('all',), open=True)]
+    for name, songs in folders.items():
+        children = tuple(TreeNode(f'song:{song}', song, values=(f'song:{song}',)) for song in songs)
+        nodes.append(TreeNode(f'folder:{name}', name, values=(f'folder:{name}',), children=children))
+    return nodes
+
+
+@pytest.fixture
+def tree():
+    return FakeTree()
+
+
+@pytest.fixture
+def sync(tree):
+    return CategoryTreeSync(tree)
+
+
+class TestCategoryTreeSync:
+    """測試分類樹差異更新"""
+
+    def test_initial_sync_builds_tree(self, sync, tree):
+        """首次同步建立完整結構"""
+        done = []
+        sync.sync(library({'Rock': ['a', 'b'], 'Pop': []}), on_done=lambda: done.append(True))
+
+        assert tree.texts() == [('All', []), ('Rock', [('a', []), ('b', [])]), ('Pop', [])]
+        assert tree.nodes[sync.iid_of('all')]['open'] is True
+        assert done == [True]
+
+    def test_unchanged_structure_makes_no_calls(self, sync, tree):
+        """結構沒有變化時不呼叫 Tk"""
+        sync.sync(library({'Rock': ['a', 'b']}))
+        tree.calls.clear()
+
+        sync.sync(library({'Rock': ['a', 'b']}))
+
+        assert tree.calls == []
+
+    def test_added_song_is_single_insert(self, sync, tree):
+        """新增歌曲只插入一個節點並保留展開狀態"""
+        sync.sync(library({'Rock': ['a', 'b']}))
+        rock = sync.iid_of('folder:Rock')
+        tree.nodes[rock]['open'] = True
+        tree.calls.clear()
+
+        sync.sync(library({'Rock': ['a', 'c', 'b']}))
+
+        assert tree.calls == ['insert']
+        assert tree.texts(rock) == [('a', []), ('c', []), ('b', [])]
+        assert tree.nodes[rock]['open'] is True
+
+    def test_removed_folder_is_single_delete(self, sync, tree):
+        """刪除資料夾只刪除一個節點 (子節點由 Tk 一併刪除)"""
+        sync.sync(library({'Rock': ['a', 'b'], 'Pop': ['c']}))
+        tree.calls.clear()
+
+        sync.sync(library({'Pop': ['c']}))
+
+        assert tree.calls == ['delete']
+        assert tree.texts() == [('All', []), ('Pop', [('c', [])])]
+
+    def test_renamed_folder_keeps_item(self, sync, tree):
+        """資料夾改名只更新文字，保留項目與子節點"""
+        sync.sync(library({'Rock': ['a', 'b']}))
+        rock = sync.iid_of('folder:Rock')
+        tree.calls.clear()
+
+        sync.sync(library({'Metal': ['a', 'b']}))
+
+        assert tree.calls == ['item']
+        assert sync.iid_of('folder:Metal') == rock
+        assert tree.nodes[rock]['values'] == ('folder:Metal',)
+        assert tree.texts() == [('All', []), ('Metal', [('a', []), ('b', [])])]
+
+    def test_unrelated_delete_and_add_are_not_renamed(self, sync, tree):
+        """刪除資料夾同時新增無關的資料夾時不沿用舊項目 (展開狀態不會移到新資料夾)"""
+        sync.sync(library({'Rock': ['1'], 'Pop': ['2']}))
+        rock = sync.iid_of('folder:Rock')
+        song = sync.iid_of('folder:Rock', 'song:1')
+        tree.nodes[rock]['open'] = True
+        tree.calls.clear()
+
+        sync.sync(library({'Jazz': ['9'], 'Pop': ['2']}))
+
+        jazz = sync.iid_of('folder:Jazz')
+        assert sorted(tree.calls) == ['delete', 'insert', 'insert']
+        assert jazz != rock
+        assert sync.iid_of('folder:Jazz', 'song:9') != song
+        assert tree.nodes[jazz]['open'] is False
+        assert tree.texts() == [('All', []), ('Jazz', [('9', [])]), ('Pop', [('2', [])])]
+
+    def test_empty_folder_renamed_in_place(self, sync, tree):
+        """沒有子節點的資料夾在相同位置改名時沿用項目"""
+        sync.sync(library({'Rock': [], 'Pop': []}))
+        rock = sync.iid_of('folder:Rock')
+        tree.calls.clear()
+
+        sync.sync(library({'Metal': [], 'Pop': []}))
+
+        assert tree.calls == ['item']
+        assert sync.iid_of('folder:Metal') == rock
+
+    def test_reordered_folders_are_moved(self, sync, tree):
+        """順序改變時移動既有節點"""
+        sync.sync(library({'A': ['1'], 'B': ['2'], 'C': ['3']}))
+        tree.calls.clear()
+
+        sync.sync(library({'C': ['3'], 'A': ['1'], 'B': ['2']}))
+
+        assert tree.calls == ['move']
+        assert [text for text, _ in tree.texts()] == ['All', 'C', 'A', 'B']
+
+    def test_duplicate_keys(self, sync, tree):
+        """同一資料夾中重複的歌曲 ID 各自有節點"""
+        sync.sync(library({'Rock': ['a', 'a']}))
+        sync.sync(library({'Rock': ['a']}))
+
+        assert tree.texts() == [('All', []), ('Rock', [('a', [])])]
+
+    def test_operations_are_batched(self, tree):
+        """操作分批在 after_idle 中執行"""
+        sync = CategoryTreeSync(tree, batch_size=3)
+        done = []
+
+        sync.sync(library({'Rock': ['a', 'b', 'c', 'd']}), on_done=lambda: done.append(True))
+
+        assert len(tree.calls) == 3
+        assert sync.is_pending()
+        assert done == []
+
+        tree.run_idle()
+
+        assert len(tree.calls) == 6
+        assert not sync.is_pending()
+        assert done == [True]
+        assert tree.texts()[1] == ('Rock', [('a', []), ('b', []), ('c', []), ('d', [])])
+
+    def test_resync_while_pending_flushes_first(self, tree):
+        """同步中再次同步時先完成上一次的操作"""
+        sync = CategoryTreeSync(tree, batch_size=2)
+        sync.sync(library({'Rock': ['a', 'b', 'c']}))
+
+        sync.sync(library({'Rock': ['a', 'c'], 'Pop': []}))
+        tree.run_idle()
+
+        assert tree.texts() == [('All', []), ('Rock', [('a', []), ('c', [])]), ('Pop', [])]
+
+    def test_reset(self, sync, tree):
+        """重設後重新建立所有節點"""
+        sync.sync(library({'Rock': ['a']}))
+        for iid in list(tree.children['']):
+            tree.delete(iid)
+
+        sync.reset()
+        sync.sync(library({'Rock': ['a']}))
+
+        assert tree.texts() == [('All', []), ('Rock', [('a', [])])]
+        assert sync.iid_of('folder:Rock', 'song:a') is not None
+        assert sync.iid_of('folder:Jazz') is None
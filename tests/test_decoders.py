@@ -0,0 +1,213 @@
+"""解碼後端單元測試"""
+import json
+import subprocess
+import pytest
+import numpy as np
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+from src.audio.decoders import (
+    DecoderBackend,
+    DecoderRegistry,
+    FFmpegDecoder,
+    LibrosaDecoder,
+    SoundFileDecoder,
+)
+
+
+class FakeDecoder(DecoderBackend):
+    """測試用解碼後端"""
+
+    def __init__(self, name, available=True, extensions=None, fail=False):
+        self.name = name
+        self.available = available
+        self.extensions = extensions
+        self.fail = fail
+        self.calls = []
+        self.probe_count = 0
+
+    def is_available(self):
+        self.probe_count += 1
+        return self.available
+
+    def supports(self, extension):
+        return self.extensions is None or extension in self.extensions
+
+    def decode(self, file_path):
+        self.calls.append(file_path)
+        if self.fail:
+            raise RuntimeError(f'{self.name} failed')
+        return np.zeros((44100, 2), dtype=np.float32), 44100
+
+
+class TestDecoderRegistry:
+    """測試後端選擇與統計"""
+
+    def test_probes_availability_once(self):
+        """測試可用性只探測一次"""
+        backend = FakeDecoder('a')
+        registry = DecoderRegistry([backend])
+        registry.decode('song.mp3')
+        registry.decode('song2.mp3')
+        assert backend.probe_count == 1
+
+    def test_skips_unavailable_and_unsupported(self):
+        """測試略過不可用或不支援該格式的後端"""
+        missing = FakeDecoder('missing', available=False)
+        wav_only = FakeDecoder('wav_only', extensions={'wav'})
+        fallback = FakeDecoder('fallback')
+        registry = DecoderRegistry([missing, wav_only, fallback])
+
+        registry.decode('song.mp3')
+
+        assert missing.calls == []
+        assert wav_only.calls == []
+        assert fallback.calls == ['song.mp3']
+
+    def test_falls_back_and_remembers_best_backend(self):
+        """測試失敗時改用下一個後端，並記住成功的後端"""
+        first = FakeDecoder('first', fail=True)
+        second = FakeDecoder('second')
+        registry = DecoderRegistry([first, second])
+
+        registry.decode('a.mp3')
+        assert registry.get_preferred_backend('mp3') == 'second'
+
+        registry.decode('b.mp3')
+        # 第二次直接使用已知可用的後端
+        assert first.calls == ['a.mp3']
+        assert second.calls == ['a.mp3', 'b.mp3']
+
+    def test_raises_last_error_when_all_fail(self):
+        """測試所有後端都失敗時拋出例外"""
+        registry = DecoderRegistry([FakeDecoder('a', fail=True), FakeDecoder('b', fail=True)])
+        with pytest.raises(RuntimeError, match='b failed'):
+            registry.decode('song.mp3')
+
+    def test_no_candidates(self):
+        """測試沒有可用後端"""
+        registry = DecoderRegistry([FakeDecoder('a', available=False)])
+        with pytest.raises(RuntimeError):
+            registry.decode('song.mp3')
+
+    def test_metrics(self):
+        """測試吞吐量統計"""
+        registry = DecoderRegistry([FakeDecoder('a', fail=True), FakeDecoder('b')])
+        registry.decode('song.mp3')
+
+        metrics = registry.get_metrics()
+        assert metrics['a']['failures'] == 1
+        assert metrics['a']['files'] == 0
+        assert metrics['b']['files'] == 1
+        assert metrics['b']['audio_seconds'] == pytest.approx(1.0)
+        assert metrics['b']['throughput'] > 0
+
+
+class TestSoundFileDecoder:
+    """測試 soundfile 後端"""
+
+    def test_decode_wav(self, tmp_path):
+        """測試解碼 WAV 為 float32 (frames, channels)"""
+        path = str(tmp_path / 'test.wav')
+        audio = (np.random.rand(1000, 2).astype(np.float32) - 0.5)
+        sf.write(path, audio, 22050, subtype='FLOAT')
+
+        decoder = SoundFileDecoder()
+        assert decoder.is_available()
+        assert decoder.supports('wav')
+
+        decoded, sample_rate = decoder.decode(path)
+        assert sample_rate == 22050
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, audio)
+
+    def test_supports_uses_available_formats(self):
+        """測試依 libsndfile 支援的格式判斷"""
+        decoder = SoundFileDecoder()
+        assert decoder.supports('flac')
+        assert not decoder.supports('xyz')
+
+
+class TestFFmpegDecoder:
+    """測試 ffmpeg 管線後端"""
+
+    @patch('src.audio.decoders.subprocess.Popen')
+    @patch('src.audio.decoders.subprocess.run')
+    def test_decode_from_pipe(self, mock_run, mock_popen):
+        """測試從管線讀取原始 float32 PCM"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps({'streams': [{'sample_rate': '48000', 'channels': 2}]}).encode()
+        )
+        audio = np.arange(20, dtype=np.float32).reshape(-1, 2)
+        payload = audio.tobytes()
+        process = MagicMock(returncode=0)
+        process.communicate.return_value = (payload, b'')
+        mock_popen.return_value = process
+
+        decoded, sample_rate = FFmpegDecoder(ffmpeg_path='ffmpeg').decode('song.m4a')
+
+        assert sample_rate == 48000
+        np.testing.assert_array_equal(decoded, audio)
+        assert '-f' in mock_popen.call_args[0][0]
+        process.communicate.assert_called_once_with(timeout=FFmpegDecoder.DECODE_TIMEOUT_SECONDS)
+
+    @patch('src.audio.decoders.subprocess.Popen')
+    @patch('src.audio.decoders.subprocess.run')
+    def test_decode_failure_reports_stderr(self, mock_run, mock_popen):
+        """測試 ffmpeg 失敗時以 stderr 內容拋出例外"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps({'streams': [{'sample_rate': '44100', 'channels': 2}]}).encode()
+        )
+        process = MagicMock(returncode=1)
+        process.communicate.return_value = (b'', b'Invalid data found')
+        mock_popen.return_value = process
+
+        with pytest.raises(RuntimeError, match='Invalid data found'):
+            FFmpegDecoder().decode('broken.m4a')
+
+    @patch('src.audio.decoders.subprocess.Popen')
+    @patch('src.audio.decoders.subprocess.run')
+    def test_decode_timeout_kills_process(self, mock_run, mock_popen):
+        """測試解碼逾時時終止 ffmpeg 並拋出例外"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps({'streams': [{'sample_rate': '44100', 'channels': 2}]}).encode()
+        )
+        process = MagicMock()
+        process.communicate.side_effect = [subprocess.TimeoutExpired('ffmpeg', 120), (b'', b'')]
+        mock_popen.return_value = process
+
+        with pytest.raises(RuntimeError):
+            FFmpegDecoder().decode('stuck.m4a')
+        process.kill.assert_called_once()
+
+    @patch('src.audio.decoders.subprocess.run')
+    def test_probe_failure(self, mock_run):
+        """測試 ffprobe 失敗時拋出例外"""
+        mock_run.return_value = MagicMock(returncode=1, stderr=b'invalid data')
+        with pytest.raises(RuntimeError):
+            FFmpegDecoder().decode('broken.mp3')
+
+    @patch('src.audio.decoders.shutil.which', return_value=None)
+    def test_unavailable_without_executable(self, mock_which):
+        """測試找不到 ffmpeg 時不可用"""
+        assert not FFmpegDecoder().is_available()
+
+
+class TestLibrosaDecoder:
+    """測試 librosa 後端"""
+
+    @patch('librosa.load')
+    def test_decode_transposes(self, mock_load):
+        """測試將 (channels, frames) 轉為 (frames, channels)"""
+        mock_load.return_value = (np.zeros((2, 100), dtype=np.float32), 44100)
+        decoded, _ = LibrosaDecoder().decode('song.mp3')
+        assert decoded.shape == (100, 2)
+
+    @patch('librosa.load')
+    def test_decode_mono(self, mock_load):
+        """測試單聲道擴展為 (frames, 1)"""
+        mock_load.return_value = (np.zeros(100, dtype=np.float32), 44100)
+        decoded, _ = LibrosaDecoder().decode('song.mp3')
+        assert decoded.shape == (100, 1)
@@ -0,0 +1,203 @@
+"""DSPGraph 單元測試"""
+import threading
+import tracemalloc
+from unittest.mock import Mock
+import pytest
+import numpy as np
+from src.audio.dsp_graph import DSPGraph, DSPNode, EqualizerNode, GainNode, LimiterNode, MeterNode
+from src.audio.equalizer_filter import EqualizerFilter
+
+
+class _CountingNode(DSPNode):
+    """記錄呼叫次數的測試節點"""
+
+    def __init__(self, name, enabled=True):
+        super().__init__(name, enabled)
+        self.calls = 0
+
+    def process(self, buffer):
+        self.calls += 1
+
+
+def _block(frames=256, value=0.5):
+    """建立測試區塊"""
+    return np.full((frames, 2), value, dtype=np.float32)
+
+
+class TestCompilation:
+    """測試執行計畫編譯"""
+
+    def test_adjacent_gains_fused(self):
+        """測試相鄰增益合併為一次乘法"""
+        graph = DSPGraph([GainNode('a', 0.5), GainNode('b', 0.5), LimiterNode('limiter')])
+        assert graph.describe() == ['gain(a+b)', 'limiter']
+
+        block = _block()
+        graph.process(block)
+        np.testing.assert_allclose(block, 0.125)
+
+    def test_gains_separated_by_node_not_fused(self):
+        """測試被其他節點隔開的增益不合併 (保持處理順序)"""
+        graph = DSPGraph([GainNode('pre', 4.0), LimiterNode('limiter'), GainNode('post', 0.5)])
+        assert graph.describe() == ['gain(pre)', 'limiter', 'gain(post)']
+
+        block = _block()
+        graph.process(block)
+        np.testing.assert_allclose(block, 0.5)
+
+    def test_unity_gain_removed(self):
+        """測試總增益為 1.0 時省略乘法"""
+        graph = DSPGraph([GainNode('a', 2.0), GainNode('b', 0.5), GainNode('c', 1.0)])
+        assert graph.describe() == []
+
+        block = _block()
+        graph.process(block)
+        np.testing.assert_allclose(block, 0.5)
+
+    def test_bypassed_node_not_in_plan(self):
+        """測試略過的節點不出現在執行計畫中"""
+        node = _CountingNode('meter', enabled=False)
+        graph = DSPGraph([node, LimiterNode('limiter')])
+        assert graph.describe() == ['limiter']
+
+        graph.process(_block())
+        assert node.calls == 0
+
+    def test_bypassed_node_between_gains_allows_fusion(self):
+        """測試略過中間節點後，兩側的增益合併"""
+        graph = DSPGraph([GainNode('a', 0.5), LimiterNode('limiter', enabled=False), GainNode('b', 0.5)])
+        assert graph.describe() == ['gain(a+b)']
+
+    def test_equalizer_without_filter_is_bypassed(self):
+        """測試沒有等化器實例的節點視為略過"""
+        graph = DSPGraph([EqualizerNode('equalizer', None)])
+        assert graph.describe() == []
+
+    def test_duplicate_names_rejected(self):
+        """測試節點名稱重複"""
+        with pytest.raises(ValueError):
+            DSPGraph([GainNode('a'), GainNode('a')])
+
+
+class TestReconfiguration:
+    """測試重新設定"""
+
+    def test_set_gain_and_enabled(self):
+        """測試修改增益與略過狀態後重新編譯"""
+        graph = DSPGraph([GainNode('volume', 1.0), LimiterNode('limiter')])
+        graph.set_gain('volume', 0.25)
+        assert graph.describe() == ['gain(volume)', 'limiter']
+
+        graph.set_enabled('limiter', False)
+        assert graph.describe() == ['gain(volume)']
+
+        with pytest.raises(KeyError):
+            graph.set_gain('missing', 0.5)
+
+    def test_add_and_remove_node(self):
+        """測試插入與移除節點"""
+        graph = DSPGraph([GainNode('volume', 0.5), LimiterNode('limiter')])
+        tap = Mock()
+        graph.add_node(MeterNode('meter', tap), before='limiter')
+        assert [node.name for node in graph.nodes] == ['volume', 'meter', 'limiter']
+
+        graph.process(_block())
+        tap.write.assert_called_once()
+
+        removed = graph.remove_node('meter')
+        assert removed.tap is tap
+        assert graph.describe() == ['gain(volume)', 'limiter']
+        assert graph.remove_node('meter') is None
+
+        with pytest.raises(ValueError):
+            graph.add_node(GainNode('x'), after='missing')
+
+    def test_update_publishes_all_attributes_together(self):
+        """測試一次修改多個屬性時只發布一次新的計畫"""
+        graph = DSPGraph([EqualizerNode('equalizer', None, enabled=False)])
+        plan_before = graph._plan
+        graph.update('equalizer', equalizer=EqualizerFilter(), enabled=True)
+        assert graph._plan is not plan_before
+        assert graph.describe() == ['equalizer']
+
+    def test_published_plan_keeps_its_equalizer_and_tap(self):
+        """測試已發布的計畫擷取編譯時的等化器與 tap，之後移除不影響執行中的計畫"""
+        equalizer = Mock()
+        tap = Mock()
+        graph = DSPGraph([EqualizerNode('equalizer', equalizer), MeterNode('meter', tap)])
+        running_plan = graph._plan
+
+        graph.update('equalizer', equalizer=None)
+        graph.update('meter', tap=None)
+        assert graph.describe() == []
+
+        # 音訊回調仍在執行舊計畫
+        block = _block()
+        for _, step in running_plan:
+            step(block)
+        equalizer.process_inplace.assert_called_once_with(block)
+        tap.write.assert_called_once_with(block)
+
+    def test_concurrent_reconfiguration_never_tears(self):
+        """測試處理期間重新設定時，每個區塊都完整套用舊或新的設定"""
+        graph = DSPGraph([GainNode('a', 1.0), GainNode('b', 1.0)])
+        stop = threading.Event()
+
+        def reconfigure():
+            while not stop.is_set():
+                # 兩個增益乘積恆為 1.0 或 0.25
+                graph.set_nodes([GainNode('a', 0.5), GainNode('b', 0.5)])
+                graph.set_nodes([GainNode('a', 1.0), GainNode('b', 1.0)])
+
+        thread = threading.Thread(target=reconfigure)
+        thread.start()
+        try:
+            block = np.empty((64, 2), dtype=np.float32)
+            for _ in range(2000):
+                block.fill(1.0)
+                graph.process(block)
+                assert block[0, 0] in (1.0, 0.25)
+                assert np.all(block == block[0, 0])
+        finally:
+            stop.set()
+            thread.join()
+
+
+class TestRealtime:
+    """測試即時處理特性"""
+
+    def test_process_does_not_allocate(self):
+        """測試增益與限幅節點處理區塊不配置區塊大小的陣列"""
+        graph = DSPGraph([
+            EqualizerNode('equalizer', EqualizerFilter()),
+            GainNode('replay_gain', 0.8),
+            GainNode('volume', 0.5),
+            LimiterNode('limiter'),
+        ])
+        block = (np.random.rand(2048, 2).astype(np.float32) - 0.5)
+
+        # 預熱
+        graph.process(block)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(20):
+                graph.process(block)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak - baseline < block.nbytes // 4
+        assert current - baseline < 1024
+
+    def test_reset_clears_node_state(self):
+        """測試 reset() 轉交給各節點"""
+        equalizer = Mock()
+        graph = DSPGraph([EqualizerNode('equalizer', equalizer)])
+        graph.reset()
+        equalizer.reset.assert_called_once()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
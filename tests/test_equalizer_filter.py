@@ -1,6 +1,7 @@
 """EqualizerFilter 單元測試"""
 import pytest
 import numpy as np
+from scipy import signal
 from src.audio.equalizer_filter import EqualizerFilter
 
 
@@ -213,6 +214,34 @@ class TestAudioProcessing:
         assert np.all(output >= -1.0)
         assert np.all(output <= 1.0)
 
+    def test_process_inplace_matches_process(self):
+        """測試就地處理與 process() 結果一致且保留濾波器狀態"""
+        audio = np.random.randn(4096, 2).astype(np.float32) * 0.1
+
+        eq_ref = EqualizerFilter()
+        eq_ref.set_band_gain(2, 6.0)
+        expected = eq_ref.process(audio)
+
+        eq = EqualizerFilter()
+        eq.set_band_gain(2, 6.0)
+        buffer = audio.copy()
+        # 分兩個區塊處理，驗證狀態跨區塊延續
+        eq.process_inplace(buffer[:2048])
+        eq.process_inplace(buffer[2048:])
+
+        assert buffer.dtype == np.float32
+        assert np.allclose(buffer, expected, atol=1e-5)
+
+    def test_process_inplace_flat_is_noop(self):
+        """測試所有增益為 0 時就地處理不改變數據"""
+        eq = EqualizerFilter()
+        buffer = np.random.randn(512, 2).astype(np.float32)
+        original = buffer.copy()
+
+        eq.process_inplace(buffer)
+
+        assert np.array_equal(buffer, original)
+
 
 class TestFilterCoefficients:
     """測試濾波器係數功能"""
@@ -285,6 +314,49 @@ class TestFrequencyResponse:
         # 該頻率處的增益應該是正的且較大
         assert mag_db[target_idx] > 6.0  # 至少 +6dB
 
+    def test_frequency_response_matches_freqz(self):
+        """測試向量化計算與 scipy freqz 的逐頻段乘積一致"""
+        eq = EqualizerFilter()
+        eq.set_all_gains([6.0, -3.0, 0.0, 2.0, 12.0, -12.0, 0.0, 4.0, -6.0, 1.0])
+
+        freqs, mag_db = eq.get_frequency_response(num_points=300)
+
+        H = np.ones(len(freqs), dtype=complex)
+        for i, gain in enumerate(eq.gains):
+            if abs(gain) >= 0.01:
+                b, a = eq._filter_coeffs[i]
+                _, h = signal.freqz(b, a, worN=freqs, fs=eq.sample_rate)
+                H *= h
+        np.testing.assert_allclose(mag_db, 20 * np.log10(np.abs(H)), atol=1e-6)
+
+    def test_frequency_response_reuses_unchanged_bands(self):
+        """測試只改變一個頻段時，其他頻段的響應沿用快取"""
+        eq = EqualizerFilter()
+        eq.set_all_gains([6.0, 3.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        eq.get_frequency_response()
+        cached_band = eq._band_responses[0][1]
+        changed_band = eq._band_responses[1][1]
+
+        eq.set_band_gain(1, -3.0)
+        _, mag_db = eq.get_frequency_response()
+
+        assert eq._band_responses[0][1] is cached_band
+        assert eq._band_responses[1][1] is not changed_band
+
+        # 結果與重新計算的等化器相同
+        fresh = EqualizerFilter()
+        fresh.set_all_gains(eq.get_all_gains())
+        np.testing.assert_allclose(mag_db, fresh.get_frequency_response()[1])
+
+    def test_frequency_response_returns_writable_frequencies(self):
+        """測試返回的頻率陣列可由呼叫端修改而不影響快取"""
+        eq = EqualizerFilter()
+        freqs, _ = eq.get_frequency_response(num_points=50)
+        freqs[0] = -1.0
+
+        freqs_again, _ = eq.get_frequency_response(num_points=50)
+        assert freqs_again[0] == pytest.approx(20.0)
+
 
 # 執行測試時的配置
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+"""淡入淡出曲線單元測試"""
+import pytest
+import numpy as np
+from src.audio.fade_curves import FADE_CURVES, apply_fade_table, get_fade_table
+
+
+def _lookup(progress, curve):
+    """以查表計算增益"""
+    gains = np.asarray(progress, dtype=np.float32).copy()
+    n = len(gains)
+    table, slopes = get_fade_table(curve)
+    apply_fade_table(
+        gains, table, slopes,
+        np.zeros(n, dtype=np.float32), np.zeros(n, dtype=np.intp), np.zeros(n, dtype=np.float32)
+    )
+    return gains
+
+
+class TestFadeTables:
+    """測試查找表"""
+
+    @pytest.mark.parametrize('curve', FADE_CURVES)
+    def test_endpoints_and_monotonic(self, curve):
+        """測試各曲線從 0 到 1 且單調遞增"""
+        table, slopes = get_fade_table(curve)
+        assert table[0] == pytest.approx(0.0, abs=1e-6)
+        assert table[-1] == pytest.approx(1.0)
+        assert np.all(slopes >= 0)
+        assert not table.flags.writeable
+
+    def test_table_shared(self):
+        """測試查找表只計算一次"""
+        assert get_fade_table('equal_power') is get_fade_table('equal_power')
+
+    def test_invalid_curve(self):
+        """測試不支援的曲線"""
+        with pytest.raises(ValueError):
+            get_fade_table('cubic')
+
+
+class TestApplyFadeTable:
+    """測試內插查表"""
+
+    def test_linear_interpolation_is_exact(self):
+        """測試線性曲線查表結果等於進度本身"""
+        progress = np.linspace(0.0, 1.0, 777)
+        np.testing.assert_allclose(_lookup(progress, 'linear'), progress, atol=1e-6)
+
+    def test_progress_clamped(self):
+        """測試超出範圍的進度限制在 0 與 1"""
+        np.testing.assert_allclose(_lookup([-0.5, 1.5], 'equal_power'), [0.0, 1.0], atol=1e-6)
+
+    def test_equal_power_between_grid_points(self):
+        """測試格點之間的內插誤差很小"""
+        progress = np.random.rand(1000)
+        np.testing.assert_allclose(_lookup(progress, 'equal_power'), np.sin(progress * np.pi / 2), atol=1e-5)
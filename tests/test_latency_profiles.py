@@ -0,0 +1,154 @@
+"""延遲設定檔與自動區塊大小調整單元測試"""
+import numpy as np
+import pytest
+import soundfile as sf
+from src.audio.audio_player import AudioPlayer
+from src.audio.callback_stats import CallbackStats
+from src.audio.latency_profiles import LATENCY_PROFILES, AdaptiveLatencyController
+from src.audio.output_backends import ArraySink, SimulatedOutputBackend
+
+
+def _run_blocks(stats, count, ratio, frames=2048, sample_rate=44100):
+    """以指定的耗時 / 期限比例記錄區塊"""
+    deadline = frames / sample_rate
+    now = 100.0
+    for _ in range(count):
+        stats.begin_block(now)
+        now += deadline * ratio
+        stats.end_block(frames, sample_rate, now)
+
+
+class TestAdaptiveLatencyController:
+    """測試自動調整決策"""
+
+    def test_grows_on_deadline_miss(self):
+        """測試期限未達時加大區塊"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(2048)
+        controller.reset(stats.snapshot(), 0.0)
+
+        _run_blocks(stats, 10, 0.1)
+        _run_blocks(stats, 1, 1.5)
+        assert controller.update(stats.snapshot(), 1.0) == 4096
+
+    def test_grows_when_headroom_low(self):
+        """測試接近期限的區塊過多時加大區塊"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(2048)
+        controller.reset(stats.snapshot(), 0.0)
+
+        _run_blocks(stats, 90, 0.1)
+        _run_blocks(stats, 10, 0.9)
+        assert controller.update(stats.snapshot(), 1.0) == 4096
+
+    def test_shrinks_after_quiet_window(self):
+        """測試長時間餘裕充足時縮小區塊"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(2048)
+        controller.reset(stats.snapshot(), 0.0)
+
+        _run_blocks(stats, 100, 0.1)
+        # 觀察期未滿不調整
+        assert controller.update(stats.snapshot(), 5.0) is None
+        assert controller.update(stats.snapshot(), 11.0) == 1024
+
+    def test_hold_after_grow_prevents_oscillation(self):
+        """測試加大區塊後的保持時間內不縮小"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(2048)
+        controller.reset(stats.snapshot(), 0.0)
+        _run_blocks(stats, 1, 2.5)
+        assert controller.update(stats.snapshot(), 1.0) == 4096
+
+        _run_blocks(stats, 100, 0.1)
+        assert controller.update(stats.snapshot(), 20.0) is None
+        _run_blocks(stats, 100, 0.1)
+        assert controller.update(stats.snapshot(), 20.0 + controller.HOLD_SECONDS) == 2048
+
+    def test_respects_limits(self):
+        """測試區塊大小限制在範圍內"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(8192)
+        controller.reset(stats.snapshot(), 0.0)
+        _run_blocks(stats, 1, 1.5)
+        assert controller.update(stats.snapshot(), 1.0) is None
+        assert controller.blocksize == AdaptiveLatencyController.MAX_BLOCKSIZE
+
+    def test_stats_reset_restarts_window(self):
+        """測試統計被重置後重新開始觀察"""
+        stats = CallbackStats()
+        controller = AdaptiveLatencyController(2048)
+        _run_blocks(stats, 50, 0.1)
+        controller.reset(stats.snapshot(), 0.0)
+
+        stats.request_reset()
+        _run_blocks(stats, 5, 1.5)
+        assert controller.update(stats.snapshot(), 1.0) is None
+
+
+class TestPlayerLatencyProfiles:
+    """測試播放器的延遲設定檔"""
+
+    @pytest.fixture
+    def player(self, tmp_path):
+        """建立使用模擬輸出、已開始播放的播放器"""
+        t = np.arange(44100 * 5) / 44100
+        mono = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        self.audio = np.column_stack((mono, mono))
+        path = str(tmp_path / 'tone.wav')
+        sf.write(path, self.audio, 44100, subtype='FLOAT')
+
+        self.sink = ArraySink()
+        self.backend = SimulatedOutputBackend(self.sink)
+        player = AudioPlayer(output_backend=self.backend)
+        player.set_fade_enabled(False)
+        assert player.play(path)
+        yield player
+        player.stop()
+
+    def test_profile_sets_blocksize_and_latency(self, player):
+        """測試設定檔變更時以新的區塊大小重新開啟串流"""
+        player.set_latency_profile('low_latency')
+        stream = self.backend.stream
+        assert len(self.backend.streams) == 2
+        assert stream.blocksize == LATENCY_PROFILES['low_latency'].blocksize
+        assert player._stream_latency == 'low'
+        assert player.get_latency_profile() == 'low_latency'
+
+    def test_reopen_keeps_position_and_output_continuous(self, player):
+        """測試重新開啟串流後從原本的位置繼續，輸出沒有缺口"""
+        self.backend.advance(3)
+        position = player.current_frame
+        assert position == 3 * AudioPlayer.BLOCKSIZE
+
+        player.set_latency_profile('power_saver')
+        assert player.current_frame == position
+        assert self.backend.stream.blocksize == 8192
+
+        self.backend.advance(2)
+        output = self.sink.get_audio()
+        np.testing.assert_allclose(output, self.audio[:len(output)], atol=1e-6)
+
+    def test_reopen_keeps_pause(self, player):
+        """測試暫停中重新開啟串流仍保持暫停"""
+        player.pause()
+        player.set_latency_profile('low_latency')
+        assert player.is_paused()
+        self.backend.advance(2)
+        assert player.current_frame == 0
+
+    def test_adaptive_grows_after_underrun(self, player):
+        """測試自動模式在欠載後加大區塊"""
+        player.set_latency_profile('adaptive')
+        self.backend.advance(2)
+        assert player.check_adaptive_latency() is False
+
+        player.callback_stats.underflows += 1
+        assert player.check_adaptive_latency() is True
+        assert self.backend.stream.blocksize == 2 * AudioPlayer.BLOCKSIZE
+
+    def test_invalid_profile(self, player):
+        """測試不支援的設定檔"""
+        with pytest.raises(ValueError):
+            player.set_latency_profile('turbo')
+        assert player.get_latency_profile() == 'balanced'
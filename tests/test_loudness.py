@@ -0,0 +1,223 @@
+"""響度分析模組單元測試"""
+import os
+import threading
+from unittest.mock import patch
+import pytest
+import numpy as np
+import soundfile as sf
+from src.audio.loudness import (
+    LoudnessIndex,
+    LoudnessMeter,
+    analyze_file,
+    analyze_library,
+    compute_gain,
+    k_weighting_sos,
+)
+
+
+def _sine(amplitude, seconds, sample_rate=48000, frequency=997, channels=2, phase=0.0):
+    """產生正弦波"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = amplitude * np.sin(2 * np.pi * frequency * t + phase)
+    return np.column_stack([mono] * channels)
+
+
+def _measure(audio, sample_rate=48000, block=4096):
+    """以指定區塊大小量測"""
+    meter = LoudnessMeter(sample_rate, audio.shape[1])
+    for start in range(0, len(audio), block):
+        meter.process(audio[start:start + block])
+    return meter
+
+
+class TestKWeighting:
+    """測試 K 加權濾波器"""
+
+    def test_matches_bs1770_coefficients_at_48k(self):
+        """測試 48 kHz 係數與 BS.1770 表列值一致"""
+        sos = k_weighting_sos(48000)
+        np.testing.assert_allclose(
+            sos[0],
+            [1.53512485958697, -2.69169618940638, 1.19839281085285,
+             1.0, -1.69065929318241, 0.73248077421585],
+            atol=1e-8
+        )
+        np.testing.assert_allclose(
+            sos[1],
+            [1.0, -2.0, 1.0, 1.0, -1.99004745483398, 0.99007225036621],
+            atol=1e-8
+        )
+
+
+class TestLoudnessMeter:
+    """測試響度與真峰值量測"""
+
+    def test_stereo_sine_reference(self):
+        """測試 -20 dBFS 997 Hz 立體聲正弦波約為 -20 LUFS"""
+        meter = _measure(_sine(0.1, 5))
+        assert meter.integrated_loudness() == pytest.approx(-20.0, abs=0.05)
+
+    def test_mono_full_scale_sine(self):
+        """測試 0 dBFS 單聲道正弦波約為 -3.01 LUFS"""
+        meter = _measure(_sine(1.0, 5, sample_rate=44100, channels=1), sample_rate=44100)
+        assert meter.integrated_loudness() == pytest.approx(-3.01, abs=0.05)
+
+    def test_block_size_does_not_change_result(self):
+        """測試不同的串流區塊大小得到相同結果"""
+        audio = _sine(0.3, 3)
+        small = _measure(audio, block=1000)
+        large = _measure(audio, block=65536)
+        assert small.integrated_loudness() == pytest.approx(large.integrated_loudness(), abs=1e-9)
+        assert small.true_peak() == pytest.approx(large.true_peak(), abs=1e-6)
+
+    def test_silence_is_gated(self):
+        """測試靜音段落不影響整合響度"""
+        loud = _sine(0.1, 3)
+        silence = np.zeros((48000 * 3, 2))
+        meter = _measure(np.concatenate((loud, silence, loud)))
+        # 若靜音被計入會降到約 -21.8 LUFS；僅邊界區塊造成少量偏差
+        assert meter.integrated_loudness() == pytest.approx(-20.0, abs=0.3)
+
+    def test_all_silence(self):
+        """測試全靜音返回 None"""
+        meter = _measure(np.zeros((48000, 2)))
+        assert meter.integrated_loudness() is None
+        assert meter.true_peak() is None
+
+    def test_too_short(self):
+        """測試短於一個閘控區塊時返回 None"""
+        meter = _measure(_sine(0.1, 0.2))
+        assert meter.integrated_loudness() is None
+
+    def test_true_peak_detects_intersample_peak(self):
+        """測試偵測取樣點之間的峰值"""
+        # fs/4 正弦波相位 45 度: 取樣值只有 0.354，實際峰值為 0.5
+        audio = _sine(0.5, 1, sample_rate=44100, frequency=44100 / 4, channels=1, phase=np.pi / 4)
+        meter = _measure(audio, sample_rate=44100, block=4099)
+        sample_peak = 20 * np.log10(np.max(np.abs(audio)))
+        assert sample_peak == pytest.approx(-9.03, abs=0.01)
+        assert meter.true_peak() == pytest.approx(-6.02, abs=0.3)
+
+
+class TestComputeGain:
+    """測試正規化增益計算"""
+
+    def test_gain_to_target(self):
+        """測試增益讓響度達到目標"""
+        gain = compute_gain(-20.0, -30.0, target_lufs=-14.0, max_true_peak_dbtp=-1.0)
+        assert 20 * np.log10(gain) == pytest.approx(6.0)
+
+    def test_gain_limited_by_true_peak(self):
+        """測試增益不讓真峰值超過上限"""
+        gain = compute_gain(-20.0, -3.0, target_lufs=-14.0, max_true_peak_dbtp=-1.0)
+        assert 20 * np.log10(gain) == pytest.approx(2.0)
+
+    def test_unknown_loudness(self):
+        """測試響度未知時不調整"""
+        assert compute_gain(None, None) == 1.0
+
+
+class TestLoudnessIndex:
+    """測試分析結果索引"""
+
+    def test_entry_invalidated_when_file_changes(self, tmp_path):
+        """測試檔案變更後結果過期"""
+        song = tmp_path / 'song.wav'
+        song.write_bytes(b'original')
+        index = LoudnessIndex(str(tmp_path / 'index.json'))
+
+        index.put(str(song), {'integrated_lufs': -20.0, 'true_peak_dbtp': -10.0})
+        assert index.is_current(str(song))
+        assert index.get_gain(str(song), target_lufs=-14.0) == pytest.approx(10 ** (6 / 20))
+
+        song.write_bytes(b'changed content')
+        assert not index.is_current(str(song))
+        assert index.get_gain(str(song)) == 1.0
+
+    def test_persistence(self, tmp_path):
+        """測試索引可以儲存與重新載入"""
+        song = tmp_path / 'song.wav'
+        song.write_bytes(b'audio')
+        index_path = str(tmp_path / 'index.json')
+
+        index = LoudnessIndex(index_path)
+        index.put(str(song), {'integrated_lufs': -18.0, 'true_peak_dbtp': -6.0})
+        assert index.save()
+
+        reloaded = LoudnessIndex(index_path)
+        assert reloaded.get(str(song))['integrated_lufs'] == -18.0
+
+
+class TestAnalyzeLibrary:
+    """測試檔案分析與批次分析"""
+
+    def _write_songs(self, directory, count):
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, f'song{i}.wav')
+            sf.write(path, _sine(0.05 * (i + 1), 2, sample_rate=44100), 44100)
+            paths.append(path)
+        return paths
+
+    def test_analyze_file(self, tmp_path):
+        """測試串流分析 WAV 檔案"""
+        path = self._write_songs(str(tmp_path), 1)[0]
+        result = analyze_file(path, block_frames=5000)
+        assert result['duration'] == pytest.approx(2.0)
+        assert result['integrated_lufs'] == pytest.approx(-26.0, abs=0.2)
+
+    def test_rerun_skips_unchanged_files(self, tmp_path):
+        """測試重新執行時略過未變更的檔案，失敗的檔案也不重試"""
+        paths = self._write_songs(str(tmp_path), 2)
+        broken = str(tmp_path / 'broken.wav')
+        with open(broken, 'wb') as f:
+            f.write(b'not audio')
+        index = LoudnessIndex(str(tmp_path / 'index.json'))
+
+        progress = []
+        summary = analyze_library(
+            paths + [broken], index, max_workers=2,
+            on_progress=lambda done, total, path: progress.append((done, total))
+        )
+        assert summary == {'analyzed': 2, 'skipped': 0, 'failed': 1}
+        assert progress[-1] == (3, 3)
+        assert index.get(paths[1])['integrated_lufs'] > index.get(paths[0])['integrated_lufs']
+
+        summary = analyze_library(paths + [broken], LoudnessIndex(str(tmp_path / 'index.json')))
+        assert summary == {'analyzed': 0, 'skipped': 3, 'failed': 0}
+
+    def test_thread_mode_does_not_spawn_processes(self, tmp_path):
+        """測試執行緒模式 (應用程式內使用) 不建立行程池"""
+        paths = self._write_songs(str(tmp_path), 2)
+        index = LoudnessIndex(str(tmp_path / 'index.json'))
+
+        with patch('src.audio.loudness.ProcessPoolExecutor', side_effect=AssertionError):
+            summary = analyze_library(paths, index, max_workers=1, use_processes=False)
+
+        assert summary == {'analyzed': 2, 'skipped': 0, 'failed': 0}
+        assert index.get(paths[0])['integrated_lufs'] < index.get(paths[1])['integrated_lufs']
+
+    def test_cancel_saves_partial_results(self, tmp_path):
+        """測試分析中途取消時停止送出工作，並儲存已完成的結果"""
+        paths = self._write_songs(str(tmp_path), 6)
+        index_path = str(tmp_path / 'index.json')
+        cancel = threading.Event()
+
+        summary = analyze_library(
+            paths, LoudnessIndex(index_path), max_workers=1, use_processes=False,
+            on_progress=lambda done, total, path: cancel.set(), cancel_event=cancel
+        )
+
+        assert 1 <= summary['analyzed'] < len(paths)
+        saved = LoudnessIndex(index_path)
+        assert sum(saved.get(path) is not None for path in paths) == summary['analyzed']
+
+    def test_periodic_save(self, tmp_path):
+        """測試分析期間定期儲存索引"""
+        paths = self._write_songs(str(tmp_path), 3)
+        index = LoudnessIndex(str(tmp_path / 'index.json'))
+
+        with patch.object(index, 'save', wraps=index.save) as mock_save:
+            analyze_library(paths, index, max_workers=1, use_processes=False, save_every=1)
+
+        assert mock_save.call_count == 3
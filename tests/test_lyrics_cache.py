@@ -0,0 +1,92 @@
+"""已解析歌詞快取單元測試"""
+import os
+from unittest.mock import patch
+import pytest
+from src.music.utils.lyrics_cache import LyricsCache
+from src.music.utils.lyrics_parser import LyricsParser
+
+
+LRC_CONTENT = "[00:10.00]第一句\n[00:20.00]第二句\n"
+
+
+class TestLyricsCache:
+    """測試歌詞快取"""
+
+    @pytest.fixture
+    def cache(self):
+        """建立歌詞快取"""
+        return LyricsCache(LyricsParser(), max_entries=2)
+
+    def _write_lrc(self, path, content=LRC_CONTENT):
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def test_parses_once(self, cache, tmp_path):
+        """測試相同檔案只解析一次"""
+        lrc_path = self._write_lrc(tmp_path / 'song.lrc')
+
+        with patch.object(cache.parser, 'parse_lrc_file', wraps=cache.parser.parse_lrc_file) as parse:
+            first = cache.get(lrc_path)
+            second = cache.get(lrc_path)
+
+        assert parse.call_count == 1
+        assert second is first
+        assert [lyric['text'] for lyric in first] == ['第一句', '第二句']
+
+    def test_reparses_after_modification(self, cache, tmp_path):
+        """測試檔案修改後重新解析"""
+        lrc_path = self._write_lrc(tmp_path / 'song.lrc')
+        cache.get(lrc_path)
+
+        self._write_lrc(tmp_path / 'song.lrc', "[00:05.00]新歌詞\n")
+        stat = os.stat(lrc_path)
+        os.utime(lrc_path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert cache.get(lrc_path)[0]['text'] == '新歌詞'
+
+    def test_missing_file_is_not_checked_again(self, cache, tmp_path):
+        """測試沒有歌詞檔時在有效期間內不再檢查檔案"""
+        lrc_path = str(tmp_path / 'missing.lrc')
+        assert cache.get(lrc_path) is None
+
+        with patch('src.music.utils.lyrics_cache.os.stat') as mock_stat:
+            assert cache.get(lrc_path) is None
+            mock_stat.assert_not_called()
+
+    def test_missing_record_expires(self, tmp_path):
+        """測試沒有歌詞檔的記錄過期後重新檢查"""
+        cache = LyricsCache(LyricsParser(), miss_ttl=0)
+        lrc_path = str(tmp_path / 'song.lrc')
+        assert cache.get(lrc_path) is None
+
+        self._write_lrc(tmp_path / 'song.lrc')
+        assert len(cache.get(lrc_path)) == 2
+
+    def test_clear_misses(self, cache, tmp_path):
+        """測試清除沒有歌詞檔的記錄"""
+        lrc_path = str(tmp_path / 'song.lrc')
+        assert cache.get(lrc_path) is None
+
+        self._write_lrc(tmp_path / 'song.lrc')
+        cache.clear_misses()
+        assert len(cache.get(lrc_path)) == 2
+
+    def test_lru_eviction(self, cache, tmp_path):
+        """測試超過上限時淘汰最久未使用的項目"""
+        paths = [self._write_lrc(tmp_path / f'{name}.lrc') for name in ('a', 'b', 'c')]
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+
+        assert list(cache._entries) == [paths[0], paths[2]]
+
+    def test_prefetch(self, cache, tmp_path):
+        """測試背景預先解析"""
+        lrc_path = self._write_lrc(tmp_path / 'next.lrc')
+        cache.prefetch([lrc_path])
+        assert cache.wait_for_prefetch(timeout=5)
+
+        with patch.object(cache.parser, 'parse_lrc_file') as parse:
+            assert len(cache.get(lrc_path)) == 2
+            parse.assert_not_called()
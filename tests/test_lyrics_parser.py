@@ -3,7 +3,7 @@ import unittest
 from unittest.mock import patch, mock_open
 import tempfile
 import os
-from src.music.utils.lyrics_parser import LyricsParser
+from src.music.utils.lyrics_parser import LyricsParser, LyricsTimeline
 
 
 class TestLyricsParser(unittest.TestCase):
@@ -223,5 +223,59 @@ class TestLyricsParser(unittest.TestCase):
         self.assertIn('English', result[2]['text'])
 
 
+class TestLyricsTimeline(unittest.TestCase):
+    """歌詞時間軸測試類別"""
+
+    def setUp(self):
+        """測試前準備"""
+        self.timeline = LyricsTimeline([10.0, 20.0, 30.0])
+
+    def test_index_at_time(self):
+        """測試以時間查詢索引"""
+        self.assertEqual(self.timeline.index_at(5.0), -1)
+        self.assertEqual(self.timeline.index_at(10.0), 0)
+        self.assertEqual(self.timeline.index_at(29.9), 1)
+        self.assertEqual(self.timeline.index_at(100.0), 2)
+
+    def test_next_change_time(self):
+        """測試下一次換句的時間"""
+        self.timeline.index_at(15.0)
+        self.assertEqual(self.timeline.next_change_time, 20.0)
+
+        self.timeline.index_at(35.0)
+        self.assertEqual(self.timeline.next_change_time, float('inf'))
+
+    def test_ticks_within_line_skip_search(self):
+        """測試同一句歌詞內的查詢不需重新搜尋"""
+        self.timeline.index_at(12.0)
+        with patch('src.music.utils.lyrics_parser.bisect.bisect_right') as mock_bisect:
+            self.assertEqual(self.timeline.index_at(15.0), 0)
+            self.assertEqual(self.timeline.index_at(19.99), 0)
+            mock_bisect.assert_not_called()
+
+    def test_seek_backwards(self):
+        """測試向前跳轉後重新搜尋"""
+        self.assertEqual(self.timeline.index_at(25.0), 1)
+        self.assertEqual(self.timeline.index_at(12.0), 0)
+        self.assertEqual(self.timeline.index_at(1.0), -1)
+        self.assertEqual(self.timeline.next_change_time, 10.0)
+
+    def test_empty_timeline(self):
+        """測試空的時間軸"""
+        timeline = LyricsTimeline([])
+        self.assertEqual(timeline.index_at(10.0), -1)
+
+    def test_parser_reuses_timeline(self):
+        """測試解析器對同一歌詞列表重複使用時間軸"""
+        parser = LyricsParser()
+        lyrics = [{'time': 10.0, 'text': '第一句'}, {'time': 20.0, 'text': '第二句'}]
+
+        timeline = parser.get_timeline(lyrics)
+        self.assertIs(parser.get_timeline(lyrics), timeline)
+
+        # 不同的歌詞列表建立新的時間軸
+        self.assertIsNot(parser.get_timeline(list(lyrics)), timeline)
+
+
 if __name__ == '__main__':
     unittest.main()
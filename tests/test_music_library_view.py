@@ -99,6 +99,29 @@ class TestMusicLibraryView(unittest.TestCase):
         # 由於我們的 mock_async_scan 立即調用回調，所以應該被調用
         self.mock_music_manager.get_all_categories.assert_called()
 
+    def test_scan_result_posted_to_ui_dispatcher(self):
+        """測試掃描結果經由 UI 派送佇列回到主執行緒，連續掃描只套用最新的結果"""
+        from src.music.views.music_library_view import MusicLibraryView
+
+        dispatcher = Mock()
+        view = MusicLibraryView(
+            parent=self.parent,
+            music_manager=self.mock_music_manager,
+            ui_dispatcher=dispatcher
+        )
+        view.reload_library()
+
+        posts = dispatcher.post.call_args_list
+        self.assertEqual(len(posts), 2)
+        for posted in posts:
+            self.assertEqual(posted.kwargs['key'], 'library_loaded')
+
+        # 執行最後一次排入的更新後，所有「載入中」節點都被移除
+        func, result = posts[-1].args
+        func(result)
+        texts = [view.category_tree.item(node, 'text') for node in view.category_tree.get_children()]
+        self.assertNotIn('⏳ 載入音樂庫中...', texts)
+
     def test_load_categories_populates_tree(self):
         """測試載入分類填充樹狀結構"""
         from src.music.views.music_library_view import MusicLibraryView
@@ -209,6 +209,81 @@ class TestMusicPlayerController:
         assert song == sample_songs[2]
         assert controller.current_index == 2
 
+    @patch('pygame.mixer.music')
+    def test_play_previous_shuffle(self, mock_mixer, mock_music_manager, sample_songs):
+        """測試隨機模式的上一首依播放順序返回"""
+        controller = MusicPlayerController(mock_music_manager)
+        controller.set_playlist(sample_songs, index=0)
+        controller.play_mode = 'shuffle'
+
+        first = controller.play_next()
+        controller.play_next()
+
+        song = controller.play_previous()
+        assert song == first
+        assert controller.current_index == sample_songs.index(first)
+
+    @patch('pygame.mixer.music')
+    def test_enqueue_next(self, mock_mixer, mock_music_manager, sample_songs):
+        """測試下一首播放的歌曲排在目前歌曲之後"""
+        controller = MusicPlayerController(mock_music_manager)
+        controller.set_playlist(sample_songs[:2], index=0)
+
+        controller.queue.enqueue_next(sample_songs[2])
+        assert controller.playlist == [sample_songs[0], sample_songs[2], sample_songs[1]]
+
+        song = controller.play_next()
+        assert song == sample_songs[2]
+        assert controller.current_index == 1
+
+    @patch('pygame.mixer.music')
+    def test_queue_edits_keep_shuffle_history(self, mock_mixer, mock_music_manager, sample_songs):
+        """測試隨機模式下編輯佇列保留本輪已播放的歌曲"""
+        controller = MusicPlayerController(mock_music_manager)
+        controller.set_playlist(sample_songs, index=0)
+        controller.play_mode = 'shuffle'
+
+        first = controller.play_next()
+        removed = next(item for item in controller.queue if item.song is not first)
+        controller.queue.remove(removed)
+
+        assert [controller.playlist[i] for i in controller.played_indices] == [first]
+        assert controller.current_song == first
+        song = controller.play_next()
+        assert song is not first
+        assert song is not removed.song
+
+    @patch('pygame.mixer.music')
+    def test_move_current_song_in_shuffle(self, mock_mixer, mock_music_manager):
+        """測試隨機模式下移動正在播放的歌曲不改變目前歌曲與已播放記錄"""
+        songs = [{'id': str(i), 'title': f'Song {i}', 'audio_path': f'{i}.mp3'} for i in range(6)]
+        controller = MusicPlayerController(mock_music_manager)
+        controller.set_playlist(songs, index=0)
+        controller.play_mode = 'shuffle'
+
+        played = [controller.play_next() for _ in range(3)]
+        controller.queue.move(controller.queue.current, None)
+
+        assert controller.current_song is played[-1]
+        assert controller.queue.current_song is played[-1]
+        assert controller.current_index == 0
+        assert [controller.playlist[i] for i in controller.played_indices] == played
+        rest = [controller.play_next() for _ in range(3)]
+        assert sorted(song['id'] for song in played + rest) == [str(i) for i in range(6)]
+
+    @patch('pygame.mixer.music')
+    def test_enqueue_next_in_shuffle(self, mock_mixer, mock_music_manager, sample_songs):
+        """測試隨機模式下「下一首播放」的歌曲會是下一首"""
+        controller = MusicPlayerController(mock_music_manager)
+        controller.set_playlist(sample_songs, index=0)
+        controller.play_mode = 'shuffle'
+        controller.play_next()
+
+        extra = {'id': 'extra', 'title': 'Extra', 'audio_path': 'extra.mp3'}
+        controller.queue.enqueue_next(extra)
+
+        assert controller.play_next() is extra
+
     @patch('pygame.mixer.music')
     def test_set_volume(self, mock_mixer, mock_music_manager):
         """測試設定音量"""
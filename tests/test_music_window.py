@@ -440,7 +440,10 @@ class TestMusicWindowPlayMode(unittest.TestCase):
             window = MusicWindow(self.music_manager_mock, root)
 
             # 設定一些已播放索引
-            window.played_indices = [0, 1, 2]
+            window.playlist = [{'id': str(i)} for i in range(3)]
+            for _ in range(3):
+                window.queue.shuffle_next()
+            self.assertEqual(len(window.played_indices), 3)
 
             # 切換到 shuffle 模式
             window.play_mode = 'sequential'
@@ -826,8 +829,8 @@ class TestMusicWindowErrorHandling(unittest.TestCase):
 
     @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
     @patch('src.music.windows.music_window.YouTubeDownloader')
-    def test_handle_paused_state_when_paused(self, mock_downloader, mock_pygame):
-        """測試暫停狀態處理 - 暫停中"""
+    def test_clock_state_when_paused(self, mock_downloader, mock_pygame):
+        """測試播放時鐘狀態 - 暫停中"""
         try:
             root = tk.Tk()
         except tk.TclError:
@@ -836,11 +839,13 @@ class TestMusicWindowErrorHandling(unittest.TestCase):
 
         try:
             window = MusicWindow(self.music_manager_mock, root)
+            window.current_song = {'duration': 180}
+            window.is_playing = True
             window.is_paused = True
 
-            result = window._handle_paused_state()
+            state = window._get_clock_state()
 
-            self.assertTrue(result)
+            self.assertTrue(state.paused)
 
         finally:
             try:
@@ -850,8 +855,8 @@ class TestMusicWindowErrorHandling(unittest.TestCase):
 
     @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
     @patch('src.music.windows.music_window.YouTubeDownloader')
-    def test_handle_paused_state_when_not_paused(self, mock_downloader, mock_pygame):
-        """測試暫停狀態處理 - 未暫停"""
+    def test_clock_state_when_stopped(self, mock_downloader, mock_pygame):
+        """測試播放時鐘狀態 - 沒有播放"""
         try:
             root = tk.Tk()
         except tk.TclError:
@@ -860,11 +865,42 @@ class TestMusicWindowErrorHandling(unittest.TestCase):
 
         try:
             window = MusicWindow(self.music_manager_mock, root)
-            window.is_paused = False
+            window.is_playing = False
 
-            result = window._handle_paused_state()
+            self.assertIsNone(window._get_clock_state())
 
-            self.assertFalse(result)
+        finally:
+            try:
+                root.destroy()
+            except:
+                pass
+
+    @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
+    @patch('src.music.windows.music_window.YouTubeDownloader')
+    def test_clock_tick_updates_ui_once(self, mock_downloader, mock_pygame):
+        """測試播放時鐘更新在同一次呼叫中更新進度、時間與歌詞"""
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("Tkinter environment not properly configured")
+            return
+
+        try:
+            from src.music.utils.playback_clock import ClockState
+
+            self.music_manager_mock.format_duration = Mock(side_effect=lambda s: f"{s//60:02d}:{s%60:02d}")
+            window = MusicWindow(self.music_manager_mock, root)
+            window.use_audio_player = True
+            window.audio_player = Mock()
+            window.playback_view = Mock()
+            window.lyrics_view = Mock()
+
+            window._on_clock_tick(ClockState(90, 180, False))
+
+            window.playback_view.update_progress.assert_called_once_with(50.0)
+            window.playback_view.update_time_label.assert_called_once_with("01:30 / 03:00")
+            window.lyrics_view.update_current_time.assert_called_once_with(90)
+            window.audio_player.check_adaptive_latency.assert_called_once()
 
         finally:
             try:
@@ -890,10 +926,10 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
         self.music_manager_mock.config_manager = self.config_manager_mock
         self.music_manager_mock.music_root_path = "/test/music"
 
-    @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
+    @patch('src.music.windows.music_window.pygame')
     @patch('src.music.windows.music_window.YouTubeDownloader')
-    def test_get_available_shuffle_indices_with_available_songs(self, mock_downloader, mock_pygame):
-        """測試取得可用隨機索引 - 有可用歌曲"""
+    def test_play_previous_wraps_around(self, mock_downloader, mock_pygame):
+        """測試播放上一首會循環"""
         try:
             root = tk.Tk()
         except tk.TclError:
@@ -902,15 +938,17 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
 
         try:
             window = MusicWindow(self.music_manager_mock, root)
-            window.playlist = [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}]
-            window.played_indices = [0, 2]
+            window.playlist = [
+                {'id': 'song1', 'audio_path': '/test/song1.mp3'},
+                {'id': 'song2', 'audio_path': '/test/song2.mp3'},
+                {'id': 'song3', 'audio_path': '/test/song3.mp3'}
+            ]
+            window.current_index = 0
 
-            available = window._get_available_shuffle_indices()
+            # 從第一首播放上一首應該到最後一首
+            window._play_previous()
 
-            self.assertIn(1, available)
-            self.assertIn(3, available)
-            self.assertNotIn(0, available)
-            self.assertNotIn(2, available)
+            self.assertEqual(window.current_index, 2)
 
         finally:
             try:
@@ -920,8 +958,8 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
 
     @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
     @patch('src.music.windows.music_window.YouTubeDownloader')
-    def test_get_available_shuffle_indices_all_played(self, mock_downloader, mock_pygame):
-        """測試取得可用隨機索引 - 全部已播放"""
+    def test_get_upcoming_songs_for_cache_warm_up(self, mock_downloader, mock_pygame):
+        """測試取得接下來的歌曲用於預熱解碼快取"""
         try:
             root = tk.Tk()
         except tk.TclError:
@@ -930,14 +968,21 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
 
         try:
             window = MusicWindow(self.music_manager_mock, root)
-            window.playlist = [{'id': '1'}, {'id': '2'}, {'id': '3'}]
-            window.played_indices = [0, 1, 2]
+            window.playlist = [{'id': str(i)} for i in range(5)]
+            window.current_index = 3
+            window.current_song = window.playlist[3]
+            window.play_mode = 'sequential'
 
-            available = window._get_available_shuffle_indices()
+            upcoming = window._get_upcoming_songs(3)
+            self.assertEqual([song['id'] for song in upcoming], ['4', '0', '1'])
 
-            # 應該重置並返回所有索引
-            self.assertEqual(len(available), 3)
-            self.assertEqual(window.played_indices, [])
+            # 隨機模式預覽的順序與之後實際播放的順序相同
+            window.play_mode = 'shuffle'
+            upcoming = window._get_upcoming_songs(3)
+            self.assertEqual(len(upcoming), 3)
+            self.assertNotIn('3', [song['id'] for song in upcoming])
+            for song in upcoming:
+                self.assertEqual(window.queue.shuffle_next().song, song)
 
         finally:
             try:
@@ -945,10 +990,14 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
             except:
                 pass
 
-    @patch('src.music.windows.music_window.pygame')
+    @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
     @patch('src.music.windows.music_window.YouTubeDownloader')
-    def test_play_previous_wraps_around(self, mock_downloader, mock_pygame):
-        """測試播放上一首會循環"""
+    def test_poll_spectrum_updates_view(self, mock_downloader, mock_pygame):
+        """測試 UI 迴圈讀取最新頻譜並在結果過期時清除顯示"""
+        import time
+        import numpy as np
+        from src.audio.spectrum_analyzer import SpectrumAnalyzer, SpectrumFrame
+
         try:
             root = tk.Tk()
         except tk.TclError:
@@ -957,17 +1006,62 @@ class TestMusicWindowPlaylistManagement(unittest.TestCase):
 
         try:
             window = MusicWindow(self.music_manager_mock, root)
-            window.playlist = [
-                {'id': 'song1', 'audio_path': '/test/song1.mp3'},
-                {'id': 'song2', 'audio_path': '/test/song2.mp3'},
-                {'id': 'song3', 'audio_path': '/test/song3.mp3'}
-            ]
-            window.current_index = 0
+            window.window = Mock()
+            window.window.winfo_viewable.return_value = 1
+            window.playback_view = Mock()
+            window.spectrum_analyzer = SpectrumAnalyzer()
+
+            bands = np.full(10, -20.0)
+            peak = np.array([-3.0, -4.0])
+            window.spectrum_analyzer._latest = SpectrumFrame(
+                frequencies=tuple(SpectrumAnalyzer().frequencies), bands=bands,
+                rms=peak, peak=peak, timestamp=time.perf_counter()
+            )
+            window._poll_spectrum()
+            window.playback_view.update_spectrum.assert_called_once_with(bands, peak)
+            window.window.after.assert_called_once_with(33, window._poll_spectrum)
+
+            # 結果過期 (暫停或停止播放)
+            window.spectrum_analyzer._latest = window.spectrum_analyzer._latest._replace(timestamp=0.0)
+            window._poll_spectrum()
+            window.playback_view.clear_spectrum.assert_called_once()
+
+            # 視窗隱藏時暫停分析並降低檢查頻率
+            window.window.winfo_viewable.return_value = 0
+            window._poll_spectrum()
+            self.assertFalse(window.spectrum_analyzer._active)
+            window.window.after.assert_called_with(MusicWindow.SPECTRUM_HIDDEN_POLL_MS, window._poll_spectrum)
 
-            # 從第一首播放上一首應該到最後一首
-            window._play_previous()
+        finally:
+            try:
+                root.destroy()
+            except:
+                pass
 
-            self.assertEqual(window.current_index, 2)
+    @patch('src.music.windows.music_window.pygame', new_callable=lambda: MagicMock())
+    @patch('src.music.windows.music_window.YouTubeDownloader')
+    def test_cleanup_stops_spectrum_analyzer(self, mock_downloader, mock_pygame):
+        """測試清理資源時停止頻譜分析線程與背景響度分析"""
+        from src.audio.spectrum_analyzer import SpectrumAnalyzer
+
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("Tkinter environment not properly configured")
+            return
+
+        try:
+            window = MusicWindow(self.music_manager_mock, root)
+            window.discord_presence = None
+            window.spectrum_analyzer = SpectrumAnalyzer()
+            window.spectrum_analyzer.start()
+            self.assertTrue(window.spectrum_analyzer.is_running())
+
+            window.cleanup()
+
+            self.assertFalse(window.spectrum_analyzer.is_running())
+            # 背景響度分析收到取消通知
+            self.assertTrue(window._loudness_cancel.is_set())
 
         finally:
             try:
@@ -129,69 +129,71 @@ class TestPlayNextRepeatOneMode:
 class TestPlayNextShuffleMode:
     """測試隨機播放模式"""
 
-    @patch('random.choice')
-    def test_shuffle_no_played_indices(self, mock_random_choice, music_window, sample_playlist):
-        """測試隨機模式 - 沒有已播放記錄"""
+    def test_shuffle_no_played_indices(self, music_window, sample_playlist):
+        """測試隨機模式 - 新的一輪從所有歌曲中選擇"""
         music_window.playlist = sample_playlist
         music_window.current_index = 0
         music_window.play_mode = 'shuffle'
-        music_window.played_indices = []
-        mock_random_choice.return_value = 1
 
         music_window._play_next()
 
-        # 應該從所有歌曲中隨機選擇
-        mock_random_choice.assert_called_once()
-        called_list = mock_random_choice.call_args[0][0]
-        assert len(called_list) == 3  # 所有歌曲都可選
-        assert set(called_list) == {0, 1, 2}
+        index = music_window.current_index
+        assert index in (0, 1, 2)
+        music_window._play_song.assert_called_once_with(sample_playlist[index])
+        assert music_window.played_indices == [index]
 
-        music_window._play_song.assert_called_once_with(sample_playlist[1])
-        assert music_window.current_index == 1
-        assert 1 in music_window.played_indices
-
-    @patch('random.choice')
-    def test_shuffle_with_played_indices(self, mock_random_choice, music_window, sample_playlist):
-        """測試隨機模式 - 有已播放記錄"""
+    def test_shuffle_with_played_indices(self, music_window, sample_playlist):
+        """測試隨機模式 - 本輪只選擇未播放的歌曲"""
         music_window.playlist = sample_playlist
         music_window.current_index = 0
         music_window.play_mode = 'shuffle'
-        music_window.played_indices = [0, 1]  # 已播放前兩首
-        mock_random_choice.return_value = 2
 
         music_window._play_next()
+        music_window._play_next()
+        played = list(music_window.played_indices)
+        music_window._play_song.reset_mock()
 
-        # 應該只從未播放的歌曲中選擇
-        mock_random_choice.assert_called_once()
-        called_list = mock_random_choice.call_args[0][0]
-        assert called_list == [2]  # 只有第三首未播放
+        music_window._play_next()
 
-        music_window._play_song.assert_called_once_with(sample_playlist[2])
-        assert music_window.current_index == 2
-        assert music_window.played_indices == [0, 1, 2]
+        # 只有一首未播放
+        remaining = ({0, 1, 2} - set(played)).pop()
+        music_window._play_song.assert_called_once_with(sample_playlist[remaining])
+        assert music_window.current_index == remaining
+        assert music_window.played_indices == played + [remaining]
 
-    @patch('random.choice')
-    def test_shuffle_all_songs_played_reset(self, mock_random_choice, music_window, sample_playlist):
-        """測試隨機模式 - 所有歌曲都已播放，重置記錄"""
+    def test_shuffle_all_songs_played_reset(self, music_window, sample_playlist):
+        """測試隨機模式 - 所有歌曲都已播放，重新洗牌"""
         music_window.playlist = sample_playlist
-        music_window.current_index = 2
+        music_window.current_index = 0
         music_window.play_mode = 'shuffle'
-        music_window.played_indices = [0, 1, 2]  # 所有歌曲都已播放
-        mock_random_choice.return_value = 0
+
+        for _ in range(3):
+            music_window._play_next()
+        last = music_window.current_index
+        music_window._play_song.reset_mock()
 
         music_window._play_next()
 
-        # 應該清空記錄並重新開始
-        assert music_window.played_indices == [0]  # 重置後只有新播放的歌曲
+        # 重置後只有新播放的歌曲，且不會立即重複上一首
+        assert music_window.played_indices == [music_window.current_index]
+        assert music_window.current_index != last
+        music_window._play_song.assert_called_once_with(sample_playlist[music_window.current_index])
 
-        # 應該從所有歌曲中隨機選擇
-        mock_random_choice.assert_called_once()
-        called_list = mock_random_choice.call_args[0][0]
-        assert len(called_list) == 3
-        assert set(called_list) == {0, 1, 2}
+    def test_shuffle_previous_returns_played_song(self, music_window, sample_playlist):
+        """測試隨機模式 - 上一首依播放順序返回"""
+        music_window.playlist = sample_playlist
+        music_window.current_index = 0
+        music_window.play_mode = 'shuffle'
 
-        music_window._play_song.assert_called_once_with(sample_playlist[0])
-        assert music_window.current_index == 0
+        music_window._play_next()
+        first = music_window.current_index
+        music_window._play_next()
+        music_window._play_song.reset_mock()
+
+        music_window._play_previous()
+
+        music_window._play_song.assert_called_once_with(sample_playlist[first])
+        assert music_window.current_index == first
 
 
 class TestPlayNextSequentialMode:
@@ -295,7 +297,6 @@ class TestPlayNextEdgeCases:
         music_window.playlist = single_song_playlist
         music_window.current_index = 0
         music_window.play_mode = 'shuffle'
-        music_window.played_indices = []
 
         music_window._play_next()
 
@@ -0,0 +1,165 @@
+"""離線渲染模組單元測試"""
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+import soundfile as sf
+from src.audio.audio_player import AudioPlayer
+from src.audio.audio_processor import AudioProcessor
+from src.audio.offline_render import (
+    RenderSettings,
+    build_processor,
+    main,
+    render_array,
+    render_batch,
+    render_file,
+)
+
+
+ROCK_GAINS = (5, 4, 3, 2, -1, 0, 2, 4, 5, 6)
+
+
+def _tone(seconds, sample_rate=44100, channels=2):
+    """產生測試用的雙頻音"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 3000 * t)
+    return np.column_stack([mono] * channels).astype(np.float32)
+
+
+def _render_live(audio, settings):
+    """以 AudioPlayer 的即時回調播放到結束，收集所有輸出區塊"""
+    with patch('src.audio.audio_player.sd.OutputStream') as mock_stream, \
+            patch('src.audio.audio_player.sf.read') as mock_read:
+        mock_stream.return_value = MagicMock()
+        mock_read.return_value = (audio, 44100)
+
+        player = AudioPlayer(audio_processor=build_processor(settings, 44100))
+        player.set_fade_enabled(False)
+        player.enable_speed_adjustment(True)
+        player.set_playback_speed(settings.speed)
+        player.set_volume(settings.volume)
+        player.play('test.wav')
+
+        outdata = np.zeros((settings.block_size, 2), dtype=np.float32)
+        blocks = []
+        while player.is_playing():
+            player._audio_callback(outdata, len(outdata), None, None)
+            blocks.append(outdata.copy())
+        player.stop()
+    return np.concatenate(blocks)
+
+
+class TestRenderMatchesLiveCallback:
+    """測試離線渲染與即時回調的輸出一致"""
+
+    @pytest.mark.parametrize('settings', [
+        RenderSettings(equalizer_gains=ROCK_GAINS, volume=0.8),
+        RenderSettings(equalizer_gains=ROCK_GAINS, replay_gain=1.5, speed=1.25),
+        RenderSettings(speed=0.8),
+    ])
+    def test_identical_output(self, settings):
+        """測試與即時回調逐樣本相同"""
+        audio = _tone(1.5)
+        offline = render_array(audio, 44100, settings)
+        live = _render_live(audio, settings)
+
+        assert len(live) >= len(offline)
+        np.testing.assert_array_equal(offline, live[:len(offline)])
+
+    def test_length_follows_speed(self):
+        """測試輸出長度依播放速度縮放"""
+        audio = _tone(2.0)
+        assert len(render_array(audio, 44100)) == len(audio)
+        faster = render_array(audio, 44100, RenderSettings(speed=2.0))
+        assert len(faster) == pytest.approx(len(audio) / 2, abs=AudioPlayer.BLOCKSIZE)
+
+
+class TestRenderSettings:
+    """測試渲染設定"""
+
+    def test_from_processor(self):
+        """測試從處理器讀取目前設定"""
+        processor = AudioProcessor(sample_rate=44100)
+        processor.get_equalizer().set_all_gains(list(ROCK_GAINS))
+        processor.set_replay_gain(0.5)
+        processor.set_playback_speed(1.5)
+
+        settings = RenderSettings.from_processor(processor, volume=0.7)
+        assert settings.equalizer_gains == ROCK_GAINS
+        assert settings.replay_gain == 0.5
+        assert settings.speed == 1.5
+        assert settings.volume == 0.7
+
+    def test_equalizer_disabled(self):
+        """測試停用等化器時不帶增益"""
+        processor = AudioProcessor(sample_rate=44100, enable_equalizer=False)
+        assert RenderSettings.from_processor(processor).equalizer_gains is None
+        assert not build_processor(RenderSettings(), 44100).is_equalizer_enabled()
+
+
+class TestRenderFile:
+    """測試檔案渲染"""
+
+    def test_render_wav_matches_array_render(self, tmp_path):
+        """測試串流檔案渲染與記憶體渲染相同"""
+        audio = _tone(1.0)
+        source = str(tmp_path / 'source.wav')
+        sf.write(source, audio, 44100, subtype='FLOAT')
+        settings = RenderSettings(equalizer_gains=ROCK_GAINS)
+
+        result = render_file(source, str(tmp_path / 'out.wav'), settings)
+        rendered, sample_rate = sf.read(result['output'], dtype='float32')
+
+        assert sample_rate == 44100
+        assert result['duration'] == pytest.approx(1.0)
+        assert result['realtime_factor'] > 0
+        np.testing.assert_array_equal(rendered, render_array(audio, 44100, settings))
+
+    def test_mono_source_rendered_as_stereo(self, tmp_path):
+        """測試單聲道來源與播放器相同地輸出為立體聲"""
+        source = str(tmp_path / 'mono.wav')
+        sf.write(source, _tone(0.5, channels=1), 44100, subtype='FLOAT')
+
+        result = render_file(source, str(tmp_path / 'out.flac'))
+        info = sf.info(result['output'])
+        assert info.channels == 2
+        assert info.format == 'FLAC'
+
+    def test_unsupported_output_format(self, tmp_path):
+        """測試不支援的輸出格式"""
+        with pytest.raises(ValueError):
+            render_file('input.wav', str(tmp_path / 'out.mp3'))
+
+
+class TestRenderBatch:
+    """測試批次渲染與命令列"""
+
+    def test_batch_with_failures(self, tmp_path):
+        """測試批次渲染回報成功、失敗與即時倍率"""
+        jobs = []
+        for i in range(2):
+            source = str(tmp_path / f'song{i}.wav')
+            sf.write(source, _tone(1.0), 44100)
+            jobs.append((source, str(tmp_path / f'song{i}.out.wav')))
+        jobs.append((str(tmp_path / 'missing.wav'), str(tmp_path / 'missing.out.wav')))
+
+        progress = []
+        summary = render_batch(jobs, max_workers=2,
+                               on_progress=lambda done, total, result: progress.append(result))
+
+        assert summary['rendered'] == 2
+        assert summary['failed'] == 1
+        assert summary['audio_seconds'] == pytest.approx(2.0)
+        assert summary['realtime_factor'] > 0
+        assert sum('error' in result for result in progress) == 1
+
+    def test_cli(self, tmp_path, capsys):
+        """測試命令列渲染到輸出目錄"""
+        source = str(tmp_path / 'song.wav')
+        sf.write(source, _tone(0.5), 44100)
+        output_dir = tmp_path / 'rendered'
+
+        code = main([source, '-o', str(output_dir), '--preset', 'rock', '-j', '1'])
+
+        assert code == 0
+        assert (output_dir / 'song.flac').exists()
+        assert '即時' in capsys.readouterr().out
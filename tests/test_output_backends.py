@@ -0,0 +1,197 @@
+"""音訊輸出後端單元測試"""
+import threading
+import time
+from unittest.mock import patch
+import numpy as np
+import pytest
+import soundfile as sf
+from src.audio.audio_player import AudioPlayer
+from src.audio.output_backends import (
+    ArraySink,
+    FileSink,
+    SimulatedOutputBackend,
+    SimulatedOutputStream,
+)
+
+
+def _write_tone(path, seconds, frequency=440, sample_rate=44100):
+    """寫入測試用的立體聲正弦波檔案並返回音訊數據"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    audio = np.column_stack((mono, mono))
+    sf.write(path, audio, sample_rate, subtype='FLOAT')
+    return audio
+
+
+def _make_player(backend):
+    """建立使用指定輸出後端、停用淡入淡出的播放器"""
+    player = AudioPlayer(output_backend=backend)
+    player.set_fade_enabled(False)
+    return player
+
+
+class TestSimulatedOutputStream:
+    """測試模擬串流的時脈與統計"""
+
+    def test_manual_clock(self):
+        """測試逐區塊推進時模擬時脈與回調參數"""
+        calls = []
+
+        def callback(outdata, frames, time_info, status):
+            calls.append((frames, time_info.currentTime, time_info.outputBufferDacTime))
+            outdata.fill(0.25)
+
+        sink = ArraySink()
+        stream = SimulatedOutputStream(48000, 2, 480, callback, sink=sink)
+        assert stream.advance(3) == 0  # 尚未啟動
+
+        stream.start()
+        assert stream.advance(3) == 3
+        assert stream.advance_seconds(0.015) == 2
+
+        assert stream.time == pytest.approx(0.05)
+        assert calls[1] == (480, pytest.approx(0.01), pytest.approx(0.02))
+        assert sink.get_audio().shape == (2400, 2)
+
+        stats = stream.get_stats()
+        assert stats['callbacks'] == 5
+        assert stats['budget_seconds'] == pytest.approx(0.01)
+        assert stats['max_seconds'] >= stats['mean_seconds']
+
+    def test_callback_error_outputs_silence(self):
+        """測試回調例外時輸出靜音而不中斷串流"""
+        def callback(outdata, frames, time_info, status):
+            outdata.fill(1.0)
+            raise RuntimeError('boom')
+
+        sink = ArraySink()
+        stream = SimulatedOutputStream(44100, 2, 256, callback, sink=sink)
+        stream.start()
+        stream.advance(2)
+        assert np.all(sink.get_audio() == 0)
+
+    def test_invalid_pacing(self):
+        """測試不支援的節拍模式"""
+        with pytest.raises(ValueError):
+            SimulatedOutputBackend(pacing='warp')
+
+
+class TestPlayerWithSimulatedBackend:
+    """測試播放器在模擬輸出後端上端到端播放"""
+
+    def test_requires_backend_without_sounddevice(self):
+        """測試沒有 sounddevice 且未指定後端時拋出例外"""
+        with patch('src.audio.audio_player.SOUNDDEVICE_AVAILABLE', False):
+            with pytest.raises(ImportError):
+                AudioPlayer()
+            AudioPlayer(output_backend=SimulatedOutputBackend())
+
+    def test_plays_file_to_end(self, tmp_path):
+        """測試播放完整檔案，輸出與來源相同且結束回調只觸發一次"""
+        path = str(tmp_path / 'song.wav')
+        audio = _write_tone(path, 0.5)
+        sink = ArraySink()
+        backend = SimulatedOutputBackend(sink=sink)
+        player = _make_player(backend)
+
+        ended = []
+        done = threading.Event()
+        player.on_playback_end = lambda: (ended.append(True), done.set())
+
+        assert player.play(path)
+        while player.is_playing():
+            backend.advance()
+        backend.advance(5)  # 結束後串流仍會繼續呼叫回調
+        assert done.wait(1.0)
+        time.sleep(0.05)
+
+        output = sink.get_audio()
+        np.testing.assert_array_equal(output[:len(audio)], audio)
+        assert np.all(output[len(audio):] == 0)
+        assert len(ended) == 1
+        player.stop()
+
+    def test_gapless_transition(self, tmp_path):
+        """測試結束回調立即換曲時，兩首之間只有最後一個區塊的補零"""
+        first = _write_tone(str(tmp_path / 'a.wav'), 0.3, frequency=440)
+        second = _write_tone(str(tmp_path / 'b.wav'), 0.3, frequency=660)
+        sink = ArraySink()
+        backend = SimulatedOutputBackend(sink=sink)
+        player = _make_player(backend)
+
+        switched = threading.Event()
+
+        def on_end():
+            if len(backend.streams) == 1:
+                player.play(str(tmp_path / 'b.wav'))
+                switched.set()
+
+        player.on_playback_end = on_end
+        player.play(str(tmp_path / 'a.wav'))
+        while player.is_playing():
+            backend.advance()
+        assert switched.wait(1.0)
+        while player.is_playing():
+            backend.advance()
+
+        output = sink.get_audio()
+        gap = -len(first) % AudioPlayer.BLOCKSIZE
+        start = len(first) + gap
+        assert gap < AudioPlayer.BLOCKSIZE
+        np.testing.assert_array_equal(output[:len(first)], first)
+        np.testing.assert_array_equal(output[start:start + len(second)], second)
+        player.stop()
+
+    def test_fast_pacing_runs_faster_than_realtime(self, tmp_path):
+        """測試 fast 模式比即時更快播完"""
+        path = str(tmp_path / 'song.wav')
+        _write_tone(path, 3.0)
+        backend = SimulatedOutputBackend(pacing='fast')
+        player = _make_player(backend)
+        done = threading.Event()
+        player.on_playback_end = done.set
+
+        started = time.perf_counter()
+        player.play(path)
+        assert done.wait(5.0)
+        elapsed = time.perf_counter() - started
+        player.stop()
+
+        assert elapsed < 3.0
+        assert backend.stream.time >= 3.0
+        assert not backend.stream.active
+
+    def test_realtime_pacing_follows_wall_clock(self, tmp_path):
+        """測試 realtime 模式依實際時間節拍"""
+        path = str(tmp_path / 'song.wav')
+        _write_tone(path, 0.3)
+        backend = SimulatedOutputBackend(pacing='realtime')
+        player = _make_player(backend)
+        done = threading.Event()
+        player.on_playback_end = done.set
+
+        started = time.perf_counter()
+        player.play(path)
+        assert done.wait(5.0)
+        elapsed = time.perf_counter() - started
+        player.stop()
+
+        assert elapsed >= 0.25
+
+    def test_file_sink(self, tmp_path):
+        """測試將播放輸出寫入檔案"""
+        path = str(tmp_path / 'song.wav')
+        audio = _write_tone(path, 0.2)
+        output_path = str(tmp_path / 'captured.wav')
+        backend = SimulatedOutputBackend(sink=FileSink(output_path, subtype='FLOAT'))
+        player = _make_player(backend)
+
+        player.play(path)
+        while player.is_playing():
+            backend.advance()
+        player.stop()
+        backend.close()
+
+        captured, sample_rate = sf.read(output_path, dtype='float32')
+        assert sample_rate == 44100
+        np.testing.assert_array_equal(captured[:len(audio)], audio)
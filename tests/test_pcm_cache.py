@@ -0,0 +1,201 @@
+"""PCMCache 單元測試"""
+import os
+import time
+from unittest.mock import patch
+import pytest
+import numpy as np
+from src.audio.pcm_cache import INT16_SCALE, PCMCache
+
+
+def _make_source(directory, name, content=b'audio'):
+    """建立假的來源檔案"""
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def _audio(frames=4410, channels=2):
+    """產生測試音訊"""
+    rng = np.random.default_rng(0)
+    return (rng.random((frames, channels), dtype=np.float32) - 0.5)
+
+
+class TestPCMCacheBasics:
+    """測試快取讀寫"""
+
+    def test_miss_returns_none(self, tmp_path):
+        """測試未快取時返回 None"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        assert cache.get(source) is None
+        assert not cache.contains(source)
+
+    def test_missing_source_returns_none(self, tmp_path):
+        """測試來源檔案不存在時返回 None"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        assert cache.get(str(tmp_path / 'missing.mp3')) is None
+
+    def test_put_and_get_float32(self, tmp_path):
+        """測試 float32 快取內容完全一致並以 memmap 讀取"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        audio = _audio()
+
+        assert cache.put(source, audio, 44100)
+        assert cache.contains(source)
+
+        cached, sample_rate = cache.get(source)
+        assert isinstance(cached, np.memmap)
+        assert sample_rate == 44100
+        assert cached.shape == audio.shape
+        np.testing.assert_array_equal(cached, audio)
+
+    def test_put_and_get_int16(self, tmp_path):
+        """測試 int16 快取佔用一半空間且誤差在量化範圍內"""
+        cache = PCMCache(str(tmp_path / 'cache'), dtype='int16')
+        source = _make_source(str(tmp_path), 'song.mp3')
+        audio = _audio()
+
+        cache.put(source, audio, 44100)
+        cached, _ = cache.get(source)
+
+        assert cached.dtype == np.int16
+        assert cache.get_total_size() == audio.size * 2
+        np.testing.assert_allclose(cached * INT16_SCALE, audio, atol=1e-4)
+
+    def test_int16_round_trip_preserves_level(self, tmp_path):
+        """測試 int16 寫入與讀取使用同一個比例，滿刻度不會變小聲"""
+        cache = PCMCache(str(tmp_path / 'cache'), dtype='int16')
+        source = _make_source(str(tmp_path), 'song.mp3')
+        audio = np.array([[1.0, -1.0], [0.0, 1.0]], dtype=np.float32)
+
+        cache.put(source, audio, 44100)
+        cached, _ = cache.get(source)
+
+        np.testing.assert_allclose(cached * INT16_SCALE, audio, rtol=1e-6)
+
+    def test_invalid_dtype(self, tmp_path):
+        """測試不支援的儲存格式"""
+        with pytest.raises(ValueError):
+            PCMCache(str(tmp_path), dtype='float64')
+
+    def test_modified_source_invalidates_entry(self, tmp_path):
+        """測試來源檔案變更後快取失效"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        cache.put(source, _audio(), 44100)
+
+        _make_source(str(tmp_path), 'song.mp3', content=b're-downloaded audio')
+        assert cache.get(source) is None
+
+    def test_corrupted_entry_is_removed(self, tmp_path):
+        """測試損毀的項目被移除而不是拋出例外"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        cache.put(source, _audio(), 44100)
+
+        key = cache.make_key(source)
+        with open(os.path.join(cache.cache_dir, key + '.pcm'), 'wb') as f:
+            f.write(b'xx')
+
+        assert cache.get(source) is None
+        assert not cache.contains(source)
+
+    def test_concurrent_writers_do_not_clobber(self, tmp_path):
+        """測試同時寫入同一首歌時不互相覆蓋暫存檔"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        audio = _audio()
+
+        threads = [cache.put_async(source, audio, 44100) for _ in range(8)]
+        for thread in threads:
+            thread.join()
+
+        cached, _ = cache.get(source)
+        np.testing.assert_array_equal(cached, audio)
+        assert not [name for name in os.listdir(cache.cache_dir) if name.endswith('.tmp')]
+
+    def test_failed_write_removes_temp_file(self, tmp_path):
+        """測試寫入失敗時刪除暫存檔與不完整的項目"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+
+        with patch('src.audio.pcm_cache.os.replace', side_effect=PermissionError('in use')):
+            assert cache.put(source, _audio(), 44100) is False
+
+        assert os.listdir(cache.cache_dir) == []
+        assert not cache.contains(source)
+
+    def test_clear(self, tmp_path):
+        """測試清除快取"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        source = _make_source(str(tmp_path), 'song.mp3')
+        cache.put(source, _audio(), 44100)
+        cache.clear()
+        assert cache.get_total_size() == 0
+        assert cache.get(source) is None
+
+
+class TestPCMCacheEviction:
+    """測試大小上限與 LRU 淘汰"""
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """測試超過上限時淘汰最久未使用的項目"""
+        audio = _audio()
+        entry_size = audio.nbytes
+        cache = PCMCache(str(tmp_path / 'cache'), max_bytes=entry_size * 2)
+
+        sources = [_make_source(str(tmp_path), f'song{i}.mp3', bytes([i]) * 10) for i in range(3)]
+        cache.put(sources[0], audio, 44100)
+        cache.put(sources[1], audio, 44100)
+
+        # 讓第一首成為最近使用
+        past = time.time() - 100
+        os.utime(os.path.join(cache.cache_dir, cache.make_key(sources[1]) + '.pcm'), (past, past))
+        assert cache.get(sources[0]) is not None
+
+        cache.put(sources[2], audio, 44100)
+
+        assert cache.contains(sources[0])
+        assert not cache.contains(sources[1])
+        assert cache.contains(sources[2])
+        assert cache.get_total_size() <= entry_size * 2
+
+
+class TestPCMCacheWarmUp:
+    """測試背景預熱"""
+
+    def test_warm_up_decodes_uncached_songs(self, tmp_path):
+        """測試預熱只解碼尚未快取的歌曲"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        sources = [_make_source(str(tmp_path), f'song{i}.mp3', bytes([i]) * 10) for i in range(3)]
+        cache.put(sources[0], _audio(), 44100)
+
+        decoded = []
+
+        def decoder(path):
+            decoded.append(path)
+            return _audio(), 44100
+
+        cache.warm_up(sources, decoder)
+        assert cache.wait_for_warm_up(timeout=5.0)
+
+        assert decoded == sources[1:]
+        assert all(cache.contains(source) for source in sources)
+
+    def test_warm_up_survives_decoder_errors(self, tmp_path):
+        """測試解碼失敗時繼續處理下一首"""
+        cache = PCMCache(str(tmp_path / 'cache'))
+        sources = [_make_source(str(tmp_path), f'song{i}.mp3', bytes([i]) * 10) for i in range(2)]
+
+        def decoder(path):
+            if path == sources[0]:
+                raise RuntimeError('decode failed')
+            return _audio(), 44100
+
+        cache.warm_up(sources, decoder)
+        assert cache.wait_for_warm_up(timeout=5.0)
+
+        assert not cache.contains(sources[0])
+        assert cache.contains(sources[1])
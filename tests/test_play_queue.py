@@ -0,0 +1,208 @@
+"""播放佇列單元測試"""
+import random
+
+import pytest
+from src.music.utils.play_queue import PlayQueue
+
+
+def _songs(count):
+    """建立測試用的歌曲列表"""
+    return [{'id': str(i), 'title': f'Song {i}'} for i in range(count)]
+
+
+def _ids(queue):
+    """佇列中歌曲的 id (依播放順序)"""
+    return [song['id'] for song in queue.songs()]
+
+
+class TestPlayQueue:
+    """測試播放佇列"""
+
+    def test_set_songs_and_current(self):
+        """測試設定歌曲與目前位置"""
+        queue = PlayQueue(_songs(3))
+        assert len(queue) == 3
+        assert queue.current is None
+        assert queue.current_index == -1
+
+        queue.set_current_index(1)
+        assert queue.current_song['id'] == '1'
+        assert queue.current_index == 1
+
+        queue.set_current_index(5)
+        assert queue.current is None
+
+    def test_enqueue_next_keeps_order(self):
+        """測試連續加入下一首時依加入順序排在目前歌曲之後"""
+        queue = PlayQueue(_songs(3))
+        queue.set_current_index(0)
+
+        queue.enqueue_next({'id': 'a'})
+        queue.enqueue_next({'id': 'b'})
+        assert _ids(queue) == ['0', 'a', 'b', '1', '2']
+        assert queue.current_index == 0
+
+    def test_append(self):
+        """測試加到最後"""
+        queue = PlayQueue(_songs(2))
+        item = queue.append({'id': 'x'})
+        assert _ids(queue) == ['0', '1', 'x']
+        assert queue.index_of(item) == 2
+
+    def test_handles_survive_edits(self):
+        """測試編輯佇列後目前位置與項目控制代碼不變"""
+        queue = PlayQueue(_songs(4))
+        queue.set_current_index(2)
+        current = queue.current
+
+        queue.remove(queue.item_at(0))
+        queue.enqueue_next({'id': 'n'})
+        queue.move(queue.item_at(2), after=None)
+
+        assert queue.current is current
+        assert queue.current_song['id'] == '2'
+        assert queue.item_at(queue.current_index) is current
+
+    def test_remove_current_keeps_next(self):
+        """測試移除目前歌曲後下一首仍是原本的下一首"""
+        queue = PlayQueue(_songs(3))
+        queue.set_current_index(1)
+
+        queue.remove(queue.current)
+        assert queue.current_song['id'] == '0'
+        assert queue.next_item().song['id'] == '2'
+
+    def test_move(self):
+        """測試移動項目"""
+        queue = PlayQueue(_songs(4))
+        queue.set_current_index(0)
+
+        queue.move(queue.item_at(3), after=queue.item_at(1))
+        assert _ids(queue) == ['0', '1', '3', '2']
+
+        queue.move_to_next(queue.item_at(3))
+        assert _ids(queue) == ['0', '2', '1', '3']
+
+        with pytest.raises(ValueError):
+            queue.move(queue.item_at(1), after=queue.item_at(1))
+
+    def test_removed_item_rejected(self):
+        """測試已移除的項目不能再操作"""
+        queue = PlayQueue(_songs(2))
+        item = queue.item_at(0)
+        queue.remove(item)
+
+        with pytest.raises(ValueError):
+            queue.remove(item)
+        with pytest.raises(ValueError):
+            queue.index_of(item)
+
+    def test_navigation_wraps(self):
+        """測試上一個 / 下一個項目"""
+        queue = PlayQueue(_songs(3))
+        assert queue.next_item().song['id'] == '0'
+
+        queue.set_current_index(2)
+        assert queue.next_item() is None
+        assert queue.next_item(wrap=True).song['id'] == '0'
+
+        queue.set_current_index(0)
+        assert queue.previous_item() is None
+        assert queue.previous_item(wrap=True).song['id'] == '2'
+
+    def test_songs_cached_until_edit(self):
+        """測試歌曲列表在編輯前重複使用"""
+        queue = PlayQueue(_songs(3))
+        songs = queue.songs()
+        assert queue.songs() is songs
+
+        queue.append({'id': 'x'})
+        assert queue.songs() is not songs
+
+    def test_set_songs_keeps_current_song(self):
+        """測試以包含目前歌曲的新列表取代時保留目前歌曲"""
+        songs = _songs(3)
+        queue = PlayQueue(songs)
+        queue.set_current_index(1)
+
+        queue.set_songs([songs[2], songs[1]])
+        assert queue.current_index == 1
+
+        queue.set_songs(_songs(2))
+        assert queue.current is None
+
+
+class TestPlayQueueShuffle:
+    """測試播放佇列的隨機播放順序"""
+
+    def _queue(self, count, seed=1):
+        """建立使用固定亂數種子、已開始播放第一首的佇列"""
+        queue = PlayQueue(_songs(count), rng=random.Random(seed))
+        queue.set_current_index(0)
+        return queue
+
+    def test_move_current_keeps_shuffle_state(self):
+        """測試移動目前歌曲後目前歌曲與本輪已播放的順序不變"""
+        for seed in range(10):
+            queue = self._queue(6, seed)
+            played = [queue.shuffle_next() for _ in range(3)]
+
+            queue.move(queue.current, None)
+
+            assert queue.current is played[-1]
+            assert queue.current_index == 0
+            assert [queue.item_at(i) for i in queue.shuffle_played_indices()][1:] == played
+            rest = [queue.shuffle_next() for _ in range(2)]
+            assert not set(rest) & set(played)
+
+    def test_enqueue_next_plays_next(self):
+        """測試隨機播放時「下一首播放」的歌曲依加入順序接在目前歌曲之後"""
+        queue = self._queue(6)
+        queue.shuffle_next()
+        upcoming = queue.shuffle_upcoming(2)
+
+        first = queue.enqueue_next({'id': 'a'})
+        second = queue.enqueue_next({'id': 'b'})
+
+        assert queue.shuffle_upcoming(4) == [first, second] + upcoming
+        assert queue.shuffle_next() is first
+        assert queue.shuffle_next() is second
+
+    def test_enqueue_next_after_selecting_song(self):
+        """測試直接選擇歌曲後加入的「下一首播放」在重建隨機順序後仍是下一首"""
+        queue = self._queue(6)
+        queue.shuffle_next()
+        queue.set_current_index(3)
+
+        item = queue.enqueue_next({'id': 'a'})
+        assert queue.shuffle_next() is item
+
+    def test_remove_current_keeps_shuffle_neighbours(self):
+        """測試隨機播放時移除目前歌曲，上一首與下一首仍是原本的歌曲"""
+        queue = self._queue(6)
+        previous = queue.shuffle_next()
+        current = queue.shuffle_next()
+        expected = queue.shuffle_upcoming(1)[0]
+
+        queue.remove(current)
+
+        assert queue.shuffle_next() is expected
+        assert queue.shuffle_previous() is previous
+
+    def test_set_current_starts_new_order(self):
+        """測試直接選擇其他歌曲後從該歌曲開始新的隨機順序"""
+        queue = self._queue(5)
+        queue.shuffle_next()
+        queue.set_current_index(4)
+
+        queue.shuffle_next()
+        assert queue.shuffle_played_indices()[0] == 4
+        assert len(queue.shuffle_played_indices()) == 2
+
+    def test_set_songs_clears_shuffle_history(self):
+        """測試取代佇列內容後清除隨機播放記錄"""
+        queue = self._queue(5)
+        queue.shuffle_next()
+
+        queue.set_songs(_songs(3))
+        assert queue.shuffle_played_indices() == []
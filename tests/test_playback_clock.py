@@ -0,0 +1,118 @@
+"""播放時鐘單元測試"""
+import pytest
+from src.music.utils.playback_clock import ClockState, PlaybackClock
+
+
+class FakeScheduler:
+    """模擬 Tk 的 after() 排程"""
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = (ms, func)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def delays(self):
+        return [ms for ms, _ in self.pending.values()]
+
+    def run_next(self):
+        """執行目前唯一待執行的排程"""
+        assert len(self.pending) == 1
+        after_id = next(iter(self.pending))
+        ms, func = self.pending.pop(after_id)
+        func()
+        return ms
+
+
+class TestPlaybackClock:
+    """測試播放時鐘"""
+
+    @pytest.fixture
+    def clock(self):
+        """建立使用模擬排程的時鐘"""
+        self.scheduler = FakeScheduler()
+        self.state = ClockState(10.0, 100.0, False)
+        self.ticks = []
+        clock = PlaybackClock(self.scheduler, lambda: self.state, self.ticks.append, tick_ms=500)
+        yield clock
+        clock.stop()
+
+    def test_start_ticks_immediately_then_periodically(self, clock):
+        """測試開始後立即更新，之後依間隔更新"""
+        clock.start()
+        assert self.scheduler.delays() == [0]
+
+        self.scheduler.run_next()
+        assert self.ticks == [self.state]
+        assert self.scheduler.delays() == [500]
+
+    def test_triggers_coalesce_into_one_pending_update(self, clock):
+        """測試多次觸發只保留一個排程"""
+        clock.start()
+        clock.start()
+        clock.request_update()
+        assert self.scheduler.delays() == [0]
+
+        self.scheduler.run_next()
+        assert len(self.ticks) == 1
+
+    def test_wakes_at_next_lyric_boundary(self, clock):
+        """測試在下一句歌詞的時間點喚醒"""
+        clock.set_boundaries([12.0, 10.1, 5.0])
+        assert clock.next_boundary(10.0) == 10.1
+
+        clock.start()
+        self.scheduler.run_next()
+        assert self.scheduler.delays() == [100 + PlaybackClock.BOUNDARY_MARGIN_MS]
+
+    def test_boundary_after_tick_interval_uses_interval(self, clock):
+        """測試歌詞邊界較遠時仍依間隔更新"""
+        clock.set_boundaries([30.0])
+        clock.start()
+        self.scheduler.run_next()
+        assert self.scheduler.delays() == [500]
+
+    def test_paused_polls_without_ticking(self, clock):
+        """測試暫停時不更新 UI，只等待恢復"""
+        self.state = ClockState(10.0, 100.0, True)
+        clock.start()
+        self.scheduler.run_next()
+        assert self.ticks == []
+        assert self.scheduler.delays() == [PlaybackClock.PAUSED_POLL_MS]
+
+    def test_stops_when_nothing_playing(self, clock):
+        """測試沒有播放時停止排程"""
+        self.state = None
+        clock.start()
+        self.scheduler.run_next()
+        assert not clock.is_running()
+        assert self.scheduler.pending == {}
+
+    def test_stop_cancels_pending(self, clock):
+        """測試停止時取消待執行的排程"""
+        clock.start()
+        clock.stop()
+        assert self.scheduler.pending == {}
+
+    def test_tick_error_keeps_clock_running(self, clock):
+        """測試更新失敗時時鐘繼續運作"""
+        def failing_tick(state):
+            raise RuntimeError("boom")
+
+        clock.on_tick = failing_tick
+        clock.start()
+        self.scheduler.run_next()
+        assert clock.is_running()
+
+    def test_tick_that_restarts_clock_is_not_doubled(self, clock):
+        """測試更新回調中重新開始 (切換歌曲) 不會產生第二個排程"""
+        clock.on_tick = lambda state: clock.start()
+        clock.start()
+        self.scheduler.run_next()
+        assert self.scheduler.delays() == [0]
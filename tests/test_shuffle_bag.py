@@ -0,0 +1,134 @@
+"""隨機播放順序單元測試"""
+import random
+from src.music.utils.shuffle_bag import ShuffleBag
+
+
+def _bag(size, seed=1):
+    """建立使用固定亂數種子的隨機順序"""
+    return ShuffleBag(size, rng=random.Random(seed))
+
+
+class TestShuffleBag:
+    """測試隨機播放順序"""
+
+    def test_cycle_plays_every_song_once(self):
+        """測試一輪中每首歌曲剛好播放一次"""
+        bag = _bag(50)
+        order = [bag.next() for _ in range(50)]
+        assert sorted(order) == list(range(50))
+        assert bag.played() == order
+
+    def test_reshuffle_on_wrap_avoids_repeat(self):
+        """測試一輪結束後重新洗牌，且新一輪第一首不是上一首"""
+        for seed in range(20):
+            bag = _bag(4, seed)
+            first_cycle = [bag.next() for _ in range(4)]
+            second_start = bag.next()
+            assert second_start != first_cycle[-1]
+            assert bag.played() == [second_start]
+
+    def test_previous_walks_history(self):
+        """測試上一首依播放順序返回"""
+        bag = _bag(10)
+        order = [bag.next() for _ in range(4)]
+
+        assert bag.previous() == order[2]
+        assert bag.previous() == order[1]
+        # 返回後再往下一首重播原本的順序
+        assert bag.next() == order[2]
+        assert bag.next() == order[3]
+
+    def test_previous_at_start(self):
+        """測試已是本輪第一首時沒有上一首"""
+        bag = _bag(3)
+        assert bag.previous() is None
+        bag.next()
+        assert bag.previous() is None
+
+    def test_reset_with_start(self):
+        """測試以目前歌曲開始新的一輪"""
+        bag = _bag(5)
+        bag.reset(5, start=3)
+        assert bag.current == 3
+        assert 3 not in [bag.next() for _ in range(4)]
+
+    def test_peek_matches_next(self):
+        """測試預覽的順序與之後播放的順序相同"""
+        bag = _bag(10)
+        bag.next()
+        upcoming = bag.peek(3)
+        assert [bag.next() for _ in range(3)] == upcoming
+
+    def test_insert_keeps_history(self):
+        """測試插入歌曲後保留已播放的順序，新歌曲在本輪稍後播放"""
+        bag = _bag(5)
+        played = [bag.next() for _ in range(3)]
+
+        bag.insert(0)
+        shifted = [index + 1 for index in played]
+        assert bag.played() == shifted
+
+        rest = [bag.next() for _ in range(3)]
+        assert sorted(shifted + rest) == list(range(6))
+
+    def test_remove_current_keeps_next(self):
+        """測試移除目前歌曲後下一首仍是原本排定的歌曲"""
+        bag = _bag(6)
+        bag.next()
+        current = bag.next()
+        expected = bag.peek(1)[0]
+
+        bag.remove(current)
+        assert bag.next() == (expected - 1 if expected > current else expected)
+        assert bag.size == 5
+
+    def test_remove_unplayed(self):
+        """測試移除尚未播放的歌曲後本輪不會播放它"""
+        bag = _bag(6)
+        played = [bag.next() for _ in range(2)]
+        removed = next(index for index in range(6) if index not in played)
+
+        bag.remove(removed)
+        remaining = [bag.next() for _ in range(3)]
+        original = [index + 1 if index >= removed else index for index in remaining]
+        assert removed not in original
+        assert sorted(played + original) == sorted(set(range(6)) - {removed})
+
+    def test_pin_next(self):
+        """測試插到下一首的值依加入順序在目前歌曲之後播放"""
+        bag = _bag(6)
+        bag.next()
+        upcoming = bag.peek(2)
+
+        bag.pin_next('a')
+        bag.pin_next('b')
+        assert [bag.next() for _ in range(4)] == ['a', 'b'] + upcoming
+
+    def test_discard_current_keeps_neighbours(self):
+        """測試移除目前的值後上一首與下一首不變"""
+        bag = _bag(6)
+        previous = bag.next()
+        current = bag.next()
+        expected = bag.peek(1)[0]
+
+        bag.discard(current)
+        assert bag.current is None
+        assert bag.played() == [previous]
+        assert bag.next() == expected
+        assert bag.previous() == previous
+
+    def test_handles(self):
+        """測試以任意可雜湊的值 (控制代碼) 洗牌"""
+        values = [object() for _ in range(5)]
+        bag = ShuffleBag(rng=random.Random(1))
+        bag.reset(values, start=values[2])
+
+        rest = [bag.next() for _ in range(4)]
+        assert set(rest) == set(values) - {values[2]}
+        assert bag.next() is not rest[-1]
+
+    def test_empty(self):
+        """測試沒有歌曲"""
+        bag = ShuffleBag()
+        assert bag.next() is None
+        assert bag.peek(3) == []
@@ -0,0 +1,152 @@
+"""SongSortIndex 的單元測試"""
+from unittest.mock import patch
+
+import pytest
+
+from src.music.utils import song_sort_index
+from src.music.utils.song_sort_index import (
+    ReversedOrder, SongSortIndex, get_sort_key, make_sort_keys
+)
+
+
+def make_song(title, uploader='', duration=0, added_time=0, precompute=True):
+    song = {'title': title, 'uploader': uploader, 'duration': duration, 'added_time': added_time}
+    if precompute:
+        song['sort_keys'] = make_sort_keys(song)
+    return song
+
+
+@pytest.fixture
+def songs():
+    return [
+        make_song('beta', 'Zed', 200, 3),
+        make_song('Alpha', 'amy', 100, 1),
+        make_song('DELTA', 'Bob', 300, 2),
+        make_song('straße', 'bob', 150, 4),
+    ]
+
+
+class TestSortKeys:
+    """測試排序鍵"""
+
+    def test_make_sort_keys(self):
+        """標題與藝術家使用 casefold，時長為數值"""
+        keys = make_sort_keys({'title': 'STRASSE', 'uploader': 'Amy', 'duration': '90', 'added_time': 5})
+
+        assert keys == {'title': 'strasse', 'uploader': 'amy', 'duration': 90.0, 'added': 5}
+
+    def test_missing_fields(self):
+        """缺少欄位時使用預設值"""
+        keys = make_sort_keys({'duration': None})
+
+        assert keys == {'title': '', 'uploader': '', 'duration': 0.0, 'added': 0}
+
+    def test_get_sort_key_without_precomputed_keys(self):
+        """沒有預先計算的歌曲即時計算排序鍵"""
+        song = make_song('Hello', precompute=False)
+
+        assert get_sort_key(song, 'title') == 'hello'
+        assert 'sort_keys' not in song
+
+
+class TestReversedOrder:
+    """測試反向檢視"""
+
+    def test_sequence_behaviour(self):
+        """反向檢視支援序列操作"""
+        view = ReversedOrder([1, 2, 3])
+
+        assert len(view) == 3
+        assert list(view) == [3, 2, 1]
+        assert view[0] == 3
+        assert view[-1] == 1
+        assert view[1:] == [2, 1]
+        assert 2 in view
+        assert view.index(1) == 2
+        assert list(reversed(view)) == [1, 2, 3]
+        with pytest.raises(IndexError):
+            view[3]
+
+
+class TestSongSortIndex:
+    """測試排序索引快取"""
+
+    def test_sort_by_field(self, songs):
+        """依各欄位排序"""
+        index = SongSortIndex()
+
+        assert list(index.get_order(songs, 'title')) == [1, 0, 2, 3]
+        assert list(index.get_order(songs, 'duration')) == [1, 3, 0, 2]
+        assert list(index.get_order(songs, 'added')) == [1, 2, 0, 3]
+
+    def test_uploader_sort_is_stable(self, songs):
+        """相同排序鍵保持原本順序"""
+        index = SongSortIndex()
+
+        assert list(index.get_order(songs, 'uploader')) == [1, 2, 3, 0]
+
+    def test_descending_is_reversed_view(self, songs):
+        """降序為升序排列的反向檢視，不重新排序"""
+        index = SongSortIndex()
+        ascending = index.get_order(songs, 'duration', source='all')
+
+        with patch.object(song_sort_index, 'get_sort_key', side_effect=AssertionError):
+            descending = index.get_order(songs, 'duration', ascending=False, source='all')
+
+        assert isinstance(descending, ReversedOrder)
+        assert list(descending) == [2, 0, 3, 1]
+        assert list(ascending) == [1, 3, 0, 2]
+
+    def test_cached_per_source_and_field(self, songs):
+        """同一來源與欄位只排序一次"""
+        index = SongSortIndex()
+        first = index.get_order(songs, 'title', source='all')
+
+        with patch.object(song_sort_index, 'get_sort_key', side_effect=AssertionError):
+            assert index.get_order(songs, 'title', source='all') is first
+
+        assert index.get_order(songs, 'duration', source='all') is not first
+
+    def test_replaced_or_grown_list_is_resorted(self, songs):
+        """列表被替換或長度改變時重新排序"""
+        index = SongSortIndex()
+        index.get_order(songs, 'title', source='all')
+
+        songs.append(make_song('aaa'))
+        assert index.get_order(songs, 'title', source='all')[0] == 4
+
+        replaced = list(reversed(songs))
+        assert index.get_order(replaced, 'title', source='all')[0] == 0
+
+    def test_without_source_is_not_cached(self, songs):
+        """沒有來源鍵時不快取"""
+        index = SongSortIndex()
+
+        assert index.get_order(songs, 'title') is not index.get_order(songs, 'title')
+
+    def test_invalidate(self, songs):
+        """清除指定來源或全部快取"""
+        index = SongSortIndex()
+        first = index.get_order(songs, 'title', source='all')
+        other = index.get_order(songs, 'title', source='folder:Rock')
+
+        index.invalidate('all')
+        assert index.get_order(songs, 'title', source='all') is not first
+        assert index.get_order(songs, 'title', source='folder:Rock') is other
+
+        index.invalidate()
+        assert index.get_order(songs, 'title', source='folder:Rock') is not other
+
+    def test_cache_is_bounded(self, songs):
+        """快取數量有上限"""
+        index = SongSortIndex(max_entries=2)
+        first = index.get_order(songs, 'title', source='a')
+        index.get_order(songs, 'title', source='b')
+        index.get_order(songs, 'title', source='c')
+
+        assert index.get_order(songs, 'title', source='a') is not first
+
+    def test_unknown_field(self, songs):
+        """不支援的欄位拋出 ValueError"""
+        with pytest.raises(ValueError):
+            SongSortIndex().get_order(songs, 'rating')
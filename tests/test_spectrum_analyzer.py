@@ -0,0 +1,156 @@
+"""頻譜分析模組單元測試"""
+import time
+import tracemalloc
+import numpy as np
+import pytest
+import soundfile as sf
+from src.audio.audio_player import AudioPlayer
+from src.audio.equalizer_filter import EqualizerFilter
+from src.audio.output_backends import SimulatedOutputBackend
+from src.audio.spectrum_analyzer import SampleRing, SpectrumAnalyzer
+
+
+def _sine(frequency, frames, amplitude=1.0, sample_rate=44100):
+    """產生立體聲正弦波"""
+    t = np.arange(frames) / sample_rate
+    mono = (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return np.column_stack((mono, mono))
+
+
+class TestSampleRing:
+    """測試樣本環形緩衝區"""
+
+    def test_read_latest_across_wrap(self):
+        """測試跨越結尾時讀取最新資料"""
+        ring = SampleRing(10, channels=2)
+        data = np.arange(30, dtype=np.float32).reshape(15, 2)
+        ring.write(data[:7])
+        ring.write(data[7:])
+
+        out = np.zeros((6, 2), dtype=np.float32)
+        assert ring.read_latest(out)
+        np.testing.assert_array_equal(out, data[9:])
+
+    def test_not_enough_data(self):
+        """測試資料不足時不讀取"""
+        ring = SampleRing(10)
+        ring.write(np.ones((3, 2), dtype=np.float32))
+        assert not ring.read_latest(np.zeros((4, 2), dtype=np.float32))
+
+    def test_channel_mismatch(self):
+        """測試單聲道區塊寫入所有聲道，多聲道區塊只保留前面的聲道"""
+        ring = SampleRing(8, channels=2)
+        ring.write(np.full((2, 1), 0.5, dtype=np.float32))
+        ring.write(np.arange(12, dtype=np.float32).reshape(2, 6))
+
+        out = np.zeros((4, 2), dtype=np.float32)
+        assert ring.read_latest(out)
+        np.testing.assert_array_equal(out, [[0.5, 0.5], [0.5, 0.5], [0, 1], [6, 7]])
+
+    def test_write_does_not_allocate(self):
+        """測試寫入只做記憶體複製"""
+        ring = SampleRing(4096 * 4)
+        block = np.ones((2048, 2), dtype=np.float32)
+        ring.write(block)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(100):
+                ring.write(block)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak - baseline < block.nbytes // 4
+
+
+class TestSpectrumAnalyzer:
+    """測試頻譜與音量分析"""
+
+    def test_bands_match_equalizer(self):
+        """測試頻段與等化器的中心頻率相同"""
+        analyzer = SpectrumAnalyzer()
+        assert analyzer.frequencies == tuple(EqualizerFilter.DEFAULT_FREQUENCIES)
+
+    @pytest.mark.parametrize('band_index', [0, 4, 7])
+    def test_sine_lands_in_its_band(self, band_index):
+        """測試滿刻度正弦波落在對應頻段且約為 0 dB"""
+        analyzer = SpectrumAnalyzer()
+        frequency = analyzer.frequencies[band_index]
+        frame = analyzer.analyze(_sine(frequency, analyzer.fft_size))
+
+        assert frame.bands[band_index] == pytest.approx(0.0, abs=1.0)
+        others = np.delete(frame.bands, band_index)
+        assert np.all(others < frame.bands[band_index] - 20)
+
+    def test_levels(self):
+        """測試各聲道的 RMS 與峰值"""
+        analyzer = SpectrumAnalyzer()
+        samples = _sine(1000, analyzer.fft_size)
+        samples[:, 1] *= 0.5
+
+        frame = analyzer.analyze(samples)
+        np.testing.assert_allclose(frame.rms, [-3.01, -9.03], atol=0.05)
+        np.testing.assert_allclose(frame.peak, [0.0, -6.02], atol=0.05)
+
+    def test_silence_at_floor(self):
+        """測試靜音時所有電平為下限"""
+        analyzer = SpectrumAnalyzer()
+        frame = analyzer.analyze(np.zeros((analyzer.fft_size, 2), dtype=np.float32))
+        assert np.all(frame.bands == SpectrumAnalyzer.FLOOR_DB)
+        assert np.all(frame.peak == SpectrumAnalyzer.FLOOR_DB)
+
+    def test_band_layout_follows_sample_rate(self):
+        """測試改變採樣率後頻段仍正確"""
+        analyzer = SpectrumAnalyzer(sample_rate=44100)
+        analyzer.analyze(np.zeros((analyzer.fft_size, 2), dtype=np.float32))
+        analyzer.set_sample_rate(22050)
+
+        frame = analyzer.analyze(_sine(3000, analyzer.fft_size, sample_rate=22050))
+        assert int(np.argmax(frame.bands)) == 5
+
+    def test_worker_publishes_only_with_new_data(self):
+        """測試背景線程只在有新資料時發布結果"""
+        analyzer = SpectrumAnalyzer(frame_rate=100)
+        analyzer.start()
+        try:
+            time.sleep(0.05)
+            assert analyzer.get_latest() is None
+
+            analyzer.write(_sine(1000, analyzer.fft_size))
+            deadline = time.time() + 2.0
+            while analyzer.get_latest() is None and time.time() < deadline:
+                time.sleep(0.01)
+            frame = analyzer.get_latest()
+            assert frame is not None
+
+            time.sleep(0.05)
+            assert analyzer.get_latest() is frame
+        finally:
+            analyzer.stop()
+        assert not analyzer.is_running()
+
+
+class TestPlayerSpectrumTap:
+    """測試播放器把處理後的樣本送到頻譜分析器"""
+
+    def test_callback_feeds_tap(self, tmp_path):
+        """測試回調把輸出區塊複製到環形緩衝區"""
+        path = str(tmp_path / 'song.wav')
+        sf.write(path, _sine(440, 44100, amplitude=0.5), 48000)
+
+        analyzer = SpectrumAnalyzer()
+        backend = SimulatedOutputBackend()
+        player = AudioPlayer(output_backend=backend)
+        player.set_fade_enabled(False)
+        player.set_spectrum_tap(analyzer)
+        player.set_volume(0.5)
+        player.play(path)
+        backend.advance(3)
+
+        assert analyzer.sample_rate == 48000
+        assert analyzer.ring.write_index == 3 * AudioPlayer.BLOCKSIZE
+        out = np.zeros((AudioPlayer.BLOCKSIZE, 2), dtype=np.float32)
+        assert analyzer.ring.read_latest(out)
+        assert np.max(np.abs(out)) == pytest.approx(0.25, abs=0.01)
+        player.stop()
@@ -0,0 +1,166 @@
+"""TimeStretcher 單元測試"""
+import pytest
+import numpy as np
+from src.audio.time_stretch import TimeStretcher
+
+
+BLOCK = 2048
+
+
+def _sine(frequency, seconds, sample_rate=44100, amplitude=0.5):
+    """產生立體聲正弦波"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return np.column_stack((mono, mono))
+
+
+def _run(stretcher, source, blocks, start=0):
+    """以拉動方式處理多個區塊
+
+    Returns:
+        tuple: (輸出音訊, 消耗的來源幀數)
+    """
+    position = start
+    outputs = []
+    for _ in range(blocks):
+        needed = stretcher.input_frames_needed(BLOCK)
+        out = np.zeros((BLOCK, source.shape[1]), dtype=np.float32)
+        stretcher.process(source[position:position + needed], out)
+        position += needed
+        outputs.append(out)
+    return np.concatenate(outputs), position - start
+
+
+class TestTimeStretcherBypass:
+    """測試原速時的直通行為"""
+
+    def test_bypass_needs_exact_frames(self):
+        """測試原速時需要的輸入幀數等於輸出幀數"""
+        stretcher = TimeStretcher()
+        assert not stretcher.is_engaged()
+        assert stretcher.input_frames_needed(BLOCK) == BLOCK
+
+    def test_bypass_copies_input(self):
+        """測試原速時輸出與輸入相同"""
+        source = _sine(440, 0.5)
+        output, consumed = _run(TimeStretcher(), source, 4)
+        assert consumed == 4 * BLOCK
+        np.testing.assert_array_equal(output, source[:4 * BLOCK])
+
+    def test_speed_is_clamped(self):
+        """測試速度範圍限制"""
+        stretcher = TimeStretcher()
+        stretcher.set_speed(3.0)
+        assert stretcher.get_speed() == TimeStretcher.MAX_SPEED
+        stretcher.set_speed(0.1)
+        assert stretcher.get_speed() == TimeStretcher.MIN_SPEED
+
+
+class TestTimeStretcherStretching:
+    """測試變速處理"""
+
+    @pytest.mark.parametrize('speed', [0.5, 0.75, 1.5, 2.0])
+    def test_consumption_follows_speed(self, speed):
+        """測試消耗的來源幀數與速度成正比"""
+        source = _sine(440, 10)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(speed)
+        _, consumed = _run(stretcher, source, 80)
+        ratio = consumed / (80 * BLOCK)
+        assert ratio == pytest.approx(speed, rel=0.05)
+
+    @pytest.mark.parametrize('speed', [0.75, 1.5])
+    def test_pitch_is_preserved(self, speed):
+        """測試變速不改變音高"""
+        source = _sine(440, 10)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(speed)
+        output, _ = _run(stretcher, source, 40)
+
+        segment = output[BLOCK * 8:BLOCK * 8 + 16384, 0]
+        spectrum = np.abs(np.fft.rfft(segment * np.hanning(len(segment))))
+        peak = np.argmax(spectrum) * 44100 / len(segment)
+        assert peak == pytest.approx(440, abs=5)
+
+    def test_output_is_finite_and_bounded(self):
+        """測試輸出數值正常且振幅不被放大"""
+        source = _sine(440, 5)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(1.3)
+        output, _ = _run(stretcher, source, 40)
+        assert np.all(np.isfinite(output))
+        assert np.max(np.abs(output)) <= 0.5 + 1e-3
+
+    def test_process_fills_entire_block(self):
+        """測試每次都產生恰好一個區塊的輸出 (開始時沒有靜音)"""
+        source = _sine(440, 2)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(0.5)
+        output, _ = _run(stretcher, source, 2)
+        assert np.max(np.abs(output[:BLOCK // 4])) > 0.1
+        assert np.max(np.abs(output[-BLOCK // 4:])) > 0.1
+
+    def test_input_need_never_exceeds_maximum(self):
+        """測試每個區塊需要的輸入不超過預先配置的上限"""
+        source = _sine(440, 20)
+        stretcher = TimeStretcher()
+        limit = stretcher.max_input_frames(BLOCK)
+        position = 0
+        for index in range(60):
+            stretcher.set_speed([2.0, 0.5, 1.0][index % 3])
+            needed = stretcher.input_frames_needed(BLOCK)
+            assert needed <= limit
+            out = np.zeros((BLOCK, 2), dtype=np.float32)
+            stretcher.process(source[position:position + needed], out)
+            position += needed
+
+
+class TestTimeStretcherTransitions:
+    """測試速度切換與重置"""
+
+    def test_return_to_normal_speed_drains_to_bypass(self):
+        """測試恢復原速後回到 bypass 且輸出與來源逐幀對齊"""
+        source = _sine(440, 10)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(1.3)
+        _, position = _run(stretcher, source, 20)
+
+        stretcher.set_speed(1.0)
+        for _ in range(4):
+            _, consumed = _run(stretcher, source, 1, start=position)
+            position += consumed
+        assert not stretcher.is_engaged()
+
+        output, consumed = _run(stretcher, source, 1, start=position)
+        assert consumed == BLOCK
+        np.testing.assert_array_equal(output, source[position:position + BLOCK])
+
+    def test_reset_clears_state(self):
+        """測試重置後回到 bypass"""
+        source = _sine(440, 2)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(1.5)
+        _run(stretcher, source, 3)
+        stretcher.set_speed(1.0)
+        stretcher.reset()
+        assert not stretcher.is_engaged()
+        assert stretcher.input_frames_needed(BLOCK) == BLOCK
+
+    def test_mono_input(self):
+        """測試單聲道輸入"""
+        source = _sine(440, 2)[:, :1]
+        stretcher = TimeStretcher(channels=1)
+        stretcher.set_speed(1.5)
+        output, consumed = _run(stretcher, source, 10)
+        assert output.shape == (10 * BLOCK, 1)
+        assert consumed > 10 * BLOCK
+
+    def test_synthesis_reuses_buffers(self):
+        """測試合成時重複使用預先配置的緩衝區"""
+        source = _sine(440, 2)
+        stretcher = TimeStretcher()
+        stretcher.set_speed(1.5)
+        scratch, acc = stretcher._scratch, stretcher._acc
+        _run(stretcher, source, 5)
+        assert stretcher._scratch is scratch
+        assert stretcher._acc is acc
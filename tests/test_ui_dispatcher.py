@@ -0,0 +1,237 @@
+"""UIDispatcher 的單元測試"""
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import ui_dispatcher
+from src.utils.ui_dispatcher import (
+    PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, UIDispatcher
+)
+
+
+class FakeScheduler:
+    """模擬 Tk 的 after() / after_cancel()，由測試手動執行"""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.delays = []
+        self._next_id = 0
+
+    def after(self, delay, func):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.scheduled[after_id] = func
+        self.delays.append(delay)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run(self):
+        """執行目前已排程的回調"""
+        callbacks = list(self.scheduled.values())
+        self.scheduled.clear()
+        for func in callbacks:
+            func()
+
+
+@pytest.fixture
+def scheduler():
+    return FakeScheduler()
+
+
+@pytest.fixture
+def dispatcher(scheduler):
+    return UIDispatcher(scheduler)
+
+
+class TestUIDispatcher:
+    """測試 UI 派送佇列"""
+
+    def test_single_after_per_frame(self, dispatcher, scheduler):
+        """多次排入只排程一次 after()"""
+        calls = []
+        for i in range(50):
+            dispatcher.post(calls.append, i)
+
+        assert len(scheduler.scheduled) == 1
+        scheduler.run()
+
+        assert calls == list(range(50))
+        assert dispatcher.pending_count() == 0
+
+    def test_next_frame_is_delayed(self, dispatcher, scheduler):
+        """處理後立即排入的更新延後到下一個畫面"""
+        with patch.object(ui_dispatcher.time, 'monotonic', return_value=100.0):
+            dispatcher.post(lambda: None)
+            scheduler.run()
+            dispatcher.post(lambda: None)
+
+        assert scheduler.delays == [0, UIDispatcher.FRAME_MS]
+
+    def test_same_key_last_write_wins(self, dispatcher, scheduler):
+        """相同 key 只執行最新的更新，並保留原本的排隊位置"""
+        calls = []
+        dispatcher.post(calls.append, 'progress 10%', key='progress')
+        dispatcher.post(calls.append, 'title')
+        dispatcher.post(calls.append, 'progress 90%', key='progress')
+
+        scheduler.run()
+
+        assert calls == ['progress 90%', 'title']
+        assert dispatcher.stats()['coalesced'] == 1
+
+    def test_priority_lanes(self, dispatcher, scheduler):
+        """高優先的更新先執行，同一通道依排入順序"""
+        calls = []
+        dispatcher.post(calls.append, 'low', priority=PRIORITY_LOW)
+        dispatcher.post(calls.append, 'normal 1')
+        dispatcher.post(calls.append, 'high', priority=PRIORITY_HIGH)
+        dispatcher.post(calls.append, 'normal 2', priority=PRIORITY_NORMAL)
+
+        scheduler.run()
+
+        assert calls == ['high', 'normal 1', 'normal 2', 'low']
+
+    def test_coalesced_key_moves_to_new_priority(self, dispatcher, scheduler):
+        """相同 key 以新的優先順序排入時移到該通道"""
+        calls = []
+        dispatcher.post(calls.append, 'other')
+        dispatcher.post(calls.append, 'old', key='next', priority=PRIORITY_LOW)
+        dispatcher.post(calls.append, 'new', key='next', priority=PRIORITY_HIGH)
+
+        scheduler.run()
+
+        assert calls == ['new', 'other']
+
+    def test_unknown_priority(self, dispatcher):
+        """不支援的優先順序拋出 ValueError"""
+        with pytest.raises(ValueError):
+            dispatcher.post(lambda: None, priority=5)
+
+    def test_posts_during_drain_wait_for_next_frame(self, dispatcher, scheduler):
+        """處理期間排入的更新留到下一個畫面"""
+        calls = []
+
+        def first():
+            calls.append('first')
+            dispatcher.post(calls.append, 'second')
+
+        dispatcher.post(first)
+        scheduler.run()
+
+        assert calls == ['first']
+        assert len(scheduler.scheduled) == 1
+
+        scheduler.run()
+        assert calls == ['first', 'second']
+
+    def test_error_is_logged_and_others_run(self, dispatcher, scheduler):
+        """單一更新失敗時記錄錯誤，其餘更新繼續執行"""
+        calls = []
+
+        def broken():
+            raise RuntimeError("boom")
+
+        dispatcher.post(broken)
+        dispatcher.post(calls.append, 'ok')
+
+        with patch.object(ui_dispatcher.logger, 'error') as mock_error:
+            scheduler.run()
+
+        assert calls == ['ok']
+        mock_error.assert_called_once()
+        stats = dispatcher.stats()
+        assert stats['errors'] == 1
+        assert stats['executed'] == 1
+
+    def test_stats(self, dispatcher, scheduler):
+        """統計佇列深度與處理次數"""
+        for i in range(3):
+            dispatcher.post(lambda: None)
+        dispatcher.post(lambda: None, key='a')
+        dispatcher.post(lambda: None, key='a')
+
+        assert dispatcher.stats()['pending'] == 4
+        scheduler.run()
+        dispatcher.post(lambda: None)
+        scheduler.run()
+
+        stats = dispatcher.stats()
+        assert stats['posted'] == 6
+        assert stats['coalesced'] == 1
+        assert stats['executed'] == 5
+        assert stats['drains'] == 2
+        assert stats['last_depth'] == 1
+        assert stats['max_depth'] == 4
+        assert stats['pending'] == 0
+        assert stats['max_drain_ms'] >= stats['avg_drain_ms'] >= 0
+
+    def test_attach_drains_queued_updates(self):
+        """設定排程前排入的更新在 attach() 後處理"""
+        calls = []
+        dispatcher = UIDispatcher()
+        dispatcher.post(calls.append, 'early')
+
+        scheduler = FakeScheduler()
+        dispatcher.attach(scheduler)
+        scheduler.run()
+
+        assert calls == ['early']
+
+    def test_flush(self, dispatcher, scheduler):
+        """flush() 立即處理並取消已排程的 after()"""
+        calls = []
+        dispatcher.post(calls.append, 'now')
+
+        dispatcher.flush()
+
+        assert calls == ['now']
+        assert scheduler.scheduled == {}
+
+    def test_shutdown_drops_pending_updates(self, dispatcher, scheduler):
+        """關閉後捨棄尚未執行的更新並拒絕新的更新"""
+        calls = []
+        dispatcher.post(calls.append, 'dropped')
+
+        dispatcher.shutdown()
+
+        assert scheduler.scheduled == {}
+        assert dispatcher.post(calls.append, 'late') is False
+        assert dispatcher.pending_count() == 0
+        assert calls == []
+
+    def test_destroyed_scheduler(self, dispatcher):
+        """視窗已銷毀時不拋出例外，重新設定視窗後繼續處理"""
+        class DestroyedScheduler:
+            def after(self, delay, func):
+                raise RuntimeError("application has been destroyed")
+
+        calls = []
+        dispatcher.attach(DestroyedScheduler())
+        assert dispatcher.post(calls.append, 'queued') is True
+
+        scheduler = FakeScheduler()
+        dispatcher.attach(scheduler)
+        scheduler.run()
+
+        assert calls == ['queued']
+
+    def test_post_from_threads(self, dispatcher, scheduler):
+        """多個執行緒同時排入"""
+        calls = []
+
+        def worker(n):
+            for i in range(100):
+                dispatcher.post(calls.append, (n, i))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(scheduler.scheduled) == 1
+        scheduler.run()
+        assert len(calls) == 400
@@ -0,0 +1,306 @@
+"""VirtualSongList 的單元測試"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.music.views.virtual_song_list import VirtualSongList
+
+
+class FakeTree:
+    """模擬 ttk.Treeview (只記錄項目與選取)"""
+
+    HEADING_HEIGHT = 24
+
+    def __init__(self):
+        self.rows = {}
+        self.order = []
+        self.bindings = {}
+        self._selection = ()
+        self._next_id = 0
+        self.insert_count = 0
+        self.delete_count = 0
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def insert(self, parent, index, values=()):
+        self._next_id += 1
+        row_id = f"I{self._next_id:03d}"
+        self.rows[row_id] = tuple(values)
+        self.order.append(row_id)
+        self.insert_count += 1
+        return row_id
+
+    def delete(self, *row_ids):
+        for row_id in row_ids:
+            del self.rows[row_id]
+            self.order.remove(row_id)
+            self.delete_count += 1
+
+    def item(self, row_id, values=()):
+        self.rows[row_id] = tuple(values)
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def bbox(self, row_id):
+        """項目池固定從頂端顯示，標題列高 HEADING_HEIGHT"""
+        offset = self.order.index(row_id)
+        return (0, self.HEADING_HEIGHT + offset * 25, 400, 25)
+
+    def selection(self):
+        return self._selection
+
+    def selection_set(self, row_id):
+        self._selection = (row_id,)
+
+    def selection_remove(self, *row_ids):
+        self._selection = ()
+
+    def shown(self):
+        """目前各列顯示的標題"""
+        return [self.rows[row_id][0] if self.rows[row_id] else None for row_id in self.order]
+
+
+class FakeScrollbar:
+    """模擬 tk.Scrollbar"""
+
+    def __init__(self):
+        self.command = None
+        self.position = None
+
+    def config(self, command=None):
+        self.command = command
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+def make_songs(count):
+    return [{'title': f"Song {i:04d}", 'duration': i} for i in range(count)]
+
+
+@pytest.fixture
+def tree():
+    return FakeTree()
+
+
+@pytest.fixture
+def scrollbar():
+    return FakeScrollbar()
+
+
+@pytest.fixture
+def formatted():
+    return []
+
+
+@pytest.fixture
+def song_list(tree, scrollbar, formatted):
+    def format_row(song):
+        formatted.append(song['title'])
+        return (song['title'],)
+
+    view = VirtualSongList(tree, scrollbar, format_row, overscan=2)
+    view.visible_rows = 5
+    return view
+
+
+class TestVirtualSongList:
+    """測試虛擬化歌曲列表"""
+
+    def test_only_materializes_visible_rows(self, song_list, tree, formatted):
+        """大量歌曲只建立可見列加預留列"""
+        song_list.set_items(make_songs(10000))
+
+        assert len(tree.get_children()) == 7
+        assert len(formatted) == 7
+        assert tree.shown()[0] == 'Song 0000'
+        assert len(song_list) == 10000
+
+    def test_short_list_has_one_row_per_song(self, song_list, tree):
+        """歌曲少於可見列時每首一列"""
+        song_list.set_items(make_songs(2))
+
+        assert tree.shown() == ['Song 0000', 'Song 0001']
+
+    def test_scrolling_recycles_rows(self, song_list, tree, scrollbar):
+        """捲動時重複使用既有的列"""
+        song_list.set_items(make_songs(100))
+        rows = tree.get_children()
+        inserted = tree.insert_count
+
+        song_list.scroll_to(50)
+
+        assert tree.get_children() == rows
+        assert tree.insert_count == inserted
+        assert tree.shown()[0] == 'Song 0050'
+        assert scrollbar.position == (0.5, 0.55)
+
+    def test_scroll_is_clamped(self, song_list, tree):
+        """捲動不超過列表結尾"""
+        song_list.set_items(make_songs(20))
+
+        song_list.scroll_to(1000)
+        assert tree.shown()[0] == 'Song 0015'
+
+        song_list.scroll_to(-5)
+        assert tree.shown()[0] == 'Song 0000'
+
+    def test_scrollbar_commands(self, song_list, tree, scrollbar):
+        """捲軸的 moveto 與 scroll 命令"""
+        song_list.set_items(make_songs(100))
+
+        scrollbar.command('moveto', '0.3')
+        assert tree.shown()[0] == 'Song 0030'
+
+        scrollbar.command('scroll', '1', 'units')
+        assert tree.shown()[0] == 'Song 0031'
+
+        scrollbar.command('scroll', '-1', 'pages')
+        assert tree.shown()[0] == 'Song 0027'
+
+    def test_mousewheel(self, song_list, tree):
+        """滑鼠滾輪捲動"""
+        song_list.set_items(make_songs(100))
+
+        assert tree.bindings['<MouseWheel>'](SimpleNamespace(num='??', delta=-120)) == "break"
+        assert tree.shown()[0] == 'Song 0003'
+
+        tree.bindings['<Button-4>'](SimpleNamespace(num=4, delta=0))
+        assert tree.shown()[0] == 'Song 0000'
+
+    def test_unchanged_rows_are_not_reformatted(self, song_list, formatted):
+        """重新繪製時不重複格式化未改變的列"""
+        song_list.set_items(make_songs(100))
+        formatted.clear()
+
+        song_list.scroll_to(1)
+
+        assert formatted == ['Song 0007']
+
+    def test_set_order_swaps_index_array(self, song_list, tree):
+        """排序只替換索引陣列，不重建列"""
+        songs = make_songs(50)
+        song_list.set_items(songs)
+        rows = tree.get_children()
+
+        song_list.set_order(reversed(range(50)))
+
+        assert tree.get_children() == rows
+        assert tree.shown()[0] == 'Song 0049'
+        assert song_list.items()[0] is songs[49]
+        assert song_list.item_at(1) is songs[48]
+
+    def test_set_order_filters(self, song_list, tree):
+        """篩選後列數減少"""
+        song_list.set_items(make_songs(50))
+
+        song_list.set_order([3, 7])
+
+        assert tree.shown() == ['Song 0003', 'Song 0007']
+        assert len(song_list) == 2
+
+    def test_position_of_follows_scroll(self, song_list, tree):
+        """列的顯示位置隨捲動改變"""
+        song_list.set_items(make_songs(100))
+        row_id = tree.get_children()[2]
+
+        assert song_list.position_of(row_id) == 2
+        song_list.scroll_to(40)
+        assert song_list.position_of(row_id) == 42
+        assert song_list.position_of('unknown') == -1
+
+    def test_selection_follows_song(self, song_list, tree):
+        """選取的歌曲捲出畫面後再捲回仍保持選取"""
+        song_list.set_items(make_songs(100))
+        tree.selection_set(tree.get_children()[1])
+        tree.bindings['<<TreeviewSelect>>'](None)
+
+        song_list.scroll_to(50)
+        assert tree.selection() == ()
+
+        song_list.scroll_to(0)
+        assert tree.selection() == (tree.get_children()[1],)
+        assert song_list.selected_position() == 1
+
+    def test_selection_survives_sort(self, song_list, tree):
+        """排序後選取同一首歌曲"""
+        song_list.set_items(make_songs(5))
+        song_list.select(0)
+
+        song_list.set_order([4, 3, 2, 1, 0])
+
+        assert song_list.selected_position() == 4
+        assert tree.rows[tree.selection()[0]] == ('Song 0000',)
+
+    def test_selected_position_after_scrolling_away(self, song_list, tree):
+        """選取列捲出項目池後仍可取得選取位置"""
+        song_list.set_items(make_songs(100))
+        tree.selection_set(tree.order[1])
+
+        song_list.scroll_to(50)
+
+        assert tree.selection() == ()
+        assert song_list.selected_position() == 1
+
+    def test_select_scrolls_into_view(self, song_list, tree):
+        """選取畫面外的列時捲動到可見範圍"""
+        song_list.set_items(make_songs(100))
+
+        song_list.select(30)
+
+        assert tree.shown()[4] == 'Song 0030'
+        assert tree.rows[tree.selection()[0]] == ('Song 0030',)
+
+    def test_keyboard_navigation(self, song_list, tree):
+        """方向鍵移動選取"""
+        song_list.set_items(make_songs(100))
+        song_list.select(4)
+
+        tree.bindings['<Down>'](SimpleNamespace(keysym='Down'))
+        assert song_list.selected_position() == 5
+        assert tree.shown()[0] == 'Song 0001'
+
+        tree.bindings['<End>'](SimpleNamespace(keysym='End'))
+        assert song_list.selected_position() == 99
+
+    def test_configure_resizes_pool(self, song_list, tree):
+        """元件高度改變時調整列數"""
+        song_list.set_items(make_songs(100))
+
+        tree.bindings['<Configure>'](SimpleNamespace(height=274))
+
+        assert song_list.visible_rows == 10
+        assert len(tree.get_children()) == 12
+
+    def test_configure_excludes_heading(self, song_list, tree):
+        """可見列數扣除標題列，最後一首可以捲動到畫面內"""
+        song_list.set_items(make_songs(100))
+
+        tree.bindings['<Configure>'](SimpleNamespace(height=250))
+        assert song_list.visible_rows == 9
+
+        tree.bindings['<End>'](SimpleNamespace(keysym='End'))
+        assert song_list.position_of(tree.order[song_list.visible_rows - 1]) == 99
+
+    def test_configure_before_rows_are_drawn(self, tree, scrollbar):
+        """尚未有列可量測時假設標題列與一列同高"""
+        song_list = VirtualSongList(tree, scrollbar, lambda song: (song['title'],))
+
+        tree.bindings['<Configure>'](SimpleNamespace(height=250))
+
+        assert song_list.visible_rows == 9
+
+    def test_clear(self, song_list, tree, scrollbar):
+        """清空列表"""
+        song_list.set_items(make_songs(10))
+
+        song_list.clear()
+
+        assert tree.get_children() == ()
+        assert song_list.items() == []
+        assert scrollbar.position == (0.0, 1.0)